@@ -27,7 +27,8 @@ from requests.utils import quote
 # Added for graphs showing Redis data
 import traceback
 # import redis
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 import datetime as dt
 # @added 20180809 - Bug #2498: Incorrect scale in some graphs
 # @modified 20181025 - Feature #2618: alert_slack
@@ -137,6 +138,8 @@ if True:
     from functions.metrics.get_dotted_representation import get_dotted_representation
     # @added 20240407 - Feature #4214: alert.paused
     from functions.settings.sms_alert_schedule import sms_alert_schedule
+    # @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+    from functions.timeseries.packed_timeseries import unpack_timeseries
 
 # @added 20201127 - Feature #3820: HORIZON_SHARDS
 try:
@@ -773,16 +776,19 @@ def alert_smtp(alert, metric, context):
             try:
                 if LOCAL_DEBUG:
                     logger.info('debug :: alert_smtp - Memory usage before get Redis timeseries data: %s (kb)' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
-                unpacker = Unpacker(use_list=True)
-                unpacker.feed(raw_series)
-                timeseries_x = [float(item[0]) for item in unpacker]
-                unpacker = Unpacker(use_list=True)
-                unpacker.feed(raw_series)
-                timeseries_y = [item[1] for item in unpacker]
-
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=True)
+                # unpacker.feed(raw_series)
+                # timeseries_x = [float(item[0]) for item in unpacker]
+                # unpacker = Unpacker(use_list=True)
+                # unpacker.feed(raw_series)
+                # timeseries_y = [item[1] for item in unpacker]
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
+                timeseries_x = [float(item[0]) for item in timeseries]
+                timeseries_y = [item[1] for item in timeseries]
                 if LOCAL_DEBUG:
                     logger.info('debug :: alert_smtp - Memory usage after get Redis timeseries data: %s (kb)' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
             except:
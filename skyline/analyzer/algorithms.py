@@ -50,6 +50,49 @@ if ENABLE_SECOND_ORDER:
     else:
         redis_conn = StrictRedis(unix_socket_path=REDIS_SOCKET_PATH)
 
+# @added 20261027 - Feature #5769: analyzer - metadata snapshot
+# Cache the Redis connection of each process rather than creating a new Redis
+# connection every time one is required for a metric
+algorithms_redis_conns = {}
+
+
+def get_algorithms_redis_conn():
+    """
+    Return the Redis connection of the process, creating it if required.
+    """
+    pid = getpid()
+    algorithms_redis_conn = algorithms_redis_conns.get(pid)
+    if algorithms_redis_conn is None:
+        from skyline_functions import get_redis_conn
+        algorithms_redis_conns.clear()
+        algorithms_redis_conn = get_redis_conn(skyline_app)
+        algorithms_redis_conns[pid] = algorithms_redis_conn
+    return algorithms_redis_conn
+
+
+# @added 20261027 - Feature #5769: analyzer - metadata snapshot
+# The trigger_history Redis keys of the metrics assigned to the process, loaded
+# with a single mget by set_trigger_history_snapshot, so that
+# is_anomalously_anomalous does not get the key of each anomalous metric
+trigger_history_snapshot = {}
+
+
+def set_trigger_history_snapshot(metric_names):
+    """
+    Load the trigger_history Redis keys of the metrics into the
+    trigger_history_snapshot of the process with a single mget, replacing the
+    previous snapshot.  A metric with no trigger_history is in the snapshot with
+    a None value.
+    """
+    trigger_history_snapshot.clear()
+    if not metric_names:
+        return trigger_history_snapshot
+    redis_conn = get_algorithms_redis_conn()
+    raw_trigger_histories = redis_conn.mget(['trigger_history.' + metric_name for metric_name in metric_names])
+    for index, metric_name in enumerate(metric_names):
+        trigger_history_snapshot[metric_name] = raw_trigger_histories[index]
+    return trigger_history_snapshot
+
 # @added 20200603 - Feature #3566: custom_algorithms
 try:
     from settings import CUSTOM_ALGORITHMS
@@ -1121,12 +1164,26 @@ def is_anomalously_anomalous(metric_name, ensemble, datapoint):
     # Get the old history
     # @added 20200505 - Feature #3504: Handle airgaps in batch metrics
     # Use get_redis_conn
-    from skyline_functions import get_redis_conn
-    redis_conn = get_redis_conn(skyline_app)
-
-    raw_trigger_history = redis_conn.get('trigger_history.' + metric_name)
+    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+    # Use the cached Redis connection of the process
+    # from skyline_functions import get_redis_conn
+    # redis_conn = get_redis_conn(skyline_app)
+    redis_conn = get_algorithms_redis_conn()
+
+    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+    # Use the trigger_history_snapshot if the metric is in it
+    # raw_trigger_history = redis_conn.get('trigger_history.' + metric_name)
+    if metric_name in trigger_history_snapshot:
+        raw_trigger_history = trigger_history_snapshot[metric_name]
+    else:
+        raw_trigger_history = redis_conn.get('trigger_history.' + metric_name)
     if not raw_trigger_history:
-        redis_conn.set('trigger_history.' + metric_name, packb([(time(), datapoint)]))
+        # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+        # redis_conn.set('trigger_history.' + metric_name, packb([(time(), datapoint)]))
+        raw_trigger_history = packb([(time(), datapoint)])
+        redis_conn.set('trigger_history.' + metric_name, raw_trigger_history)
+        if metric_name in trigger_history_snapshot:
+            trigger_history_snapshot[metric_name] = raw_trigger_history
         return True
 
     trigger_history = unpackb(raw_trigger_history)
@@ -1137,7 +1194,12 @@ def is_anomalously_anomalous(metric_name, ensemble, datapoint):
 
     # Update the history
     trigger_history.append(new_trigger)
-    redis_conn.set('trigger_history.' + metric_name, packb(trigger_history))
+    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+    # redis_conn.set('trigger_history.' + metric_name, packb(trigger_history))
+    raw_trigger_history = packb(trigger_history)
+    redis_conn.set('trigger_history.' + metric_name, raw_trigger_history)
+    if metric_name in trigger_history_snapshot:
+        trigger_history_snapshot[metric_name] = raw_trigger_history
 
     # Should we surface the anomaly?
     trigger_times = [x[0] for x in trigger_history]
@@ -1165,10 +1227,12 @@ def is_anomalously_anomalous(metric_name, ensemble, datapoint):
 # def run_selected_algorithm(timeseries, metric_name, airgapped_metrics, run_negatives_present):
 # @modified 20210519 - Feature #4076: CUSTOM_STALE_PERIOD
 # Added custom_stale_metrics_dict
+# @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+# Added vectorized_ensemble
 def run_selected_algorithm(
         timeseries, metric_name, airgapped_metrics, airgapped_metrics_filled,
         run_negatives_present, check_for_airgaps_only,
-        custom_stale_metrics_dict):
+        custom_stale_metrics_dict, vectorized_ensemble=None):
     """
     Run selected algorithm if not Stale, Boring or TooShort
 
@@ -1182,6 +1246,10 @@ def run_selected_algorithm(
         time series and NOT do analysis
     :param custom_stale_metrics_dict: the dictionary containing the
         CUSTOM_STALE_PERIOD to metrics with a custom stale period defined
+    :param vectorized_ensemble: the ensemble of the three-sigma ALGORITHMS
+        results for this time series from run_selected_algorithms_vectorized,
+        optional, if passed the results are used rather than running each
+        three-sigma algorithm
     :type timeseries: list
     :type metric_name: str
     :type airgapped_metrics: list
@@ -1189,6 +1257,7 @@ def run_selected_algorithm(
     :type run_negatives_present: boolean
     :type check_for_airgap_only: boolean
     :type custom_stale_metrics_dict: dict
+    :type vectorized_ensemble: list
     :return: anomalous, ensemble, datapoint, negatives_found, algorithms_run
     :rtype: (boolean, list, float, boolean, list)
 
@@ -1255,8 +1324,11 @@ def run_selected_algorithm(
             try:
                 # @added 20200505 - Feature #3504: Handle airgaps in batch metrics
                 # Use get_redis_conn
-                from skyline_functions import get_redis_conn
-                redis_conn = get_redis_conn(skyline_app)
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # Use the cached Redis connection of the process
+                # from skyline_functions import get_redis_conn
+                # redis_conn = get_redis_conn(skyline_app)
+                redis_conn = get_algorithms_redis_conn()
                 redis_conn.sadd('analyzer.alert_on_stale_metrics', metric_name)
             except:
                 pass
@@ -1273,8 +1345,11 @@ def run_selected_algorithm(
             if not add_to_alert_on_stale_metrics:
                 # @added 20200505 - Feature #3504: Handle airgaps in batch metrics
                 # Use get_redis_conn
-                from skyline_functions import get_redis_conn
-                redis_conn = get_redis_conn(skyline_app)
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # Use the cached Redis connection of the process
+                # from skyline_functions import get_redis_conn
+                # redis_conn = get_redis_conn(skyline_app)
+                redis_conn = get_algorithms_redis_conn()
             check_airgap_only = redis_conn.get(check_airgap_only_key)
         except:
             check_airgap_only = None
@@ -1305,8 +1380,11 @@ def run_selected_algorithm(
                 redis_populated = False
                 redis_populated_key = 'mirage.redis_populated.%s' % base_name
                 try:
-                    from skyline_functions import get_redis_conn
-                    redis_conn = get_redis_conn(skyline_app)
+                    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                    # Use the cached Redis connection of the process
+                    # from skyline_functions import get_redis_conn
+                    # redis_conn = get_redis_conn(skyline_app)
+                    redis_conn = get_algorithms_redis_conn()
                 except:
                     redis_conn = None
                 if redis_conn:
@@ -1405,8 +1483,11 @@ def run_selected_algorithm(
             except:
                 # @added 20200505 - Feature #3504: Handle airgaps in batch metrics
                 # Use get_redis_conn
-                from skyline_functions import get_redis_conn
-                redis_conn = get_redis_conn(skyline_app)
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # Use the cached Redis connection of the process
+                # from skyline_functions import get_redis_conn
+                # redis_conn = get_redis_conn(skyline_app)
+                redis_conn = get_algorithms_redis_conn()
         if airgaps:
             for i in airgaps:
                 try:
@@ -1748,7 +1829,9 @@ def run_selected_algorithm(
         if DEBUG_CUSTOM_ALGORITHMS and len(custom_algorithms_to_run) > 0:
             logger.debug('debug :: running three-sigma algorithms')
 
-        for algorithm in ALGORITHMS:
+        # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+        # for algorithm in ALGORITHMS:
+        for algorithm_index, algorithm in enumerate(ALGORITHMS):
 
             if consensus_possible and run_3sigma_algorithms:
                 if send_algorithm_run_metrics:
@@ -1763,7 +1846,17 @@ def run_selected_algorithm(
                 try:
                     # @modified 20221019 - Feature #4700: algorithms - single series
                     # algorithm_result = [globals()[test_algorithm](timeseries) for test_algorithm in run_algorithm]
-                    algorithm_result = [globals()[test_algorithm](timeseries, series) for test_algorithm in run_algorithm]
+                    # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+                    # Use the result of the algorithm from the vectorized
+                    # ensemble if passed, the algorithms that the
+                    # RUN_OPTIMIZED_WORKFLOW skips are not reached here so
+                    # the ensemble is only used when all algorithms are not
+                    # being timed
+                    # algorithm_result = [globals()[test_algorithm](timeseries, series) for test_algorithm in run_algorithm]
+                    if vectorized_ensemble is not None and not time_all_algorithms:
+                        algorithm_result = [vectorized_ensemble[algorithm_index]]
+                    else:
+                        algorithm_result = [globals()[test_algorithm](timeseries, series) for test_algorithm in run_algorithm]
                 except:
                     # logger.error('%s failed' % (algorithm))
                     algorithm_result = [None]
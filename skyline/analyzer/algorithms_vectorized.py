@@ -0,0 +1,438 @@
+"""
+The vectorized algorithms evaluate the three-sigma algorithms for a batch of
+metrics in a single call, using numpy broadcasting across a 2D array of all the
+time series, rather than calling each algorithm for each metric on a list of
+tuples.  They replicate the results of the algorithms in algorithms.py as run by
+run_selected_algorithm (with USE_NUMBA).
+
+The time series are right aligned so that the last data point of every metric
+is in the last column and shorter time series are padded with NaN at the start.
+NaN values in the data are ignored, as pandas does.  Custom algorithms,
+airgaps, second order and stale alerting are not handled here, the metrics
+that require them must be run through run_selected_algorithm.
+"""
+from __future__ import division
+import logging
+import traceback
+import warnings
+from time import time
+
+import pandas
+import numpy as np
+import scipy
+
+from settings import (
+    ALGORITHMS,
+    CONSENSUS,
+    FULL_DURATION,
+    MAX_TOLERABLE_BOREDOM,
+    MIN_TOLERABLE_LENGTH,
+    STALE_PERIOD,
+    BOREDOM_SET_SIZE,
+    RUN_OPTIMIZED_WORKFLOW,
+    ENABLE_ALL_ALGORITHMS_RUN_METRICS,
+    FULL_NAMESPACE,
+)
+
+import algorithms
+from algorithms import USE_NUMBA
+
+skyline_app = 'analyzer'
+skyline_app_logger = '%sLog' % skyline_app
+logger = logging.getLogger(skyline_app_logger)
+
+# @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+# The vectorized implementations of the three-sigma algorithms.  Each takes the
+# right aligned, NaN padded timestamps and values 2D arrays of a batch of
+# metrics and returns a 1D result array of the same length as the batch, with
+# 1 for True, 0 for False and -1 for None (algorithm error).
+RESULT_TRUE = 1
+RESULT_FALSE = 0
+RESULT_NONE = -1
+
+
+def pad_timeseries(timeseries_list):
+    """
+    Create the right aligned, NaN padded 2D timestamps and values arrays for a
+    list of time series.
+
+    :param timeseries_list: a list of time series, each either a list of
+        (timestamp, value) items or a numpy structured array as returned by
+        :func:`functions.timeseries.packed_timeseries.unpack_timeseries_array`
+    :type timeseries_list: list
+    :return: (timestamps, values, lengths)
+    :rtype: tuple
+
+    """
+    lengths = np.array([len(timeseries) for timeseries in timeseries_list], dtype=np.int64)
+    max_length = 0
+    if lengths.size:
+        max_length = int(lengths.max())
+    timestamps = np.full((len(timeseries_list), max_length), np.nan, dtype=np.float64)
+    values = np.full((len(timeseries_list), max_length), np.nan, dtype=np.float64)
+    for index, timeseries in enumerate(timeseries_list):
+        length = lengths[index]
+        if not length:
+            continue
+        if isinstance(timeseries, np.ndarray) and timeseries.dtype.names:
+            timestamps[index, (max_length - length):] = timeseries['timestamp']
+            values[index, (max_length - length):] = timeseries['value']
+            continue
+        timeseries_array = np.array(
+            [[item[0], item[1]] for item in timeseries], dtype=np.float64)
+        timestamps[index, (max_length - length):] = timeseries_array[:, 0]
+        values[index, (max_length - length):] = timeseries_array[:, 1]
+    return timestamps, values, lengths
+
+
+def _to_result(condition, valid=None):
+    """
+    Convert a boolean array to a result array, setting the result of any rows
+    that are not valid to RESULT_NONE.
+    """
+    result = np.where(condition, RESULT_TRUE, RESULT_FALSE).astype(np.int8)
+    if valid is not None:
+        result[~valid] = RESULT_NONE
+    return result
+
+
+def vectorized_tail_avg(values, lengths):
+    """
+    The average of the last three data points of each time series, the
+    vectorized equivalent of algorithms.tail_avg.
+    """
+    if values.shape[1] < 3:
+        return values[:, -1].copy()
+    tail_average = (values[:, -1] + values[:, -2] + values[:, -3]) / 3
+    short = lengths < 3
+    tail_average[short] = values[short, -1]
+    return tail_average
+
+
+def vectorized_histogram_bins(timestamps, values, lengths, tail_average):
+    """
+    A timeseries is anomalous if the average of the last three datapoints falls
+    into a histogram bin with less than 20 other datapoints.
+    """
+    bins = 15
+    rows = values.shape[0]
+    present = ~np.isnan(values)
+    has_values = present.any(axis=1)
+    safe_values = np.where(present, values, 0)
+    minimums = np.where(present, values, np.inf).min(axis=1)
+    maximums = np.where(present, values, -np.inf).max(axis=1)
+    # Mirror np.histogram when the range is zero
+    no_range = minimums == maximums
+    minimums = np.where(no_range, minimums - 0.5, minimums)
+    maximums = np.where(no_range, maximums + 0.5, maximums)
+    widths = np.where(has_values, maximums - minimums, 1)
+
+    bin_indices = np.floor(bins * (safe_values - minimums[:, None]) / widths[:, None])
+    bin_indices = np.clip(bin_indices, 0, bins - 1).astype(np.int64)
+    flat_indices = (bin_indices + (np.arange(rows) * bins)[:, None])[present]
+    counts = np.bincount(flat_indices, minlength=(rows * bins)).reshape(rows, bins)
+
+    # Is it in the first bin?  Note that the original algorithm only checks
+    # the first bin if the tail_avg is <= the first bin edge
+    first_bin = (tail_average <= minimums) & (counts[:, 0] <= 20)
+    # Is it in the current bin?
+    tail_bins = np.floor(bins * (tail_average - minimums) / widths)
+    in_bin = (tail_bins >= 1) & (tail_bins <= (bins - 1)) & (tail_average < maximums)
+    tail_bin_indices = np.where(in_bin, tail_bins, 0).astype(np.int64)
+    current_bin = in_bin & (counts[np.arange(rows), tail_bin_indices] <= 20)
+    return _to_result((first_bin | current_bin) & has_values)
+
+
+def vectorized_first_hour_average(timestamps, values, lengths, tail_average):
+    """
+    Calcuate the simple average over one hour, FULL_DURATION seconds ago.
+    A timeseries is anomalous if the average of the last three datapoints
+    are outside of three standard deviations of this value.
+    """
+    last_hour_threshold = timestamps[:, -1] - FULL_DURATION
+    last_hour_threshold_end = last_hour_threshold + 3600
+    in_first_hour = (timestamps > last_hour_threshold[:, None]) & (timestamps < last_hour_threshold_end[:, None])
+    first_hour_values = np.where(in_first_hour, values, np.nan)
+    mean = np.nanmean(first_hour_values, axis=1)
+    stdDev = np.nanstd(first_hour_values, axis=1, ddof=1)
+    return _to_result(np.abs(tail_average - mean) > 3 * stdDev)
+
+
+def vectorized_stddev_from_average(timestamps, values, lengths, tail_average):
+    """
+    A timeseries is anomalous if the absolute value of the average of the latest
+    three datapoint minus the moving average is greater than three standard
+    deviations of the average.
+    """
+    mean = np.nanmean(values, axis=1)
+    stdDev = np.nanstd(values, axis=1, ddof=1)
+    return _to_result(np.abs(tail_average - mean) > 3 * stdDev)
+
+
+def vectorized_grubbs(timestamps, values, lengths, tail_average):
+    """
+    A timeseries is anomalous if the Z score is greater than the Grubb's score.
+    """
+    stdDev = np.nanstd(values, axis=1, ddof=1)
+    mean = np.nanmean(values, axis=1)
+    z_score = (tail_average - mean) / stdDev
+    len_series = lengths.astype(np.float64)
+    threshold = scipy.stats.t.isf(.05 / (2 * len_series), len_series - 2)
+    threshold_squared = threshold * threshold
+    grubbs_score = ((len_series - 1) / np.sqrt(len_series)) * np.sqrt(threshold_squared / (len_series - 2 + threshold_squared))
+    return _to_result((stdDev != 0) & (z_score > grubbs_score))
+
+
+def vectorized_ks_test(timestamps, values, lengths, tail_average, timeseries_list=None):
+    """
+    A timeseries is anomalous if 2 sample Kolmogorov-Smirnov test indicates
+    that data distribution for last 10 minutes is different from last hour.
+    The sample size conditions are evaluated for all the time series at once
+    and only the time series that have enough data in both samples are run
+    through algorithms.ks_test, which at a 60 second resolution is none.
+    """
+    hour_ago = time() - 3600
+    ten_minutes_ago = time() - 600
+    reference = (timestamps >= hour_ago) & (timestamps < ten_minutes_ago)
+    probe = timestamps >= ten_minutes_ago
+    candidates = (reference.sum(axis=1) >= 20) & (probe.sum(axis=1) >= 20)
+    result = _to_result(np.zeros(len(lengths), dtype=bool))
+    for index in np.flatnonzero(candidates):
+        if timeseries_list is not None:
+            timeseries = timeseries_list[index]
+        else:
+            length = lengths[index]
+            timeseries = list(zip(timestamps[index, -length:], values[index, -length:]))
+        algorithm_result = algorithms.ks_test(timeseries, None)
+        if algorithm_result is None:
+            result[index] = RESULT_NONE
+        elif algorithm_result:
+            result[index] = RESULT_TRUE
+    return result
+
+
+def vectorized_mean_subtraction_cumulation(timestamps, values, lengths, tail_average):
+    """
+    A timeseries is anomalous if the value of the next datapoint in the
+    series is farther than three standard deviations out in cumulative terms
+    after subtracting the mean from each data point.
+    """
+    # The numba implementation uses the population standard deviation and
+    # the pandas implementation the sample standard deviation
+    ddof = 0
+    if not USE_NUMBA:
+        ddof = 1
+    series = values - np.nanmean(values[:, :-1], axis=1)[:, None]
+    stdDev = np.nanstd(series[:, :-1], axis=1, ddof=ddof)
+    return _to_result(np.abs(series[:, -1]) > 3 * stdDev)
+
+
+def vectorized_median_absolute_deviation(timestamps, values, lengths, tail_average):
+    """
+    A timeseries is anomalous if the deviation of its latest datapoint with
+    respect to the median is X times larger than the median of deviations.
+    """
+    median = np.nanmedian(values, axis=1)
+    demedianed = np.abs(values - median[:, None])
+    median_deviation = np.nanmedian(demedianed, axis=1)
+    # The test statistic is infinite when the median is zero,
+    # so it becomes super sensitive. We play it safe and skip when this happens.
+    test_statistic = demedianed[:, -1] / np.where(median_deviation == 0, np.nan, median_deviation)
+    return _to_result(test_statistic > 6)
+
+
+def vectorized_stddev_from_moving_average(timestamps, values, lengths, tail_average):
+    """
+    A timeseries is anomalous if the absolute value of the average of the latest
+    three datapoint minus the moving average is greater than three standard
+    deviations of the moving average.  The exponentially weighted mean and
+    unbiased standard deviation of the last data point are calculated directly
+    with the weights that pandas ewm(com=50, adjust=True) applies.
+    """
+    alpha = 1 / (1 + 50)
+    # The series are right aligned so the weights are the same for every row
+    weights = (1 - alpha) ** np.arange(values.shape[1] - 1, -1, -1, dtype=np.float64)
+    present = ~np.isnan(values)
+    row_weights = np.where(present, weights[None, :], 0)
+    safe_values = np.where(present, values, 0)
+    sum_weights = row_weights.sum(axis=1)
+    sum_weights_squared = (row_weights * row_weights).sum(axis=1)
+    expAverage = (row_weights * safe_values).sum(axis=1) / sum_weights
+    biased_variance = (row_weights * ((safe_values - expAverage[:, None]) ** 2)).sum(axis=1) / sum_weights
+    numerator = sum_weights * sum_weights
+    denominator = numerator - sum_weights_squared
+    variance = np.where(denominator > 0, biased_variance * (numerator / np.where(denominator > 0, denominator, 1)), np.nan)
+    stdDev = np.sqrt(variance)
+    return _to_result(np.abs(values[:, -1] - expAverage) > 3 * stdDev)
+
+
+def vectorized_least_squares(timestamps, values, lengths, tail_average):
+    """
+    A timeseries is anomalous if the average of the last three datapoints
+    on a projected least squares model is greater than three sigma.  The least
+    squares fit of every time series is solved in closed form.
+    """
+    present = ~np.isnan(timestamps)
+    # np.linalg.lstsq fails on NaN values, which algorithms.least_squares
+    # returns as None
+    valid = ~(present & np.isnan(values)).any(axis=1)
+    x = np.where(present, timestamps, np.nan)
+    y = np.where(present, values, np.nan)
+    x_mean = np.nanmean(x, axis=1)
+    y_mean = np.nanmean(y, axis=1)
+    x_centred = x - x_mean[:, None]
+    m = np.nansum(x_centred * (y - y_mean[:, None]), axis=1) / np.nansum(x_centred * x_centred, axis=1)
+    c = y_mean - (m * x_mean)
+    errors = y - ((m[:, None] * x) + c[:, None])
+    std_dev = np.nanstd(errors, axis=1, ddof=1)
+    t = (errors[:, -1] + errors[:, -2] + errors[:, -3]) / 3
+    anomalous = (np.abs(t) > std_dev * 3) & (np.round(std_dev) != 0) & (np.round(t) != 0)
+    return _to_result(anomalous & (lengths >= 3), valid)
+
+
+VECTORIZED_ALGORITHMS = {
+    'histogram_bins': vectorized_histogram_bins,
+    'first_hour_average': vectorized_first_hour_average,
+    'stddev_from_average': vectorized_stddev_from_average,
+    'grubbs': vectorized_grubbs,
+    'ks_test': vectorized_ks_test,
+    'mean_subtraction_cumulation': vectorized_mean_subtraction_cumulation,
+    'median_absolute_deviation': vectorized_median_absolute_deviation,
+    'stddev_from_moving_average': vectorized_stddev_from_moving_average,
+    'least_squares': vectorized_least_squares,
+}
+
+
+def vectorized_algorithm_exceptions(timestamps, values, lengths, custom_stale_periods=None):
+    """
+    Determine the TooShort, Stale and Boring time series for the batch, the
+    same exceptions that run_selected_algorithm raises.
+
+    :param custom_stale_periods: an array of the stale period of each metric,
+        optional, defaults to STALE_PERIOD for all
+    :return: a list of the exception name or None for each time series
+    :rtype: list
+
+    """
+    exceptions = [None] * len(lengths)
+    if not len(lengths):
+        return exceptions
+    stale_periods = np.full(len(lengths), float(STALE_PERIOD))
+    if custom_stale_periods is not None:
+        stale_periods = np.asarray(custom_stale_periods, dtype=np.float64)
+    now = time()
+    boredom_window = values[:, -min(MAX_TOLERABLE_BOREDOM, values.shape[1]):]
+    sorted_window = np.sort(boredom_window, axis=1)
+    changes = (np.diff(sorted_window, axis=1) != 0) & ~np.isnan(sorted_window[:, 1:])
+    unique_values = changes.sum(axis=1) + (~np.isnan(sorted_window)).any(axis=1)
+    for index, length in enumerate(lengths):
+        if not length:
+            exceptions[index] = 'EmptyTimeseries'
+        elif length < MIN_TOLERABLE_LENGTH:
+            exceptions[index] = 'TooShort'
+        elif now - timestamps[index, -1] > stale_periods[index]:
+            exceptions[index] = 'Stale'
+        elif unique_values[index] == BOREDOM_SET_SIZE:
+            exceptions[index] = 'Boring'
+    return exceptions
+
+
+def run_selected_algorithms_vectorized(
+        timeseries_list, metric_names=None, custom_stale_metrics_dict=None):
+    """
+    Run the three-sigma ALGORITHMS on a batch of time series at once and
+    return the same anomalous, ensemble and datapoint results for each time
+    series that run_selected_algorithm returns.  With RUN_OPTIMIZED_WORKFLOW
+    the results of the algorithms after CONSENSUS can no longer be achieved
+    are set to None in the ensemble, as run_selected_algorithm does.
+
+    :param timeseries_list: a list of time series
+    :param metric_names: the list of the full Redis metric names of the time
+        series, only required if custom_stale_metrics_dict is passed
+    :param custom_stale_metrics_dict: the dictionary containing the
+        CUSTOM_STALE_PERIOD to metrics with a custom stale period defined
+    :type timeseries_list: list
+    :type metric_names: list
+    :type custom_stale_metrics_dict: dict
+    :return: (results, exceptions) where results is a list of (anomalous,
+        ensemble, datapoint) tuples, None for a time series that raised an
+        exception, and exceptions is a list of the exception name or None
+    :rtype: (list, list)
+
+    """
+    results = [None] * len(timeseries_list)
+    if not timeseries_list:
+        return results, []
+
+    timestamps, values, lengths = pad_timeseries(timeseries_list)
+
+    custom_stale_periods = None
+    if custom_stale_metrics_dict and metric_names:
+        custom_stale_periods = []
+        for metric_name in metric_names:
+            base_name = str(metric_name).replace(FULL_NAMESPACE, '', 1)
+            try:
+                custom_stale_periods.append(float(custom_stale_metrics_dict[base_name]))
+            except:
+                custom_stale_periods.append(float(STALE_PERIOD))
+    exceptions = vectorized_algorithm_exceptions(timestamps, values, lengths, custom_stale_periods)
+    analyse = np.array([exception is None for exception in exceptions], dtype=bool)
+    if not analyse.any():
+        return results, exceptions
+
+    indices = np.flatnonzero(analyse)
+    timestamps = timestamps[indices]
+    values = values[indices]
+    lengths = lengths[indices]
+    # Trim the padding common to all the analysed rows
+    max_length = int(lengths.max())
+    timestamps = timestamps[:, -max_length:]
+    values = values[:, -max_length:]
+    analysed_timeseries = [timeseries_list[index] for index in indices]
+
+    algorithm_results = np.full((len(indices), len(ALGORITHMS)), RESULT_NONE, dtype=np.int8)
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        tail_average = vectorized_tail_avg(values, lengths)
+        for algorithm_index, algorithm in enumerate(ALGORITHMS):
+            try:
+                if algorithm == 'ks_test':
+                    algorithm_results[:, algorithm_index] = vectorized_ks_test(
+                        timestamps, values, lengths, tail_average,
+                        timeseries_list=analysed_timeseries)
+                elif algorithm in VECTORIZED_ALGORITHMS:
+                    algorithm_results[:, algorithm_index] = VECTORIZED_ALGORITHMS[algorithm](
+                        timestamps, values, lengths, tail_average)
+                else:
+                    # An algorithm with no vectorized implementation is run on
+                    # each time series
+                    for row, timeseries in enumerate(analysed_timeseries):
+                        series = pandas.Series(x[1] for x in timeseries)
+                        algorithm_result = getattr(algorithms, algorithm)(timeseries, series)
+                        if algorithm_result is None:
+                            continue
+                        algorithm_results[row, algorithm_index] = RESULT_TRUE if algorithm_result else RESULT_FALSE
+            except:
+                logger.error(traceback.format_exc())
+                logger.error('error :: run_selected_algorithms_vectorized :: %s failed' % algorithm)
+                algorithm_results[:, algorithm_index] = RESULT_NONE
+
+    # Set the algorithms after which CONSENSUS could no longer be achieved to
+    # None as the RUN_OPTIMIZED_WORKFLOW does not run them
+    if RUN_OPTIMIZED_WORKFLOW and not ENABLE_ALL_ALGORITHMS_RUN_METRICS:
+        maximum_false_count = len(ALGORITHMS) - CONSENSUS + 1
+        false_counts = np.cumsum(algorithm_results == RESULT_FALSE, axis=1)
+        false_counts_before = np.zeros_like(false_counts)
+        false_counts_before[:, 1:] = false_counts[:, :-1]
+        algorithm_results[false_counts_before >= maximum_false_count] = RESULT_NONE
+
+    threshold = len(ALGORITHMS) - CONSENSUS
+    false_count = (algorithm_results == RESULT_FALSE).sum(axis=1)
+    none_count = (algorithm_results == RESULT_NONE).sum(axis=1)
+    anomalous = (false_count <= threshold) & (none_count < len(ALGORITHMS))
+    result_values = {RESULT_TRUE: True, RESULT_FALSE: False, RESULT_NONE: None}
+    for row, index in enumerate(indices):
+        ensemble = [result_values[int(result)] for result in algorithm_results[row]]
+        datapoint = timeseries_list[index][-1][1]
+        results[index] = (bool(anomalous[row]), ensemble, datapoint)
+    return results, exceptions
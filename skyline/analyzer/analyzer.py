@@ -35,7 +35,9 @@ from shutil import rmtree
 # @added 20220722 - Task #4624: Change all dict copy to deepcopy
 import copy
 
-from msgpack import Unpacker, packb
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker, packb
+from msgpack import packb
 
 import settings
 from skyline_functions import (
@@ -71,6 +73,10 @@ from matched_or_regexed_in_list import matched_or_regexed_in_list
 
 from alerters import trigger_alert
 from algorithms import run_selected_algorithm
+# @added 20261027 - Feature #5769: analyzer - metadata snapshot
+from algorithms import set_trigger_history_snapshot
+# @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+from algorithms_vectorized import run_selected_algorithms_vectorized
 # modified 20201020 - Feature #3792: algorithm_exceptions - EmptyTimeseries
 from algorithm_exceptions import TooShort, Stale, Boring, EmptyTimeseries
 
@@ -107,6 +113,18 @@ from functions.redis.redis_rename_key import redis_rename_key
 # @added 20240518 - Feature #5356: get_batch_processing_namespaces
 #                   Feature #5352: vista - bigquery
 from functions.settings.get_batch_processing_namespaces import get_batch_processing_namespaces
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# Added unpack_timeseries_array and PACKED_RECORD_MARKER
+# from functions.timeseries.packed_timeseries import unpack_timeseries
+from functions.timeseries.packed_timeseries import (
+    unpack_timeseries, unpack_timeseries_array, PACKED_RECORD_MARKER)
+# @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+from functions.analyzer.get_cost_balanced_assigned_metrics import get_cost_balanced_assigned_metrics
+# @added 20261027 - Feature #5769: analyzer - metadata snapshot
+from functions.analyzer.get_metadata_snapshot import get_metadata_snapshot
+# @added 20261026 - Feature #5768: check queue
+from functions.redis.check_queue import add_check_to_queue, remove_queued_check
 
 settings_warnings = []
 
@@ -408,6 +426,8 @@ low_priority_metrics_hash_key = 'analyzer.low_priority_metrics.last_analyzed_tim
 metrics_last_timestamp_hash_key = 'analyzer.metrics.last_analyzed_timestamp'
 # @added 20230402 - Feature #4888: analyzer - load_shedding
 metrics_last_analysis_hash_key = 'analyzer.metrics.last_analysis_timestamp'
+# @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+metrics_analysis_cost_hash_key = 'analyzer.metrics.analysis_cost'
 
 # @added 20201107 - Feature #3830: metrics_manager
 ANALYZER_USE_METRICS_MANAGER = True
@@ -467,6 +487,60 @@ except Exception as err:
     SKYLINE_DAWN_ENABLED = True
     settings_warnings.append('warning :: SKYLINE_DAWN_ENABLED is not defined in settings.py, err: %s' % err)
 
+# @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+ANALYZER_COST_BALANCED_ASSIGNMENT = True
+try:
+    ANALYZER_COST_BALANCED_ASSIGNMENT = settings.ANALYZER_COST_BALANCED_ASSIGNMENT
+except Exception as err:
+    ANALYZER_COST_BALANCED_ASSIGNMENT = True
+    settings_warnings.append('warning :: ANALYZER_COST_BALANCED_ASSIGNMENT is not defined in settings.py, err: %s' % err)
+
+# @added 20261021 - Feature #5763: analyzer - persistent spin_process workers
+ANALYZER_PERSISTENT_WORKERS = False
+try:
+    ANALYZER_PERSISTENT_WORKERS = settings.ANALYZER_PERSISTENT_WORKERS
+except Exception as err:
+    ANALYZER_PERSISTENT_WORKERS = False
+    settings_warnings.append('warning :: ANALYZER_PERSISTENT_WORKERS is not defined in settings.py, err: %s' % err)
+ANALYZER_PERSISTENT_WORKERS_MAX_RUNS = 60
+try:
+    ANALYZER_PERSISTENT_WORKERS_MAX_RUNS = int(settings.ANALYZER_PERSISTENT_WORKERS_MAX_RUNS)
+except Exception as err:
+    ANALYZER_PERSISTENT_WORKERS_MAX_RUNS = 60
+    settings_warnings.append('warning :: ANALYZER_PERSISTENT_WORKERS_MAX_RUNS is not defined in settings.py, err: %s' % err)
+
+# @added 20261026 - Feature #5768: check queue
+MIRAGE_CHECK_QUEUE = True
+try:
+    MIRAGE_CHECK_QUEUE = settings.MIRAGE_CHECK_QUEUE
+except Exception as err:
+    MIRAGE_CHECK_QUEUE = True
+    settings_warnings.append('warning :: MIRAGE_CHECK_QUEUE is not defined in settings.py, err: %s' % err)
+
+# @added 20261027 - Feature #5769: analyzer - metadata snapshot
+ANALYZER_METADATA_SNAPSHOT = True
+try:
+    ANALYZER_METADATA_SNAPSHOT = settings.ANALYZER_METADATA_SNAPSHOT
+except Exception as err:
+    ANALYZER_METADATA_SNAPSHOT = True
+    settings_warnings.append('warning :: ANALYZER_METADATA_SNAPSHOT is not defined in settings.py, err: %s' % err)
+
+# @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+ANALYZER_VECTORIZED_ALGORITHMS = False
+try:
+    ANALYZER_VECTORIZED_ALGORITHMS = settings.ANALYZER_VECTORIZED_ALGORITHMS
+except Exception as err:
+    ANALYZER_VECTORIZED_ALGORITHMS = False
+    settings_warnings.append('warning :: ANALYZER_VECTORIZED_ALGORITHMS is not defined in settings.py, err: %s' % err)
+
+# @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE = 1000
+try:
+    ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE = int(settings.ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE)
+except Exception as err:
+    ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE = 1000
+    settings_warnings.append('warning :: ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE is not defined in settings.py, err: %s' % err)
+
 if len(settings_warnings) > 0:
     for settings_warning in settings_warnings:
         logger.warning(settings_warning)
@@ -531,6 +605,9 @@ class Analyzer(Thread):
         # self.anomalous_metrics = Manager().list()
         self.exceptions_q = Queue()
         self.anomaly_breakdown_q = Queue()
+        # @added 20261021 - Feature #5763: analyzer - persistent spin_process workers
+        self.spin_workers = {}
+        self.spin_workers_completed_q = Queue()
         # @modified 20160813 - Bug #1558: Memory leak in Analyzer
         # Not used
         # self.mirage_metrics = Manager().list()
@@ -604,11 +681,83 @@ class Analyzer(Thread):
         trigger_alert(alert, metric, context)
 
 
+    # @added 20261021 - Feature #5763: analyzer - persistent spin_process workers
+    def spin_worker(self, i_process, assignment_q):
+        """
+        A persistent spin_process worker.  Rather than a new spin_process being
+        spawned for every run, the worker process remains running between runs
+        and waits for an assignment on the assignment_q, so that the Redis
+        connections, imported modules, custom_algorithms and the numba compiled
+        algorithms remain loaded between runs.  Each assignment is run with
+        :meth:`spin_process` and its completion is reported on the
+        :obj:`self.spin_workers_completed_q`.  The worker exits after
+        :mod:`settings.ANALYZER_PERSISTENT_WORKERS_MAX_RUNS` runs, if the parent
+        process dies or if it is sent None, and is replaced with a new worker on
+        the next run.
+
+        :param i_process: the process number
+        :param assignment_q: the queue the parent puts the assignments on
+        :type i_process: int
+        :type assignment_q: object
+        :return: None
+
+        """
+        logger.info('spin_worker %s started with pid: %s' % (
+            str(i_process), str(getpid())))
+        runs = 0
+        while True:
+            self.check_if_parent_is_alive()
+            try:
+                assignment = assignment_q.get(timeout=1)
+            except Empty:
+                continue
+            if assignment is None:
+                logger.info('spin_worker %s stopping' % str(i_process))
+                break
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # Added metadata_snapshot.  The worker loads the snapshot itself
+            # in a single pipeline rather than the parent pickling it through
+            # every assignment_q on every run
+            # run_id, unique_metrics, test_values, assigned_metrics, metadata_snapshot = assignment
+            run_id, unique_metrics, test_values, assigned_metrics = assignment
+            metadata_snapshot = {}
+            if ANALYZER_METADATA_SNAPSHOT:
+                try:
+                    metadata_snapshot = get_metadata_snapshot(self)
+                except Exception as err:
+                    logger.error('error :: spin_worker %s - get_metadata_snapshot failed, err: %s' % (
+                        str(i_process), err))
+                    metadata_snapshot = {}
+            try:
+                self.spin_process(i_process, unique_metrics, test_values, assigned_metrics, metadata_snapshot)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: spin_worker %s - spin_process failed, err: %s' % (
+                    str(i_process), err))
+            del unique_metrics
+            del assigned_metrics
+            del metadata_snapshot
+            runs += 1
+            self.spin_workers_completed_q.put((i_process, run_id))
+            if runs >= ANALYZER_PERSISTENT_WORKERS_MAX_RUNS:
+                logger.info('spin_worker %s has completed %s runs, exiting to be replaced' % (
+                    str(i_process), str(runs)))
+                break
+        return
+
     # @modified 20240719 - Feature #5396: test_value
     # Added test_values
-    def spin_process(self, i_process, unique_metrics, test_values):
+    # @modified 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+    # Added cost_balanced_assigned_metrics
+    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+    # Added metadata_snapshot
+    def spin_process(self, i_process, unique_metrics, test_values, cost_balanced_assigned_metrics=None, metadata_snapshot=None):
         """
-        Assign a bunch of metrics for a process to analyze.
+        Assign a bunch of metrics for a process to analyze.  If
+        cost_balanced_assigned_metrics is passed the process analyzes those
+        metrics, otherwise a contiguous slice of unique_metrics.  If a
+        metadata_snapshot is passed the Redis sets and hashes in the snapshot
+        are used rather than being read from Redis.
 
         Multiple get the assigned_metrics to the process from Redis.
 
@@ -658,6 +807,20 @@ class Analyzer(Thread):
             logger.error('error :: Analyzer could not update the Redis %s key - %s' % (
                 skyline_app, e))
 
+        # @added 20261027 - Feature #5769: analyzer - metadata snapshot
+        # Use the Redis sets and hashes loaded once for the run by the parent
+        # process with get_metadata_snapshot, any that are not in the snapshot
+        # are read from Redis
+        if not metadata_snapshot:
+            metadata_snapshot = {}
+        if metadata_snapshot:
+            logger.info('using metadata_snapshot with %s Redis keys' % str(len(metadata_snapshot)))
+
+        def get_snapshot_or_redis(redis_key, command):
+            if redis_key in metadata_snapshot:
+                return metadata_snapshot[redis_key]
+            return getattr(self.redis_conn_decoded, command)(redis_key)
+
         # @modified 20160801 - Adding additional exception handling to Analyzer
         # Check the unique_metrics list is valid
         try:
@@ -710,7 +873,9 @@ class Analyzer(Thread):
         errors = []
         algorithms = {}
         try:
-            algorithms = self.redis_conn_decoded.hgetall('metrics_manager.algorithms.ids')
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # algorithms = self.redis_conn_decoded.hgetall('metrics_manager.algorithms.ids')
+            algorithms = get_snapshot_or_redis('metrics_manager.algorithms.ids', 'hgetall')
         except Exception as err:
             logger.error('error :: hgetall metrics_manager.algorithms.ids - %s' % str(err))
         
@@ -738,7 +903,9 @@ class Analyzer(Thread):
         if ANALYZER_SKIP:
             logger.info('determining ANALYZER_SKIP metrics from analyzer.metrics_manager.analyzer_skip Redis set')
             try:
-                analyzer_skip_metrics = list(self.redis_conn_decoded.smembers('analyzer.metrics_manager.analyzer_skip'))
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # analyzer_skip_metrics = list(self.redis_conn_decoded.smembers('analyzer.metrics_manager.analyzer_skip'))
+                analyzer_skip_metrics = list(get_snapshot_or_redis('analyzer.metrics_manager.analyzer_skip', 'smembers'))
             except Exception as e:
                 logger.error(traceback.format_exc())
                 logger.error('error :: failed to generate a list from analyzer.metrics_manager.analyzer_skip Redis set - %s' % e)
@@ -747,7 +914,9 @@ class Analyzer(Thread):
         # @added 20231016 - Feature #5102: webapp - api skip_analysis
         api_skip_analysis_metrics = []
         try:
-            api_skip_analysis_metrics = list(self.redis_conn_decoded.hkeys('metrics_manager.api_skip_analysis'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # api_skip_analysis_metrics = list(self.redis_conn_decoded.hkeys('metrics_manager.api_skip_analysis'))
+            api_skip_analysis_metrics = list(get_snapshot_or_redis('metrics_manager.api_skip_analysis', 'hkeys'))
         except Exception as err:
             logger.error('error :: hkeys failed on metrics_manager.api_skip_analysis - %s' % (
                 err))
@@ -785,7 +954,9 @@ class Analyzer(Thread):
         # @added 20220119 - Bug #4386: analyzer - do not do monotonic_count on batch metrics
         last_known_batch_metrics = []
         try:
-            last_known_batch_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.batch_processing_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # last_known_batch_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.batch_processing_metrics'))
+            last_known_batch_metrics = list(get_snapshot_or_redis('aet.analyzer.batch_processing_metrics', 'smembers'))
         except Exception as err:
             logger.error(traceback.format_exc())
             logger.error('error :: failed to generate a list from aet.analyzer.batch_processing_metrics Redis set - %s' % err)
@@ -807,7 +978,9 @@ class Analyzer(Thread):
         last_timestamps_hash_dict = {}
         logger.info('determining last timestamps from %s Redis hash' % redis_last_timestamp_hash)
         try:
-            last_timestamps_hash_dict = self.redis_conn_decoded.hgetall(redis_last_timestamp_hash)
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # last_timestamps_hash_dict = self.redis_conn_decoded.hgetall(redis_last_timestamp_hash)
+            last_timestamps_hash_dict = get_snapshot_or_redis(redis_last_timestamp_hash, 'hgetall')
         except Exception as err:
             logger.error('error :: failed to generate last_timestamps_hash_dict from %s Redis hash, err: %s' % (
                 redis_last_timestamp_hash, err))
@@ -843,7 +1016,17 @@ class Analyzer(Thread):
         logger.info('assigned_min: %s, assigned_max: %s' % (str(assigned_min), str(assigned_max)))
 
         # Compile assigned metrics
-        assigned_metrics = [unique_metrics[index] for index in assigned_keys]
+        # @modified 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+        # assigned_metrics = [unique_metrics[index] for index in assigned_keys]
+        if cost_balanced_assigned_metrics is not None:
+            assigned_metrics = list(cost_balanced_assigned_metrics)
+            if analyzer_skip_metrics:
+                analyzer_skip_metrics_set = set(analyzer_skip_metrics)
+                assigned_metrics = [metric for metric in assigned_metrics if metric not in analyzer_skip_metrics_set]
+                del analyzer_skip_metrics_set
+            logger.info('using %s cost balanced assigned_metrics' % str(len(assigned_metrics)))
+        else:
+            assigned_metrics = [unique_metrics[index] for index in assigned_keys]
         if LOCAL_DEBUG:
             logger.debug('debug :: Memory usage spin_process after assigned_metrics: %s (kb)' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
 
@@ -969,7 +1152,9 @@ class Analyzer(Thread):
         skyline_feedback_metrics = []
         if load_shedding_active:
             try:
-                skyline_feedback_metrics = self.redis_conn_decoded.smembers('metrics_manager.analyzer.skyline_feedback_metrics')
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # skyline_feedback_metrics = self.redis_conn_decoded.smembers('metrics_manager.analyzer.skyline_feedback_metrics')
+                skyline_feedback_metrics = get_snapshot_or_redis('metrics_manager.analyzer.skyline_feedback_metrics', 'smembers')
                 logger.info('load_shedding_active got %s feedback metrics from metrics_manager.analyzer.skyline_feedback_metrics' % (
                     str(len(skyline_feedback_metrics))))
             except Exception as err:
@@ -1018,7 +1203,9 @@ class Analyzer(Thread):
 
             try:
                 try:
-                    smtp_alerter_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.smtp_alerter_metrics'))
+                    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                    # smtp_alerter_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.smtp_alerter_metrics'))
+                    smtp_alerter_metrics = list(get_snapshot_or_redis('aet.analyzer.smtp_alerter_metrics', 'smembers'))
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: failed to generate a list from aet.analyzer.smtp_alerter_metrics Redis set for priority based assigned_metrics')
@@ -1119,7 +1306,9 @@ class Analyzer(Thread):
                     if low_priority_analyzed_metrics:
                         boring_metrics = []
                         try:
-                            all_boring_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.boring'))
+                            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                            # all_boring_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.boring'))
+                            all_boring_metrics = list(get_snapshot_or_redis('aet.analyzer.boring', 'smembers'))
                             for base_name in all_boring_metrics:
                                 if base_name in low_priority_assigned_metrics:
                                     boring_metrics.append(base_name)
@@ -1127,7 +1316,9 @@ class Analyzer(Thread):
                             boring_metrics = []
                         stale_metrics = []
                         try:
-                            all_stale_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.stale'))
+                            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                            # all_stale_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.stale'))
+                            all_stale_metrics = list(get_snapshot_or_redis('aet.analyzer.stale', 'smembers'))
                             for base_name in all_stale_metrics:
                                 if base_name in low_priority_assigned_metrics:
                                     stale_metrics.append(base_name)
@@ -1135,7 +1326,9 @@ class Analyzer(Thread):
                             stale_metrics = []
                         tooshort_metrics = []
                         try:
-                            all_tooshort_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.tooshort'))
+                            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                            # all_tooshort_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.tooshort'))
+                            all_tooshort_metrics = list(get_snapshot_or_redis('aet.analyzer.tooshort', 'smembers'))
                             for base_name in all_tooshort_metrics:
                                 if base_name in low_priority_assigned_metrics:
                                     tooshort_metrics.append(base_name)
@@ -1236,6 +1429,21 @@ class Analyzer(Thread):
 
         # @added 20230331 - Feature #4886: analyzer - operation_timings
         operation_timings['mget'] = [(time() - start_mget)]
+
+        # @added 20261027 - Feature #5769: analyzer - metadata snapshot
+        # Get the trigger_history keys of all the assigned metrics in a single
+        # mget rather than is_anomalously_anomalous getting the key of each
+        # anomalous metric
+        if settings.ENABLE_SECOND_ORDER and not raw_assigned_failed:
+            try:
+                set_trigger_history_snapshot(assigned_metrics)
+            except Exception as err:
+                logger.error('error :: set_trigger_history_snapshot failed, err: %s' % err)
+                try:
+                    set_trigger_history_snapshot([])
+                except:
+                    pass
+
         start_metrics_management_stuff = time()
 
         # Make process-specific dicts
@@ -1271,7 +1479,9 @@ class Analyzer(Thread):
             # @modified 20191014 - Bug #3266: py3 Redis binary objects not strings
             #                      Branch #3262: py3
             # mirage_unique_metrics = list(self.redis_conn.smembers('mirage.unique_metrics'))
-            mirage_unique_metrics = list(self.redis_conn_decoded.smembers('mirage.unique_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # mirage_unique_metrics = list(self.redis_conn_decoded.smembers('mirage.unique_metrics'))
+            mirage_unique_metrics = list(get_snapshot_or_redis('mirage.unique_metrics', 'smembers'))
         except:
             mirage_unique_metrics = []
 
@@ -1428,7 +1638,9 @@ class Analyzer(Thread):
             # @modified 20191014 - Bug #3266: py3 Redis binary objects not strings
             #                      Branch #3262: py3
             # ionosphere_unique_metrics = list(self.redis_conn.smembers('ionosphere.unique_metrics'))
-            ionosphere_unique_metrics = list(self.redis_conn_decoded.smembers('ionosphere.unique_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # ionosphere_unique_metrics = list(self.redis_conn_decoded.smembers('ionosphere.unique_metrics'))
+            ionosphere_unique_metrics = list(get_snapshot_or_redis('ionosphere.unique_metrics', 'smembers'))
         except:
             ionosphere_unique_metrics = []
 
@@ -1467,14 +1679,18 @@ class Analyzer(Thread):
             # @modified 20191014 - Bug #3266: py3 Redis binary objects not strings
             #                      Branch #3262: py3
             # derivative_metrics = list(self.redis_conn.smembers('derivative_metrics'))
-            derivative_metrics = list(self.redis_conn_decoded.smembers('derivative_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # derivative_metrics = list(self.redis_conn_decoded.smembers('derivative_metrics'))
+            derivative_metrics = list(get_snapshot_or_redis('derivative_metrics', 'smembers'))
         except:
             derivative_metrics = []
 
         # @added 20220323 - Feature #4502: settings - MONOTONIC_METRIC_NAMESPACES
         always_derivative_metrics = []
         try:
-            always_derivative_metrics = list(self.redis_conn_decoded.smembers('metrics_manager.always_derivative_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # always_derivative_metrics = list(self.redis_conn_decoded.smembers('metrics_manager.always_derivative_metrics'))
+            always_derivative_metrics = list(get_snapshot_or_redis('metrics_manager.always_derivative_metrics', 'smembers'))
         except Exception as err:
             logger.error('error :: failed to get metrics_manager.always_derivative_metrics Redis set - %s' % str(err))
         if always_derivative_metrics:
@@ -1485,7 +1701,9 @@ class Analyzer(Thread):
             # @modified 20191014 - Bug #3266: py3 Redis binary objects not strings
             #                      Branch #3262: py3
             # non_derivative_metrics = list(self.redis_conn.smembers('non_derivative_metrics'))
-            non_derivative_metrics = list(self.redis_conn_decoded.smembers('non_derivative_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # non_derivative_metrics = list(self.redis_conn_decoded.smembers('non_derivative_metrics'))
+            non_derivative_metrics = list(get_snapshot_or_redis('non_derivative_metrics', 'smembers'))
         except:
             non_derivative_metrics = []
 
@@ -1493,7 +1711,9 @@ class Analyzer(Thread):
         #                   Feature #3866: MIRAGE_ENABLE_HIGH_RESOLUTION_ANALYSIS
         longterm_non_derivative_metrics = []
         try:
-            longterm_non_derivative_metrics_dict = self.redis_conn_decoded.hgetall('metrics_manager.longterm_non_derivative_metrics')
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # longterm_non_derivative_metrics_dict = self.redis_conn_decoded.hgetall('metrics_manager.longterm_non_derivative_metrics')
+            longterm_non_derivative_metrics_dict = get_snapshot_or_redis('metrics_manager.longterm_non_derivative_metrics', 'hgetall')
             longterm_non_derivative_metrics = list(longterm_non_derivative_metrics_dict.keys())
             non_derivative_metrics = list(set(non_derivative_metrics + longterm_non_derivative_metrics))
         except Exception as err:
@@ -1572,14 +1792,18 @@ class Analyzer(Thread):
         # Optimise Redis SCAN operations
         all_z_derivative_keys_from_set = []
         try:
-            all_z_derivative_keys_from_set = self.redis_conn_decoded.smembers('analyzer.all_z_derivative_metrics')
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # all_z_derivative_keys_from_set = self.redis_conn_decoded.smembers('analyzer.all_z_derivative_metrics')
+            all_z_derivative_keys_from_set = get_snapshot_or_redis('analyzer.all_z_derivative_metrics', 'smembers')
             logger.info('got %s z_derivative_keys from analyzer.all_z_derivative_metrics set' % str(len(all_z_derivative_keys_from_set)))
         except Exception as err:
             logger.error('error :: smembers failed on analyzer.all_z_derivative_metrics, err: %s' % err)
             all_z_derivative_keys_from_set = []  
         all_zz_derivative_keys_from_set = []
         try:
-            all_zz_derivative_keys_from_set = self.redis_conn_decoded.smembers('analyzer.all_zz_derivative_metrics')
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # all_zz_derivative_keys_from_set = self.redis_conn_decoded.smembers('analyzer.all_zz_derivative_metrics')
+            all_zz_derivative_keys_from_set = get_snapshot_or_redis('analyzer.all_zz_derivative_metrics', 'smembers')
             logger.info('got %s zz_derivative_keys from analyzer.all_zz_derivative_metrics set' % str(len(all_zz_derivative_keys_from_set)))
         except Exception as err:
             logger.error('error :: smembers failed on analyzer.all_zz_derivative_metrics, err: %s' % err)
@@ -1649,9 +1873,38 @@ class Analyzer(Thread):
         else:
             all_zz_derivative_keys = all_zz_derivative_keys_from_set
 
+        # @added 20261027 - Feature #5769: analyzer - metadata snapshot
+        # Rather than getting the zz.derivative_metric and
+        # zz.derivative_metric.last_timestamp keys of each assigned metric
+        # individually when it is classified, get them all with a single mget
+        zz_derivative_metric_values = {}
+        if all_zz_derivative_keys:
+            zz_derivative_metric_keys = []
+            try:
+                for metric_name in assigned_metrics:
+                    if metric_name.startswith(settings.FULL_NAMESPACE):
+                        zz_base_name = metric_name.replace(settings.FULL_NAMESPACE, '', 1)
+                    else:
+                        zz_base_name = str(metric_name)
+                    zz_key = 'zz.derivative_metric.%s' % zz_base_name
+                    if zz_key in all_zz_derivative_keys:
+                        zz_derivative_metric_keys.append(zz_key)
+                        zz_derivative_metric_keys.append('zz.derivative_metric.last_timestamp.%s' % zz_base_name)
+                if zz_derivative_metric_keys:
+                    zz_derivative_metric_values = dict(zip(
+                        zz_derivative_metric_keys,
+                        self.redis_conn_decoded.mget(zz_derivative_metric_keys)))
+                logger.info('got %s zz.derivative_metric values for the assigned metrics with mget' % (
+                    str(len(zz_derivative_metric_values))))
+            except Exception as err:
+                logger.error('error :: mget failed on zz.derivative_metric keys, err: %s' % err)
+                zz_derivative_metric_values = {}
+
         aet_metrics_manager_metric_names_with_ids = {}
         try:
-            aet_metrics_manager_metric_names_with_ids = self.redis_conn_decoded.hgetall('aet.metrics_manager.metric_names_with_ids')
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # aet_metrics_manager_metric_names_with_ids = self.redis_conn_decoded.hgetall('aet.metrics_manager.metric_names_with_ids')
+            aet_metrics_manager_metric_names_with_ids = get_snapshot_or_redis('aet.metrics_manager.metric_names_with_ids', 'hgetall')
         except Exception as err:
             logger.error('error :: failed to hgetall on aet.metrics_manager.metric_names_with_ids from Redis - %s' % str(err))
 
@@ -1682,7 +1935,9 @@ class Analyzer(Thread):
             # @modified 20191014 - Bug #3266: py3 Redis binary objects not strings
             #                      Branch #3262: py3
             # non_smtp_alerter_metrics = list(self.redis_conn.smembers('analyzer.non_smtp_alerter_metrics'))
-            non_smtp_alerter_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.non_smtp_alerter_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # non_smtp_alerter_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.non_smtp_alerter_metrics'))
+            non_smtp_alerter_metrics = list(get_snapshot_or_redis('aet.analyzer.non_smtp_alerter_metrics', 'smembers'))
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: failed to generate a list from aet.analyzer.non_smtp_alerter_metrics Redis set')
@@ -1693,7 +1948,9 @@ class Analyzer(Thread):
         # time series data needs to be sorted and deduplicated
         flux_upload_metrics_to_sort_and_deduplicate = []
         try:
-            flux_upload_metrics_to_sort_and_deduplicate = list(self.redis_conn_decoded.smembers('flux.sort_and_dedup.metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # flux_upload_metrics_to_sort_and_deduplicate = list(self.redis_conn_decoded.smembers('flux.sort_and_dedup.metrics'))
+            flux_upload_metrics_to_sort_and_deduplicate = list(get_snapshot_or_redis('flux.sort_and_dedup.metrics', 'smembers'))
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: failed to generate a list from flux.sort_and_dedup.metrics Redis set')
@@ -1702,7 +1959,9 @@ class Analyzer(Thread):
         # @added 20200604 - Feature #3570: Mirage - populate_redis
         mirage_filled_metrics_to_sort_and_deduplicate = []
         try:
-            mirage_filled_metrics_to_sort_and_deduplicate = list(self.redis_conn_decoded.smembers('mirage.filled'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # mirage_filled_metrics_to_sort_and_deduplicate = list(self.redis_conn_decoded.smembers('mirage.filled'))
+            mirage_filled_metrics_to_sort_and_deduplicate = list(get_snapshot_or_redis('mirage.filled', 'smembers'))
             if mirage_filled_metrics_to_sort_and_deduplicate:
                 logger.info('determined %s metrics from mirage.filled Redis set' % str(len(mirage_filled_metrics_to_sort_and_deduplicate)))
         except:
@@ -1766,7 +2025,9 @@ class Analyzer(Thread):
 
         if IDENTIFY_AIRGAPS:
             try:
-                airgapped_metrics = list(self.redis_conn_decoded.smembers('analyzer.airgapped_metrics'))
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # airgapped_metrics = list(self.redis_conn_decoded.smembers('analyzer.airgapped_metrics'))
+                airgapped_metrics = list(get_snapshot_or_redis('analyzer.airgapped_metrics', 'smembers'))
             except Exception as e:
                 logger.error('error :: could not query Redis for analyzer.airgapped_metrics - %s' % str(e))
                 airgapped_metrics = []
@@ -1776,7 +2037,9 @@ class Analyzer(Thread):
             # Handle airgaps filled so that once they have been submitted as filled
             # Analyzer will not identify them as airgapped again
             try:
-                airgapped_metrics_filled = list(self.redis_conn_decoded.smembers('analyzer.airgapped_metrics.filled'))
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # airgapped_metrics_filled = list(self.redis_conn_decoded.smembers('analyzer.airgapped_metrics.filled'))
+                airgapped_metrics_filled = list(get_snapshot_or_redis('analyzer.airgapped_metrics.filled', 'smembers'))
             except Exception as e:
                 logger.error('error :: could not remove item from analyzer.airgapped_metrics.filled Redis set - %s' % str(e))
 
@@ -1806,7 +2069,9 @@ class Analyzer(Thread):
             # done in metrics_manager
             flux_filled_hash_key = 'flux.filled_metrics'
             try:
-                hash_flux_filled_keys = self.redis_conn_decoded.hkeys(flux_filled_hash_key)
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # hash_flux_filled_keys = self.redis_conn_decoded.hkeys(flux_filled_hash_key)
+                hash_flux_filled_keys = get_snapshot_or_redis(flux_filled_hash_key, 'hkeys')
             except Exception as err:
                 logger.error(traceback.format_exc())
                 logger.error('error :: hgetall failed %s Redis hash - %s' % (
@@ -1872,7 +2137,9 @@ class Analyzer(Thread):
         # as inactive
         # inactive_after = settings.FULL_DURATION - 3600
         try:
-            inactive_metrics = list(self.redis_conn_decoded.smembers('analyzer.inactive_metrics'))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # inactive_metrics = list(self.redis_conn_decoded.smembers('analyzer.inactive_metrics'))
+            inactive_metrics = list(get_snapshot_or_redis('analyzer.inactive_metrics', 'smembers'))
         except:
             inactive_metrics = []
 
@@ -1923,14 +2190,18 @@ class Analyzer(Thread):
         analyzer_custom_algorithm_only_metrics = []
         redis_set = 'metrics_manager.analyzer.custom_algorithm_only.metrics'
         try:
-            analyzer_custom_algorithm_only_metrics = list(self.redis_conn_decoded.smembers(redis_set))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # analyzer_custom_algorithm_only_metrics = list(self.redis_conn_decoded.smembers(redis_set))
+            analyzer_custom_algorithm_only_metrics = list(get_snapshot_or_redis(redis_set, 'smembers'))
         except Exception as err:
             logger.error('error :: could not query Redis for set %s - %s' % (redis_set, err))
             analyzer_custom_algorithm_only_metrics = []
         analyzer_batch_custom_algorithm_only_metrics = []
         redis_set = 'metrics_manager.analyzer_batch.custom_algorithm_only.metrics'
         try:
-            analyzer_batch_custom_algorithm_only_metrics = list(self.redis_conn_decoded.smembers(redis_set))
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # analyzer_batch_custom_algorithm_only_metrics = list(self.redis_conn_decoded.smembers(redis_set))
+            analyzer_batch_custom_algorithm_only_metrics = list(get_snapshot_or_redis(redis_set, 'smembers'))
         except Exception as err:
             logger.error('error :: could not query Redis for set %s - %s' % (redis_set, err))
             analyzer_batch_custom_algorithm_only_metrics = []
@@ -1944,7 +2215,9 @@ class Analyzer(Thread):
 
         if ANALYZER_CHECK_LAST_TIMESTAMP:
             try:
-                metrics_last_timestamp_dict = self.redis_conn_decoded.hgetall(metrics_last_timestamp_hash_key)
+                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                # metrics_last_timestamp_dict = self.redis_conn_decoded.hgetall(metrics_last_timestamp_hash_key)
+                metrics_last_timestamp_dict = get_snapshot_or_redis(metrics_last_timestamp_hash_key, 'hgetall')
                 if metrics_last_timestamp_dict:
                     logger.info('ANALYZER_CHECK_LAST_TIMESTAMP - got %s metrics and last analysed timestamps from %s Redis hash key' % (
                         str(len(metrics_last_timestamp_dict)),
@@ -1961,7 +2234,9 @@ class Analyzer(Thread):
                 # If all_stale_metrics were not determined for ANALYZER_ANALYZE_LOW_PRIORITY_METRICS
                 # get them
                 try:
-                    all_stale_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.stale'))
+                    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                    # all_stale_metrics = list(self.redis_conn_decoded.smembers('aet.analyzer.stale'))
+                    all_stale_metrics = list(get_snapshot_or_redis('aet.analyzer.stale', 'smembers'))
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: failed to get Redis key aet.analyzer.stale for ANALYZER_CHECK_LAST_TIMESTAMP')
@@ -1976,7 +2251,9 @@ class Analyzer(Thread):
         metrics_updated_in_last_timeseries_timestamp_hash_key_count = 0
         custom_stale_metrics_dict = {}
         try:
-            custom_stale_metrics_dict = self.redis_conn_decoded.hgetall(custom_stale_metrics_hash_key)
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # custom_stale_metrics_dict = self.redis_conn_decoded.hgetall(custom_stale_metrics_hash_key)
+            custom_stale_metrics_dict = get_snapshot_or_redis(custom_stale_metrics_hash_key, 'hgetall')
         except Exception as e:
             logger.error(traceback.format_exc())
             logger.error('error :: failed to create custom_stale_metrics_dict from Redis hash key %s - %s' % (
@@ -1989,7 +2266,9 @@ class Analyzer(Thread):
         metrics_last_timeseries_timestamp_dict = {}
         metrics_last_timeseries_timestamp_hash_key = 'analyzer.metrics.last_timeseries_timestamp'
         try:
-            metrics_last_timeseries_timestamp_dict = self.redis_conn_decoded.hgetall(metrics_last_timeseries_timestamp_hash_key)
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # metrics_last_timeseries_timestamp_dict = self.redis_conn_decoded.hgetall(metrics_last_timeseries_timestamp_hash_key)
+            metrics_last_timeseries_timestamp_dict = get_snapshot_or_redis(metrics_last_timeseries_timestamp_hash_key, 'hgetall')
         except Exception as e:
             logger.error(traceback.format_exc())
             logger.error('error :: failed to create metrics_last_timeseries_timestamp_dict from Redis hash key %s - %s' % (
@@ -2018,6 +2297,87 @@ class Analyzer(Thread):
         # Do sadd once for all rather than for each batch metric
         analyzer_batch_processing_metrics_current = []
 
+        # @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+        # Run the three-sigma algorithms on the assigned metrics in batches.
+        # The results are only used for a metric if its time series is not
+        # changed in the loop below.
+        # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+        # Rather than decoding and scoring every assigned metric up front,
+        # including the metrics that are skipped in the loop, a batch is only
+        # run when a metric reaches analysis and is made up of that metric and
+        # the following assigned metrics that are expected to reach analysis.
+        vectorized_timeseries_arrays = {}
+        vectorized_results = {}
+        if ANALYZER_VECTORIZED_ALGORITHMS:
+            vectorized_skip_metrics = set(derivative_metrics)
+            vectorized_skip_base_names = set(test_values_base_names)
+            vectorized_skip_base_names.update(flux_upload_metrics_to_sort_and_deduplicate)
+            vectorized_skip_base_names.update(mirage_filled_metrics_to_sort_and_deduplicate)
+            if ANALYZER_BATCH_PROCESSING_OVERFLOW_ENABLED:
+                vectorized_skip_metrics.update(analyzer_batch_queued_metrics)
+            if load_shedding_active and skyline_feedback_metrics:
+                vectorized_skip_base_names.update(skyline_feedback_metrics)
+            vectorized_stale_metrics = set(all_stale_metrics)
+
+        def run_vectorized_batch(index, timeseries_array):
+            """
+            Run the vectorized algorithms on the metric at index and the
+            following assigned metrics that are not skipped before analysis,
+            up to ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE metrics.  The
+            arrays of the following metrics are kept for the loop to use.
+            """
+            start_vectorized = time()
+            batch_indices = [index]
+            batch_timeseries = [timeseries_array]
+            for j in range(index + 1, len(assigned_metrics)):
+                if len(batch_indices) >= ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE:
+                    break
+                if j in vectorized_results or assigned_metrics[j] in vectorized_skip_metrics:
+                    continue
+                j_base_name = assigned_metrics[j]
+                if j_base_name.startswith(settings.FULL_NAMESPACE):
+                    j_base_name = j_base_name.replace(settings.FULL_NAMESPACE, '', 1)
+                if j_base_name in vectorized_skip_base_names:
+                    continue
+                j_timeseries_array = vectorized_timeseries_arrays.get(j)
+                if j_timeseries_array is None:
+                    try:
+                        j_timeseries_array = unpack_timeseries_array(raw_assigned[j], sort=True)
+                    except:
+                        continue
+                    vectorized_timeseries_arrays[j] = j_timeseries_array
+                if not len(j_timeseries_array):
+                    continue
+                # Metrics with no new data are not analysed, unless they are
+                # sent for analysis to be classified as stale
+                if ANALYZER_CHECK_LAST_TIMESTAMP and metrics_last_timestamp_dict:
+                    j_last_timestamp = int(j_timeseries_array[-1][0])
+                    try:
+                        j_last_analyzed_timestamp = int(float(metrics_last_timestamp_dict[j_base_name]))
+                    except:
+                        j_last_analyzed_timestamp = None
+                    if j_last_analyzed_timestamp == j_last_timestamp:
+                        if j_base_name in vectorized_stale_metrics or (int(spin_start) - j_last_timestamp) < settings.STALE_PERIOD:
+                            continue
+                batch_indices.append(j)
+                batch_timeseries.append(j_timeseries_array)
+            try:
+                batch_results, batch_exceptions = run_selected_algorithms_vectorized(
+                    batch_timeseries, [assigned_metrics[j] for j in batch_indices],
+                    custom_stale_metrics_dict)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: run_selected_algorithms_vectorized failed - %s' % err)
+                batch_results = [None] * len(batch_indices)
+            for j, batch_result in zip(batch_indices, batch_results):
+                vectorized_results[j] = batch_result
+            try:
+                operation_timings['run_selected_algorithms_vectorized'].append((time() - start_vectorized))
+            except:
+                operation_timings['run_selected_algorithms_vectorized'] = [(time() - start_vectorized)]
+            logger.info('run_selected_algorithms_vectorized ran on %s metrics in %.6f seconds' % (
+                str(len(batch_indices)), (time() - start_vectorized)))
+
         # Distill timeseries strings into lists
         for i, metric_name in enumerate(assigned_metrics):
             self.check_if_parent_is_alive()
@@ -2245,11 +2605,48 @@ class Analyzer(Thread):
             # @added 20230331 - Feature #4886: analyzer - operation_timings
             start_unpack = time()
 
+            # @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+            timeseries_sorted = False
+
+            # @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+            vectorized_timeseries_array = None
+
             try:
                 raw_series = raw_assigned[i]
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                # timeseries = unpack_timeseries(raw_series)
+                # Keys in the numpy format are decoded and sorted as a
+                # numpy array and converted to a list once, the algorithms
+                # still take a list of tuples.  msgpack keys are decoded as
+                # before so that their data point types are unchanged.
+                # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+                # Use the array that the vectorized results were determined on
+                # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+                # With the vectorized algorithms all the metric data is decoded
+                # as a numpy array, which may already have been decoded for a
+                # vectorized batch
+                # if vectorized_timeseries_arrays and vectorized_timeseries_arrays[i] is not None:
+                #     timeseries = vectorized_timeseries_arrays[i].tolist()
+                #     vectorized_timeseries_arrays[i] = None
+                #     timeseries_sorted = True
+                if ANALYZER_VECTORIZED_ALGORITHMS:
+                    vectorized_timeseries_array = vectorized_timeseries_arrays.pop(i, None)
+                    if vectorized_timeseries_array is None:
+                        try:
+                            vectorized_timeseries_array = unpack_timeseries_array(raw_series, sort=True)
+                        except:
+                            vectorized_timeseries_array = None
+                if vectorized_timeseries_array is not None:
+                    timeseries = vectorized_timeseries_array.tolist()
+                    timeseries_sorted = True
+                elif raw_series and raw_series[0] == PACKED_RECORD_MARKER:
+                    timeseries = unpack_timeseries_array(raw_series, sort=True).tolist()
+                    timeseries_sorted = True
+                else:
+                    timeseries = unpack_timeseries(raw_series)
             except Exception as err:
                 # @modified 20230202 - Feature #4792: functions.metrics_manager.manage_inactive_metrics
                 #                      Feature #4838: functions.metrics.get_namespace_metric.count
@@ -2273,7 +2670,11 @@ class Analyzer(Thread):
             # series which are artefacts of the collector or carbon-relay, sort
             # all time series by timestamp before analysis.
             original_timeseries = timeseries
-            if original_timeseries:
+            # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+            # Do not sort a time series that has already been sorted when it
+            # was decoded
+            # if original_timeseries:
+            if original_timeseries and not timeseries_sorted:
 
                 # @added 20230331 - Feature #4886: analyzer - operation_timings
                 start_sort = time()
@@ -2287,6 +2688,15 @@ class Analyzer(Thread):
                 except:
                     operation_timings['sort_timeseries'] = [(time() - start_sort)]
 
+            # @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+            # The vectorized results are only valid for this time series object,
+            # if it is replaced below they are not used
+            vectorized_input_timeseries = None
+            # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+            # if vectorized_results:
+            if vectorized_timeseries_array is not None:
+                vectorized_input_timeseries = timeseries
+
             last_timeseries_timestamp = 0
 
             # @added 20200427 - Feature #3514: Identify inactive metrics
@@ -2601,9 +3011,11 @@ class Analyzer(Thread):
                     logger.info('getting current Redis key %s data to compare with sorted and deduplicated data' % str(metric_name))
                     try:
                         test_raw_series = self.redis_conn.get(metric_name)
-                        unpacker = Unpacker(use_list=False)
-                        unpacker.feed(test_raw_series)
-                        test_timeseries = list(unpacker)
+                        # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                        # unpacker = Unpacker(use_list=False)
+                        # unpacker.feed(test_raw_series)
+                        # test_timeseries = list(unpacker)
+                        test_timeseries = unpack_timeseries(test_raw_series)
                     except:
                         logger.error(traceback.format_exc())
                         logger.error('error :: failed to get Redis key %s to test against sorted and deduplicated data' % str(metric_name))
@@ -2726,9 +3138,11 @@ class Analyzer(Thread):
                     logger.info('determining if any new data was added to the metric Redis key during the rename')
                     try:
                         test_raw_series = self.redis_conn.get(metric_key_to_delete)
-                        unpacker = Unpacker(use_list=False)
-                        unpacker.feed(test_raw_series)
-                        test_timeseries = list(unpacker)
+                        # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                        # unpacker = Unpacker(use_list=False)
+                        # unpacker.feed(test_raw_series)
+                        # test_timeseries = list(unpacker)
+                        test_timeseries = unpack_timeseries(test_raw_series)
                     except:
                         logger.error(traceback.format_exc())
                         logger.error('error :: failed to get Redis key %s to test against sorted and deduplicated data' % str(metric_key_to_delete))
@@ -2815,9 +3229,11 @@ class Analyzer(Thread):
                 updated_timeseries = []
                 try:
                     raw_series = self.redis_conn.get(metric_name)
-                    unpacker = Unpacker(use_list=False)
-                    unpacker.feed(raw_series)
-                    updated_timeseries = list(unpacker)
+                    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                    # unpacker = Unpacker(use_list=False)
+                    # unpacker.feed(raw_series)
+                    # updated_timeseries = list(unpacker)
+                    updated_timeseries = unpack_timeseries(raw_series)
                 except Exception as err:
                     # @modified 20230202 - Feature #4792: functions.metrics_manager.manage_inactive_metrics
                     #                      Feature #4838: functions.metrics.get_namespace_metric.count
@@ -3044,7 +3460,13 @@ class Analyzer(Thread):
                         # Only check if the key exists
                         if last_key_value_data:
                             try:
-                                last_key_value_data = self.redis_conn_decoded.get(running_derivative_metric_key)
+                                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                                # Use the value from the mget if it was got
+                                # last_key_value_data = self.redis_conn_decoded.get(running_derivative_metric_key)
+                                if running_derivative_metric_key in zz_derivative_metric_values:
+                                    last_key_value_data = zz_derivative_metric_values[running_derivative_metric_key]
+                                else:
+                                    last_key_value_data = self.redis_conn_decoded.get(running_derivative_metric_key)
                             except Exception as err:
                                 logger.error('error :: could not query Redis for running_derivative_metric_key - %s: %s' % (
                                     running_derivative_metric_key, err))
@@ -3073,7 +3495,13 @@ class Analyzer(Thread):
                                 # otherwise it will log an error and if this
                                 # data does not exist it is OK it is idempotent
                                 # last_monotonic_timestamp_data = int(self.redis_conn_decoded.get(running_derivative_metric_last_timestamp_key))
-                                last_monotonic_timestamp_data = self.redis_conn_decoded.get(running_derivative_metric_last_timestamp_key)
+                                # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                                # Use the value from the mget if it was got
+                                # last_monotonic_timestamp_data = self.redis_conn_decoded.get(running_derivative_metric_last_timestamp_key)
+                                if running_derivative_metric_last_timestamp_key in zz_derivative_metric_values:
+                                    last_monotonic_timestamp_data = zz_derivative_metric_values[running_derivative_metric_last_timestamp_key]
+                                else:
+                                    last_monotonic_timestamp_data = self.redis_conn_decoded.get(running_derivative_metric_last_timestamp_key)
                                 if last_monotonic_timestamp_data:
                                     last_monotonic_timestamp = int(last_monotonic_timestamp_data)
                             except Exception as e:
@@ -3848,7 +4276,22 @@ class Analyzer(Thread):
                 if check_for_anomalous:
                     # @added 20230331 - Feature #4886: analyzer - operation_timings
                     start_run_selected_algorithm = time()
-                    anomalous, ensemble, datapoint, negatives_found, algorithms_run = run_selected_algorithm(timeseries, metric_name, metric_airgaps, metric_airgaps_filled, run_negatives_present, check_for_airgaps_only, custom_stale_metrics_dict)
+                    # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+                    # Added vectorized_ensemble
+                    # anomalous, ensemble, datapoint, negatives_found, algorithms_run = run_selected_algorithm(timeseries, metric_name, metric_airgaps, metric_airgaps_filled, run_negatives_present, check_for_airgaps_only, custom_stale_metrics_dict)
+                    vectorized_ensemble = None
+                    # @modified 20261019 - Feature #5761: analyzer - vectorized algorithms
+                    # Only run a batch when a metric reaches analysis
+                    # if vectorized_results and timeseries is vectorized_input_timeseries:
+                    #     if vectorized_results[i] is not None:
+                    #         vectorized_ensemble = vectorized_results[i][1]
+                    if vectorized_input_timeseries is not None and timeseries is vectorized_input_timeseries:
+                        if i not in vectorized_results:
+                            run_vectorized_batch(i, vectorized_timeseries_array)
+                        vectorized_result = vectorized_results.pop(i, None)
+                        if vectorized_result is not None:
+                            vectorized_ensemble = vectorized_result[1]
+                    anomalous, ensemble, datapoint, negatives_found, algorithms_run = run_selected_algorithm(timeseries, metric_name, metric_airgaps, metric_airgaps_filled, run_negatives_present, check_for_airgaps_only, custom_stale_metrics_dict, vectorized_ensemble)
 
                     # @added 20241120 - Task #5526: Build v5.0.0 and upgrade deps
                     #                   Branch #5532: v5.0.0-alpha
@@ -4499,7 +4942,28 @@ class Analyzer(Thread):
                                     except:
                                         anomaly_check_file = None
                                 mirage_anomaly_check_file_created = False
-                                if anomaly_check_file:
+                                # @added 20261026 - Feature #5768: check queue
+                                # Add the check to the mirage check queue rather
+                                # than writing a check file
+                                mirage_anomaly_check_queued = False
+                                if anomaly_check_file and MIRAGE_CHECK_QUEUE:
+                                    try:
+                                        mirage_anomaly_check_queued = add_check_to_queue(
+                                            skyline_app, 'mirage', anomaly_check_file,
+                                            [['metric', str(metric[1])],
+                                             ['value', float(metric[0])],
+                                             ['hours_to_resolve', int(float(use_hours_to_resolve))],
+                                             ['metric_timestamp', int(float(metric[2]))],
+                                             ['snab_only_check', (str(snab_only_check) == 'True')],
+                                             ['triggered_algorithms', list(triggered_algorithms)]],
+                                            redis_conn=self.redis_conn)
+                                    except Exception as err:
+                                        logger.error('error :: failed to add mirage check to queue, err: %s' % err)
+                                    if mirage_anomaly_check_queued:
+                                        mirage_anomaly_check_file_created = True
+                                # @modified 20261026 - Feature #5768: check queue
+                                # if anomaly_check_file:
+                                if anomaly_check_file and not mirage_anomaly_check_queued:
                                     try:
                                         with open(anomaly_check_file, 'w') as fh:
                                             # metric_name, anomalous datapoint, hours to resolve, timestamp
@@ -4517,9 +4981,12 @@ class Analyzer(Thread):
                                         logger.error(traceback.format_exc())
                                         logger.error('error :: failed to write anomaly_check_file')
                                 if mirage_anomaly_check_file_created:
-                                    if python_version == 2:
+                                    # @modified 20261026 - Feature #5768: check queue
+                                    # if python_version == 2:
+                                    if python_version == 2 and not mirage_anomaly_check_queued:
                                         os.chmod(anomaly_check_file, 0o644)
-                                    if python_version == 3:
+                                    # if python_version == 3:
+                                    if python_version == 3 and not mirage_anomaly_check_queued:
                                         os.chmod(anomaly_check_file, mode=0o644)
                                     logger.info('added mirage check :: %s,%s,%s' % (metric[1], metric[0], use_hours_to_resolve))
                                     try:
@@ -5355,9 +5822,11 @@ class Analyzer(Thread):
                             break
                         try:
                             raw_series = raw_assigned[i]
-                            unpacker = Unpacker(use_list=False)
-                            unpacker.feed(raw_series)
-                            timeseries = list(unpacker)
+                            # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                            # unpacker = Unpacker(use_list=False)
+                            # unpacker.feed(raw_series)
+                            # timeseries = list(unpacker)
+                            timeseries = unpack_timeseries(raw_series)
                         except:
                             timeseries = []
                         anomalous = None
@@ -5500,6 +5969,24 @@ class Analyzer(Thread):
             except Exception as err:
                 logger.error('error :: failed to update analyzer.analysis_times_per_metric Redis hash key - %s' % err)
 
+        # @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+        # Record the analysis time of each metric so that the next run can
+        # divide the metrics between the processes by analysis cost
+        # @modified 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+        # Only record the costs if they are used to assign the metrics, the
+        # metrics no longer in unique_metrics are removed when they are
+        # read in run
+        # if ANALYZER_COST_BALANCED_ASSIGNMENT and times_per_metric:
+        if ANALYZER_COST_BALANCED_ASSIGNMENT and settings.ANALYZER_PROCESSES > 1 and times_per_metric:
+            try:
+                self.redis_conn.hset(metrics_analysis_cost_hash_key, mapping=times_per_metric)
+                self.redis_conn.expire(metrics_analysis_cost_hash_key, 3600)
+                logger.info('%s Redis hash updated with %s metric analysis times' % (
+                    metrics_analysis_cost_hash_key, str(len(times_per_metric))))
+            except Exception as err:
+                logger.error('error :: failed to update %s Redis hash key - %s' % (
+                    metrics_analysis_cost_hash_key, err))
+
         spin_end = time() - spin_start
         logger.info('spin_process took %.2f seconds' % spin_end)
         return
@@ -6457,11 +6944,143 @@ class Analyzer(Thread):
                 logger.error('error :: exists failed on Redis %s key - %s' % (
                     start_key, err))
 
+            # @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+            # Divide the metrics between the processes by the analysis time of
+            # each metric in the last run, rather than an equal number of
+            # metrics per process, so that a process that is assigned the
+            # expensive metrics does not determine the run time.
+            cost_balanced_assigned_metrics_lists = []
+            if ANALYZER_COST_BALANCED_ASSIGNMENT and settings.ANALYZER_PROCESSES > 1:
+                metrics_analysis_cost = {}
+                try:
+                    metrics_analysis_cost = self.redis_conn_decoded.hgetall(metrics_analysis_cost_hash_key)
+                except Exception as err:
+                    logger.error('error :: hgetall failed on %s Redis hash, err: %s' % (
+                        metrics_analysis_cost_hash_key, err))
+                    metrics_analysis_cost = {}
+                if metrics_analysis_cost:
+                    unique_metrics_analysis_cost = {}
+                    # @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+                    unique_base_names = set()
+                    for metric_name in unique_metrics:
+                        if metric_name.startswith(settings.FULL_NAMESPACE):
+                            base_name = metric_name.replace(settings.FULL_NAMESPACE, '', 1)
+                        else:
+                            base_name = str(metric_name)
+                        # @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+                        unique_base_names.add(base_name)
+                        try:
+                            unique_metrics_analysis_cost[metric_name] = metrics_analysis_cost[base_name]
+                        except KeyError:
+                            continue
+                    try:
+                        cost_balanced_assigned_metrics_lists = get_cost_balanced_assigned_metrics(
+                            self, settings.ANALYZER_PROCESSES, unique_metrics,
+                            unique_metrics_analysis_cost)
+                    except Exception as err:
+                        logger.error('error :: get_cost_balanced_assigned_metrics failed, assigning metrics by index, err: %s' % err)
+                        cost_balanced_assigned_metrics_lists = []
+                    del unique_metrics_analysis_cost
+                    # @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+                    # The spin_processes only update the cost of the metrics
+                    # they analyse, remove the metrics that are no longer in
+                    # unique_metrics so that the hash does not grow with every
+                    # metric that has ever been analysed
+                    stale_cost_metrics = [base_name for base_name in metrics_analysis_cost if base_name not in unique_base_names]
+                    if stale_cost_metrics:
+                        try:
+                            self.redis_conn.hdel(metrics_analysis_cost_hash_key, *stale_cost_metrics)
+                            logger.info('removed %s metrics no longer in unique_metrics from %s Redis hash' % (
+                                str(len(stale_cost_metrics)), metrics_analysis_cost_hash_key))
+                        except Exception as err:
+                            logger.error('error :: hdel failed on %s Redis hash, err: %s' % (
+                                metrics_analysis_cost_hash_key, err))
+                    del unique_base_names
+                    del stale_cost_metrics
+                del metrics_analysis_cost
+
+            # @added 20261027 - Feature #5769: analyzer - metadata snapshot
+            # Load the Redis sets and hashes that each spin_process reads in a
+            # single pipeline once for the run and pass the snapshot to the
+            # processes, rather than each process reading them individually.
+            # The snapshot is built before the spin_process processes are
+            # forked so it is inherited, the persistent spin_workers each load
+            # their own snapshot.
+            metadata_snapshot = {}
+            # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+            # if ANALYZER_METADATA_SNAPSHOT:
+            if ANALYZER_METADATA_SNAPSHOT and not ANALYZER_PERSISTENT_WORKERS:
+                try:
+                    metadata_snapshot = get_metadata_snapshot(self)
+                except Exception as err:
+                    logger.error('error :: get_metadata_snapshot failed, err: %s' % err)
+                    metadata_snapshot = {}
+
             # Spawn processes
             pids = []
             spawned_pids = []
             pid_count = 0
+
+            # @added 20261021 - Feature #5763: analyzer - persistent spin_process workers
+            # Rather than spawning a spin_process for each run, assign the
+            # metrics to the persistent spin_workers, starting any that are not
+            # running.
+            spin_workers_run_id = None
+            if ANALYZER_PERSISTENT_WORKERS:
+                spin_workers_run_id = time()
+                if cost_balanced_assigned_metrics_lists:
+                    spin_workers_assigned_metrics_lists = cost_balanced_assigned_metrics_lists
+                else:
+                    spin_workers_assigned_metrics_lists = []
+                    keys_per_processor = int(ceil(float(len(unique_metrics)) / float(settings.ANALYZER_PROCESSES)))
+                    for i in range(1, settings.ANALYZER_PROCESSES + 1):
+                        assigned_min = (i - 1) * keys_per_processor
+                        if i == settings.ANALYZER_PROCESSES:
+                            assigned_max = len(unique_metrics)
+                        else:
+                            assigned_max = min(len(unique_metrics), i * keys_per_processor)
+                        spin_workers_assigned_metrics_lists.append(unique_metrics[assigned_min:assigned_max])
+                # Discard any completions from a previous run that timed out
+                while True:
+                    try:
+                        self.spin_workers_completed_q.get_nowait()
+                    except Empty:
+                        break
+                for i in range(1, settings.ANALYZER_PROCESSES + 1):
+                    try:
+                        spin_worker = self.spin_workers.get(i)
+                        if not spin_worker or not spin_worker['process'].is_alive():
+                            assignment_q = Queue()
+                            p = Process(target=self.spin_worker, args=(i, assignment_q))
+                            p.start()
+                            spin_worker = {'process': p, 'assignment_q': assignment_q}
+                            self.spin_workers[i] = spin_worker
+                            logger.info('started spin_worker %s of %s with pid: %s' % (
+                                str(i), str(settings.ANALYZER_PROCESSES), str(p.pid)))
+                        assigned_metrics = list(spin_workers_assigned_metrics_lists[i - 1])
+                        # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                        # Added metadata_snapshot
+                        # spin_worker['assignment_q'].put((spin_workers_run_id, assigned_metrics, test_values, assigned_metrics))
+                        # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                        # The spin_worker loads the metadata_snapshot itself
+                        # spin_worker['assignment_q'].put((spin_workers_run_id, assigned_metrics, test_values, assigned_metrics, metadata_snapshot))
+                        # @modified 20261021 - Feature #5763: analyzer - persistent spin_process workers
+                        # spin_process uses unique_metrics for more than the
+                        # assignment, pass the real unique_metrics
+                        # spin_worker['assignment_q'].put((spin_workers_run_id, assigned_metrics, test_values, assigned_metrics))
+                        spin_worker['assignment_q'].put((spin_workers_run_id, unique_metrics, test_values, assigned_metrics))
+                        pids.append(spin_worker['process'])
+                        pid_count += 1
+                        spawned_pids.append(spin_worker['process'].pid)
+                    except:
+                        logger.error('error :: failed to assign metrics to spin_worker %s' % str(i))
+                        logger.error(traceback.format_exc())
+                logger.info('assigned metrics to %s spin_workers' % str(pid_count))
+
             for i in range(1, settings.ANALYZER_PROCESSES + 1):
+                # @added 20261021 - Feature #5763: analyzer - persistent spin_process workers
+                if ANALYZER_PERSISTENT_WORKERS:
+                    break
                 if i > len(unique_metrics):
                     logger.info('warning :: skyline is set for more cores than needed.')
                     # break
@@ -6469,7 +7088,15 @@ class Analyzer(Thread):
                     # @modified 20240719 - Feature #5396: test_value
                     #                      Feature #5390: custom_algorithms - condition
                     # Added test_values
-                    p = Process(target=self.spin_process, args=(i, unique_metrics, test_values))
+                    # @modified 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+                    # Added cost_balanced_assigned_metrics
+                    # p = Process(target=self.spin_process, args=(i, unique_metrics, test_values))
+                    # @modified 20261027 - Feature #5769: analyzer - metadata snapshot
+                    # Added metadata_snapshot
+                    if cost_balanced_assigned_metrics_lists:
+                        p = Process(target=self.spin_process, args=(i, unique_metrics, test_values, cost_balanced_assigned_metrics_lists[i - 1], metadata_snapshot))
+                    else:
+                        p = Process(target=self.spin_process, args=(i, unique_metrics, test_values, None, metadata_snapshot))
                     pids.append(p)
                     pid_count += 1
                     logger.info('starting %s of %s spin_process/es' % (str(pid_count), str(settings.ANALYZER_PROCESSES)))
@@ -6491,7 +7118,43 @@ class Analyzer(Thread):
             #                      Feature #4702: numba optimisations
             # Use start up key and allow numba cache files to be created
             # while time() - p_starts <= settings.MAX_ANALYZER_PROCESS_RUNTIME:
-            while time() - p_starts <= max_analyzer_process_runtime:
+            # @added 20261021 - Feature #5763: analyzer - persistent spin_process workers
+            # The spin_workers remain alive so wait for each to report that it
+            # has completed the run, or to have died.  Any that exceed the
+            # max_analyzer_process_runtime are terminated and replaced on the
+            # next run.
+            if ANALYZER_PERSISTENT_WORKERS:
+                completed_spin_workers = []
+                while time() - p_starts <= max_analyzer_process_runtime:
+                    try:
+                        completed_i_process, completed_run_id = self.spin_workers_completed_q.get(timeout=0.1)
+                        if completed_run_id == spin_workers_run_id:
+                            completed_spin_workers.append(completed_i_process)
+                    except Empty:
+                        pass
+                    running_spin_workers = [
+                        i for i, spin_worker in self.spin_workers.items()
+                        if i not in completed_spin_workers and spin_worker['process'].is_alive()]
+                    if not running_spin_workers:
+                        time_to_run = time() - p_starts
+                        logger.info('%s :: %s spin_workers completed in %.2f seconds' % (skyline_app, str(settings.ANALYZER_PROCESSES), time_to_run))
+                        break
+                else:
+                    logger.info('%s :: timed out, killing spin_workers that have not completed' % (skyline_app))
+                    for i in list(self.spin_workers.keys()):
+                        if i in completed_spin_workers:
+                            continue
+                        p = self.spin_workers[i]['process']
+                        logger.info('%s :: killing spin_worker %s with pid: %s' % (skyline_app, str(i), str(p.pid)))
+                        p.terminate()
+                        del self.spin_workers[i]
+                        logger.info('%s :: killed spin_worker %s' % (skyline_app, str(i)))
+                # The spin_workers are not stopped
+                pids = []
+
+            # @modified 20261021 - Feature #5763: analyzer - persistent spin_process workers
+            # while time() - p_starts <= max_analyzer_process_runtime:
+            while not ANALYZER_PERSISTENT_WORKERS and time() - p_starts <= max_analyzer_process_runtime:
                 if any(p.is_alive() for p in pids):
                     # Just to avoid hogging the CPU
                     sleep(.1)
@@ -6502,7 +7165,11 @@ class Analyzer(Thread):
                     break
             else:
                 # We only enter this if we didn't 'break' above.
-                logger.info('%s :: timed out, killing all spin_process processes' % (skyline_app))
+                # @modified 20261021 - Feature #5763: analyzer - persistent spin_process workers
+                # The spin_workers are monitored above
+                # logger.info('%s :: timed out, killing all spin_process processes' % (skyline_app))
+                if not ANALYZER_PERSISTENT_WORKERS:
+                    logger.info('%s :: timed out, killing all spin_process processes' % (skyline_app))
                 for p in pids:
                     logger.info('%s :: killing spin_process process' % (skyline_app))
                     p.terminate()
@@ -7367,6 +8034,8 @@ class Analyzer(Thread):
 
                                 if anomaly_check_file:
                                     anomaly_check_file_created = False
+                                    # @added 20261026 - Feature #5768: check queue
+                                    anomaly_check_queued = False
                                     # @added 20200904 - Task #3730: Validate Mirage running multiple processes
                                     # Only add the mirage check files if it was
                                     # added by the spin_process
@@ -7445,16 +8114,32 @@ class Analyzer(Thread):
                                             except:
                                                 use_hours_to_resolve = 168
 
-                                        with open(anomaly_check_file, 'w') as fh:
-                                            # metric_name, anomalous datapoint, hours to resolve, timestamp
-                                            # @modified 20190410 - Feature #2882: Mirage - periodic_check
-                                            # fh.write('metric = "%s"\nvalue = "%s"\nhours_to_resolve = "%s"\nmetric_timestamp = "%s"\n' % (metric[1], metric[0], alert[3], str(metric[2])))
-                                            # @modified 20250324 - Feature #5611: custom_algorithm_only
-                                            # Added custom_algorithm_only
-                                            #fh.write('metric = "%s"\nvalue = "%s"\nhours_to_resolve = "%s"\nmetric_timestamp = "%s"\n' % (metric[1], metric[0], str(use_hours_to_resolve), str(metric[2])))
-                                            fh.write('metric = "%s"\nvalue = "%s"\nhours_to_resolve = "%s"\nmetric_timestamp = "%s"\ncustom_algorithm_only = "%s"\n' % (
-                                                     metric[1], metric[0], str(use_hours_to_resolve), str(metric[2]),
-                                                     str(i_custom_algorithm_only)))
+                                        # @added 20261026 - Feature #5768: check queue
+                                        # Add the check to the mirage check queue
+                                        # rather than writing a check file
+                                        if MIRAGE_CHECK_QUEUE:
+                                            anomaly_check_queued = add_check_to_queue(
+                                                skyline_app, 'mirage', anomaly_check_file,
+                                                [['metric', str(metric[1])],
+                                                 ['value', float(metric[0])],
+                                                 ['hours_to_resolve', int(float(use_hours_to_resolve))],
+                                                 ['metric_timestamp', int(float(metric[2]))],
+                                                 ['custom_algorithm_only', str(i_custom_algorithm_only)]],
+                                                redis_conn=self.redis_conn)
+
+                                        # @modified 20261026 - Feature #5768: check queue
+                                        # Only write a check file if not queued
+                                        if not anomaly_check_queued:
+                                            with open(anomaly_check_file, 'w') as fh:
+                                                # metric_name, anomalous datapoint, hours to resolve, timestamp
+                                                # @modified 20190410 - Feature #2882: Mirage - periodic_check
+                                                # fh.write('metric = "%s"\nvalue = "%s"\nhours_to_resolve = "%s"\nmetric_timestamp = "%s"\n' % (metric[1], metric[0], alert[3], str(metric[2])))
+                                                # @modified 20250324 - Feature #5611: custom_algorithm_only
+                                                # Added custom_algorithm_only
+                                                #fh.write('metric = "%s"\nvalue = "%s"\nhours_to_resolve = "%s"\nmetric_timestamp = "%s"\n' % (metric[1], metric[0], str(use_hours_to_resolve), str(metric[2])))
+                                                fh.write('metric = "%s"\nvalue = "%s"\nhours_to_resolve = "%s"\nmetric_timestamp = "%s"\ncustom_algorithm_only = "%s"\n' % (
+                                                         metric[1], metric[0], str(use_hours_to_resolve), str(metric[2]),
+                                                         str(i_custom_algorithm_only)))
                                         anomaly_check_file_created = True
                                         if i_custom_algorithm_only == 'custom_algorithm_only':
                                             logger.info('debug :: custom_algorithm_only added anomaly_check_file: %s' % (
@@ -7469,13 +8154,16 @@ class Analyzer(Thread):
                                             resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
 
                                     if anomaly_check_file_created:
-                                        if python_version == 2:
+                                        # @modified 20261026 - Feature #5768: check queue
+                                        # if python_version == 2:
+                                        if python_version == 2 and not anomaly_check_queued:
                                             # @modified 20190130 - Task #2690: Test Skyline on Python-3.6.7
                                             #                      Task #2828: Skyline - Python 3.7
                                             #                      Branch #3262: py3
                                             # os.chmod(anomaly_check_file, 0644)
                                             os.chmod(anomaly_check_file, 0o644)
-                                        if python_version == 3:
+                                        # if python_version == 3:
+                                        if python_version == 3 and not anomaly_check_queued:
                                             os.chmod(anomaly_check_file, mode=0o644)
                                         if LOCAL_DEBUG:
                                             logger.info(
@@ -7975,6 +8663,10 @@ class Analyzer(Thread):
                                 logger.info('removed mirage check file as waterfall alerted on - %s' % mirage_check_file)
                             except OSError:
                                 logger.error('error - failed to remove %s, continuing' % mirage_check_file)
+                        # @added 20261026 - Feature #5768: check queue
+                        if MIRAGE_CHECK_QUEUE:
+                            if remove_queued_check(skyline_app, 'mirage', check_file, redis_conn=self.redis_conn):
+                                logger.info('removed mirage queued check as waterfall alerted on - %s' % check_file)
                         ionosphere_check_file = '%s/%s' % (settings.IONOSPHERE_CHECK_PATH, check_file)
                         if os.path.isfile(ionosphere_check_file):
                             try:
@@ -8810,9 +9502,11 @@ class Analyzer(Thread):
 
             if raw_series is not None:
                 try:
-                    unpacker = Unpacker(use_list=False)
-                    unpacker.feed(raw_series)
-                    timeseries = list(unpacker)
+                    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                    # unpacker = Unpacker(use_list=False)
+                    # unpacker.feed(raw_series)
+                    # timeseries = list(unpacker)
+                    timeseries = unpack_timeseries(raw_series)
 
                     # @added 20200506 - Feature #3532: Sort all time series
                     # To ensure that there are no unordered timestamps in the time
@@ -9150,7 +9844,9 @@ class Analyzer(Thread):
 
             unique_metrics = []
             raw_series = None
-            unpacker = None
+            # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+            # unpacker is no longer used
+            # unpacker = None
             # We del all variables that are floats as they become unique objects and
             # can result in what appears to be a memory leak, but it is not, it
             # is just the way that Python handles floats
@@ -26,7 +26,8 @@ from ast import literal_eval
 import copy
 import json
 
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 
 import settings
 from skyline_functions import (
@@ -91,6 +92,9 @@ from functions.redis.populate_redis_metric import populate_redis_metric
 
 # @added 20240602 - Feature #5368: analyzer_batch - reprocess
 from functions.cluster.is_shard_metric import is_shard_metric
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import (
+    pack_timeseries, unpack_timeseries)
 
 # TODO if settings.ENABLE_CRUCIBLE: and ENABLE_PANORAMA
 #    from spectrum import push_to_crucible
@@ -171,7 +175,8 @@ if ROOMBA_DO_NOT_PROCESS_BATCH_METRICS:
     except ImportError:
         eliminated_in_python3 = True
     from redis import WatchError
-    from msgpack import packb
+    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+    # from msgpack import packb
 # @added 20200817 - Feature #3684: ROOMBA_BATCH_METRICS_CUSTOM_DURATIONS
 #                   Feature #3650: ROOMBA_DO_NOT_PROCESS_BATCH_METRICS
 #                   Feature #3480: batch_processing
@@ -706,9 +711,11 @@ class AnalyzerBatch(Thread):
                 return
 
             try:
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
             except:
                 timeseries = []
 
@@ -874,14 +881,18 @@ class AnalyzerBatch(Thread):
                     # Purge if everything was deleted, set key otherwise
                     if len(trimmed) > 0:
                         # Serialize and turn key back into not-an-array
-                        btrimmed = packb(trimmed)
-                        if len(trimmed) <= 15:
-                            value = btrimmed[1:]
-                        elif len(trimmed) <= 65535:
-                            value = btrimmed[3:]
-                            trimmed_keys += 1
-                        else:
-                            value = btrimmed[5:]
+                        # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                        # btrimmed = packb(trimmed)
+                        # if len(trimmed) <= 15:
+                        #     value = btrimmed[1:]
+                        # elif len(trimmed) <= 65535:
+                        #     value = btrimmed[3:]
+                        #     trimmed_keys += 1
+                        # else:
+                        #     value = btrimmed[5:]
+                        #     trimmed_keys += 1
+                        value = pack_timeseries(trimmed)
+                        if len(trimmed) > 15:
                             trimmed_keys += 1
                         pipe.set(key, value)
                         active_keys += 1
@@ -928,9 +939,11 @@ class AnalyzerBatch(Thread):
                     return
 
                 try:
-                    unpacker = Unpacker(use_list=False)
-                    unpacker.feed(raw_series)
-                    timeseries = list(unpacker)
+                    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                    # unpacker = Unpacker(use_list=False)
+                    # unpacker.feed(raw_series)
+                    # timeseries = list(unpacker)
+                    timeseries = unpack_timeseries(raw_series)
                     if roombaed:
                         logger.info('batch_processing :: after roomba %s has %s data points' % (key, str(len(timeseries))))
                 except:
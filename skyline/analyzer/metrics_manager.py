@@ -19,7 +19,8 @@ from contextlib import nullcontext
 import copy
 
 # @added 20201209 - Feature #3870: metrics_manager - check_data_sparsity
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 # from collections import Counter
 
 # @added 20201213 - Feature #3890: metrics_manager - sync_cluster_files
@@ -192,6 +193,8 @@ from functions.metrics_manager.cluster_sync_bq_archives import cluster_sync_bq_a
 
 # @added 20250321 - Feature #5611: custom_algorithm_only
 from functions.metrics_manager.manage_custom_algorithm_only_metrics import manage_custom_algorithm_only_metrics
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 skyline_app = 'analyzer'
 skyline_app_logger = '%sLog' % skyline_app
@@ -5366,9 +5369,11 @@ class Metrics_Manager(Thread):
                         try:
                             try:
                                 raw_series = raw_assigned[check_metric_index]
-                                unpacker = Unpacker(use_list=False)
-                                unpacker.feed(raw_series)
-                                timeseries = list(unpacker)
+                                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                                # unpacker = Unpacker(use_list=False)
+                                # unpacker.feed(raw_series)
+                                # timeseries = list(unpacker)
+                                timeseries = unpack_timeseries(raw_series)
                             except:
                                 timeseries = []
 
@@ -5758,9 +5763,11 @@ class Metrics_Manager(Thread):
                     try:
                         try:
                             raw_series = unchecked_raw_assigned[i]
-                            unpacker = Unpacker(use_list=False)
-                            unpacker.feed(raw_series)
-                            timeseries = list(unpacker)
+                            # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                            # unpacker = Unpacker(use_list=False)
+                            # unpacker.feed(raw_series)
+                            # timeseries = list(unpacker)
+                            timeseries = unpack_timeseries(raw_series)
                         except:
                             timeseries = []
                         metric_name = str(metric_name)
@@ -7210,9 +7217,11 @@ class Metrics_Manager(Thread):
                             timeseries = []
                             try:
                                 raw_series = raw_assigned[i]
-                                unpacker = Unpacker(use_list=False)
-                                unpacker.feed(raw_series)
-                                timeseries = list(unpacker)
+                                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                                # unpacker = Unpacker(use_list=False)
+                                # unpacker.feed(raw_series)
+                                # timeseries = list(unpacker)
+                                timeseries = unpack_timeseries(raw_series)
                             except Exception as err:
                                 logger.info('warning :: metrics_manager :: roomba batch_processing_metrics failed to unpack %s timeseries - %s' % (
                                     str(metric_name), err))
@@ -9,7 +9,9 @@ from time import time, sleep, strftime, gmtime
 from threading import Thread
 from collections import defaultdict
 from multiprocessing import Process, Manager, Queue
-from msgpack import Unpacker, unpackb, packb
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker, unpackb, packb
+from msgpack import unpackb, packb
 import os
 from os import path, kill, getpid, system
 from math import ceil
@@ -38,6 +40,8 @@ from alerters import trigger_alert
 from algorithms_dev import run_selected_algorithm
 # from skyline import algorithm_exceptions
 from algorithm_exceptions import TooShort, Stale, Boring
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 try:
     send_algorithm_run_metrics = settings.ENABLE_ALGORITHM_RUN_METRICS
@@ -437,9 +441,11 @@ class AnalyzerDev(Thread):
 
             try:
                 raw_series = raw_assigned[i]
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
             except:
                 timeseries = []
 
@@ -879,9 +885,11 @@ class AnalyzerDev(Thread):
             # Check canary metric
             raw_series = self.redis_conn.get(settings.FULL_NAMESPACE + settings.CANARY_METRIC)
             if raw_series is not None:
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
 
                 # @added 20200507 - Feature #3532: Sort all time series
                 # To ensure that there are no unordered timestamps in the time
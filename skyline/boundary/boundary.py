@@ -32,7 +32,9 @@ from ast import literal_eval
 # @added 20231026 - Feature #5104: boundary - external_settings
 import copy
 
-from msgpack import Unpacker, packb
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker, packb
+from msgpack import packb
 
 import settings
 # @modified 20171216 - Task #2236: Change Boundary to only send to Panorama on alert
@@ -94,6 +96,8 @@ from functions.prometheus.metric_name_labels_parser import metric_name_labels_pa
 # Added external_settings and bq_accounts_settings
 from functions.settings.get_external_settings import get_external_settings
 from functions.settings.get_bq_accounts_settings import get_bq_accounts_settings
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 skyline_app = 'boundary'
 skyline_app_logger = skyline_app + 'Log'
@@ -708,9 +712,11 @@ class Boundary(Thread):
                     try:
                         # raw_series = raw_assigned[metric_and_algo[0]]
                         raw_series = raw_assigned[raw_assigned_index]
-                        unpacker = Unpacker(use_list=False)
-                        unpacker.feed(raw_series)
-                        timeseries = list(unpacker)
+                        # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                        # unpacker = Unpacker(use_list=False)
+                        # unpacker.feed(raw_series)
+                        # timeseries = list(unpacker)
+                        timeseries = unpack_timeseries(raw_series)
                     except Exception as err:
                         boundary_errors[metric_name] = {'err': str(err), 'traceback': str(traceback.format_exc())}
                         timeseries = []
@@ -2641,9 +2647,11 @@ class Boundary(Thread):
             # Check canary metric
             raw_series = self.redis_conn.get(settings.FULL_NAMESPACE + settings.CANARY_METRIC)
             if raw_series is not None:
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
 
                 # @added 20200507 - Feature #3532: Sort all time series
                 # To ensure that there are no unordered timestamps in the time
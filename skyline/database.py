@@ -3,6 +3,11 @@ database.py
 """
 import logging
 import traceback
+# @added 20261024 - Feature #5766: database - pooled engine
+from contextlib import contextmanager
+from os import getpid
+from threading import Lock
+
 from sqlalchemy import (
     create_engine, Column, Table, Integer, String, MetaData, DateTime)
 from sqlalchemy.dialects.mysql import DOUBLE, FLOAT, TINYINT, VARCHAR, SMALLINT
@@ -26,6 +31,213 @@ except AttributeError:
 except Exception as outer_err:
     OTEL_ENABLED = False
 
+# @added 20261024 - Feature #5766: database - pooled engine
+DATABASE_POOLED_ENGINE = False
+try:
+    DATABASE_POOLED_ENGINE = settings.DATABASE_POOLED_ENGINE
+except AttributeError:
+    DATABASE_POOLED_ENGINE = False
+DATABASE_POOL_SIZE = 5
+try:
+    DATABASE_POOL_SIZE = int(settings.DATABASE_POOL_SIZE)
+except AttributeError:
+    DATABASE_POOL_SIZE = 5
+DATABASE_POOL_MAX_OVERFLOW = 10
+try:
+    DATABASE_POOL_MAX_OVERFLOW = int(settings.DATABASE_POOL_MAX_OVERFLOW)
+except AttributeError:
+    DATABASE_POOL_MAX_OVERFLOW = 10
+DATABASE_POOL_RECYCLE = 3600
+try:
+    DATABASE_POOL_RECYCLE = int(settings.DATABASE_POOL_RECYCLE)
+except AttributeError:
+    DATABASE_POOL_RECYCLE = 3600
+
+# @added 20261024 - Feature #5766: database - pooled engine
+# One pooled engine per process, keyed by pid so that a forked child process
+# never uses the connections of its parent's pool.  The reflected table
+# objects of the pooled engine are also cached so that the *_table_meta
+# functions do not reflect the table from the database on every call.
+pooled_engines = {}
+pooled_engines_reflected_tables = {}
+pooled_engines_lock = Lock()
+
+
+def create_mysql_engine(current_skyline_app, pooled=False):
+    """
+    Create a sqlalchemy MySQL engine, instrumented with opentelemetry for the
+    webapp if OTEL_ENABLED.
+
+    :param current_skyline_app: the app calling the function
+    :param pooled: whether to create the engine with the
+        :mod:`settings.DATABASE_POOL_SIZE`, :mod:`settings.DATABASE_POOL_MAX_OVERFLOW`
+        and :mod:`settings.DATABASE_POOL_RECYCLE` pool settings and pre ping
+        health checks
+    :type current_skyline_app: str
+    :type pooled: boolean
+    :return: engine
+    :rtype: object
+
+    """
+    if OTEL_ENABLED and current_skyline_app == 'webapp':
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+    engine_kwargs = {}
+    if pooled:
+        engine_kwargs = {
+            'pool_size': DATABASE_POOL_SIZE,
+            'max_overflow': DATABASE_POOL_MAX_OVERFLOW,
+            'pool_recycle': DATABASE_POOL_RECYCLE,
+            'pool_pre_ping': True,
+        }
+    engine = create_engine(
+        'mysql+mysqlconnector://%s:%s@%s:%s/%s' % (
+            settings.PANORAMA_DBUSER, settings.PANORAMA_DBUSERPASS,
+            settings.PANORAMA_DBHOST, str(settings.PANORAMA_DBPORT),
+            settings.PANORAMA_DATABASE), **engine_kwargs)
+
+    if OTEL_ENABLED and current_skyline_app == 'webapp':
+        instrumented = False
+        try:
+            instrumented = SQLAlchemyInstrumentor().is_instrumented_by_opentelemetry
+        except Exception as err:
+            current_skyline_app_logger = current_skyline_app + 'Log'
+            current_logger = logging.getLogger(current_skyline_app_logger)
+            current_logger.error('error :: get_engine - SQLAlchemyInstrumentor().is_instrumented_by_opentelemetry failed - %s' % (
+                err))
+        if not instrumented:
+            current_skyline_app_logger = current_skyline_app + 'Log'
+            current_logger = logging.getLogger(current_skyline_app_logger)
+            current_logger.info('get_engine - starting SQLAlchemyInstrumentor')
+            SQLAlchemyInstrumentor().instrument(
+                engine=engine,
+            )
+    return engine
+
+
+def is_pooled_engine(engine):
+    """
+    Whether the engine is the pooled engine of a process.  All the Skyline apps
+    dispose of the engine after each operation, the pooled engine must not be
+    disposed of, the connections are returned to the pool when they are
+    closed.  Use :func:`dispose_pooled_engine` to dispose of the pooled engine.
+
+    :param engine: the sqlalchemy engine object
+    :type engine: object
+    :return: pooled
+    :rtype: boolean
+
+    """
+    if engine is None:
+        return False
+    return any(pooled_engine is engine for pooled_engine in list(pooled_engines.values()))
+
+
+def get_pooled_engine(current_skyline_app):
+    """
+    Return the pooled sqlalchemy engine of the process, creating it if it does
+    not exist.
+
+    :param current_skyline_app: the app calling the function
+    :type current_skyline_app: str
+    :return: engine
+    :rtype: object
+
+    """
+    pid = getpid()
+    engine = pooled_engines.get(pid)
+    if engine is not None:
+        return engine
+    with pooled_engines_lock:
+        engine = pooled_engines.get(pid)
+        if engine is None:
+            engine = create_mysql_engine(current_skyline_app, pooled=True)
+            pooled_engines[pid] = engine
+            pooled_engines_reflected_tables[pid] = {}
+            current_skyline_app_logger = current_skyline_app + 'Log'
+            current_logger = logging.getLogger(current_skyline_app_logger)
+            current_logger.info('get_engine - created pooled MySQL engine for pid %s' % str(pid))
+    return engine
+
+
+def dispose_pooled_engine(current_skyline_app):
+    """
+    Dispose of the pooled sqlalchemy engine of the process and its cached
+    reflected tables.
+
+    :param current_skyline_app: the app calling the function
+    :type current_skyline_app: str
+    :return: None
+
+    """
+    pid = getpid()
+    with pooled_engines_lock:
+        engine = pooled_engines.pop(pid, None)
+        pooled_engines_reflected_tables.pop(pid, None)
+    if engine is not None:
+        try:
+            engine.dispose()
+        except:
+            current_skyline_app_logger = current_skyline_app + 'Log'
+            current_logger = logging.getLogger(current_skyline_app_logger)
+            current_logger.error(traceback.format_exc())
+            current_logger.error('error :: dispose_pooled_engine :: failed to dispose of pooled engine')
+    return
+
+
+@contextmanager
+def engine_connection(current_skyline_app):
+    """
+    A context manager that yields a connection from the engine returned by
+    :func:`get_engine`, which is returned to the pool (or closed and the engine
+    disposed of if the engine is not pooled) on exit.
+
+    Usage::
+
+        with engine_connection(skyline_app) as connection:
+            result = connection.execute(stmt)
+
+    :param current_skyline_app: the app calling the function
+    :type current_skyline_app: str
+    :return: connection
+    :rtype: object
+
+    """
+    engine, fail_msg, trace = get_engine(current_skyline_app)
+    if not engine:
+        raise RuntimeError(fail_msg)
+    try:
+        with engine.connect() as connection:
+            yield connection
+    finally:
+        engine_disposal(current_skyline_app, engine)
+
+
+def reflect_table(table_name, table_meta, engine):
+    """
+    Reflect a table from the database, or return the cached reflected table if
+    the engine is the pooled engine.
+
+    :param table_name: the table name
+    :param table_meta: the sqlalchemy MetaData
+    :param engine: the sqlalchemy engine object
+    :type table_name: str
+    :type table_meta: object
+    :type engine: object
+    :return: table
+    :rtype: object
+
+    """
+    pid = getpid()
+    reflected_tables = pooled_engines_reflected_tables.get(pid)
+    if reflected_tables is None or pooled_engines.get(pid) is not engine:
+        return Table(table_name, table_meta, autoload_with=engine)
+    table = reflected_tables.get(table_name)
+    if table is None:
+        table = Table(table_name, table_meta, autoload_with=engine)
+        reflected_tables[table_name] = table
+    return table
+
 
 def get_engine(current_skyline_app):
     '''
@@ -43,6 +255,13 @@ def get_engine(current_skyline_app):
     '''
     try:
 
+        # @added 20261024 - Feature #5766: database - pooled engine
+        # Return the pooled engine of the process rather than creating a new
+        # engine, and new connection, for every operation
+        if DATABASE_POOLED_ENGINE:
+            engine = get_pooled_engine(current_skyline_app)
+            return engine, 'got pooled MySQL engine', 'none'
+
         # @added 20220405 - Task #4514: Integrate opentelemetry
         #                   Feature #4516: flux - opentelemetry traces
         if OTEL_ENABLED and current_skyline_app == 'webapp':
@@ -98,6 +317,11 @@ def engine_disposal(current_skyline_app, engine):
     :type current_skyline_app: str
     :type engine: object
     """
+    # @added 20261024 - Feature #5766: database - pooled engine
+    # The pooled engine is not disposed of, the connections are returned to the
+    # pool when they are closed
+    if is_pooled_engine(engine):
+        return
     if engine:
         try:
             engine.dispose()
@@ -161,7 +385,9 @@ def ionosphere_table_meta(current_skyline_app, engine):
     #        mysql_engine='MyISAM')
     #    ionosphere_table.create(engine, checkfirst=True)
     #    return ionosphere_table, 'ionosphere_table meta OK', 'none'
-        ionosphere_table = Table('ionosphere', ionosphere_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # ionosphere_table = Table('ionosphere', ionosphere_meta, autoload_with=engine)
+        ionosphere_table = reflect_table('ionosphere', ionosphere_meta, engine)
         return ionosphere_table, 'ionosphere_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -192,7 +418,9 @@ def metrics_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #metrics_table = Table('metrics', metrics_meta, autoload=True, autoload_with=engine)
-        metrics_table = Table('metrics', metrics_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # metrics_table = Table('metrics', metrics_meta, autoload_with=engine)
+        metrics_table = reflect_table('metrics', metrics_meta, engine)
         return metrics_table, 'metrics_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -223,7 +451,9 @@ def anomalies_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #anomalies_table = Table('anomalies', anomalies_meta, autoload=True, autoload_with=engine)
-        anomalies_table = Table('anomalies', anomalies_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # anomalies_table = Table('anomalies', anomalies_meta, autoload_with=engine)
+        anomalies_table = reflect_table('anomalies', anomalies_meta, engine)
         return anomalies_table, 'anomalies_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -260,7 +490,9 @@ def ionosphere_matched_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #ionosphere_matched_table = Table('ionosphere_matched', ionosphere_matched_meta, autoload=True, autoload_with=engine)
-        ionosphere_matched_table = Table('ionosphere_matched', ionosphere_matched_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # ionosphere_matched_table = Table('ionosphere_matched', ionosphere_matched_meta, autoload_with=engine)
+        ionosphere_matched_table = reflect_table('ionosphere_matched', ionosphere_matched_meta, engine)
         return ionosphere_matched_table, 'ionosphere_matched_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -292,7 +524,9 @@ def ionosphere_layers_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #ionosphere_layers_table = Table('ionosphere_layers', ionosphere_layers_meta, autoload=True, autoload_with=engine)
-        ionosphere_layers_table = Table('ionosphere_layers', ionosphere_layers_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # ionosphere_layers_table = Table('ionosphere_layers', ionosphere_layers_meta, autoload_with=engine)
+        ionosphere_layers_table = reflect_table('ionosphere_layers', ionosphere_layers_meta, engine)
         return ionosphere_layers_table, 'ionosphere_layers_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -323,7 +557,9 @@ def layers_algorithms_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #layers_algorithms_table = Table('layers_algorithms', layers_algorithms_meta, autoload=True, autoload_with=engine)
-        layers_algorithms_table = Table('layers_algorithms', layers_algorithms_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # layers_algorithms_table = Table('layers_algorithms', layers_algorithms_meta, autoload_with=engine)
+        layers_algorithms_table = reflect_table('layers_algorithms', layers_algorithms_meta, engine)
         return layers_algorithms_table, 'layers_algorithms_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -354,7 +590,9 @@ def ionosphere_layers_matched_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #ionosphere_layers_matched_table = Table('ionosphere_layers_matched', ionosphere_layers_matched_meta, autoload=True, autoload_with=engine)
-        ionosphere_layers_matched_table = Table('ionosphere_layers_matched', ionosphere_layers_matched_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # ionosphere_layers_matched_table = Table('ionosphere_layers_matched', ionosphere_layers_matched_meta, autoload_with=engine)
+        ionosphere_layers_matched_table = reflect_table('ionosphere_layers_matched', ionosphere_layers_matched_meta, engine)
         return ionosphere_layers_matched_table, 'ionosphere_layers_matched_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -386,7 +624,9 @@ def luminosity_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #luminosity_table = Table('luminosity', luminosity_meta, autoload=True, autoload_with=engine)
-        luminosity_table = Table('luminosity', luminosity_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # luminosity_table = Table('luminosity', luminosity_meta, autoload_with=engine)
+        luminosity_table = reflect_table('luminosity', luminosity_meta, engine)
         return luminosity_table, 'luminosity_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -419,7 +659,9 @@ def snab_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #snab_table = Table('snab', snab_meta, autoload=True, autoload_with=engine)
-        snab_table = Table('snab', snab_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # snab_table = Table('snab', snab_meta, autoload_with=engine)
+        snab_table = reflect_table('snab', snab_meta, engine)
         return snab_table, 'snab_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -452,7 +694,9 @@ def motifs_matched_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #motifs_matched_table = Table('motifs_matched', motifs_matched_meta, autoload=True, autoload_with=engine)
-        motifs_matched_table = Table('motifs_matched', motifs_matched_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # motifs_matched_table = Table('motifs_matched', motifs_matched_meta, autoload_with=engine)
+        motifs_matched_table = reflect_table('motifs_matched', motifs_matched_meta, engine)
         return motifs_matched_table, 'snab_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -485,7 +729,9 @@ def not_anomalous_motifs_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #not_anomalous_motifs_table = Table('not_anomalous_motifs', not_anomalous_motifs_meta, autoload=True, autoload_with=engine)
-        not_anomalous_motifs_table = Table('not_anomalous_motifs', not_anomalous_motifs_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # not_anomalous_motifs_table = Table('not_anomalous_motifs', not_anomalous_motifs_meta, autoload_with=engine)
+        not_anomalous_motifs_table = reflect_table('not_anomalous_motifs', not_anomalous_motifs_meta, engine)
         return not_anomalous_motifs_table, 'not_anomalous_motifs meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -517,7 +763,9 @@ def cloudburst_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #cloudburst_table = Table('cloudburst', cloudburst_meta, autoload=True, autoload_with=engine)
-        cloudburst_table = Table('cloudburst', cloudburst_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # cloudburst_table = Table('cloudburst', cloudburst_meta, autoload_with=engine)
+        cloudburst_table = reflect_table('cloudburst', cloudburst_meta, engine)
         return cloudburst_table, 'cloudburst meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -549,7 +797,9 @@ def cloudbursts_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #cloudbursts_table = Table('cloudbursts', cloudbursts_meta, autoload=True, autoload_with=engine)
-        cloudbursts_table = Table('cloudbursts', cloudbursts_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # cloudbursts_table = Table('cloudbursts', cloudbursts_meta, autoload_with=engine)
+        cloudbursts_table = reflect_table('cloudbursts', cloudbursts_meta, engine)
         return cloudbursts_table, 'cloudbursts meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -581,7 +831,9 @@ def metric_group_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #metric_group_table = Table('metric_group', metric_group_meta, autoload=True, autoload_with=engine)
-        metric_group_table = Table('metric_group', metric_group_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # metric_group_table = Table('metric_group', metric_group_meta, autoload_with=engine)
+        metric_group_table = reflect_table('metric_group', metric_group_meta, engine)
         return metric_group_table, 'metric_group meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -613,7 +865,9 @@ def metric_group_info_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #metric_group_info_table = Table('metric_group_info', metric_group_info_meta, autoload=True, autoload_with=engine)
-        metric_group_info_table = Table('metric_group_info', metric_group_info_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # metric_group_info_table = Table('metric_group_info', metric_group_info_meta, autoload_with=engine)
+        metric_group_info_table = reflect_table('metric_group_info', metric_group_info_meta, engine)
         return metric_group_info_table, 'metric_group_info meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -646,7 +900,9 @@ def ionosphere_minmax_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #ionosphere_minmax_table = Table('ionosphere_minmax', ionosphere_minmax_meta, autoload=True, autoload_with=engine)
-        ionosphere_minmax_table = Table('ionosphere_minmax', ionosphere_minmax_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # ionosphere_minmax_table = Table('ionosphere_minmax', ionosphere_minmax_meta, autoload_with=engine)
+        ionosphere_minmax_table = reflect_table('ionosphere_minmax', ionosphere_minmax_meta, engine)
         return ionosphere_minmax_table, 'ionosphere_minmax meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -678,7 +934,9 @@ def algorithms_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #algorithms_table = Table('algorithms', algorithms_meta, autoload=True, autoload_with=engine)
-        algorithms_table = Table('algorithms', algorithms_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # algorithms_table = Table('algorithms', algorithms_meta, autoload_with=engine)
+        algorithms_table = reflect_table('algorithms', algorithms_meta, engine)
         return algorithms_table, 'algorithms_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -710,7 +968,9 @@ def snab_results_algorithms_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #snab_results_algorithms_table = Table('snab_results_algorithms', snab_results_algorithms_meta, autoload=True, autoload_with=engine)
-        snab_results_algorithms_table = Table('snab_results_algorithms', snab_results_algorithms_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # snab_results_algorithms_table = Table('snab_results_algorithms', snab_results_algorithms_meta, autoload_with=engine)
+        snab_results_algorithms_table = reflect_table('snab_results_algorithms', snab_results_algorithms_meta, engine)
         return snab_results_algorithms_table, 'snab_results_algorithms meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -741,7 +1001,9 @@ def comments_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #comments_table = Table('comments', comments_meta, autoload=True, autoload_with=engine)
-        comments_table = Table('comments', comments_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # comments_table = Table('comments', comments_meta, autoload_with=engine)
+        comments_table = reflect_table('comments', comments_meta, engine)
         return comments_table, 'comments meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -773,7 +1035,9 @@ def anomalies_updated_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #anomalies_updated_table = Table('anomalies_updated', anomalies_updated_meta, autoload=True, autoload_with=engine)
-        anomalies_updated_table = Table('anomalies_updated', anomalies_updated_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # anomalies_updated_table = Table('anomalies_updated', anomalies_updated_meta, autoload_with=engine)
+        anomalies_updated_table = reflect_table('anomalies_updated', anomalies_updated_meta, engine)
         return anomalies_updated_table, 'anomalies_updated meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -804,7 +1068,9 @@ def alias_features_profile_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #alias_features_profile_table = Table('alias_features_profile', alias_features_profile_meta, autoload=True, autoload_with=engine)
-        alias_features_profile_table = Table('alias_features_profile', alias_features_profile_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # alias_features_profile_table = Table('alias_features_profile', alias_features_profile_meta, autoload_with=engine)
+        alias_features_profile_table = reflect_table('alias_features_profile', alias_features_profile_meta, engine)
         return alias_features_profile_table, 'alias_features_profile meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -837,7 +1103,9 @@ def algorithm_groups_table_meta(current_skyline_app, engine):
         # @modified 20260225 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #algorithm_groups_table = Table('algorithm_groups', algorithm_groups_meta, autoload=True, autoload_with=engine)
-        algorithm_groups_table = Table('algorithm_groups', algorithm_groups_meta, autoload_with=engine)
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # algorithm_groups_table = Table('algorithm_groups', algorithm_groups_meta, autoload_with=engine)
+        algorithm_groups_table = reflect_table('algorithm_groups', algorithm_groups_meta, engine)
         return algorithm_groups_table, 'algorithm_groups_table meta reflected OK', 'none'
     except:
         trace = traceback.format_exc()
@@ -17,10 +17,16 @@ from contextlib import nullcontext
 import numpy as np
 import pandas as pd
 
-from tsfresh.feature_extraction import (
-    # @modified 20210101 - Task #3928: Update Skyline to use new tsfresh feature extraction method
-    # extract_features, ReasonableFeatureExtractionSettings)
-    extract_features, EfficientFCParameters)
+# @modified 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+# The feature calculators are determined by get_fc_parameters and
+# extract_features is called in extract_tsfresh_features
+# from tsfresh.feature_extraction import (
+#     # @modified 20210101 - Task #3928: Update Skyline to use new tsfresh feature extraction method
+#     # extract_features, ReasonableFeatureExtractionSettings)
+#     # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+#     # extract_features is called in extract_tsfresh_features
+#     # extract_features, EfficientFCParameters)
+#     EfficientFCParameters)
 from tsfresh import __version__ as tsfresh_version
 
 import settings
@@ -44,6 +50,11 @@ from functions.timeseries.downsample import downsample_timeseries
 
 # @added 20241115 - Feature #5548: functions.numpy.minmax_scale
 from functions.numpy.minmax_scale import minmax_scale
+# @added 20261030 - Feature #5772: ionosphere - in memory feature extraction
+from functions.ionosphere.tsfresh_features import (
+    extract_tsfresh_features, get_calculated_features_from_df,
+    # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+    get_fc_parameters)
 
 skyline_version = skyline_version.__absolute_version__
 
@@ -100,7 +111,12 @@ def feature_name_id(current_skyline_app, feature_name):
 
 # @modified 20240703 - Feature #5384: ionosphere - preprocess_validate_training
 # Added the preprocess_validate_training functionality
-def calculate_features_profile(current_skyline_app, timestamp, metric, context, preprocess_validate_training=False):
+# @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+# Added the write_features_file and calculated_features parameters
+def calculate_features_profile(
+        current_skyline_app, timestamp, metric, context,
+        preprocess_validate_training=False, write_features_file=True,
+        calculated_features=None):
     """
     Calculates a tsfresh features profile from a training data set
 
@@ -115,6 +131,14 @@ def calculate_features_profile(current_skyline_app, timestamp, metric, context,
     :type context: str
     :param preprocess_validate_training: whether this is a preprocess_validate_training request
     :type preprocess_validate_training: bool
+    :param write_features_file: whether to save the transposed features csv,
+        if False the features are only returned via calculated_features
+    :type write_features_file: bool
+    :param calculated_features: an optional list which is extended with the
+        calculated features as [feature_name, value] items, the same as
+        get_calculated_features returns from the transposed features csv, so
+        that the caller does not need to read the csv file back in
+    :type calculated_features: list
     :return: (features_profile_csv_file_path, successful, fail_msg, traceback_format_exc, calc_time)
     :rtype: int
     :rtype: (str, boolean, str, str, str)
@@ -568,206 +592,121 @@ def calculate_features_profile(current_skyline_app, timestamp, metric, context,
         current_logger.info('%s' % fail_msg)
         return 'error', False, fp_created, fp_id, fail_msg, trace, f_calc
 
+    # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+    # The time series is no longer written to the tsfresh input csv file and
+    # read back into a DataFrame, the DataFrame is created in memory from the
+    # time series and the features are extracted and transposed in
+    # extract_tsfresh_features.  The count and sum of the features values are
+    # calculated from the transposed DataFrame rather than by reading the
+    # transposed features csv back in, which is only written if required.
+    # if os.path.isfile(ts_csv):
+    #     os.remove(ts_csv)
+    # for ts, value in converted:
+    #     utc_ts_line = '%s,%s,%s\n' % (use_base_name, str(int(ts)), str(value))
+    #     with open(ts_csv, 'a') as fh:
+    #         fh.write(utc_ts_line)
+    # del converted
+    # try:
+    #     df = pd.read_csv(ts_csv, delimiter=',', header=None, names=['metric', 'timestamp', 'value'])
+    # ...
+    # df_features = extract_features(
+    #     df, default_fc_parameters=EfficientFCParameters(),
+    #     column_id='metric', column_sort='timestamp', column_kind=None,
+    #     column_value=None, disable_progressbar=True)
+    # ...
+    # df_t = df_features.transpose()
     if os.path.isfile(ts_csv):
         os.remove(ts_csv)
 
-    for ts, value in converted:
-        # print('%s,%s' % (str(int(ts)), str(value)))
-        # utc_ts_line = '%s,%s,%s\n' % (metric, str(int(ts)), str(value))
-        utc_ts_line = '%s,%s,%s\n' % (use_base_name, str(int(ts)), str(value))
-        with open(ts_csv, 'a') as fh:
-            fh.write(utc_ts_line)
-
-    del converted
-
-    try:
-        df = pd.read_csv(ts_csv, delimiter=',', header=None, names=['metric', 'timestamp', 'value'])
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        current_logger.info('%s :: DataFrame created with %s' % (
-            log_context, ts_csv))
-    except:
-        trace = traceback.format_exc()
-        current_logger.error(trace)
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        fail_msg = 'error: %s :: failed to create a pandas DataFrame with %s' % (log_context, ts_csv)
-        current_logger.error('%s' % fail_msg)
-        if os.path.isfile(ts_csv):
-            os.remove(ts_csv)
-            # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-            # Added log_context to report the context
-            current_logger.info('%s :: removed %s' % (log_context, ts_csv))
-        end = timer()
-        return 'error', False, fp_created, fp_id, fail_msg, trace, f_calc
-
-# @added 20161207 - Task #1658: Patterning Skyline Ionosphere
-# Coverting the Dataframe types to suit MySQL data types
-# For anyone in here if you have done a code review of Skyline there are
-# a number of questions that arise from the decision to deviate from json or
-# storing msgppack as BLOB etc.  tsfresh used csv and we can csv from Graphite
-# etc.  Skyline should be able to handle csv.  As for how data is stored in
-# MySQL, this was given considerable review and thought.  Given that Ionosphere
-# and Skyline in general should not be limited to the domain of analyzing
-# Graphite machine metrics but other timeseries data sources too.
-#    df['feature_name'] = df['feature_name'].astype(string)
-#    df['value'] = df['value'].astype(float)
-
-    # Test the DataFrame
-    try:
-        df_created = df.head()
-        del df_created
-    except:
-        trace = traceback.format_exc()
-        current_logger.debug(trace)
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        fail_msg = 'error: %s :: failed to read the pandas DataFrame created with %s' % (log_context, ts_csv)
-        current_logger.error('%s' % fail_msg)
-        if os.path.isfile(ts_csv):
-            os.remove(ts_csv)
-            # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-            # Added log_context to report the context
-            current_logger.info('%s :: removed %s' % (log_context, ts_csv))
-        end = timer()
-        return 'error', False, fp_created, fp_id, fail_msg, trace, f_calc
-
-    df.columns = ['metric', 'timestamp', 'value']
-
-    start_feature_extraction = timer()
     # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
     # Added log_context to report the context
     current_logger.info('%s :: starting extract_features with %s' % (
         log_context, str(TSFRESH_VERSION)))
-    df_features = False
+    df_t = None
+    feature_extraction_time = 0
+    # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+    # Use the IONOSPHERE_TSFRESH_FEATURE_SET feature calculators
+    fc_parameters, tsfresh_feature_set = get_fc_parameters()
+    current_logger.info('%s :: using the %s tsfresh feature set with %s calculators' % (
+        log_context, tsfresh_feature_set, str(len(fc_parameters))))
     try:
-        # @modified 20161226 - Bug #1822: tsfresh extract_features process stalling
-        # Changed to use the new ReasonableFeatureExtractionSettings that was
-        # introduced in tsfresh-0.4.0 to exclude the computationally high cost
-        # of extracting features from very static timeseries that has little to
-        # no variation is the values, which results in features taking up to
-        # almost 600 seconds to calculate on a timeseries of length 10075
-        # (168h - 1 datapoint per 60s)
-        # In terms of inline feature calculatation, always exclude
-        # high_comp_cost features.
-        # df_features = extract_features(df, column_id='metric', column_sort='timestamp', column_kind=None, column_value=None)
-        # @modified 20210101 - Task #3928: Update Skyline to use new tsfresh feature extraction method
-        # tsf_settings = ReasonableFeatureExtractionSettings()
-        # >>> from tsfresh.feature_extraction import extract_features, EfficientFCParameters
-        # >>> extract_features(df, default_fc_parameters=EfficientFCParameters())
-
-        # Disable tqdm progress bar
-        # @modified 20210101 - Task #3928: Update Skyline to use new tsfresh feature extraction method
-        # tsf_settings.disable_progressbar = True
-        df_features = extract_features(
-            # @modified 20210101 - Task #3928: Update Skyline to use new tsfresh feature extraction method
-            # df, column_id='metric', column_sort='timestamp', column_kind=None,
-            # column_value=None, feature_extraction_settings=tsf_settings)
-            df, default_fc_parameters=EfficientFCParameters(),
-            column_id='metric', column_sort='timestamp', column_kind=None,
-            column_value=None, disable_progressbar=True)
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        current_logger.info('%s :: features extracted from %s data' % (
-            log_context, ts_csv))
+        # @modified 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+        # fc_parameters=EfficientFCParameters())
+        df_t, feature_extraction_time = extract_tsfresh_features(
+            current_skyline_app, converted, use_base_name,
+            fc_parameters=fc_parameters)
+        current_logger.info('%s :: features extracted and transposed from %s data points' % (
+            log_context, str(len(converted))))
     except:
         trace = traceback.format_exc()
         current_logger.debug(trace)
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
         fail_msg = 'error: %s :: extracting features with tsfresh from - %s' % (log_context, ts_csv)
         current_logger.error('%s' % fail_msg)
-        end_feature_extraction = timer()
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        current_logger.info(
-            '%s :: feature extraction failed in %.6f seconds' % (
-                log_context, (end_feature_extraction - start_feature_extraction)))
-        if os.path.isfile(ts_csv):
-            os.remove(ts_csv)
-            # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-            # Added log_context to report the context
-            current_logger.info('%s :: removed %s' % (log_context, ts_csv))
         end = timer()
         return 'error', False, fp_created, fp_id, fail_msg, trace, f_calc
 
-    end_feature_extraction = timer()
-    feature_extraction_time = end_feature_extraction - start_feature_extraction
+    del converted
+
     # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
     # Added log_context to report the context
     current_logger.info(
         '%s :: feature extraction took %.6f seconds' % (log_context, feature_extraction_time))
 
-    del df
-
     # write to disk
     fname_out = fname_in + '.features.csv'
-    # df_features.to_csv(fname_out)
-
-    # Transpose
-    df_t = False
-    try:
-        df_t = df_features.transpose()
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        current_logger.info('%s :: features transposed' % log_context)
-    except:
-        trace = traceback.format_exc()
-        current_logger.debug(trace)
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        fail_msg = 'error :: %s :: transposing tsfresh features from - %s' % (log_context, ts_csv)
-        current_logger.error('%s' % fail_msg)
-        if os.path.isfile(ts_csv):
-            os.remove(ts_csv)
-            # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-            # Added log_context to report the context
-            current_logger.info('%s :: removed %s' % (log_context, ts_csv))
-        end = timer()
-        return 'error', False, fp_created, fp_id, fail_msg, trace, f_calc
-
-    del df_features
 
     # Create transposed features csv
     t_fname_out = fname_in + '.features.transposed.csv'
-    try:
-        df_t.to_csv(t_fname_out)
-        # @added 20260426 - Task #5713: Test CentOS Stream 10
-        #                   Task #5710: utcfromtimestamp - deprecated datetime and pandas
-        # pandas 3.0.0, set permissions
-        os.chmod(t_fname_out, mode=0o644)
-    except:
-        trace = traceback.format_exc()
-        current_logger.debug(trace)
-        # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
-        # Added log_context to report the context
-        fail_msg = 'error :: %s :: saving transposed tsfresh features from - %s' % (log_context, ts_csv)
-        current_logger.error('%s' % fail_msg)
-        if os.path.isfile(ts_csv):
-            os.remove(ts_csv)
+    # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+    # Only write the transposed features csv when it is required
+    if write_features_file:
+        try:
+            df_t.to_csv(t_fname_out)
+            # @added 20260426 - Task #5713: Test CentOS Stream 10
+            #                   Task #5710: utcfromtimestamp - deprecated datetime and pandas
+            # pandas 3.0.0, set permissions
+            os.chmod(t_fname_out, mode=0o644)
+        except:
+            trace = traceback.format_exc()
+            current_logger.debug(trace)
             # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
             # Added log_context to report the context
-            current_logger.info('%s :: removed %s' % (log_context, ts_csv))
-        end = timer()
-        return 'error', False, fp_created, fp_id, fail_msg, trace, f_calc
+            fail_msg = 'error :: %s :: saving transposed tsfresh features from - %s' % (log_context, ts_csv)
+            current_logger.error('%s' % fail_msg)
+            end = timer()
+            return 'error', False, fp_created, fp_id, fail_msg, trace, f_calc
 
-    del df_t
+    # @added 20261030 - Feature #5772: ionosphere - in memory feature extraction
+    # Pass the calculated features back to the caller in the same form as
+    # get_calculated_features returns them from the transposed features csv
+    if isinstance(calculated_features, list):
+        try:
+            calculated_features.extend(get_calculated_features_from_df(df_t))
+        except:
+            trace = traceback.format_exc()
+            current_logger.error(trace)
+            current_logger.error('error :: %s :: failed to determine calculated features from the transposed DataFrame' % log_context)
 
     # Calculate the count and sum of the features values
-    df_sum = False
+    # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+    # Calculated from the transposed DataFrame
+    # df_sum = pd.read_csv(
+    #     t_fname_out, delimiter=',', header=0,
+    #     names=['feature_name', 'value'])
+    df_sum = None
     try:
-        df_sum = pd.read_csv(
-            t_fname_out, delimiter=',', header=0,
-            names=['feature_name', 'value'])
-        df_sum.columns = ['feature_name', 'value']
-        df_sum['feature_name'] = df_sum['feature_name'].astype(str)
-        df_sum['value'] = df_sum['value'].astype(float)
+        df_sum = pd.DataFrame({
+            'feature_name': df_t.index.astype(str),
+            'value': df_t.iloc[:, 0].to_numpy(dtype=np.float64)})
     except:
         trace = traceback.format_exc()
         current_logger.error(trace)
         # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
         # Added log_context to report the context
         current_logger.error('error :: %s :: failed to create Dataframe to sum' % log_context)
+
+    del df_t
+
     try:
         features_count = len(df_sum['value'])
     except:
@@ -792,8 +731,10 @@ def calculate_features_profile(current_skyline_app, timestamp, metric, context,
     # @modified 20190413 - Bug #2934: Ionosphere - no mirage.redis.24h.json file
     # Added log_context to report the context
     current_logger.info('%s :: features saved to %s' % (log_context, fname_out))
-    current_logger.info('%s :: transposed features saved to %s' % (
-        log_context, t_fname_out))
+    # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+    if write_features_file:
+        current_logger.info('%s :: transposed features saved to %s' % (
+            log_context, t_fname_out))
     total_calc_time = '%.6f' % (end - start)
     calc_time = '%.6f' % (feature_extraction_time)
     current_logger.info('%s :: total feature profile completed in %s seconds' % (
@@ -804,9 +745,13 @@ def calculate_features_profile(current_skyline_app, timestamp, metric, context,
         # @modified 20170108 - Feature #1842: Ionosphere - Graphite now graphs
         # Added the ts_full_duration here as it was not added here on the 20170104
         # when it was added the webapp and ionosphere
-        data = '[%s, \'%s\', %s, %s, %s, %s]' % (
+        # @modified 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+        # Added the tsfresh_feature_set so that the features profile can be
+        # stamped with the feature set it was created with
+        data = '[%s, \'%s\', %s, %s, %s, %s, \'%s\']' % (
             str(int(time.time())), str(tsfresh_version), str(calc_time),
-            str(features_count), str(features_sum), str(ts_full_duration))
+            str(features_count), str(features_sum), str(ts_full_duration),
+            str(tsfresh_feature_set))
         write_data_to_file(current_skyline_app, features_profile_details_file, 'w', data)
     except:
         trace = traceback.format_exc()
@@ -74,6 +74,10 @@ if True:
     from functions.skyline.callback import callback
     # @added 20241113 - Task #5547: flux - vortex - return results if exist
     from functions.mirage.get_vortex_metric_data_from_archive import get_vortex_metric_data_from_archive
+    # @added 20261108 - Feature #5781: flux - listen accounting
+    from functions.flux.listen_accounting import ListenAccounting
+    # @added 20261109 - Feature #5782: flux - listen cache
+    from functions.flux.listen_cache import ListenCache
 
 # @added 20200818 - Feature #3694: flux - POST multiple metrics
 # Added validation of FLUX_API_KEYS
@@ -116,6 +120,26 @@ try:
 except:
     FLUX_PERSIST_QUEUE = False
 
+# @added 20261108 - Feature #5781: flux - listen accounting
+try:
+    FLUX_LISTEN_BUFFERED_ACCOUNTING = settings.FLUX_LISTEN_BUFFERED_ACCOUNTING
+except:
+    FLUX_LISTEN_BUFFERED_ACCOUNTING = False
+try:
+    FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL = settings.FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL
+except:
+    FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL = 1
+
+# @added 20261109 - Feature #5782: flux - listen cache
+try:
+    FLUX_LISTEN_CACHE = settings.FLUX_LISTEN_CACHE
+except:
+    FLUX_LISTEN_CACHE = False
+try:
+    FLUX_LISTEN_CACHE_REFRESH_INTERVAL = settings.FLUX_LISTEN_CACHE_REFRESH_INTERVAL
+except:
+    FLUX_LISTEN_CACHE_REFRESH_INTERVAL = 5
+
 # @added 20210406 - Feature #4004: flux - aggregator.py and FLUX_AGGREGATE_NAMESPACES
 try:
     # @modified 20220722 - Task #4624: Change all dict copy to deepcopy
@@ -371,11 +395,42 @@ for namespace in list(namespace_quotas_dict.keys()):
 
 # @added 20220202 - Feature #4412: flux - quota - thunder alert
 skyline_app = 'flux'
-if namespaces_with_quotas:
+# @modified 20261109 - Feature #5782: flux - listen cache
+# With the listen cache namespace quotas that are added after start up are
+# enforced, so thunder_send_event must be available
+# if namespaces_with_quotas:
+if namespaces_with_quotas or FLUX_LISTEN_CACHE:
     from functions.thunder.send_event import thunder_send_event
 else:
     thunder_send_event = None
 
+# @added 20261108 - Feature #5781: flux - listen accounting
+# The flux.listen.added_to_queue, namespace quota and flux.listen.discarded.*
+# keys that are updated for every data point are accumulated in the process
+# and written to Redis in one pipeline per FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL
+# via accounting_conn.  The FLUX_PERSIST_QUEUE flux.queue set is not buffered,
+# the data must be in the set before it is queued so that it is not left in
+# the set after the worker has processed it or lost if the process dies.
+if FLUX_LISTEN_BUFFERED_ACCOUNTING:
+    accounting_conn = ListenAccounting(skyline_app, FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL)
+else:
+    accounting_conn = redis_conn
+
+# @added 20261109 - Feature #5782: flux - listen cache
+# The API keys, key namespaces and namespace quota data are resolved from a
+# versioned in-process cache that is refreshed by a background thread in each
+# worker, rather than from Redis in the request path
+listen_cache = None
+if FLUX_LISTEN_CACHE:
+    try:
+        listen_cache_self_api_key = settings.FLUX_SELF_API_KEY
+    except:
+        listen_cache_self_api_key = None
+    listen_cache = ListenCache(
+        skyline_app, flux_api_keys=FLUX_API_KEYS,
+        flux_self_api_key=listen_cache_self_api_key,
+        refresh_interval=FLUX_LISTEN_CACHE_REFRESH_INTERVAL)
+
 # @added 20220128 - Feature #4404: flux - external_settings - aggregation
 #                   Feature #4324: flux - reload external_settings
 #                   Feature #4376: webapp - update_external_settings
@@ -479,6 +534,20 @@ def validate_key(caller, apikey):
 
     keyValid = False
 
+    # @added 20261109 - Feature #5782: flux - listen cache
+    # Resolve a known key from the listen_cache, an unknown key is checked
+    # against the updated keys as before
+    if listen_cache:
+        try:
+            keyValid, metric_namespace_prefix = listen_cache.validate_key(apikey)
+            if keyValid and apikey.isalnum() and len(apikey) == 32:
+                return True, metric_namespace_prefix
+        except Exception as err:
+            logger.error('error :: %s :: listen_cache.validate_key failed - %s' % (
+                caller, err))
+        keyValid = False
+        metric_namespace_prefix = None
+
     try:
         isAlNum = False
         isAlNum = apikey.isalnum()
@@ -900,7 +969,9 @@ class MetricData(object):
                     # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                     unique_value = '%s' % str(time())
                     try:
-                        redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                        # @modified 20261108 - Feature #5781: flux - listen accounting
+                        # redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                        accounting_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
                         if FLUX_VERBOSE_LOGGING:
                             logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_parameters' % str(unique_value))
                     except Exception as err:
@@ -922,7 +993,9 @@ class MetricData(object):
                 # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                 unique_value = '%s' % str(time())
                 try:
-                    redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                    accounting_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
                     if FLUX_VERBOSE_LOGGING:
                         logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_parameters' % str(unique_value))
                 except Exception as e:
@@ -1017,7 +1090,9 @@ class MetricData(object):
                         # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                         unique_value = '%s' % str(time())
                         try:
-                            redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                            # @modified 20261108 - Feature #5781: flux - listen accounting
+                            # redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                            accounting_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
                             if FLUX_VERBOSE_LOGGING:
                                 logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_key' % str(unique_value))
                         except Exception as e:
@@ -1055,7 +1130,9 @@ class MetricData(object):
                 # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                 unique_value = '%s' % str(time())
                 try:
-                    redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                    accounting_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
                     if FLUX_VERBOSE_LOGGING:
                         logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_key' % str(unique_value))
                 except Exception as e:
@@ -1098,7 +1175,9 @@ class MetricData(object):
                             metric = str(time())
                         try:
                             unique_value = '%s.%s' % (str(metric), str(request_param_value))
-                            redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                            # @modified 20261108 - Feature #5781: flux - listen accounting
+                            # redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                            accounting_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
                             if FLUX_VERBOSE_LOGGING:
                                 logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_timestamp' % str(unique_value))
                         except Exception as e:
@@ -1128,7 +1207,9 @@ class MetricData(object):
                     metric = str(time())
                 try:
                     unique_value = '%s.%s' % (str(metric), str(request_param_value))
-                    redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                    accounting_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
                     if FLUX_VERBOSE_LOGGING:
                         logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_timestamp' % str(unique_value))
                 except Exception as e:
@@ -1161,7 +1242,9 @@ class MetricData(object):
                     if not metric:
                         metric = str(time())
                     try:
-                        redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                        # @modified 20261108 - Feature #5781: flux - listen accounting
+                        # redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                        accounting_conn.sadd('flux.listen.discarded.metric_name', str(metric))
                         if FLUX_VERBOSE_LOGGING:
                             logger.info('listen :: added %s to Redis set flux.listen.discarded.metric_name' % str(metric))
                     except Exception as e:
@@ -1193,7 +1276,9 @@ class MetricData(object):
                         metric = str(time())
                     unique_value = '%s.%s' % (str(metric), str(request_param_value))
                     try:
-                        redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                        # @modified 20261108 - Feature #5781: flux - listen accounting
+                        # redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                        accounting_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
                         if FLUX_VERBOSE_LOGGING:
                             logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_value' % str(unique_value))
                     except Exception as e:
@@ -1218,7 +1303,9 @@ class MetricData(object):
             # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
             unique_value = '%s' % str(time())
             try:
-                redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                # @modified 20261108 - Feature #5781: flux - listen accounting
+                # redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                accounting_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
                 if FLUX_VERBOSE_LOGGING:
                     logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_key' % str(unique_value))
             except Exception as e:
@@ -1239,7 +1326,9 @@ class MetricData(object):
             # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
             metric = str(time())
             try:
-                redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                # @modified 20261108 - Feature #5781: flux - listen accounting
+                # redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                accounting_conn.sadd('flux.listen.discarded.metric_name', str(metric))
                 if FLUX_VERBOSE_LOGGING:
                     logger.info('listen :: added %s to Redis set flux.listen.discarded.metric_name' % str(metric))
             except Exception as e:
@@ -1262,7 +1351,9 @@ class MetricData(object):
                 metric = str(time())
             unique_value = '%s.%s' % (str(metric), str(time()))
             try:
-                redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                # @modified 20261108 - Feature #5781: flux - listen accounting
+                # redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                accounting_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
                 if FLUX_VERBOSE_LOGGING:
                     logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_value' % str(unique_value))
             except Exception as e:
@@ -1313,7 +1404,13 @@ class MetricData(object):
                 check_namespace_quota = str(metric_namespace_prefix)
             else:
                 check_namespace_quota = metric.split('.', maxsplit=1)[0]
-            if check_namespace_quota in namespaces_with_quotas:
+            # @modified 20261109 - Feature #5782: flux - listen cache
+            # Use the quotas of the listen_cache
+            # if check_namespace_quota in namespaces_with_quotas:
+            #     namespace_quota = get_namespace_quota(check_namespace_quota)
+            if listen_cache:
+                namespace_quota = listen_cache.get_namespace_quota(check_namespace_quota)
+            elif check_namespace_quota in namespaces_with_quotas:
                 namespace_quota = get_namespace_quota(check_namespace_quota)
             if namespace_quota:
                 namespace_quota_key_reference_timestamp = (int(time()) // 60 * 60)
@@ -1321,12 +1418,22 @@ class MetricData(object):
                     check_namespace_quota, str(namespace_quota_key_reference_timestamp))
                 current_namespace_metric_count = 0
                 try:
-                    current_namespace_metric_count = redis_conn_decoded.scard(namespace_quota_redis_key)
+                    # @modified 20261109 - Feature #5782: flux - listen cache
+                    # current_namespace_metric_count = redis_conn_decoded.scard(namespace_quota_redis_key)
+                    if listen_cache:
+                        current_namespace_metric_count = listen_cache.get_namespace_metric_count(check_namespace_quota)
+                    else:
+                        current_namespace_metric_count = redis_conn_decoded.scard(namespace_quota_redis_key)
                 except:
                     current_namespace_metric_count = 0
                 quota_namespace_metrics_redis_key = 'flux.quota.namespace_metrics.%s' % check_namespace_quota
                 try:
-                    namespace_metrics = list(redis_conn_decoded.smembers(quota_namespace_metrics_redis_key))
+                    # @modified 20261109 - Feature #5782: flux - listen cache
+                    # namespace_metrics = list(redis_conn_decoded.smembers(quota_namespace_metrics_redis_key))
+                    if listen_cache:
+                        namespace_metrics = list(listen_cache.get_namespace_metrics(check_namespace_quota))
+                    else:
+                        namespace_metrics = list(redis_conn_decoded.smembers(quota_namespace_metrics_redis_key))
                 except:
                     namespace_metrics = []
                     # @added 20220426 - Feature #4536: Handle Redis failure
@@ -1390,7 +1497,9 @@ class MetricData(object):
             try:
                 if metric not in namespace_metrics:
                     try:
-                        redis_conn.sadd(quota_namespace_metrics_redis_key, metric)
+                        # @modified 20261108 - Feature #5781: flux - listen accounting
+                        # redis_conn.sadd(quota_namespace_metrics_redis_key, metric)
+                        accounting_conn.sadd(quota_namespace_metrics_redis_key, metric)
                     except Exception as err:
                         logger.error('error :: listen :: failed to add %s to Redis set %s, %s' % (
                             metric, quota_namespace_metrics_redis_key, err))
@@ -1398,8 +1507,12 @@ class MetricData(object):
                 logger.error(traceback.format_exc())
                 logger.error('error :: listen :: error adding metric to quota_namespace_metrics_redis_key, %s' % err)
             try:
-                redis_conn.sadd(namespace_quota_redis_key, metric)
-                redis_conn.expire(namespace_quota_redis_key, 60)
+                # @modified 20261108 - Feature #5781: flux - listen accounting
+                # redis_conn.sadd(namespace_quota_redis_key, metric)
+                accounting_conn.sadd(namespace_quota_redis_key, metric)
+                # @modified 20261108 - Feature #5781: flux - listen accounting
+                # redis_conn.expire(namespace_quota_redis_key, 60)
+                accounting_conn.expire(namespace_quota_redis_key, 60)
             except Exception as err:
                 logger.error('error :: listen :: failed to add %s to Redis set %s, %s' % (
                     metric, namespace_quota_redis_key, err))
@@ -1545,7 +1658,9 @@ class MetricData(object):
             return
         # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
         try:
-            redis_conn.incr('flux.listen.added_to_queue')
+            # @modified 20261108 - Feature #5781: flux - listen accounting
+            # redis_conn.incr('flux.listen.added_to_queue')
+            accounting_conn.incr('flux.listen.added_to_queue')
         except Exception as e:
             # logger.error('error :: listen :: failed to increment to Redis key flux.listen.added_to_queue - %s' % e)
             # @added 20220428 - Feature #4536: Handle Redis failure
@@ -1712,7 +1827,9 @@ class MetricDataPost(object):
                 # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                 unique_value = '%s' % str(time())
                 try:
-                    redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                    accounting_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
                     if FLUX_VERBOSE_LOGGING:
                         logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_parameters no POST data' % str(unique_value))
                 except Exception as err:
@@ -1962,7 +2079,9 @@ class MetricDataPost(object):
                     # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                     unique_value = '%s' % str(time())
                     try:
-                        redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                        # @modified 20261108 - Feature #5781: flux - listen accounting
+                        # redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                        accounting_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
                         if FLUX_VERBOSE_LOGGING:
                             logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_key' % str(unique_value))
                     except Exception as e:
@@ -2009,7 +2128,9 @@ class MetricDataPost(object):
                 # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                 unique_value = '%s' % str(time())
                 try:
-                    redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
+                    accounting_conn.sadd('flux.listen.discarded.invalid_key', str(unique_value))
                     if FLUX_VERBOSE_LOGGING:
                         logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_key' % str(unique_value))
                 except Exception as e:
@@ -2090,7 +2211,9 @@ class MetricDataPost(object):
                 # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                 unique_value = '%s' % str(time())
                 try:
-                    redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
+                    accounting_conn.sadd('flux.listen.discarded.invalid_parameters', str(unique_value))
                     if FLUX_VERBOSE_LOGGING:
                         logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_parameters' % str(unique_value))
                 except Exception as err:
@@ -2423,7 +2546,13 @@ class MetricDataPost(object):
                 else:
                     if len(received_namespaces) == 1:
                         check_namespace_quota = received_namespaces[0]
-                if check_namespace_quota in namespaces_with_quotas:
+                # @modified 20261109 - Feature #5782: flux - listen cache
+                # Use the quotas of the listen_cache
+                # if check_namespace_quota in namespaces_with_quotas:
+                #     namespace_quota = get_namespace_quota(check_namespace_quota)
+                if listen_cache:
+                    namespace_quota = listen_cache.get_namespace_quota(check_namespace_quota)
+                elif check_namespace_quota in namespaces_with_quotas:
                     namespace_quota = get_namespace_quota(check_namespace_quota)
                 # @modified 20260506 - Feature #4284: flux - telegraf
                 # Wrapped in if FLUX_VERBOSE_LOGGING
@@ -2454,12 +2583,22 @@ class MetricDataPost(object):
                             str(check_namespace_quota), str(namespace_quota)))
                     current_namespace_metric_count = 0
                     try:
-                        current_namespace_metric_count = redis_conn_decoded.scard(namespace_quota_redis_key)
+                        # @modified 20261109 - Feature #5782: flux - listen cache
+                        # current_namespace_metric_count = redis_conn_decoded.scard(namespace_quota_redis_key)
+                        if listen_cache:
+                            current_namespace_metric_count = listen_cache.get_namespace_metric_count(check_namespace_quota)
+                        else:
+                            current_namespace_metric_count = redis_conn_decoded.scard(namespace_quota_redis_key)
                     except:
                         current_namespace_metric_count = 0
                     quota_namespace_metrics_redis_key = 'flux.quota.namespace_metrics.%s' % check_namespace_quota
                     try:
-                        namespace_metrics = list(redis_conn_decoded.smembers(quota_namespace_metrics_redis_key))
+                        # @modified 20261109 - Feature #5782: flux - listen cache
+                        # namespace_metrics = list(redis_conn_decoded.smembers(quota_namespace_metrics_redis_key))
+                        if listen_cache:
+                            namespace_metrics = list(listen_cache.get_namespace_metrics(check_namespace_quota))
+                        else:
+                            namespace_metrics = list(redis_conn_decoded.smembers(quota_namespace_metrics_redis_key))
                     except:
                         namespace_metrics = []
                         # @added 20220426 - Feature #4536: Handle Redis failure
@@ -2914,7 +3053,9 @@ class MetricDataPost(object):
                             if not metric:
                                 metric = str(time())
                             try:
-                                redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                                # @modified 20261108 - Feature #5781: flux - listen accounting
+                                # redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                                accounting_conn.sadd('flux.listen.discarded.metric_name', str(metric))
                                 if FLUX_VERBOSE_LOGGING:
                                     logger.info('listen :: added %s to Redis set flux.listen.discarded.metric_name' % str(metric))
                             except Exception as err:
@@ -2947,7 +3088,9 @@ class MetricDataPost(object):
                         # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                         metric = 'none.%s' % str(time())
                         try:
-                            redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                            # @modified 20261108 - Feature #5781: flux - listen accounting
+                            # redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                            accounting_conn.sadd('flux.listen.discarded.metric_name', str(metric))
                             if FLUX_VERBOSE_LOGGING:
                                 logger.info('listen :: added %s to Redis set flux.listen.discarded.metric_name' % str(metric))
                         except Exception as e:
@@ -3049,7 +3192,9 @@ class MetricDataPost(object):
                                     metric = str(time())
                                 try:
                                     unique_value = '%s.%s' % (str(metric), str(timestamp_present))
-                                    redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                                    # redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                                    accounting_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
                                     if FLUX_VERBOSE_LOGGING:
                                         logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_timestamp' % str(unique_value))
                                 except Exception as e:
@@ -3075,7 +3220,9 @@ class MetricDataPost(object):
                                 metric = str(time())
                             try:
                                 unique_value = '%s.%s' % (str(metric), str(timestamp_present))
-                                redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                                # @modified 20261108 - Feature #5781: flux - listen accounting
+                                # redis_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
+                                accounting_conn.sadd('flux.listen.discarded.invalid_timestamp', str(unique_value))
                                 if FLUX_VERBOSE_LOGGING:
                                     logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_timestamp' % str(unique_value))
                             except Exception as e:
@@ -3131,7 +3278,9 @@ class MetricDataPost(object):
                                 metric = str(time())
                             unique_value = '%s.%s.%s' % (str(metric), str(timestamp_present), str(value_present))
                             try:
-                                redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                                # @modified 20261108 - Feature #5781: flux - listen accounting
+                                # redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                                accounting_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
                                 if FLUX_VERBOSE_LOGGING:
                                     logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_value' % str(unique_value))
                             except Exception as e:
@@ -3158,7 +3307,9 @@ class MetricDataPost(object):
                         # @added 20210511 - Feature #4060: skyline.flux.worker.discarded metrics
                         metric = 'none.%s' % str(time())
                         try:
-                            redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                            # @modified 20261108 - Feature #5781: flux - listen accounting
+                            # redis_conn.sadd('flux.listen.discarded.metric_name', str(metric))
+                            accounting_conn.sadd('flux.listen.discarded.metric_name', str(metric))
                             if FLUX_VERBOSE_LOGGING:
                                 logger.info('listen :: added %s to Redis set flux.listen.discarded.metric_name' % str(metric))
                         except Exception as e:
@@ -3187,7 +3338,9 @@ class MetricDataPost(object):
                             metric = str(time())
                         unique_value = '%s.%s.%s' % (str(metric), str(timestamp_present), str(value_present))
                         try:
-                            redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                            # @modified 20261108 - Feature #5781: flux - listen accounting
+                            # redis_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
+                            accounting_conn.sadd('flux.listen.discarded.invalid_value', str(unique_value))
                             if FLUX_VERBOSE_LOGGING:
                                 logger.info('listen :: added %s to Redis set flux.listen.discarded.invalid_value' % str(unique_value))
                         except Exception as e:
@@ -3246,7 +3399,9 @@ class MetricDataPost(object):
                                     # Only add to quota_namespace_metrics_redis_key once
                                     if not update_namespace_quota_set_once:
                                         try:
-                                            redis_conn.sadd(quota_namespace_metrics_redis_key, metric)
+                                            # @modified 20261108 - Feature #5781: flux - listen accounting
+                                            # redis_conn.sadd(quota_namespace_metrics_redis_key, metric)
+                                            accounting_conn.sadd(quota_namespace_metrics_redis_key, metric)
                                         except Exception as err:
                                             logger.error('error :: listen :: failed to add %s to Redis set %s, %s' % (
                                                 metric, quota_namespace_metrics_redis_key, err))
@@ -3261,8 +3416,12 @@ class MetricDataPost(object):
                             # add_to_namespace_quota_set.append(metric)
                             if not update_namespace_quota_set_once:
                                 try:
-                                    redis_conn.sadd(namespace_quota_redis_key, metric)
-                                    redis_conn.expire(namespace_quota_redis_key, 60)
+                                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                                    # redis_conn.sadd(namespace_quota_redis_key, metric)
+                                    accounting_conn.sadd(namespace_quota_redis_key, metric)
+                                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                                    # redis_conn.expire(namespace_quota_redis_key, 60)
+                                    accounting_conn.expire(namespace_quota_redis_key, 60)
                                 except Exception as err:
                                     logger.error('error :: listen :: failed to add %s to Redis set %s, %s' % (
                                         metric, namespace_quota_redis_key, err))
@@ -3351,7 +3510,9 @@ class MetricDataPost(object):
                         # Use a single incrby call instead of a redis conn and incr per metric
                         if not use_incrby:
                             try:
-                                redis_conn.incr('flux.listen.added_to_queue')
+                                # @modified 20261108 - Feature #5781: flux - listen accounting
+                                # redis_conn.incr('flux.listen.added_to_queue')
+                                accounting_conn.incr('flux.listen.added_to_queue')
                             except Exception as e:
                                 # logger.error('error :: listen :: failed to increment to Redis key flux.listen.added_to_queue - %s' % e)
                                 # @added 20220428 - Feature #4536: Handle Redis failure
@@ -3375,7 +3536,9 @@ class MetricDataPost(object):
                         start_namespace_quota_set_update = timer()
                     add_to_namespace_quota_set_set = set(add_to_namespace_quota_set)
                     try:
-                        redis_conn.sadd(quota_namespace_metrics_redis_key, *set(add_to_namespace_quota_set))
+                        # @modified 20261108 - Feature #5781: flux - listen accounting
+                        # redis_conn.sadd(quota_namespace_metrics_redis_key, *set(add_to_namespace_quota_set))
+                        accounting_conn.sadd(quota_namespace_metrics_redis_key, *set(add_to_namespace_quota_set))
                         # redis_conn.expire(quota_namespace_metrics_redis_key, 80)
                         logger.info('listen :: added %s metrics to %s' % (
                             str(len(set(add_to_namespace_quota_set))),
@@ -3451,7 +3614,9 @@ class MetricDataPost(object):
             # Use a single incrby call instead of a redis conn and incr per metric
             if increment_by:
                 try:
-                    redis_conn.incrby('flux.listen.added_to_queue', increment_by)
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.incrby('flux.listen.added_to_queue', increment_by)
+                    accounting_conn.incrby('flux.listen.added_to_queue', increment_by)
                 except Exception as err:
                     if settings.MEMCACHE_ENABLED:
                         try:
@@ -3691,7 +3856,9 @@ class MetricDataPost(object):
                     # @added 20220303 - Feature #4400: flux - quota
                     if metrics_added_to_aggregation:
                         try:
-                            redis_conn.incrby('flux.listen.added_to_aggregation_queue', len(metrics_added_to_aggregation))
+                            # @modified 20261108 - Feature #5781: flux - listen accounting
+                            # redis_conn.incrby('flux.listen.added_to_aggregation_queue', len(metrics_added_to_aggregation))
+                            accounting_conn.incrby('flux.listen.added_to_aggregation_queue', len(metrics_added_to_aggregation))
                         except Exception as err:
                             logger.error('error :: listen :: failed to incrby to Redis key flux.listen.added_to_aggregation_queue - %s' % err)
 
@@ -3956,7 +4123,9 @@ class MetricDataPost(object):
             # @added 20220303 - Feature #4400: flux - quota
             if metrics_added_to_aggregation:
                 try:
-                    redis_conn.incrby('flux.listen.added_to_aggregation_queue', len(metrics_added_to_aggregation))
+                    # @modified 20261108 - Feature #5781: flux - listen accounting
+                    # redis_conn.incrby('flux.listen.added_to_aggregation_queue', len(metrics_added_to_aggregation))
+                    accounting_conn.incrby('flux.listen.added_to_aggregation_queue', len(metrics_added_to_aggregation))
                 except Exception as err:
                     logger.error('error :: listen :: failed to incrby to Redis key flux.listen.added_to_aggregation_queue - %s' % err)
 
@@ -14,6 +14,8 @@ import gzip
 import resource
 # @added 20220722 - Task #4624: Change all dict copy to deepcopy
 import copy
+# @added 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+import math
 
 from logger import set_up_logging
 
@@ -45,6 +47,8 @@ if True:
 
     from functions.flux.prometheus_horizon_request import prometheus_horizon_request
     from matched_or_regexed_in_list import matched_or_regexed_in_list
+    # @added 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+    from functions.prometheus.remote_write_metrics import get_remote_write_metrics
 
     # @added 20240319 - Feature #5312: thunder - 207 alert
     # This was declared below in if namespaces_with_quotas block but declaring
@@ -69,6 +73,12 @@ try:
 except:
     FLUX_PROMETHEUS_MAX_AGE = 300
 
+# @added 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+try:
+    FLUX_PROMETHEUS_PROTOBUF_FAST_PATH = settings.FLUX_PROMETHEUS_PROTOBUF_FAST_PATH
+except:
+    FLUX_PROMETHEUS_PROTOBUF_FAST_PATH = True
+
 # Consolidate flux logging
 logger = set_up_logging(None)
 
@@ -635,6 +645,8 @@ class PrometheusMetricDataPost(object):
         # Decompress and decode Prometheus WriteRequest data
         prometheus_data = {}
         prometheus_metadata = {}
+        # @added 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+        protobuf_timeseries = False
         if content_encoding == 'snappy':
             try:
                 key = req.get_header('key')
@@ -675,7 +687,15 @@ class PrometheusMetricDataPost(object):
                 prom_dataP_WriteRequest = remote_pb2.WriteRequest()
                 prom_dataP_WriteRequest.ParseFromString(prom_data)
                 debug_key = 'flux.prom_dataP_WriteRequest.debug.%s' % str(current_aligned_ts)
-                prometheus_data = pb_json_format.MessageToDict(prom_dataP_WriteRequest)
+                # @modified 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+                # Do not convert the entire WriteRequest into a dict with
+                # MessageToDict, iterate the protobuf timeseries directly
+                # prometheus_data = pb_json_format.MessageToDict(prom_dataP_WriteRequest)
+                if FLUX_PROMETHEUS_PROTOBUF_FAST_PATH and len(prom_dataP_WriteRequest.timeseries) > 0:
+                    prometheus_data = {'timeseries': prom_dataP_WriteRequest.timeseries}
+                    protobuf_timeseries = True
+                else:
+                    prometheus_data = pb_json_format.MessageToDict(prom_dataP_WriteRequest)
                 request_type = 'remote_write'
                 if LOCAL_DEBUG:
                     logger.debug('debug :: prometheus :: %s :: request_type: %s' % (str(now), str(request_type)))
@@ -687,9 +707,17 @@ class PrometheusMetricDataPost(object):
 
             prometheus_metadata = {}
             try:
-                prom_dataP_Metadata = remote_pb2.WriteRequest()
-                prom_dataP_Metadata.ParseFromString(prom_data)
-                if str(prom_dataP_Metadata).startswith('metadata'):
+                # @modified 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+                # A WriteRequest with timeseries is not a metadata request, so
+                # do not parse it again and render it as text to determine that
+                # prom_dataP_Metadata = remote_pb2.WriteRequest()
+                # prom_dataP_Metadata.ParseFromString(prom_data)
+                # if str(prom_dataP_Metadata).startswith('metadata'):
+                prom_dataP_Metadata = None
+                if not protobuf_timeseries:
+                    prom_dataP_Metadata = remote_pb2.WriteRequest()
+                    prom_dataP_Metadata.ParseFromString(prom_data)
+                if prom_dataP_Metadata is not None and str(prom_dataP_Metadata).startswith('metadata'):
                     if LOCAL_DEBUG:
                         logger.debug('debug :: prometheus :: %s :: metadata requests' % (str(now)))
                     prometheus_metadata = pb_json_format.MessageToDict(prom_dataP_Metadata)
@@ -1060,7 +1088,68 @@ class PrometheusMetricDataPost(object):
             except Exception as err:
                 logger.error('error :: prometheus :: could not add prom_data to %s - %s' % (metadata_key, str(err)))
 
-        if prometheus_data and timeseries_data:
+        # @added 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+        # Iterate the protobuf timeseries directly, the metric name translated
+        # from each label set is cached by get_remote_write_metrics
+        if prometheus_data and timeseries_data and protobuf_timeseries:
+            try:
+                remote_write_metrics, remote_write_labels_dropped, remote_write_labels_checked_to_drop, remote_write_errors = get_remote_write_metrics(
+                    'flux', prom_dataP_WriteRequest, tenant_id, server_id, dropLabels)
+                labels_dropped += remote_write_labels_dropped
+                labels_checked_to_drop += remote_write_labels_checked_to_drop
+                if remote_write_errors:
+                    logger.error('error :: prometheus :: %s :: could not translate %s WriteRequest timeseries' % (
+                        str(now), str(remote_write_errors)))
+                for metric, metric_namespace, samples in remote_write_metrics:
+                    if len(metric) > 4096:
+                        dropped_too_long.append(metric)
+                        continue
+
+                    if not test_only:
+                        metric_namespaces.append(metric_namespace)
+                        cardinality_metric_namespace = '%s.%s' % (str(tenant_id), metric_namespace)
+                        cardinality_metric_namespaces.append(cardinality_metric_namespace)
+                        try:
+                            metric_namespaces_dict[metric_namespace].append(metric)
+                            cardinality_metric_namespaces_dict[cardinality_metric_namespace].append(metric)
+                        except KeyError:
+                            metric_namespaces_dict[metric_namespace] = [metric]
+                            cardinality_metric_namespaces_dict[cardinality_metric_namespace] = [metric]
+
+                    for sample in samples:
+                        value = sample.value
+                        # @modified 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+                        # Skip NaN values
+                        # if value != value:
+                        if math.isnan(value):
+                            continue
+                        # MessageToDict does not include a 0 timestamp so these
+                        # are skipped, as they were
+                        timestamp = sample.timestamp
+                        if not timestamp:
+                            continue
+                        if timestamp < (current_ts - FLUX_PROMETHEUS_MAX_AGE):
+                            old_data_return_400 = True
+                            age = current_ts - timestamp
+                            logger.info('prometheus :: %s :: data too old, age: %s for tenant_id: %s, returning 400' % (
+                                str(now), str(age), str(tenant_id)))
+                            break
+                        metric_list_data = '%s %s %s %s %s' % (
+                            str(tenant_id), str(server_id), str(timestamp),
+                            str(value), metric)
+                        prometheus_metrics_list.append(metric_list_data)
+                        if test_only:
+                            test_only_metrics_submitted.append(metric)
+
+                logger.info('prometheus :: %s :: got %s metrics in %s request' % (
+                    str(now), str(len(prometheus_metrics_list)), request_type))
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: prometheus :: could not parse prometheus WriteRequest timeseries - %s' % str(err))
+
+        # @modified 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+        # if prometheus_data and timeseries_data:
+        if prometheus_data and timeseries_data and not protobuf_timeseries:
             if LOCAL_DEBUG:
                 logger.debug('debug :: prometheus :: %s :: prometheus_data and timeseries_data available' % (str(now)))
 
@@ -16,6 +16,8 @@ except ImportError:
     from queue import Empty  # Python 3
 from time import sleep, time
 from ast import literal_eval
+# @added 20261107 - Feature #5780: flux - worker batch mode
+from collections import deque
 
 # @added 20201019 - Feature #3790: flux - pickle to Graphite
 # bandit [B403:blacklist] Consider possible security implications associated
@@ -57,6 +59,9 @@ if load_settings:
     # @added 20231223 - Task #5188: Optimise redis renames
     #                   Task #5178: Build and test skyline v4.1.0
     from functions.redis.redis_rename_key import redis_rename_key
+    # @added 20261107 - Feature #5780: flux - worker batch mode
+    from functions.flux.worker_batch import (
+        get_metric_data_batch, prefetch_last_metric_data)
 
 # @added 20220428 - Feature #4536: Handle Redis failure
 if settings.MEMCACHE_ENABLED:
@@ -116,6 +121,16 @@ try:
 except:
     IDENTIFY_AIRGAPS = False
 
+# @added 20261107 - Feature #5780: flux - worker batch mode
+try:
+    FLUX_WORKER_BATCH_SIZE = int(settings.FLUX_WORKER_BATCH_SIZE)
+except:
+    FLUX_WORKER_BATCH_SIZE = 1
+try:
+    FLUX_CARBON_PERSISTENT_CONNECTION = settings.FLUX_CARBON_PERSISTENT_CONNECTION
+except:
+    FLUX_CARBON_PERSISTENT_CONNECTION = False
+
 parent_skyline_app = 'flux'
 
 # @added 20191010 - Feature #3250: Allow Skyline to send metrics to another Carbon host
@@ -203,6 +218,46 @@ class Worker(Process):
         Called when the process intializes.
         """
 
+        # @added 20261107 - Feature #5780: flux - worker batch mode
+        # Keep the carbon pickle connection open between submissions rather
+        # than connecting and closing a socket for every submission.  If the
+        # connection has been closed by carbon or the send fails the socket is
+        # closed and the submission is made once more on a new connection.
+        carbon_pickle_connection = {'sock': None}
+
+        def close_carbon_pickle_connection():
+            sock = carbon_pickle_connection['sock']
+            carbon_pickle_connection['sock'] = None
+            if sock:
+                try:
+                    sock.close()
+                except:
+                    pass
+
+        def get_carbon_pickle_connection():
+            sock = carbon_pickle_connection['sock']
+            if sock:
+                # Carbon does not send anything on the pickle connection so if
+                # there is anything to read the connection has been closed
+                connection_closed = False
+                try:
+                    sock.settimeout(0)
+                    if not sock.recv(1, socket.MSG_PEEK):
+                        connection_closed = True
+                except BlockingIOError:
+                    connection_closed = False
+                except:
+                    connection_closed = True
+                if connection_closed:
+                    close_carbon_pickle_connection()
+                    sock = None
+                else:
+                    sock.settimeout(10)
+            if not sock:
+                sock = socket.create_connection((CARBON_HOST, settings.FLUX_CARBON_PICKLE_PORT), timeout=10)
+                carbon_pickle_connection['sock'] = sock
+            return sock
+
         def pickle_data_to_graphite(data):
 
             message = None
@@ -214,6 +269,20 @@ class Worker(Process):
                 logger.error(traceback.format_exc())
                 logger.error('error :: worker :: failed to pickle to send to Graphite')
                 return False
+            # @added 20261107 - Feature #5780: flux - worker batch mode
+            if message and FLUX_CARBON_PERSISTENT_CONNECTION:
+                for attempt in range(2):
+                    try:
+                        sock = get_carbon_pickle_connection()
+                        sock.sendall(message)
+                        return True
+                    except Exception as err:
+                        close_carbon_pickle_connection()
+                        if attempt:
+                            logger.error(traceback.format_exc())
+                            logger.error('error :: worker :: failed to send pickle data to Graphite on the persistent connection - %s' % err)
+                            return False
+                        logger.info('worker :: reconnecting to carbon to send pickle data - %s' % err)
             if message:
                 try:
                     sock = socket.socket()
@@ -314,6 +383,32 @@ class Worker(Process):
                 logger.error('error :: worker :: failed to add %s metrics to memcache flux.workers.metrics_sent while Redis unavailable' % str(len(metrics_to_add)))
             return success
 
+        # Add the metrics sent and the flux.last.metric_data of the batch to
+        # Redis in one pipelined round trip.  If Redis is unavailable the
+        # metrics sent are added to sent_add_to_memcache.
+        def flush_batch_redis_data(
+                batch_metrics_sent, batch_flux_last_metric_data,
+                sent_add_to_memcache, failed_over_to_memcache):
+            if not batch_metrics_sent and not batch_flux_last_metric_data:
+                return True
+            flushed = False
+            try:
+                pipe = self.redis_conn.pipeline(transaction=False)
+                if batch_metrics_sent:
+                    pipe.sadd('flux.workers.metrics_sent', *list(set(batch_metrics_sent)))
+                if batch_flux_last_metric_data:
+                    pipe.hset('flux.last.metric_data', mapping=batch_flux_last_metric_data)
+                pipe.execute()
+                flushed = True
+            except Exception as err:
+                if not failed_over_to_memcache:
+                    logger.error('error :: worker :: failed to add the batch metrics_sent and flux.last.metric_data to Redis - %s' % err)
+                if settings.MEMCACHE_ENABLED:
+                    sent_add_to_memcache.extend(batch_metrics_sent)
+            del batch_metrics_sent[:]
+            batch_flux_last_metric_data.clear()
+            return flushed
+
         logger.info('worker :: starting worker')
 
         # Determine a master worker that zerofills and last_known_value
@@ -447,6 +542,12 @@ class Worker(Process):
         sent_add_to_memcache = []
         last_timed_out_empty_log = int(time())
 
+        # @added 20261107 - Feature #5780: flux - worker batch mode
+        metric_data_batch = deque()
+        batch_last_metric_data = {}
+        batch_metrics_sent = []
+        batch_flux_last_metric_data = {}
+
         # Populate API keys and tokens in memcache
         # python-2.x and python3.x handle while 1 and while True differently
         # while 1:
@@ -454,6 +555,10 @@ class Worker(Process):
         while running:
             # Make sure Redis is up
             redis_up = False
+            # @added 20261107 - Feature #5780: flux - worker batch mode
+            # Only check Redis once per batch
+            if metric_data_batch:
+                redis_up = True
             while not redis_up:
                 try:
                     redis_up = self.redis_conn.ping()
@@ -524,7 +629,35 @@ class Worker(Process):
                 # Get a metric from the queue with a 1 second timeout, each
                 # metric item on the queue is a list e.g.
                 # metric_data = [metricName, metricValue, metricTimestamp]
-                metric_data = self.q.get(True, 1)
+                # @modified 20261107 - Feature #5780: flux - worker batch mode
+                # Process the items in the current batch and when the batch
+                # has been processed get the next batch from the queue
+                # metric_data = self.q.get(True, 1)
+                if metric_data_batch:
+                    metric_data = metric_data_batch.popleft()
+                else:
+                    flush_batch_redis_data(
+                        batch_metrics_sent, batch_flux_last_metric_data,
+                        sent_add_to_memcache, failed_over_to_memcache)
+                    metric_data = self.q.get(True, 1)
+                    batch_last_metric_data = {}
+                    if FLUX_WORKER_BATCH_SIZE > 1:
+                        metric_data_batch = get_metric_data_batch(
+                            self.q, metric_data, FLUX_WORKER_BATCH_SIZE)
+                        metric_data = metric_data_batch.popleft()
+                        try:
+                            if settings.FLUX_SEND_TO_CARBON:
+                                check_metrics = []
+                                if VISTA_ENABLED and vista_metrics:
+                                    check_metrics = vista_metrics
+                                batch_last_metric_data = prefetch_last_metric_data(
+                                    skyline_app, self.redis_conn_decoded,
+                                    [metric_data] + list(metric_data_batch),
+                                    FLUX_CHECK_LAST_TIMESTAMP, check_metrics)
+                        except Exception as err:
+                            if not failed_over_to_memcache:
+                                logger.error('error :: worker :: failed to prefetch the last metric data of the batch from Redis - %s' % err)
+                            batch_last_metric_data = {}
 
             except Empty:
                 if pickle_data:
@@ -1555,12 +1688,18 @@ class Worker(Process):
                         # Swap to using a Redis hash instead of the
                         # flux.last.<metric> keys
                         redis_last_metric_data_dict = {}
-                        try:
-                            redis_last_metric_data_dict = get_last_metric_data(skyline_app, metric)
-                        except Exception as err:
-                            if not failed_over_to_memcache:
-                                logger.error('error :: worker :: get_last_metric_data failed - %s' % (
-                                    err))
+                        # @added 20261107 - Feature #5780: flux - worker batch mode
+                        # Use the last metric data prefetched for the batch
+                        prefetched_last_metric_data = batch_last_metric_data.get(metric)
+                        if prefetched_last_metric_data:
+                            redis_last_metric_data_dict = prefetched_last_metric_data['last_metric_data_dict']
+                        else:
+                            try:
+                                redis_last_metric_data_dict = get_last_metric_data(skyline_app, metric)
+                            except Exception as err:
+                                if not failed_over_to_memcache:
+                                    logger.error('error :: worker :: get_last_metric_data failed - %s' % (
+                                        err))
 
                         use_old_timestamp_keys = True
                         if redis_last_metric_data_dict:
@@ -1575,7 +1714,11 @@ class Worker(Process):
                                 last_metric_timestamp = None
 
                         redis_last_metric_data = None
-                        if not last_metric_timestamp:
+                        # @modified 20261107 - Feature #5780: flux - worker batch mode
+                        # if not last_metric_timestamp:
+                        if not last_metric_timestamp and prefetched_last_metric_data:
+                            redis_last_metric_data = prefetched_last_metric_data['last_metric_data']
+                        elif not last_metric_timestamp:
                             try:
                                 # @modified 20191128 - Bug #3266: py3 Redis binary objects not strings
                                 #                      Branch #3262: py3
@@ -1654,14 +1797,20 @@ class Worker(Process):
                                 metrics_sent.append(metric)
                                 # @added 20210407 - Feature #4004: flux - aggregator.py and FLUX_AGGREGATE_NAMESPACES
                                 # Better handle multiple workers
-                                try:
-                                    self.redis_conn.sadd('flux.workers.metrics_sent', metric)
-                                except Exception as e:
-                                    if not failed_over_to_memcache:
-                                        logger.error('error :: worker :: failed to add metric to flux.workers.metrics_sent Redis set - %s' % str(e))
-                                    # @added 20220428 - Feature #4536: Handle Redis failure
-                                    if settings.MEMCACHE_ENABLED:
-                                        sent_add_to_memcache.append(metric)
+                                # @modified 20261107 - Feature #5780: flux - worker batch mode
+                                # In batch mode the metrics sent are added to
+                                # Redis in one pipeline per batch
+                                if FLUX_WORKER_BATCH_SIZE > 1:
+                                    batch_metrics_sent.append(metric)
+                                else:
+                                    try:
+                                        self.redis_conn.sadd('flux.workers.metrics_sent', metric)
+                                    except Exception as e:
+                                        if not failed_over_to_memcache:
+                                            logger.error('error :: worker :: failed to add metric to flux.workers.metrics_sent Redis set - %s' % str(e))
+                                        # @added 20220428 - Feature #4536: Handle Redis failure
+                                        if settings.MEMCACHE_ENABLED:
+                                            sent_add_to_memcache.append(metric)
 
                                 # @added 202011120 - Feature #3790: flux - pickle to Graphite
                                 # Debug Redis set
@@ -1696,11 +1845,24 @@ class Worker(Process):
                                 # flux.last.<metric> keys
                                 metric_data_dict = {'timestamp': timestamp, 'value': value}
                                 new_memcache_flux_last_metric_data[metric] = metric_data_dict
-                                try:
-                                    self.redis_conn.hset('flux.last.metric_data', metric, str(metric_data_dict))
-                                except Exception as err:
-                                    if not failed_over_to_memcache:
-                                        logger.error('error :: worker :: failed to set flux.last.metric_data Redis key - %s' % str(err))
+                                # @modified 20261107 - Feature #5780: flux - worker batch mode
+                                # In batch mode the flux.last.metric_data is
+                                # set in one pipeline per batch and the
+                                # prefetched data is updated so that any later
+                                # data point for the metric in the batch is
+                                # deduplicated against this data point
+                                if FLUX_WORKER_BATCH_SIZE > 1:
+                                    batch_flux_last_metric_data[metric] = str(metric_data_dict)
+                                    batch_last_metric_data[metric] = {
+                                        'last_metric_data_dict': metric_data_dict,
+                                        'last_metric_data': None,
+                                    }
+                                else:
+                                    try:
+                                        self.redis_conn.hset('flux.last.metric_data', metric, str(metric_data_dict))
+                                    except Exception as err:
+                                        if not failed_over_to_memcache:
+                                            logger.error('error :: worker :: failed to set flux.last.metric_data Redis key - %s' % str(err))
 
                             # @added 20200213 - Bug #3448: Repeated airgapped_metrics
                             else:
@@ -1771,11 +1933,25 @@ class Worker(Process):
                     except:
                         pass
 
+                # @added 20261107 - Feature #5780: flux - worker batch mode
+                # Add the batch metrics sent and flux.last.metric_data to Redis
+                # when the batch has been processed or before the metrics sent
+                # are counted and evaluated for filling
+                if not metric_data_batch or (int(time()) - last_sent_to_graphite) >= 60:
+                    flush_batch_redis_data(
+                        batch_metrics_sent, batch_flux_last_metric_data,
+                        sent_add_to_memcache, failed_over_to_memcache)
+
                 submit_pickle_data = False
                 if pickle_data:
                     number_of_datapoints = len(pickle_data)
                     if number_of_datapoints >= 1000:
                         submit_pickle_data = True
+                    # @added 20261107 - Feature #5780: flux - worker batch mode
+                    # Submit the pickle data once per batch
+                    elif FLUX_WORKER_BATCH_SIZE > 1:
+                        if not metric_data_batch:
+                            submit_pickle_data = True
                     else:
                         try:
                             metric_data_queue_size = self.q.qsize()
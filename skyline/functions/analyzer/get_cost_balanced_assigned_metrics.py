@@ -0,0 +1,84 @@
+"""
+get_cost_balanced_assigned_metrics.py
+"""
+import logging
+import heapq
+from time import time
+
+import numpy as np
+
+skyline_app = 'analyzer'
+skyline_app_logger = '%sLog' % skyline_app
+logger = logging.getLogger(skyline_app_logger)
+
+
+# @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+def get_cost_balanced_assigned_metrics(
+        self, number_of_processes, unique_metrics, metrics_analysis_cost):
+    """
+
+    Divide the unique_metrics between the number_of_processes so that the total
+    analysis cost of the metrics assigned to each process is as equal as
+    possible, rather than assigning each process an equal sized contiguous
+    slice of unique_metrics.  The analysis cost of each metric is the number of
+    seconds it took to analyse in the last run, metrics with no recorded cost
+    are assigned the median cost.  The metrics are assigned most expensive
+    first, each to the process with the lowest total cost (longest processing
+    time first) and the metrics assigned to each process are returned in the
+    same order as they are in unique_metrics.
+
+    :param self: the self object
+    :param number_of_processes: the number of processes that will be used
+    :param unique_metrics: the list of metrics to assign
+    :param metrics_analysis_cost: the analysis cost in seconds of each metric
+    :type self: object
+    :type number_of_processes: int
+    :type unique_metrics: list
+    :type metrics_analysis_cost: dict
+    :return: assigned_metrics_lists
+    :rtype: list
+
+    """
+    start = time()
+    number_of_processes = max(1, int(number_of_processes))
+    costs = []
+    known_costs = []
+    for metric in unique_metrics:
+        cost = None
+        try:
+            cost = float(metrics_analysis_cost[metric])
+        except (KeyError, TypeError, ValueError):
+            cost = None
+        if cost is not None and cost >= 0:
+            known_costs.append(cost)
+        else:
+            cost = None
+        costs.append(cost)
+    default_cost = 1.0
+    if known_costs:
+        default_cost = max(float(np.median(known_costs)), 0.000001)
+    costs = np.array(
+        [default_cost if cost is None else cost for cost in costs],
+        dtype=np.float64)
+
+    # Most expensive first, the index is used as the tie breaker so that
+    # the assignment is deterministic
+    ordered_indices = sorted(range(len(costs)), key=lambda index: (-costs[index], index))
+    processes_heap = [(0.0, process_index) for process_index in range(number_of_processes)]
+    assigned_indices = [[] for process_index in range(number_of_processes)]
+    for index in ordered_indices:
+        process_cost, process_index = heapq.heappop(processes_heap)
+        assigned_indices[process_index].append(index)
+        heapq.heappush(processes_heap, (process_cost + costs[index], process_index))
+
+    assigned_metrics_lists = []
+    process_costs = []
+    for indices in assigned_indices:
+        indices.sort()
+        assigned_metrics_lists.append([unique_metrics[index] for index in indices])
+        process_costs.append(round(float(costs[indices].sum()), 2))
+
+    logger.info('get_cost_balanced_assigned_metrics :: assigned %s metrics (%s with a recorded cost) to %s processes with estimated costs: %s, took %.6f seconds' % (
+        str(len(unique_metrics)), str(len(known_costs)),
+        str(number_of_processes), str(process_costs), (time() - start)))
+    return assigned_metrics_lists
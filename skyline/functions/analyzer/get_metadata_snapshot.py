@@ -0,0 +1,99 @@
+"""
+get_metadata_snapshot.py
+"""
+import logging
+import traceback
+from time import time
+
+skyline_app = 'analyzer'
+skyline_app_logger = '%sLog' % skyline_app
+logger = logging.getLogger(skyline_app_logger)
+
+# @added 20261027 - Feature #5769: analyzer - metadata snapshot
+# The Redis sets and hashes that each spin_process reads at the start of a run
+# to determine the skip, batch, derivative, airgap, stale and last timestamp
+# state of the metrics.  None of these are modified by spin_process before they
+# are read, so they can be loaded once per run and shared.  Each item is the
+# Redis key and the read command used on it.
+ANALYZER_METADATA_SNAPSHOT_KEYS = [
+    ('metrics_manager.algorithms.ids', 'hgetall'),
+    ('analyzer.metrics_manager.analyzer_skip', 'smembers'),
+    ('metrics_manager.api_skip_analysis', 'hkeys'),
+    ('aet.analyzer.batch_processing_metrics', 'smembers'),
+    ('analyzer.last_timestamp.base_names', 'hgetall'),
+    ('metrics_manager.analyzer.skyline_feedback_metrics', 'smembers'),
+    ('aet.analyzer.smtp_alerter_metrics', 'smembers'),
+    ('aet.analyzer.boring', 'smembers'),
+    ('aet.analyzer.stale', 'smembers'),
+    ('aet.analyzer.tooshort', 'smembers'),
+    ('mirage.unique_metrics', 'smembers'),
+    ('ionosphere.unique_metrics', 'smembers'),
+    ('derivative_metrics', 'smembers'),
+    ('metrics_manager.always_derivative_metrics', 'smembers'),
+    ('non_derivative_metrics', 'smembers'),
+    ('metrics_manager.longterm_non_derivative_metrics', 'hgetall'),
+    ('analyzer.all_z_derivative_metrics', 'smembers'),
+    ('analyzer.all_zz_derivative_metrics', 'smembers'),
+    ('aet.metrics_manager.metric_names_with_ids', 'hgetall'),
+    ('aet.analyzer.non_smtp_alerter_metrics', 'smembers'),
+    ('flux.sort_and_dedup.metrics', 'smembers'),
+    ('mirage.filled', 'smembers'),
+    ('analyzer.airgapped_metrics', 'smembers'),
+    ('analyzer.airgapped_metrics.filled', 'smembers'),
+    ('flux.filled_metrics', 'hkeys'),
+    ('analyzer.inactive_metrics', 'smembers'),
+    ('metrics_manager.analyzer.custom_algorithm_only.metrics', 'smembers'),
+    ('metrics_manager.analyzer_batch.custom_algorithm_only.metrics', 'smembers'),
+    ('analyzer.metrics.last_analyzed_timestamp', 'hgetall'),
+    ('analyzer.metrics_manager.custom_stale_periods', 'hgetall'),
+    ('analyzer.metrics.last_timeseries_timestamp', 'hgetall'),
+]
+
+
+# @added 20261027 - Feature #5769: analyzer - metadata snapshot
+def get_metadata_snapshot(self, redis_keys=None):
+    """
+
+    Load the Redis sets and hashes that are read by every spin_process at the
+    start of a run in a single non-transactional Redis pipeline, so that they
+    are read once per run and not once per process with a round trip for each.
+    The snapshot is a dict keyed by the Redis key, a key that failed to load is
+    not included in the snapshot so that spin_process falls back to reading it
+    from Redis directly.
+
+    :param self: the self object
+    :param redis_keys: a list of (redis_key, command) tuples to load, defaults
+        to ANALYZER_METADATA_SNAPSHOT_KEYS
+    :type self: object
+    :type redis_keys: list
+    :return: metadata_snapshot
+    :rtype: dict
+
+    """
+    start = time()
+    if not redis_keys:
+        redis_keys = list(ANALYZER_METADATA_SNAPSHOT_KEYS)
+    metadata_snapshot = {}
+    results = []
+    try:
+        pipe = self.redis_conn_decoded.pipeline(transaction=False)
+        for redis_key, command in redis_keys:
+            getattr(pipe, command)(redis_key)
+        results = pipe.execute(raise_on_error=False)
+    except Exception as err:
+        logger.error(traceback.format_exc())
+        logger.error('error :: get_metadata_snapshot :: pipeline failed, err: %s' % err)
+        return metadata_snapshot
+    errors = []
+    for index, result in enumerate(results):
+        redis_key = redis_keys[index][0]
+        if isinstance(result, Exception):
+            errors.append([redis_key, str(result)])
+            continue
+        metadata_snapshot[redis_key] = result
+    if errors:
+        logger.error('error :: get_metadata_snapshot :: failed to load %s keys: %s' % (
+            str(len(errors)), str(errors)))
+    logger.info('get_metadata_snapshot :: loaded %s of %s Redis keys in %.6f seconds' % (
+        str(len(metadata_snapshot)), str(len(redis_keys)), (time() - start)))
+    return metadata_snapshot
@@ -9,6 +9,8 @@ from sqlalchemy.sql import select
 
 import settings
 from database import get_engine, engine_disposal, ionosphere_table_meta
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 from functions.metrics.get_base_name_from_metric_id import get_base_name_from_metric_id
 from skyline_functions import get_redis_conn_decoded
 # @added 20250829 - Feature #5644: ionosphere.learn_self_validation
@@ -82,7 +84,11 @@ def get_ionosphere_learnt_unvalidated_fps(
         fail_msg = 'error ::  %s :: failed to get ionosphere_table meta, err: %s' % (function_str, err)
         current_logger.error('%s' % fail_msg)
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except Exception as dispose_err:
             current_logger.error(traceback.format_exc())
             current_logger.error('error :: %s :: calling engine.dispose(), err: %s' % (function_str, dispose_err))
@@ -221,7 +227,11 @@ def get_ionosphere_learnt_unvalidated_fps(
             function_str, str(limit), str(results_count)))
 
     try:
-        engine.dispose()
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # The pooled engine is not disposed of
+        # engine.dispose()
+        if not is_pooled_engine(engine):
+            engine.dispose()
     except Exception as dispose_err:
         current_logger.error(traceback.format_exc())
         current_logger.error('error :: %s :: calling engine.dispose(), err: %s' % (function_str, dispose_err))
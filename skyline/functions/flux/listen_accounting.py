@@ -0,0 +1,138 @@
+"""
+listen_accounting.py
+"""
+import atexit
+import logging
+import threading
+from os import getpid
+from time import sleep
+
+try:
+    from settings import MEMCACHE_ENABLED
+except:
+    MEMCACHE_ENABLED = False
+from skyline_functions import get_redis_conn
+from functions.memcache.incr_memcache_key import incr_memcache_key
+
+
+# @added 20261108 - Feature #5781: flux - listen accounting
+class ListenAccounting(object):
+    """
+    Accumulate the Redis set adds, counter increments and key expiries that
+    flux listen makes for every data point in the process and write them to
+    Redis in one pipeline every flush_interval seconds, so that the same Redis
+    keys are populated without a Redis round trip per data point in the
+    request.  The sadd, incr, incrby and expire methods take the same
+    arguments as the Redis methods so that the object can be used in place of
+    the Redis connection for these keys.
+
+    Each gunicorn worker process has its own accumulated data and flusher
+    thread, which are reset if the object is used in a forked process.  The
+    accumulated data is swapped out for new empty data under a lock that is
+    never held during any I/O, so the requests are never blocked by the flush.
+    """
+    def __init__(self, skyline_app, flush_interval=1):
+        self.skyline_app = skyline_app
+        self.logger = logging.getLogger('%sLog' % skyline_app)
+        self.flush_interval = max(0.1, float(flush_interval))
+        self.pid = None
+        self.redis_conn = None
+        self.lock = None
+        self.sets = {}
+        self.counters = {}
+        self.expires = {}
+        self.flusher = None
+
+    def check_process(self):
+        """
+        Reset the accumulated data and start the flusher thread in a new
+        process.
+        """
+        pid = getpid()
+        if self.pid == pid:
+            return
+        self.pid = pid
+        self.redis_conn = None
+        self.lock = threading.Lock()
+        self.sets = {}
+        self.counters = {}
+        self.expires = {}
+        self.flusher = threading.Thread(target=self.flush_loop, args=(pid,))
+        self.flusher.daemon = True
+        self.flusher.start()
+        atexit.register(self.flush)
+
+    def sadd(self, key, *values):
+        self.check_process()
+        with self.lock:
+            key_set = self.sets.setdefault(key, set())
+            key_set.update(values)
+        return len(values)
+
+    def incrby(self, key, amount=1):
+        self.check_process()
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + int(amount)
+            count = self.counters[key]
+        return count
+
+    def incr(self, key, amount=1):
+        return self.incrby(key, amount)
+
+    def expire(self, key, seconds):
+        self.check_process()
+        with self.lock:
+            self.expires[key] = int(seconds)
+        return True
+
+    def flush(self):
+        """
+        Write the accumulated data to Redis in one pipeline.  If Redis is
+        unavailable the counters are incremented in memcache and the set
+        members are discarded, as they are when flux listen fails to add them
+        to Redis directly.
+
+        :return: flushed
+        :rtype: boolean
+
+        """
+        if self.pid != getpid() or not self.lock:
+            return False
+        with self.lock:
+            sets, self.sets = self.sets, {}
+            counters, self.counters = self.counters, {}
+            expires, self.expires = self.expires, {}
+        if not sets and not counters and not expires:
+            return True
+        try:
+            if not self.redis_conn:
+                self.redis_conn = get_redis_conn(self.skyline_app)
+            pipe = self.redis_conn.pipeline(transaction=False)
+            for key, values in sets.items():
+                pipe.sadd(key, *values)
+            for key, amount in counters.items():
+                pipe.incrby(key, amount)
+            # Expire after the sets have been added so the keys exist
+            for key, seconds in expires.items():
+                pipe.expire(key, seconds)
+            pipe.execute()
+        except Exception as err:
+            self.redis_conn = None
+            self.logger.error('error :: listen :: ListenAccounting failed to flush %s sets and %s counters to Redis - %s' % (
+                str(len(sets)), str(len(counters)), err))
+            if MEMCACHE_ENABLED:
+                for key, amount in counters.items():
+                    try:
+                        incr_memcache_key(self.skyline_app, key, amount)
+                    except:
+                        pass
+            return False
+        return True
+
+    def flush_loop(self, pid):
+        while self.pid == pid:
+            sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as err:
+                self.logger.error('error :: listen :: ListenAccounting flush failed - %s' % err)
@@ -0,0 +1,206 @@
+"""
+listen_cache.py
+"""
+import logging
+import threading
+from ast import literal_eval
+from os import getpid
+from time import sleep, time
+
+from skyline_functions import get_redis_conn_decoded
+
+
+# @added 20261109 - Feature #5782: flux - listen cache
+class ListenCache(object):
+    """
+    A versioned in-process cache of the data that flux listen resolves on every
+    request: the valid API keys and the namespace of each key, the namespace
+    quotas, and the metrics and current minute metric count of each namespace
+    with a quota.  The cache is refreshed by a single background thread in each
+    gunicorn worker process every refresh_interval seconds, so no Redis
+    requests are made in the request path to validate a key or determine a
+    namespace quota.
+
+    The keys and quotas are rebuilt when the skyline.external_settings,
+    skyline.external_settings.update.flux or metrics_manager.flux.namespace_quotas
+    data changes and the version is incremented.  Each refresh replaces the
+    snapshot dict in a single assignment, so the request path reads a
+    consistent snapshot without a lock.  If Redis is unavailable the last
+    snapshot is kept.
+    """
+    def __init__(self, skyline_app, flux_api_keys=None, flux_self_api_key=None, refresh_interval=5):
+        self.skyline_app = skyline_app
+        self.logger = logging.getLogger('%sLog' % skyline_app)
+        self.flux_api_keys = dict(flux_api_keys or {})
+        self.flux_self_api_key = flux_self_api_key
+        self.refresh_interval = max(1, float(refresh_interval))
+        self.pid = None
+        self.redis_conn_decoded = None
+        self.refresher = None
+        self.change_key = None
+        self.snapshot = {
+            'version': 0,
+            'refreshed_at': 0,
+            'valid_keys': set(),
+            'key_namespaces': {},
+            'namespace_quotas': {},
+            'namespace_metrics': {},
+            'namespace_metric_counts': {},
+        }
+
+    def check_process(self):
+        """
+        Refresh the cache and start the refresher thread in a new process.
+        """
+        pid = getpid()
+        if self.pid == pid:
+            return
+        self.pid = pid
+        self.redis_conn_decoded = None
+        self.change_key = None
+        try:
+            self.refresh()
+        except Exception as err:
+            self.logger.error('error :: listen :: ListenCache initial refresh failed - %s' % err)
+        self.refresher = threading.Thread(target=self.refresh_loop, args=(pid,))
+        self.refresher.daemon = True
+        self.refresher.start()
+
+    def build_keys(self, skyline_external_settings):
+        valid_keys = set()
+        key_namespaces = {}
+        if self.flux_self_api_key:
+            valid_keys.add(str(self.flux_self_api_key))
+            key_namespaces[str(self.flux_self_api_key)] = None
+        for flux_api_key in self.flux_api_keys:
+            valid_keys.add(str(flux_api_key))
+            key_namespaces[str(flux_api_key)] = self.flux_api_keys[flux_api_key]
+        for settings_key in skyline_external_settings:
+            try:
+                flux_token = skyline_external_settings[settings_key].get('flux_token')
+                if flux_token:
+                    valid_keys.add(str(flux_token))
+                    key_namespaces[str(flux_token)] = skyline_external_settings[settings_key]['namespace']
+            except Exception as err:
+                self.logger.error('error :: listen :: ListenCache failed to determine the flux_token of %s - %s' % (
+                    str(settings_key), err))
+        return valid_keys, key_namespaces
+
+    def refresh(self):
+        """
+        Refresh the cache from Redis in two pipelined round trips.
+
+        :return: version
+        :rtype: int
+
+        """
+        if not self.redis_conn_decoded:
+            self.redis_conn_decoded = get_redis_conn_decoded(self.skyline_app)
+        pipe = self.redis_conn_decoded.pipeline(transaction=False)
+        pipe.get('skyline.external_settings.update.flux')
+        pipe.get('skyline.external_settings')
+        pipe.hgetall('metrics_manager.flux.namespace_quotas')
+        update_flux, skyline_external_settings_raw, namespace_quotas_dict = pipe.execute()
+
+        current_snapshot = self.snapshot
+        version = current_snapshot['version']
+        change_key = (update_flux, skyline_external_settings_raw, str(sorted((namespace_quotas_dict or {}).items())))
+        if change_key != self.change_key:
+            skyline_external_settings = {}
+            if skyline_external_settings_raw:
+                skyline_external_settings = literal_eval(skyline_external_settings_raw)
+            valid_keys, key_namespaces = self.build_keys(skyline_external_settings)
+            namespace_quotas = {}
+            for namespace, quota_str in (namespace_quotas_dict or {}).items():
+                try:
+                    namespace_quotas[namespace] = int(quota_str)
+                except (TypeError, ValueError):
+                    namespace_quotas[namespace] = 0
+            version += 1
+        else:
+            valid_keys = current_snapshot['valid_keys']
+            key_namespaces = current_snapshot['key_namespaces']
+            namespace_quotas = current_snapshot['namespace_quotas']
+
+        namespace_metrics = {}
+        namespace_metric_counts = {}
+        quota_namespaces = [namespace for namespace in namespace_quotas if namespace_quotas[namespace]]
+        if quota_namespaces:
+            namespace_quota_key_reference_timestamp = (int(time()) // 60 * 60)
+            pipe = self.redis_conn_decoded.pipeline(transaction=False)
+            for namespace in quota_namespaces:
+                pipe.smembers('flux.quota.namespace_metrics.%s' % namespace)
+                pipe.scard('flux.namespace_quota.%s.%s' % (
+                    namespace, str(namespace_quota_key_reference_timestamp)))
+            results = pipe.execute()
+            for index, namespace in enumerate(quota_namespaces):
+                namespace_metrics[namespace] = set(results[index * 2])
+                namespace_metric_counts[namespace] = (
+                    namespace_quota_key_reference_timestamp, int(results[(index * 2) + 1]))
+
+        self.snapshot = {
+            'version': version,
+            'refreshed_at': int(time()),
+            'valid_keys': valid_keys,
+            'key_namespaces': key_namespaces,
+            'namespace_quotas': namespace_quotas,
+            'namespace_metrics': namespace_metrics,
+            'namespace_metric_counts': namespace_metric_counts,
+        }
+        if version != current_snapshot['version']:
+            self.change_key = change_key
+            self.logger.info('listen :: ListenCache refreshed to version %s with %s keys and %s namespace quotas' % (
+                str(version), str(len(valid_keys)), str(len(namespace_quotas))))
+        return version
+
+    def refresh_loop(self, pid):
+        while self.pid == pid:
+            sleep(self.refresh_interval)
+            try:
+                self.refresh()
+            except Exception as err:
+                self.redis_conn_decoded = None
+                self.logger.error('error :: listen :: ListenCache refresh failed, using version %s - %s' % (
+                    str(self.snapshot['version']), err))
+
+    def validate_key(self, apikey):
+        """
+        Return whether the key is valid and the namespace of the key.
+
+        :param apikey: the API key
+        :type apikey: str
+        :return: (valid, metric_namespace_prefix)
+        :rtype: tuple
+
+        """
+        self.check_process()
+        snapshot = self.snapshot
+        if apikey not in snapshot['valid_keys']:
+            return False, None
+        return True, snapshot['key_namespaces'].get(apikey)
+
+    def get_namespace_quota(self, namespace):
+        self.check_process()
+        return self.snapshot['namespace_quotas'].get(namespace, 0)
+
+    def get_namespace_metrics(self, namespace):
+        """
+        Return the metrics of the namespace.  The set must not be modified.
+        """
+        self.check_process()
+        return self.snapshot['namespace_metrics'].get(namespace, set())
+
+    def get_namespace_metric_count(self, namespace):
+        """
+        Return the count of the metrics received in the namespace in the
+        current minute when the cache was refreshed, or 0 if the cache was
+        refreshed in the previous minute.
+        """
+        self.check_process()
+        try:
+            reference_timestamp, count = self.snapshot['namespace_metric_counts'][namespace]
+        except KeyError:
+            return 0
+        if reference_timestamp != (int(time()) // 60 * 60):
+            return 0
+        return count
@@ -0,0 +1,100 @@
+"""
+worker_batch.py
+"""
+import logging
+from ast import literal_eval
+from collections import deque
+from queue import Empty
+
+
+# @added 20261107 - Feature #5780: flux - worker batch mode
+# Drain up to batch_size items from the queue after the first item is received,
+# so that the last metric data of all the metrics in the batch can be
+# determined from Redis in one pipelined round trip rather than a round trip
+# per item.
+def get_metric_data_batch(q, first_metric_data, batch_size):
+    """
+    Return a deque of the first_metric_data and up to batch_size - 1 further
+    items that are available on the queue without blocking.
+
+    :param q: the flux worker queue
+    :param first_metric_data: the item already taken from the queue
+    :param batch_size: the maximum number of items in the batch
+    :type q: multiprocessing.Queue
+    :type first_metric_data: list
+    :type batch_size: int
+    :return: metric_data_batch
+    :rtype: collections.deque
+
+    """
+    metric_data_batch = deque([first_metric_data])
+    while len(metric_data_batch) < batch_size:
+        try:
+            metric_data_batch.append(q.get_nowait())
+        except Empty:
+            break
+    return metric_data_batch
+
+
+def prefetch_last_metric_data(
+        current_skyline_app, redis_conn_decoded, metric_data_batch,
+        check_last_timestamp=True, check_metrics=None):
+    """
+    Return a dict of the flux.last.metric_data hash dict and the old
+    flux.last.<metric> key data of each metric in the batch that has its last
+    timestamp checked, in the forms that get_last_metric_data and the
+    redis_conn_decoded.get of the flux.last.<metric> key return.  Each metric is
+    only fetched once, however many data points it has in the batch.
+
+    :param current_skyline_app: the app calling the function
+    :param redis_conn_decoded: the decoded Redis connection
+    :param metric_data_batch: the flux worker queue items, each item being
+        [metric, value, timestamp, backfill, ...]
+    :param check_last_timestamp: whether the last timestamp of metrics that are
+        not backfilled is checked, FLUX_CHECK_LAST_TIMESTAMP
+    :param check_metrics: metrics that always have their last timestamp checked,
+        e.g. the vista metrics
+    :type current_skyline_app: str
+    :type redis_conn_decoded: object
+    :type metric_data_batch: list
+    :type check_last_timestamp: boolean
+    :type check_metrics: list
+    :return: batch_last_metric_data
+    :rtype: dict
+
+    """
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    check_metrics = set(check_metrics or [])
+    metrics = []
+    for item in metric_data_batch:
+        try:
+            metric = str(item[0])
+            backfill = int(item[3])
+        except:
+            continue
+        if (not backfill and check_last_timestamp) or metric in check_metrics:
+            metrics.append(metric)
+    metrics = sorted(set(metrics))
+    if not metrics:
+        return {}
+    pipe = redis_conn_decoded.pipeline(transaction=False)
+    pipe.hmget('flux.last.metric_data', metrics)
+    pipe.mget(['flux.last.%s' % metric for metric in metrics])
+    last_metric_data_dict_strs, last_metric_data_strs = pipe.execute()
+    batch_last_metric_data = {}
+    for index, metric in enumerate(metrics):
+        last_metric_data_dict = {}
+        if last_metric_data_dict_strs[index]:
+            try:
+                last_metric_data_dict = literal_eval(last_metric_data_dict_strs[index])
+            except Exception as err:
+                current_logger.error('error :: prefetch_last_metric_data :: failed to literal_eval flux.last.metric_data for %s - %s' % (
+                    metric, err))
+                last_metric_data_dict = {}
+        batch_last_metric_data[metric] = {
+            'last_metric_data_dict': last_metric_data_dict,
+            'last_metric_data': last_metric_data_strs[index],
+        }
+    return batch_last_metric_data
@@ -0,0 +1,332 @@
+"""
+graphite_client.py
+"""
+import logging
+import os
+import datetime
+import json
+import traceback
+from queue import Queue, Empty
+from threading import Thread
+from time import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from msgpack import unpackb
+
+import settings
+from skyline_functions import get_redis_conn_decoded, sanitise_graphite_url
+from functions.metrics.last_known_value_metrics_list import last_known_value_metrics_list
+from functions.metrics.zero_fill_metrics_list import zero_fill_metrics_list
+
+try:
+    GRAPHITE_HTTP_POOL_SIZE = int(settings.GRAPHITE_HTTP_POOL_SIZE)
+except:
+    GRAPHITE_HTTP_POOL_SIZE = 10
+try:
+    GRAPHITE_RENDER_FORMAT = settings.GRAPHITE_RENDER_FORMAT
+except:
+    GRAPHITE_RENDER_FORMAT = 'json'
+
+# @added 20261104 - Feature #5777: graphite - shared http session
+# The shared session of each process, keyed by pid so that a forked process
+# never uses the connections of its parent
+graphite_sessions = {}
+
+
+# @added 20261104 - Feature #5777: graphite - shared http session
+def get_graphite_session():
+    """
+    Return the shared requests session that the process makes Graphite
+    requests with.  The session keeps up to GRAPHITE_HTTP_POOL_SIZE keep-alive
+    connections open to Graphite so that each request does not have to
+    establish a new connection.
+
+    :return: session
+    :rtype: requests.Session
+
+    """
+    pid = os.getpid()
+    session = graphite_sessions.get(pid)
+    if session is None:
+        for session_pid in list(graphite_sessions.keys()):
+            del graphite_sessions[session_pid]
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=GRAPHITE_HTTP_POOL_SIZE,
+            pool_maxsize=GRAPHITE_HTTP_POOL_SIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        graphite_sessions[pid] = session
+    return session
+
+
+def get_graphite_timeout():
+    """
+    Return the (connect, read) timeout for Graphite requests.
+    """
+    return (int(settings.GRAPHITE_CONNECT_TIMEOUT), int(settings.GRAPHITE_READ_TIMEOUT))
+
+
+# @added 20261104 - Feature #5777: graphite - shared http session
+def get_graphite_targets(current_skyline_app, metrics, redis_conn_decoded=None):
+    """
+    Return the Graphite render targets for a list of metrics, applying the
+    nonNegativeDerivative, transformNull and keepLastValue functions in the
+    same way that get_graphite_metric does.  The Redis sets and metric lists
+    are only surfaced once for all the metrics.  If REMOTE_SKYLINE_INSTANCES
+    is set and a metric is not known in the local Redis, its target is None
+    as get_graphite_metric has to determine it from the remote instances.
+
+    :param current_skyline_app: the app calling the function
+    :param metrics: the base_names
+    :param redis_conn_decoded: an optional Redis connection
+    :type current_skyline_app: str
+    :type metrics: list
+    :type redis_conn_decoded: object
+    :return: targets
+    :rtype: dict
+
+    """
+    function_str = 'functions.graphite.graphite_client.get_graphite_targets'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    if not redis_conn_decoded:
+        try:
+            redis_conn_decoded = get_redis_conn_decoded(current_skyline_app)
+        except Exception as err:
+            current_logger.error('error :: %s :: get_redis_conn_decoded failed - %s' % (
+                function_str, err))
+    derivative_metrics = set()
+    non_derivative_metrics = set()
+    metrics_manager_non_derivative_metrics = set()
+    try:
+        derivative_metrics = set(redis_conn_decoded.smembers('aet.metrics_manager.derivative_metrics'))
+        non_derivative_metrics = set(redis_conn_decoded.smembers('non_derivative_metrics'))
+        metrics_manager_non_derivative_metrics = set(redis_conn_decoded.smembers('metrics_manager.non_derivative_metrics'))
+    except Exception as err:
+        current_logger.error('error :: %s :: failed to get derivative_metrics sets from Redis - %s' % (
+            function_str, err))
+    last_known_value_metrics = []
+    try:
+        last_known_value_metrics = last_known_value_metrics_list(current_skyline_app)
+    except Exception as err:
+        current_logger.error('error :: %s :: last_known_value_metrics_list failed - %s' % (
+            function_str, err))
+    zero_fill_metrics = []
+    try:
+        zero_fill_metrics = zero_fill_metrics_list(current_skyline_app)
+    except Exception as err:
+        current_logger.error('error :: %s :: zero_fill_metrics_list failed - %s' % (
+            function_str, err))
+
+    targets = {}
+    for metric in metrics:
+        redis_metric_name = '%s%s' % (settings.FULL_NAMESPACE, str(metric))
+        known_derivative_metric = False
+        metric_found_in_redis = False
+        if redis_metric_name in derivative_metrics:
+            known_derivative_metric = True
+            metric_found_in_redis = True
+            if redis_metric_name in non_derivative_metrics:
+                known_derivative_metric = False
+            if metric in metrics_manager_non_derivative_metrics:
+                known_derivative_metric = False
+        if not metric_found_in_redis and settings.REMOTE_SKYLINE_INSTANCES:
+            targets[metric] = None
+            continue
+        target = metric
+        if known_derivative_metric:
+            target = 'nonNegativeDerivative(%s)' % metric
+        if metric in zero_fill_metrics:
+            if not known_derivative_metric:
+                target = 'transformNull(%s,0)' % target
+            else:
+                target = 'keepLastValue(%s)' % target
+        if metric in last_known_value_metrics:
+            target = 'keepLastValue(%s)' % target
+        targets[metric] = target
+    return targets
+
+
+# @added 20261104 - Feature #5777: graphite - shared http session
+def parse_graphite_response(content, render_format='json'):
+    """
+    Parse the first series of a Graphite render API json or msgpack response
+    into a float64 array of [timestamp, value] data points, without the data
+    points that have no value.
+
+    :param content: the response content
+    :param render_format: json or msgpack
+    :type content: bytes
+    :type render_format: str
+    :return: timeseries
+    :rtype: np.array
+
+    """
+    if render_format == 'msgpack':
+        series = unpackb(content, raw=False)
+        if not series:
+            return np.empty((0, 2), dtype=np.float64)
+        values = np.array(series[0]['values'], dtype=np.float64)
+        timestamps = series[0]['start'] + (np.arange(len(values), dtype=np.float64) * series[0]['step'])
+    else:
+        series = json.loads(content)
+        if not series:
+            return np.empty((0, 2), dtype=np.float64)
+        # None values become nan
+        datapoints = np.array(series[0]['datapoints'], dtype=np.float64).reshape(-1, 2)
+        values = datapoints[:, 0]
+        timestamps = datapoints[:, 1]
+    timeseries = np.column_stack((timestamps, values))
+    return timeseries[~np.isnan(timeseries).any(axis=1)]
+
+
+# @added 20261104 - Feature #5777: graphite - shared http session
+def fetch_graphite_timeseries(
+        current_skyline_app, metric, target, from_timestamp, until_timestamp,
+        render_format=None):
+    """
+    Fetch a Graphite target with the shared session and parse the response in
+    memory.  The from and until use the same minute resolution as
+    get_graphite_metric so that the same data points are returned.  Returns
+    None if the request or parsing fails.
+
+    :param current_skyline_app: the app calling the function
+    :param metric: the base_name
+    :param target: the Graphite target
+    :param from_timestamp: the from unix timestamp
+    :param until_timestamp: the until unix timestamp
+    :param render_format: json or msgpack, defaults to GRAPHITE_RENDER_FORMAT
+    :type current_skyline_app: str
+    :type metric: str
+    :type target: str
+    :type from_timestamp: int
+    :type until_timestamp: int
+    :type render_format: str
+    :return: timeseries
+    :rtype: np.array or None
+
+    """
+    function_str = 'functions.graphite.graphite_client.fetch_graphite_timeseries'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    if not render_format:
+        render_format = GRAPHITE_RENDER_FORMAT
+    if render_format not in ['json', 'msgpack']:
+        render_format = 'json'
+    graphite_port = '80'
+    if settings.GRAPHITE_PORT != '':
+        graphite_port = str(settings.GRAPHITE_PORT)
+    if settings.GRAPHITE_PORT == '443' and settings.GRAPHITE_PROTOCOL == 'https':
+        graphite_port = ''
+    graphite_from = datetime.datetime.fromtimestamp(int(from_timestamp)).strftime('%H:%M_%Y%m%d')
+    graphite_until = datetime.datetime.fromtimestamp(int(until_timestamp)).strftime('%H:%M_%Y%m%d')
+    url = '%s://%s:%s/%s?from=%s&until=%s&target=%s&format=%s' % (
+        settings.GRAPHITE_PROTOCOL, settings.GRAPHITE_HOST, graphite_port,
+        settings.GRAPHITE_RENDER_URI, graphite_from, graphite_until, target,
+        render_format)
+    sanitised, url = sanitise_graphite_url(current_skyline_app, url)
+    session = get_graphite_session()
+    try:
+        r = session.get(url, timeout=get_graphite_timeout())
+        if r.status_code != 200:
+            current_logger.error('error :: %s :: Graphite returned status code %s for %s' % (
+                function_str, str(r.status_code), url))
+            return None
+        timeseries = parse_graphite_response(r.content, render_format)
+        # As get_graphite_metric does, try the url encoded name if there is
+        # no data for a metric with a % in the name
+        if not len(timeseries) and '%' in metric:
+            new_url = url.replace('%', '%25').replace('%2525', '%25')
+            r = session.get(new_url, timeout=get_graphite_timeout())
+            if r.status_code == 200:
+                timeseries = parse_graphite_response(r.content, render_format)
+    except Exception as err:
+        current_logger.error('error :: %s :: failed to fetch %s - %s' % (
+            function_str, url, err))
+        return None
+    return timeseries
+
+
+def fetch_worker(current_skyline_app, jobs_queue, results):
+    """
+    A thread that fetches the jobs on the jobs_queue until it is empty and adds
+    the time series to the results.
+    """
+    while True:
+        try:
+            key, metric, target, from_timestamp, until_timestamp = jobs_queue.get_nowait()
+        except Empty:
+            break
+        results[key] = fetch_graphite_timeseries(
+            current_skyline_app, metric, target, from_timestamp, until_timestamp)
+
+
+# @added 20261104 - Feature #5777: graphite - shared http session
+def fetch_graphite_metrics_timeseries(
+        current_skyline_app, fetches, threads=4, redis_conn_decoded=None):
+    """
+    Fetch the time series of multiple metrics from Graphite concurrently with
+    the shared session.  Each fetch is a (metric, from_timestamp,
+    until_timestamp) tuple and the returned dict is keyed by the fetch tuple,
+    with the time series as a float64 array of [timestamp, value] data points
+    or None if it could not be fetched.  Metrics whose Graphite target cannot
+    be determined locally are not fetched and are not in the returned dict, so
+    that the caller fetches them with get_graphite_metric.
+
+    :param current_skyline_app: the app calling the function
+    :param fetches: the (metric, from_timestamp, until_timestamp) fetches
+    :param threads: the maximum number of concurrent requests
+    :param redis_conn_decoded: an optional Redis connection
+    :type current_skyline_app: str
+    :type fetches: list
+    :type threads: int
+    :type redis_conn_decoded: object
+    :return: fetched_timeseries
+    :rtype: dict
+
+    """
+    function_str = 'functions.graphite.graphite_client.fetch_graphite_metrics_timeseries'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    start = time()
+    fetched_timeseries = {}
+    fetches = list(dict.fromkeys(fetches))
+    if not fetches:
+        return fetched_timeseries
+    try:
+        targets = get_graphite_targets(
+            current_skyline_app, list(set(fetch[0] for fetch in fetches)),
+            redis_conn_decoded=redis_conn_decoded)
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: get_graphite_targets failed - %s' % (
+            function_str, err))
+        return fetched_timeseries
+    jobs_queue = Queue()
+    jobs_count = 0
+    for fetch in fetches:
+        metric, from_timestamp, until_timestamp = fetch
+        if not targets.get(metric):
+            continue
+        jobs_queue.put((fetch, metric, targets[metric], from_timestamp, until_timestamp))
+        jobs_count += 1
+    use_threads = max(1, min(int(threads), jobs_count))
+    workers = []
+    for i in range(use_threads):
+        t = Thread(target=fetch_worker, args=(current_skyline_app, jobs_queue, fetched_timeseries))
+        t.daemon = True
+        workers.append(t)
+        t.start()
+    for t in workers:
+        t.join()
+    failed = len([key for key, timeseries in fetched_timeseries.items() if timeseries is None])
+    current_logger.info('%s :: fetched %s of %s time series (%s failed) with %s threads in %.6f seconds' % (
+        function_str, str(jobs_count), str(len(fetches)), str(failed),
+        str(use_threads), (time() - start)))
+    return fetched_timeseries
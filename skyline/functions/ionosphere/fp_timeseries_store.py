@@ -0,0 +1,378 @@
+"""
+fp_timeseries_store.py
+"""
+import logging
+import os
+import traceback
+from collections import OrderedDict
+from time import time
+
+import numpy as np
+from sqlalchemy import select, Table, MetaData
+
+import settings
+from skyline_functions import mkdir_p
+from database import get_engine, engine_disposal
+from functions.numpy.minmax_scale import minmax_scale
+
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+# The time series of a features profile does not change once the features
+# profile is created, so rather than SELECTing the z_ts_<metric_id> rows or
+# literal_eval the memcache fp.<fp_id>.<metric_id>.ts string on every check,
+# the fp time series of a metric are stored in a binary file per metric as
+# contiguous arrays, with the minmax scaled values and the min and max of each
+# fp precomputed.  The file is memory mapped by ionosphere, inference and the
+# webapp, so the data is shared via the page cache.  The file format is:
+#
+#   header: 8 byte magic, uint64 fp count, uint64 total values count
+#   index: a FP_TIMESERIES_STORE_INDEX_DTYPE record per fp
+#   data: int64 timestamps, float64 values and float64 minmax scaled values of
+#         all the fps, each fp at its index offset
+#
+# A store file is only ever replaced as a whole with os.replace, so a process
+# that has the previous file mapped continues to read a consistent store.
+try:
+    IONOSPHERE_FP_TIMESERIES_STORE_DIR = settings.IONOSPHERE_FP_TIMESERIES_STORE_DIR
+except:
+    IONOSPHERE_FP_TIMESERIES_STORE_DIR = '/opt/skyline/ionosphere/fp_timeseries'
+try:
+    IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED = int(settings.IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED)
+except:
+    IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED = 1000
+
+FP_TIMESERIES_STORE_MAGIC = b'SKYFPTS1'
+FP_TIMESERIES_STORE_HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'), ('fp_count', '<u8'), ('values_count', '<u8')])
+FP_TIMESERIES_STORE_INDEX_DTYPE = np.dtype([
+    ('fp_id', '<i8'), ('offset', '<i8'), ('length', '<i8'),
+    ('min', '<f8'), ('max', '<f8')])
+
+# The stores mapped by this process, keyed by metric id, in least recently used
+# order.  Only IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED stores are kept mapped,
+# the least recently used store is unmapped when its arrays are no longer
+# referenced.
+fp_timeseries_stores = OrderedDict()
+
+
+def get_fp_timeseries_store_path(metric_id):
+    """
+    Return the path of the fp time series store file of a metric.
+
+    :param metric_id: the metric id
+    :type metric_id: int
+    :return: path
+    :rtype: str
+
+    """
+    return '%s/%s.fp_timeseries' % (IONOSPHERE_FP_TIMESERIES_STORE_DIR, str(metric_id))
+
+
+def load_fp_timeseries_store(current_skyline_app, metric_id):
+    """
+    Return the fp time series in the store file of a metric as read only arrays
+    on the memory mapped file, e.g.:
+
+    fp_timeseries = {
+        123: {
+            'timestamps': np.array([1666700000, 1666700060]),
+            'values': np.array([1.0, 3.0]),
+            'minmax_values': np.array([0.0, 1.0]),
+            'min': 1.0,
+            'max': 3.0,
+        },
+    }
+
+    The mapped store is reused until the store file is replaced.
+
+    :param current_skyline_app: the app calling the function
+    :param metric_id: the metric id
+    :type current_skyline_app: str
+    :type metric_id: int
+    :return: fp_timeseries
+    :rtype: dict
+
+    """
+    function_str = 'functions.ionosphere.fp_timeseries_store.load_fp_timeseries_store'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    store_path = get_fp_timeseries_store_path(metric_id)
+    try:
+        store_stat = os.stat(store_path)
+    except FileNotFoundError:
+        fp_timeseries_stores.pop(int(metric_id), None)
+        return {}
+    store_signature = (store_stat.st_ino, store_stat.st_mtime_ns, store_stat.st_size)
+    mapped_store = fp_timeseries_stores.get(int(metric_id))
+    if mapped_store and mapped_store['signature'] == store_signature:
+        fp_timeseries_stores.move_to_end(int(metric_id))
+        return mapped_store['fp_timeseries']
+
+    fp_timeseries = {}
+    try:
+        raw = np.memmap(store_path, dtype=np.uint8, mode='r')
+        header_size = FP_TIMESERIES_STORE_HEADER_DTYPE.itemsize
+        header = raw[:header_size].view(FP_TIMESERIES_STORE_HEADER_DTYPE)[0]
+        if header['magic'] != FP_TIMESERIES_STORE_MAGIC:
+            raise ValueError('%s is not an fp time series store' % store_path)
+        fp_count = int(header['fp_count'])
+        values_count = int(header['values_count'])
+        offset = header_size
+        index_size = fp_count * FP_TIMESERIES_STORE_INDEX_DTYPE.itemsize
+        index = raw[offset:(offset + index_size)].view(FP_TIMESERIES_STORE_INDEX_DTYPE)
+        offset += index_size
+        data_size = values_count * 8
+        timestamps = raw[offset:(offset + data_size)].view('<i8')
+        offset += data_size
+        values = raw[offset:(offset + data_size)].view('<f8')
+        offset += data_size
+        minmax_values = raw[offset:(offset + data_size)].view('<f8')
+        for record in index:
+            start = int(record['offset'])
+            end = start + int(record['length'])
+            fp_timeseries[int(record['fp_id'])] = {
+                'timestamps': timestamps[start:end],
+                'values': values[start:end],
+                'minmax_values': minmax_values[start:end],
+                'min': float(record['min']),
+                'max': float(record['max']),
+            }
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to load %s, err: %s' % (
+            function_str, store_path, err))
+        return {}
+    fp_timeseries_stores[int(metric_id)] = {
+        'signature': store_signature,
+        'fp_timeseries': fp_timeseries,
+    }
+    fp_timeseries_stores.move_to_end(int(metric_id))
+    while len(fp_timeseries_stores) > max(1, IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED):
+        fp_timeseries_stores.popitem(last=False)
+    return fp_timeseries
+
+
+def write_fp_timeseries_store(current_skyline_app, metric_id, fp_timeseries):
+    """
+    Write the fp time series of a metric to the store file, replacing the
+    existing store file.
+
+    :param current_skyline_app: the app calling the function
+    :param metric_id: the metric id
+    :param fp_timeseries: a dict of fp_id and a dict with the timestamps and
+        values arrays of the fp, minmax_values, min and max are calculated if
+        they are not present
+    :type current_skyline_app: str
+    :type metric_id: int
+    :type fp_timeseries: dict
+    :return: success
+    :rtype: boolean
+
+    """
+    function_str = 'functions.ionosphere.fp_timeseries_store.write_fp_timeseries_store'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    store_path = get_fp_timeseries_store_path(metric_id)
+    tmp_store_path = '%s.%s.tmp' % (store_path, str(os.getpid()))
+    fp_ids = sorted(fp_timeseries.keys())
+    index = np.zeros(len(fp_ids), dtype=FP_TIMESERIES_STORE_INDEX_DTYPE)
+    offset = 0
+    timestamps_arrays = []
+    values_arrays = []
+    minmax_values_arrays = []
+    for i, fp_id in enumerate(fp_ids):
+        fp_data = fp_timeseries[fp_id]
+        fp_values = np.asarray(fp_data['values'], dtype=np.float64)
+        length = len(fp_values)
+        if 'minmax_values' in fp_data:
+            fp_minmax_values = np.asarray(fp_data['minmax_values'], dtype=np.float64)
+            fp_min = fp_data['min']
+            fp_max = fp_data['max']
+        else:
+            fp_minmax_values = minmax_scale(fp_values)
+            if len(fp_minmax_values) != length:
+                fp_minmax_values = np.full(length, np.nan, dtype=np.float64)
+            fp_min = float(fp_values.min()) if length else np.nan
+            fp_max = float(fp_values.max()) if length else np.nan
+        index[i] = (int(fp_id), offset, length, fp_min, fp_max)
+        timestamps_arrays.append(np.asarray(fp_data['timestamps'], dtype=np.int64))
+        values_arrays.append(fp_values)
+        minmax_values_arrays.append(fp_minmax_values)
+        offset += length
+    header = np.array(
+        [(FP_TIMESERIES_STORE_MAGIC, len(fp_ids), offset)],
+        dtype=FP_TIMESERIES_STORE_HEADER_DTYPE)
+    try:
+        if not os.path.isdir(IONOSPHERE_FP_TIMESERIES_STORE_DIR):
+            mkdir_p(IONOSPHERE_FP_TIMESERIES_STORE_DIR)
+        with open(tmp_store_path, 'wb') as f:
+            f.write(header.tobytes())
+            f.write(index.tobytes())
+            for arrays, dtype in [(timestamps_arrays, '<i8'), (values_arrays, '<f8'), (minmax_values_arrays, '<f8')]:
+                for array in arrays:
+                    f.write(array.astype(dtype, copy=False).tobytes())
+        os.replace(tmp_store_path, store_path)
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to write %s, err: %s' % (
+            function_str, store_path, err))
+        if os.path.isfile(tmp_store_path):
+            try:
+                os.remove(tmp_store_path)
+            except OSError:
+                pass
+        return False
+    return True
+
+
+def remove_fp_timeseries_store_fps(current_skyline_app, metric_id, fp_ids):
+    """
+    Remove the time series of fp_ids that have been disabled or deleted from
+    the store file of a metric.  The store file is removed if no fps remain.
+
+    :param current_skyline_app: the app calling the function
+    :param metric_id: the metric id
+    :param fp_ids: the fp ids to remove
+    :type current_skyline_app: str
+    :type metric_id: int
+    :type fp_ids: list
+    :return: success
+    :rtype: boolean
+
+    """
+    function_str = 'functions.ionosphere.fp_timeseries_store.remove_fp_timeseries_store_fps'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    fp_ids = set(int(fp_id) for fp_id in fp_ids)
+    stored_fp_timeseries = load_fp_timeseries_store(current_skyline_app, metric_id)
+    if not fp_ids.intersection(stored_fp_timeseries):
+        return True
+    new_store = {
+        fp_id: fp_data for fp_id, fp_data in stored_fp_timeseries.items()
+        if fp_id not in fp_ids}
+    fp_timeseries_stores.pop(int(metric_id), None)
+    if new_store:
+        success = write_fp_timeseries_store(current_skyline_app, metric_id, new_store)
+    else:
+        success = True
+        try:
+            os.remove(get_fp_timeseries_store_path(metric_id))
+        except FileNotFoundError:
+            pass
+        except Exception as err:
+            current_logger.error('error :: %s :: failed to remove %s, err: %s' % (
+                function_str, get_fp_timeseries_store_path(metric_id), err))
+            success = False
+    if success:
+        current_logger.info('%s :: removed fp ids %s from the store of metric id %s' % (
+            function_str, str(sorted(fp_ids)), str(metric_id)))
+    return success
+
+
+def get_stored_fp_timeseries(
+        current_skyline_app, metric_id, fp_ids, engine=None):
+    """
+    Return the fp time series of the fp_ids of a metric from the fp time series
+    store, in the form returned by load_fp_timeseries_store.  The time series of
+    any fp_ids that are not in the store are fetched from the z_ts_<metric_id>
+    table in one query and added to the store.  If the time series of an fp_id
+    cannot be determined the fp_id is not in the returned dict.
+
+    :param current_skyline_app: the app calling the function
+    :param metric_id: the metric id
+    :param fp_ids: the fp ids to return the time series of
+    :param engine: an optional engine to use
+    :type current_skyline_app: str
+    :type metric_id: int
+    :type fp_ids: list
+    :type engine: object
+    :return: fp_timeseries
+    :rtype: dict
+
+    """
+    function_str = 'functions.ionosphere.fp_timeseries_store.get_stored_fp_timeseries'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    start = time()
+    fp_ids = [int(fp_id) for fp_id in fp_ids]
+    stored_fp_timeseries = load_fp_timeseries_store(current_skyline_app, metric_id)
+    missing_fp_ids = [fp_id for fp_id in fp_ids if fp_id not in stored_fp_timeseries]
+
+    added_fp_timeseries = {}
+    if missing_fp_ids:
+        dispose_engine = False
+        metric_fp_ts_table = 'z_ts_%s' % str(metric_id)
+        fps_rows = {}
+        try:
+            if not engine:
+                engine, fail_msg, trace = get_engine(current_skyline_app)
+                dispose_engine = True
+            use_table_meta = MetaData()
+            use_table = Table(metric_fp_ts_table, use_table_meta, autoload_with=engine)
+            stmt = select(use_table.c.fp_id, use_table.c.timestamp, use_table.c.value).where(
+                use_table.c.fp_id.in_(missing_fp_ids))
+            with engine.connect() as connection:
+                result = connection.execute(stmt)
+                for row in result.fetchall():
+                    # The same rows that get_db_fp_timeseries returns
+                    if not row.timestamp or row.value is None:
+                        continue
+                    row_fp_id = int(row.fp_id)
+                    if row_fp_id not in fps_rows:
+                        fps_rows[row_fp_id] = []
+                    fps_rows[row_fp_id].append((int(row.timestamp), float(row.value)))
+        except Exception as err:
+            current_logger.error(traceback.format_exc())
+            current_logger.error('error :: %s :: could not determine timestamps and values from %s, err: %s' % (
+                function_str, metric_fp_ts_table, err))
+        if dispose_engine and engine:
+            engine_disposal(current_skyline_app, engine)
+        for fp_id, fp_rows in fps_rows.items():
+            fp_array = np.array(fp_rows, dtype=np.float64)
+            added_fp_timeseries[fp_id] = {
+                'timestamps': fp_array[:, 0].astype(np.int64),
+                'values': fp_array[:, 1],
+            }
+
+    if added_fp_timeseries:
+        new_store = dict(stored_fp_timeseries)
+        new_store.update(added_fp_timeseries)
+        if write_fp_timeseries_store(current_skyline_app, metric_id, new_store):
+            stored_fp_timeseries = load_fp_timeseries_store(current_skyline_app, metric_id)
+        else:
+            # Use the fetched data even if the store could not be written
+            stored_fp_timeseries = dict(stored_fp_timeseries)
+            for fp_id, fp_data in added_fp_timeseries.items():
+                fp_values = fp_data['values']
+                stored_fp_timeseries[fp_id] = {
+                    'timestamps': fp_data['timestamps'],
+                    'values': fp_values,
+                    'minmax_values': minmax_scale(fp_values),
+                    'min': float(fp_values.min()),
+                    'max': float(fp_values.max()),
+                }
+
+    fp_timeseries = {
+        fp_id: stored_fp_timeseries[fp_id] for fp_id in fp_ids
+        if fp_id in stored_fp_timeseries}
+    current_logger.info('%s :: %s fp time series (%s fps from the DB) for metric id %s in %.6f seconds' % (
+        function_str, str(len(fp_timeseries)), str(len(added_fp_timeseries)),
+        str(metric_id), (time() - start)))
+    return fp_timeseries
+
+
+def fp_timeseries_to_list(fp_data):
+    """
+    Return a stored fp time series as a list [[ts, value],...,[ts, value]],
+    the form returned by get_db_fp_timeseries.
+
+    :param fp_data: a fp dict from get_stored_fp_timeseries
+    :type fp_data: dict
+    :return: timeseries
+    :rtype: list
+
+    """
+    return [list(item) for item in zip(fp_data['timestamps'].tolist(), fp_data['values'].tolist())]
@@ -0,0 +1,196 @@
+"""
+get_fp_features_matrix.py
+"""
+import logging
+import traceback
+from time import time
+
+import numpy as np
+from msgpack import packb, unpackb
+from sqlalchemy import select, Table, MetaData
+
+from skyline_functions import get_redis_conn
+from database import get_engine, engine_disposal
+
+# @added 20261029 - Feature #5771: ionosphere - fp features matrix
+# The features of a features profile do not change once the features profile is
+# created, so the features of all the features profiles of a metric are cached
+# as a matrix with a row per fp id and a column per feature id.  The matrix is
+# only updated when the fp ids of the metric change, the features of added fp
+# ids are fetched from the DB and the rows of fp ids that are disabled or
+# no longer checked are removed.
+FP_FEATURES_MATRIX_REDIS_KEY_PREFIX = 'ionosphere.fp_features_matrix'
+FP_FEATURES_MATRIX_REDIS_KEY_TTL = 86400
+
+
+def get_fp_features_matrix(
+        current_skyline_app, metric_id, fp_ids, engine=None, redis_conn=None):
+    """
+    Return the features of the fp_ids of a metric as a matrix, from the Redis
+    cache or the z_fp_<metric_id> table, e.g.:
+
+    fp_features_matrix = {
+        'fp_ids': [1, 2],
+        'feature_ids': [1, 2, 3],
+        'values': np.array([[1.1, 0.0, 2.3], [1.0, np.nan, 2.2]]),
+    }
+
+    A feature that a features profile does not have is nan.  If the features of
+    any fp_id cannot be determined the fp_id is not in the matrix.
+
+    :param current_skyline_app: the app calling the function
+    :param metric_id: the metric id
+    :param fp_ids: the fp ids to return the features of
+    :param engine: an optional engine to use
+    :param redis_conn: an optional (not decoded) Redis connection to use
+    :type current_skyline_app: str
+    :type metric_id: int
+    :type fp_ids: list
+    :type engine: object
+    :type redis_conn: object
+    :return: fp_features_matrix
+    :rtype: dict
+
+    """
+    function_str = 'functions.ionosphere.get_fp_features_matrix'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    start = time()
+    fp_ids = [int(fp_id) for fp_id in fp_ids]
+    redis_key = '%s.%s' % (FP_FEATURES_MATRIX_REDIS_KEY_PREFIX, str(metric_id))
+
+    # Load the cached rows
+    fp_features = {}
+    try:
+        if not redis_conn:
+            redis_conn = get_redis_conn(current_skyline_app)
+        packed_matrix = redis_conn.get(redis_key)
+        if packed_matrix:
+            cached_matrix = unpackb(packed_matrix, raw=False)
+            cached_feature_ids = cached_matrix['feature_ids']
+            cached_values = np.frombuffer(cached_matrix['values'], dtype=np.float64).reshape(
+                len(cached_matrix['fp_ids']), len(cached_feature_ids))
+            for index, fp_id in enumerate(cached_matrix['fp_ids']):
+                row = cached_values[index]
+                present = ~np.isnan(row)
+                fp_features[fp_id] = dict(zip(
+                    [cached_feature_ids[i] for i in np.flatnonzero(present)],
+                    row[present].tolist()))
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to load %s, err: %s' % (
+            function_str, redis_key, err))
+        fp_features = {}
+
+    cached_fp_ids = set(fp_features.keys())
+    missing_fp_ids = [fp_id for fp_id in fp_ids if fp_id not in cached_fp_ids]
+    removed_fp_ids = [fp_id for fp_id in cached_fp_ids if fp_id not in fp_ids]
+
+    # Fetch the features of all the fp ids that are not cached in one query
+    if missing_fp_ids:
+        dispose_engine = False
+        metric_fp_table = 'z_fp_%s' % str(metric_id)
+        try:
+            if not engine:
+                engine, fail_msg, trace = get_engine(current_skyline_app)
+                dispose_engine = True
+            use_table_meta = MetaData()
+            use_table = Table(metric_fp_table, use_table_meta, autoload_with=engine)
+            stmt = select(use_table.c.fp_id, use_table.c.feature_id, use_table.c.value).where(
+                use_table.c.fp_id.in_(missing_fp_ids))
+            with engine.connect() as connection:
+                result = connection.execute(stmt)
+                for row in result.fetchall():
+                    row_fp_id = int(row.fp_id)
+                    if row_fp_id not in fp_features:
+                        fp_features[row_fp_id] = {}
+                    fp_features[row_fp_id][int(row.feature_id)] = float(row.value)
+        except Exception as err:
+            current_logger.error(traceback.format_exc())
+            current_logger.error('error :: %s :: could not determine features from %s, err: %s' % (
+                function_str, metric_fp_table, err))
+        if dispose_engine and engine:
+            engine_disposal(current_skyline_app, engine)
+
+    matrix_fp_ids = [fp_id for fp_id in fp_ids if fp_features.get(fp_id)]
+    feature_ids = sorted(set().union(*[fp_features[fp_id].keys() for fp_id in matrix_fp_ids]))
+    feature_indices = {feature_id: index for index, feature_id in enumerate(feature_ids)}
+    values = np.full((len(matrix_fp_ids), len(feature_ids)), np.nan, dtype=np.float64)
+    for index, fp_id in enumerate(matrix_fp_ids):
+        for feature_id, value in fp_features[fp_id].items():
+            values[index, feature_indices[feature_id]] = value
+    fp_features_matrix = {
+        'fp_ids': matrix_fp_ids,
+        'feature_ids': feature_ids,
+        'values': values,
+    }
+
+    # Update the cache if fp ids were added or removed
+    added_fp_ids = [fp_id for fp_id in missing_fp_ids if fp_id in matrix_fp_ids]
+    if added_fp_ids or removed_fp_ids:
+        try:
+            cache_data = {
+                'fp_ids': matrix_fp_ids,
+                'feature_ids': feature_ids,
+                'values': values.tobytes(),
+            }
+            redis_conn.setex(
+                redis_key, FP_FEATURES_MATRIX_REDIS_KEY_TTL,
+                packb(cache_data, use_bin_type=True))
+        except Exception as err:
+            current_logger.error(traceback.format_exc())
+            current_logger.error('error :: %s :: failed to set %s, err: %s' % (
+                function_str, redis_key, err))
+
+    current_logger.info('%s :: %s fps, %s features (%s fps from the DB, %s removed) for metric id %s in %.6f seconds' % (
+        function_str, str(len(matrix_fp_ids)), str(len(feature_ids)),
+        str(len(added_fp_ids)), str(len(removed_fp_ids)), str(metric_id),
+        (time() - start)))
+    return fp_features_matrix
+
+
+def get_fp_features_scores(fp_features_matrix, calc_features_by_id):
+    """
+    Compare the calculated features to the features of every features profile
+    in the fp_features_matrix in a single operation, returning the number of
+    common features and the sums of the common feature values of the features
+    profile and the calculated features for each fp id, e.g.:
+
+    fp_features_scores = {
+        1: {'count': 3, 'fp_sum': 3.4, 'calc_sum': 3.5},
+        2: {'count': 2, 'fp_sum': 3.2, 'calc_sum': 3.3},
+    }
+
+    :param fp_features_matrix: the fp_features_matrix from
+        get_fp_features_matrix
+    :param calc_features_by_id: the calculated features as a list of
+        [feature_id, value]
+    :type fp_features_matrix: dict
+    :type calc_features_by_id: list
+    :return: fp_features_scores
+    :rtype: dict
+
+    """
+    fp_features_scores = {}
+    if not fp_features_matrix or not fp_features_matrix['fp_ids']:
+        return fp_features_scores
+    feature_indices = {
+        feature_id: index for index, feature_id in enumerate(fp_features_matrix['feature_ids'])}
+    calc_values = np.full(len(feature_indices), np.nan, dtype=np.float64)
+    for feature_id, calc_value in calc_features_by_id:
+        index = feature_indices.get(int(feature_id))
+        if index is not None:
+            calc_values[index] = float(calc_value)
+    values = fp_features_matrix['values']
+    common = ~np.isnan(values) & ~np.isnan(calc_values)
+    counts = common.sum(axis=1)
+    fp_sums = np.where(common, values, 0.0).sum(axis=1)
+    calc_sums = np.where(common, calc_values, 0.0).sum(axis=1)
+    for index, fp_id in enumerate(fp_features_matrix['fp_ids']):
+        fp_features_scores[fp_id] = {
+            'count': int(counts[index]),
+            'fp_sum': float(fp_sums[index]),
+            'calc_sum': float(calc_sums[index]),
+        }
+    return fp_features_scores
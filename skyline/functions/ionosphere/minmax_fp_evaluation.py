@@ -0,0 +1,324 @@
+"""
+minmax_fp_evaluation.py
+"""
+import logging
+import traceback
+from ast import literal_eval
+from multiprocessing import Process, Queue
+from queue import Empty
+from time import time
+
+import numpy as np
+
+from functions.ionosphere.tsfresh_features import (
+    extract_tsfresh_features, get_fc_parameters)
+from functions.numpy.percent_different import get_percent_different
+
+
+# @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+def load_anomaly_json_timeseries(anomaly_json):
+    """
+    Load a training data time series json file as a list of [ts, value] in the
+    same way that the ionosphere minmax check does.
+
+    :param anomaly_json: the path of the json file
+    :type anomaly_json: str
+    :return: timeseries
+    :rtype: list
+
+    """
+    with open(anomaly_json, 'r') as f:
+        raw_timeseries = f.read()
+    timeseries_array_str = str(raw_timeseries).replace('(', '[').replace(')', ']')
+    if 'nan' in timeseries_array_str:
+        timeseries_array_str = timeseries_array_str.replace('nan', 'None').replace('NaN', 'None')
+    return literal_eval(timeseries_array_str)
+
+
+# @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+def minmax_ranges_similar(
+        min_fp_value, max_fp_value, min_anomalous_value, max_anomalous_value,
+        range_tolerance):
+    """
+    Determine if the ranges of a features profile time series and the anomalous
+    time series are similar enough to be compared with Min-Max scaling, the
+    same evaluation that the ionosphere minmax check makes.
+
+    :param min_fp_value: the min value of the fp time series
+    :param max_fp_value: the max value of the fp time series
+    :param min_anomalous_value: the min value of the anomalous time series
+    :param max_anomalous_value: the max value of the anomalous time series
+    :param range_tolerance: the IONOSPHERE_MINMAX_SCALING_RANGE_TOLERANCE
+    :type min_fp_value: float
+    :type max_fp_value: float
+    :type min_anomalous_value: float
+    :type max_anomalous_value: float
+    :type range_tolerance: float
+    :return: range_similar
+    :rtype: boolean
+
+    """
+    lower_range_similar = False
+    upper_range_similar = False
+    try:
+        if int(min_fp_value) == int(min_anomalous_value):
+            lower_range_similar = True
+        elif min_fp_value and min_anomalous_value:
+            lower_min_fp_value = int(min_fp_value - (min_fp_value * range_tolerance))
+            upper_min_fp_value = int(min_fp_value + (min_fp_value * range_tolerance))
+            if int(min_anomalous_value) in range(lower_min_fp_value, upper_min_fp_value):
+                lower_range_similar = True
+        if int(max_fp_value) == int(max_anomalous_value):
+            upper_range_similar = True
+        elif max_fp_value and max_anomalous_value and lower_range_similar:
+            lower_max_fp_value = int(max_fp_value - (max_fp_value * range_tolerance))
+            upper_max_fp_value = int(max_fp_value + (max_fp_value * range_tolerance))
+            if int(max_anomalous_value) in range(lower_max_fp_value, upper_max_fp_value):
+                upper_range_similar = True
+    except (TypeError, ValueError, OverflowError):
+        return False
+    return lower_range_similar and upper_range_similar
+
+
+# @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+def is_minmax_match(minmax_fp_features_sum, minmax_anomalous_features_sum, percent_similar):
+    """
+    Determine if the minmax scaled features sums match, in the same way that
+    the ionosphere minmax check does.
+
+    :param minmax_fp_features_sum: the minmax scaled fp features sum
+    :param minmax_anomalous_features_sum: the minmax scaled anomalous features
+        sum
+    :param percent_similar: the percent similar to match within
+    :type minmax_fp_features_sum: float
+    :type minmax_anomalous_features_sum: float
+    :type percent_similar: float
+    :return: matched
+    :rtype: boolean
+
+    """
+    if not minmax_fp_features_sum or not minmax_anomalous_features_sum:
+        return False
+    percent_different = get_percent_different(minmax_fp_features_sum, minmax_anomalous_features_sum, True)
+    if not percent_different:
+        return False
+    return abs(percent_different) < float(percent_similar)
+
+
+# @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+def get_minmax_features(
+        current_skyline_app, timestamps, minmax_values, metric_name='metric',
+        n_jobs=None):
+    """
+    Calculate the features count and features sum of a minmax scaled time
+    series with the EfficientFCParameters, the values that the ionosphere
+    minmax check compares and stores in the ionosphere_minmax table.  The count
+    is the number of features calculated and the sum is the sum of the features
+    that have a value.
+
+    :param current_skyline_app: the app calling the function
+    :param timestamps: the timestamps
+    :param minmax_values: the minmax scaled values
+    :param metric_name: the metric name to use as the tsfresh column_id
+    :param n_jobs: the tsfresh n_jobs
+    :type current_skyline_app: str
+    :type timestamps: array
+    :type minmax_values: array
+    :type metric_name: str
+    :type n_jobs: int
+    :return: (features_count, features_sum, calc_time)
+    :rtype: tuple
+
+    """
+    start = time()
+    timeseries = np.column_stack((
+        np.asarray(timestamps, dtype=np.float64),
+        np.asarray(minmax_values, dtype=np.float64)))
+    fc_parameters, feature_set = get_fc_parameters('efficient')
+    df_t, feature_extraction_time = extract_tsfresh_features(
+        current_skyline_app, timeseries, metric_name=metric_name,
+        fc_parameters=fc_parameters, n_jobs=n_jobs)
+    feature_values = df_t.iloc[:, 0].to_numpy(dtype=np.float64)
+    return int(len(feature_values)), float(np.nansum(feature_values)), (time() - start)
+
+
+def minmax_features_worker(current_skyline_app, jobs_queue, results_queue):
+    """
+    A worker process that calculates the minmax features of the fp jobs on the
+    jobs_queue until it gets None and puts the results on the results_queue.
+    """
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+    while True:
+        job = jobs_queue.get()
+        if job is None:
+            break
+        fp_id, timestamps, minmax_values = job
+        try:
+            features_count, features_sum, calc_time = get_minmax_features(
+                current_skyline_app, timestamps, minmax_values, n_jobs=0)
+        except Exception as err:
+            current_logger.error(traceback.format_exc())
+            current_logger.error('error :: minmax_features_worker :: get_minmax_features failed for fp id %s - %s' % (
+                str(fp_id), err))
+            features_count, features_sum, calc_time = None, None, None
+        results_queue.put((fp_id, features_count, features_sum, calc_time))
+
+
+# @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+def evaluate_minmax_fps_parallel(
+        current_skyline_app, candidates, minmax_anomalous_features_sum,
+        processes=2, timeout=60):
+    """
+    Calculate the minmax features of the features profiles of a check in a
+    bounded pool of processes and stop as soon as the first fp that matches is
+    known.  The candidates are in the order that the fps are checked in, each
+    a dict with the fp_id, the percent_similar to match within and either the
+    features_sum from the ionosphere_minmax table or the timestamps and
+    minmax_values to calculate the features from.  The first match is only
+    known once every candidate before it has been evaluated, so the fp that
+    matches is the same fp that would match if the fps were evaluated
+    sequentially.  Returns the calculated minmax features and the matched fp
+    id, e.g.:
+
+    minmax_evaluation = {
+        'fp_minmax_features': {
+            123: {'features_count': 210, 'features_sum': 3787.6, 'calc_time': 1.18},
+        },
+        'matched_fp_id': 123,
+        'calculated': 3,
+        'not_calculated': 5,
+    }
+
+    :param current_skyline_app: the app calling the function
+    :param candidates: the fp candidates
+    :param minmax_anomalous_features_sum: the minmax scaled anomalous features
+        sum
+    :param processes: the maximum number of processes to use
+    :param timeout: the maximum number of seconds to run for
+    :type current_skyline_app: str
+    :type candidates: list
+    :type minmax_anomalous_features_sum: float
+    :type processes: int
+    :type timeout: int
+    :return: minmax_evaluation
+    :rtype: dict
+
+    """
+    function_str = 'functions.ionosphere.minmax_fp_evaluation.evaluate_minmax_fps_parallel'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    start = time()
+    fp_minmax_features = {}
+    matches = {}
+    evaluated = set()
+    jobs = []
+    for candidate in candidates:
+        fp_id = candidate['fp_id']
+        if candidate.get('features_sum') is not None:
+            matches[fp_id] = is_minmax_match(
+                candidate['features_sum'], minmax_anomalous_features_sum,
+                candidate['percent_similar'])
+            evaluated.add(fp_id)
+        else:
+            jobs.append(candidate)
+    percent_similars = {candidate['fp_id']: candidate['percent_similar'] for candidate in candidates}
+
+    def get_matched_fp_id():
+        for candidate in candidates:
+            if candidate['fp_id'] not in evaluated:
+                return None
+            if matches.get(candidate['fp_id']):
+                return candidate['fp_id']
+        return None
+
+    matched_fp_id = get_matched_fp_id()
+    pids = []
+    if jobs and matched_fp_id is None:
+        jobs_queue = Queue()
+        results_queue = Queue()
+        use_processes = max(1, min(int(processes), len(jobs)))
+        # Only one job per process is queued at a time and the next job is
+        # queued when a result is received, so that no jobs are left in the
+        # jobs_queue when the processes are terminated on the first match
+        jobs_queued = [0]
+
+        def queue_next_job():
+            if jobs_queued[0] < len(jobs):
+                job = jobs[jobs_queued[0]]
+                jobs_queue.put((
+                    job['fp_id'], np.asarray(job['timestamps']).tolist(),
+                    np.asarray(job['minmax_values']).tolist()))
+            else:
+                jobs_queue.put(None)
+            jobs_queued[0] += 1
+
+        for i in range(use_processes):
+            queue_next_job()
+        for i in range(use_processes):
+            p = Process(target=minmax_features_worker, args=(current_skyline_app, jobs_queue, results_queue))
+            pids.append(p)
+            p.start()
+        results_count = 0
+        while results_count < len(jobs):
+            remaining = timeout - (time() - start)
+            if remaining <= 0:
+                current_logger.info('%s :: timed out after %s seconds' % (function_str, str(timeout)))
+                break
+            try:
+                fp_id, features_count, features_sum, calc_time = results_queue.get(timeout=remaining)
+            except Empty:
+                current_logger.info('%s :: timed out after %s seconds' % (function_str, str(timeout)))
+                break
+            except Exception as err:
+                current_logger.error(traceback.format_exc())
+                current_logger.error('error :: %s :: failed to get result, err: %s' % (function_str, err))
+                break
+            results_count += 1
+            evaluated.add(fp_id)
+            queue_next_job()
+            if features_count is None:
+                current_logger.error('error :: %s :: failed to calculate minmax features for fp id %s' % (
+                    function_str, str(fp_id)))
+                continue
+            fp_minmax_features[fp_id] = {
+                'features_count': features_count,
+                'features_sum': features_sum,
+                'calc_time': calc_time,
+            }
+            matches[fp_id] = is_minmax_match(
+                features_sum, minmax_anomalous_features_sum, percent_similars[fp_id])
+            matched_fp_id = get_matched_fp_id()
+            if matched_fp_id is not None:
+                break
+        for p in pids:
+            if p.is_alive():
+                try:
+                    p.terminate()
+                except Exception as err:
+                    current_logger.error('error :: %s :: failed to terminate process, err: %s' % (
+                        function_str, err))
+        for p in pids:
+            p.join(timeout=5)
+        # Do not wait for the queue feeder threads to flush any items that
+        # were not consumed by the terminated processes, otherwise the calling
+        # process cannot exit
+        for mp_queue in [jobs_queue, results_queue]:
+            try:
+                mp_queue.cancel_join_thread()
+                mp_queue.close()
+            except Exception as err:
+                current_logger.error('error :: %s :: failed to close queue, err: %s' % (
+                    function_str, err))
+
+    minmax_evaluation = {
+        'fp_minmax_features': fp_minmax_features,
+        'matched_fp_id': matched_fp_id,
+        'calculated': len(fp_minmax_features),
+        'not_calculated': len(jobs) - len(fp_minmax_features),
+    }
+    current_logger.info('%s :: %s candidates, calculated minmax features for %s of %s fps with %s processes, matched_fp_id: %s in %.6f seconds' % (
+        function_str, str(len(candidates)), str(len(fp_minmax_features)),
+        str(len(jobs)), str(len(pids)), str(matched_fp_id), (time() - start)))
+    return minmax_evaluation
@@ -0,0 +1,275 @@
+"""
+motif_search.py
+"""
+import logging
+from timeit import default_timer as timer
+
+import numpy as np
+from scipy.fft import rfft, irfft, next_fast_len
+from scipy.ndimage import minimum_filter1d, maximum_filter1d
+
+
+# @added 20261101 - Feature #5774: ionosphere - batched motif search
+def get_motif_search_method(fp_timeseries_length, batch_size, query_length, top_matches):
+    """
+    Determine which MASS method inference would use to search a features
+    profile time series for a batch_size motif, with the same conditions that
+    inference applies to mts.mass2_batch and mts.mass3, e.g.:
+
+    ('mass2_batch', 18, None) or ('mass3', None, None) or
+    (None, None, 'the batch_size is too close to length')
+
+    :param fp_timeseries_length: the length of the fp time series
+    :param batch_size: the batch_size
+    :param query_length: the length of the query subsequence
+    :param top_matches: the top_matches to find with mass2_batch
+    :type fp_timeseries_length: int
+    :type batch_size: int
+    :type query_length: int
+    :type top_matches: int
+    :return: (method, use_top_matches, skip_reason)
+    :rtype: tuple
+
+    """
+    n = int(fp_timeseries_length)
+    indices_count = len(range(0, n - batch_size + 1, batch_size))
+    method = 'mass2_batch'
+    use_top_matches = None
+    if indices_count < 3:
+        method = 'mass3'
+    if method == 'mass2_batch':
+        use_top_matches = top_matches
+        if (n / int(batch_size)) <= int(top_matches):
+            use_top_matches = round(n / int(batch_size)) - 2
+            if use_top_matches == 2:
+                use_top_matches = 1
+            if use_top_matches < 1:
+                use_top_matches = 1
+        if not isinstance(use_top_matches, int) or use_top_matches < 1:
+            return None, None, 'top_matches must be an integer > 0'
+        # mass2_batch np.argpartition would be out of bounds
+        if use_top_matches >= indices_count:
+            method = 'mass3'
+            use_top_matches = None
+    if method == 'mass3':
+        pieces = n - query_length
+        if pieces < query_length:
+            pieces = query_length + 2
+        if n <= pieces:
+            return None, None, 'fp_timeseries length is not long enough for the query size'
+        ten_percent_of_batch_size = int(batch_size / 10)
+        if (n - ten_percent_of_batch_size) < batch_size:
+            return None, None, 'the batch_size is too close to length'
+    return method, use_top_matches, None
+
+
+# @added 20261101 - Feature #5774: ionosphere - batched motif search
+def sliding_distance_profiles(fps_values, query, fft_cache=None):
+    """
+    Compute the z-normalised Euclidean distance profile of the query against
+    every features profile time series in a single batched FFT convolution.
+    The distance at position p is the distance of the query to
+    fp_values[p:p + len(query)], the same distance that mts.mass2 and mts.mass3
+    compute.  A window or query with no variance has a nan distance.
+
+    The FFTs of the fp time series are stored in the fft_cache keyed by
+    (fp_id, fft_length) so that each fp time series is only transformed once
+    for all the queries it is searched for.
+
+    :param fps_values: a dict of fp_id and the fp values as a float64 array
+    :param query: the query values
+    :param fft_cache: an optional dict to cache the fp time series FFTs
+    :type fps_values: dict
+    :type query: array
+    :type fft_cache: dict
+    :return: distance_profiles
+    :rtype: dict
+
+    """
+    distance_profiles = {}
+    query = np.asarray(query, dtype=np.float64)
+    m = len(query)
+    fp_ids = [fp_id for fp_id, values in fps_values.items() if len(values) >= m]
+    if not fp_ids or m == 0:
+        return distance_profiles
+    if fft_cache is None:
+        fft_cache = {}
+    fft_length = next_fast_len(max(len(fps_values[fp_id]) for fp_id in fp_ids))
+
+    uncached_fp_ids = [fp_id for fp_id in fp_ids if (fp_id, fft_length) not in fft_cache]
+    if uncached_fp_ids:
+        padded = np.zeros((len(uncached_fp_ids), fft_length), dtype=np.float64)
+        for row, fp_id in enumerate(uncached_fp_ids):
+            values = fps_values[fp_id]
+            padded[row, :len(values)] = values
+        ffts = rfft(padded, axis=1)
+        for row, fp_id in enumerate(uncached_fp_ids):
+            fft_cache[(fp_id, fft_length)] = ffts[row]
+
+    reversed_query = np.zeros(fft_length, dtype=np.float64)
+    reversed_query[:m] = query[::-1]
+    query_fft = rfft(reversed_query)
+    fps_ffts = np.vstack([fft_cache[(fp_id, fft_length)] for fp_id in fp_ids])
+    dot_products = irfft(fps_ffts * query_fft, n=fft_length, axis=1)
+
+    mean_query = query.mean()
+    std_query = query.std()
+    for row, fp_id in enumerate(fp_ids):
+        values = fps_values[fp_id]
+        n = len(values)
+        # Centre the values before the cumulative sums to limit the loss of
+        # precision on large values
+        centre = values.mean()
+        centred = values - centre
+        cumsum = np.concatenate(([0.0], np.cumsum(centred)))
+        cumsum_sq = np.concatenate(([0.0], np.cumsum(centred * centred)))
+        window_means = (cumsum[m:] - cumsum[:-m]) / m
+        window_vars = ((cumsum_sq[m:] - cumsum_sq[:-m]) / m) - (window_means * window_means)
+        window_stds = np.sqrt(np.clip(window_vars, 0.0, None))
+        window_means = window_means + centre
+        dots = dot_products[row, (m - 1):n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            squared = 2 * (m - (dots - m * window_means * mean_query) / (window_stds * std_query))
+        squared[~np.isfinite(squared)] = np.nan
+        distance_profiles[fp_id] = np.sqrt(np.clip(squared, 0.0, None))
+    return distance_profiles
+
+
+# @added 20261101 - Feature #5774: ionosphere - batched motif search
+def batched_motif_search(current_skyline_app, search_jobs, fft_cache=None):
+    """
+    Run the motif search jobs of all the features profiles of a metric in
+    batches.  All the jobs that search for the same query are computed in one
+    batched FFT convolution with sliding_distance_profiles and the mass2_batch
+    and mass3 candidates are then selected from the distance profiles.
+
+    Candidates are pruned before they are returned if they would be removed in
+    the inference motifs evaluation anyway, if the distance is nan or greater
+    than the max_distance or if the fp window is not in the padded range of
+    the query, the all_in_range evaluation.  The window range uses the same
+    index to index + batch_size window that the inference evaluation uses.
+
+    Each search job is a dict with the keys fp_id, fp_values, query,
+    batch_size, method, use_top_matches, max_distance, min_y, max_y,
+    range_padding, min_y_padded, max_y_padded and find_exact_matches.  The
+    result of each job, in the order of the search_jobs, is a dict of the
+    indices and dists of the motifs in the form that inference creates from
+    the mts.mass2_batch and mts.mass3 results, the exact_match_indices and the
+    candidates and pruned counts.
+
+    :param current_skyline_app: the app calling the function
+    :param search_jobs: the search jobs
+    :param fft_cache: an optional dict to cache the fp time series FFTs in
+        across calls
+    :type current_skyline_app: str
+    :type search_jobs: list
+    :type fft_cache: dict
+    :return: results
+    :rtype: list
+
+    """
+    function_str = 'functions.ionosphere.motif_search.batched_motif_search'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    start = timer()
+    if fft_cache is None:
+        fft_cache = {}
+    results = [None] * len(search_jobs)
+
+    # Group the jobs that search for the same query
+    query_groups = {}
+    for job_index, job in enumerate(search_jobs):
+        query = np.asarray(job['query'], dtype=np.float64)
+        query_key = (int(job['batch_size']), query.tobytes())
+        if query_key not in query_groups:
+            query_groups[query_key] = {'query': query, 'job_indices': []}
+        query_groups[query_key]['job_indices'].append(job_index)
+
+    window_ranges = {}
+    for query_key, query_group in query_groups.items():
+        query = query_group['query']
+        m = len(query)
+        fps_values = {}
+        for job_index in query_group['job_indices']:
+            job = search_jobs[job_index]
+            fps_values[job['fp_id']] = job['fp_values']
+        distance_profiles = sliding_distance_profiles(fps_values, query, fft_cache)
+
+        for job_index in query_group['job_indices']:
+            job = search_jobs[job_index]
+            result = {
+                'indices': [], 'dists': [], 'exact_match_indices': [],
+                'candidates': 0, 'pruned': 0,
+            }
+            results[job_index] = result
+            profile = distance_profiles.get(job['fp_id'])
+            if profile is None:
+                continue
+            values = job['fp_values']
+            n = len(values)
+            batch_size = int(job['batch_size'])
+
+            if job['method'] == 'mass2_batch':
+                # The minimum distance in each batch_size block, as
+                # mts.mass2_batch determines per subsequence
+                block_starts = np.arange(0, n - batch_size + 1, batch_size)
+                positions_per_block = batch_size - m + 1
+                if positions_per_block < 1:
+                    continue
+                block_positions = block_starts[:, None] + np.arange(positions_per_block)[None, :]
+                block_dists = profile[block_positions]
+                sortable = np.where(np.isnan(block_dists), np.inf, block_dists)
+                min_offsets = np.argmin(sortable, axis=1)
+                block_rows = np.arange(len(block_starts))
+                indices = block_positions[block_rows, min_offsets]
+                dists = block_dists[block_rows, min_offsets]
+                top_indices = np.argpartition(
+                    np.where(np.isnan(dists), np.inf, dists),
+                    job['use_top_matches'])[0:job['use_top_matches']]
+                indices = indices[top_indices]
+                dists = dists[top_indices]
+            else:
+                # inference indexes the mts.mass3 distance profile from the end
+                # of the first query length window
+                dists = profile
+                indices = np.arange(len(profile)) + (m - 1)
+            result['candidates'] = int(len(dists))
+
+            with np.errstate(invalid='ignore'):
+                keep = ~np.isnan(dists) & (dists <= job['max_distance'])
+            # Exact distance matches are evaluated as exact in inference
+            check_range = keep & (dists != 0)
+            if np.any(check_range):
+                if (job['fp_id'], batch_size) not in window_ranges:
+                    # The min and max of each index:index + batch_size window,
+                    # truncated at the end of the time series as the slice in
+                    # inference is
+                    origin = -(batch_size // 2)
+                    window_ranges[(job['fp_id'], batch_size)] = (
+                        minimum_filter1d(values, size=batch_size, mode='constant', cval=np.inf, origin=origin),
+                        maximum_filter1d(values, size=batch_size, mode='constant', cval=-np.inf, origin=origin))
+                window_mins, window_maxs = window_ranges[(job['fp_id'], batch_size)]
+                range_indices = np.clip(indices, 0, n - 1)
+                window_min = window_mins[range_indices]
+                window_max = window_maxs[range_indices]
+                in_range = (
+                    (window_min >= job['min_y_padded']) & (window_max <= job['max_y_padded'])
+                    & (window_max >= (job['max_y'] - job['range_padding']))
+                    & (window_min <= (job['min_y'] + job['range_padding'])))
+                keep = keep & (~check_range | in_range)
+            result['pruned'] = int(len(dists) - np.count_nonzero(keep))
+            result['indices'] = indices[keep].tolist()
+            result['dists'] = dists[keep].tolist()
+
+            if job['method'] == 'mass2_batch' and job['find_exact_matches']:
+                # The batch_size subsequence at each index that equals the
+                # query, as the inference exact match iteration compares
+                first_value_positions = np.flatnonzero(values[:(n - m + 1)] == query[0])
+                result['exact_match_indices'] = [
+                    int(position) for position in first_value_positions
+                    if position < (n - 1) and np.array_equal(values[position:(position + batch_size)], query)]
+
+    current_logger.info('%s :: %s search jobs in %s query batches in %.6f seconds' % (
+        function_str, str(len(search_jobs)), str(len(query_groups)), (timer() - start)))
+    return results
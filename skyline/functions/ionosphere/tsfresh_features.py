@@ -0,0 +1,213 @@
+"""
+tsfresh_features.py
+"""
+import logging
+from timeit import default_timer as timer
+
+import numpy as np
+import pandas as pd
+
+from tsfresh.feature_extraction import extract_features, EfficientFCParameters
+
+import settings
+
+# @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+TSFRESH_FEATURE_SETS = ['efficient', 'fast']
+try:
+    IONOSPHERE_TSFRESH_FEATURE_SET = str(settings.IONOSPHERE_TSFRESH_FEATURE_SET)
+except:
+    IONOSPHERE_TSFRESH_FEATURE_SET = 'efficient'
+if IONOSPHERE_TSFRESH_FEATURE_SET not in TSFRESH_FEATURE_SETS:
+    IONOSPHERE_TSFRESH_FEATURE_SET = 'efficient'
+try:
+    IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS = list(settings.IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS)
+except:
+    IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS = [
+        'agg_linear_trend', 'ar_coefficient', 'augmented_dickey_fuller',
+        'change_quantiles', 'cwt_coefficients', 'friedrich_coefficients',
+        'lempel_ziv_complexity', 'max_langevin_fixed_point', 'number_cwt_peaks',
+        'partial_autocorrelation', 'permutation_entropy',
+    ]
+
+
+# @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+def get_fc_parameters(feature_set=None):
+    """
+    Return the tsfresh feature calculator parameters of a feature set, the
+    'efficient' set is EfficientFCParameters and the 'fast' set is
+    EfficientFCParameters without the IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS.
+
+    :param feature_set: the feature set, defaults to
+        IONOSPHERE_TSFRESH_FEATURE_SET
+    :type feature_set: str
+    :return: (fc_parameters, feature_set)
+    :rtype: tuple
+
+    """
+    if not feature_set:
+        feature_set = IONOSPHERE_TSFRESH_FEATURE_SET
+    fc_parameters = EfficientFCParameters()
+    if feature_set == 'fast':
+        for calculator in IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS:
+            fc_parameters.pop(calculator, None)
+    else:
+        feature_set = 'efficient'
+    return fc_parameters, feature_set
+
+
+def extract_tsfresh_features(
+        current_skyline_app, timeseries, metric_name='metric',
+        fc_parameters=None, n_jobs=None):
+    """
+    Extract the tsfresh features of a time series in memory, without writing
+    the time series to a tsfresh input csv file and reading it back.  Returns
+    the features transposed as they are saved to the
+    tsfresh.input.csv.features.transposed.csv file, a DataFrame indexed by
+    feature name with a single column of values.
+
+    :param current_skyline_app: the app calling the function
+    :param timeseries: the time series as a list [[ts, value],...,[ts, value]],
+        a 2 dimensional numpy array or a pandas Series of values indexed by
+        timestamp
+    :param metric_name: the metric name to use as the tsfresh column_id
+    :param fc_parameters: the tsfresh feature calculator parameters, defaults
+        to EfficientFCParameters
+    :param n_jobs: the tsfresh n_jobs, defaults to the tsfresh default, 0 runs
+        the extraction in process
+    :type current_skyline_app: str
+    :type timeseries: list
+    :type metric_name: str
+    :type fc_parameters: dict
+    :type n_jobs: int
+    :return: (df_features_transposed, feature_extraction_time)
+    :rtype: tuple
+
+    """
+    function_str = 'functions.ionosphere.tsfresh_features.extract_tsfresh_features'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    if isinstance(timeseries, pd.Series):
+        timestamps = timeseries.index.to_numpy()
+        values = timeseries.to_numpy()
+    else:
+        timeseries_array = np.asarray(timeseries, dtype=np.float64)
+        timestamps = timeseries_array[:, 0]
+        values = timeseries_array[:, 1]
+    # The same types as the DataFrame read from the tsfresh input csv file
+    df = pd.DataFrame({
+        'metric': str(metric_name),
+        'timestamp': timestamps.astype(np.int64),
+        'value': values.astype(np.float64),
+    })
+    if fc_parameters is None:
+        fc_parameters = EfficientFCParameters()
+
+    # @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+    extract_kwargs = {}
+    if n_jobs is not None:
+        extract_kwargs['n_jobs'] = int(n_jobs)
+
+    start_feature_extraction = timer()
+    df_features = extract_features(
+        df, default_fc_parameters=fc_parameters,
+        column_id='metric', column_sort='timestamp', column_kind=None,
+        column_value=None, disable_progressbar=True, **extract_kwargs)
+    feature_extraction_time = timer() - start_feature_extraction
+    current_logger.info('%s :: extracted %s features from %s data points in %.6f seconds' % (
+        function_str, str(df_features.shape[1]), str(len(df)),
+        feature_extraction_time))
+    return df_features.transpose(), feature_extraction_time
+
+
+def get_calculated_features_from_df(df_features_transposed):
+    """
+    Return the calculated features from the transposed features DataFrame in
+    the same form as they are returned from the
+    tsfresh.input.csv.features.transposed.csv file by get_calculated_features,
+    a list of [feature_name, value].  Features with no value are not included.
+
+    :param df_features_transposed: the DataFrame from extract_tsfresh_features
+    :type df_features_transposed: pandas.DataFrame
+    :return: calculated_features
+    :rtype: list
+
+    """
+    calculated_features = []
+    feature_values = df_features_transposed.iloc[:, 0]
+    for feature_name, calc_value in zip(feature_values.index, feature_values.to_numpy(dtype=np.float64)):
+        if np.isnan(calc_value):
+            continue
+        feature_name = str(feature_name)
+        if ',' in feature_name:
+            feature_name = '"%s"' % feature_name
+        calculated_features.append([feature_name, float(calc_value)])
+    return calculated_features
+
+
+# @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+def time_tsfresh_calculators(
+        current_skyline_app, timeseries, fc_parameters=None, loops=1):
+    """
+    Time each tsfresh feature calculator on a time series, calculator by
+    calculator, to determine which calculators account for the feature
+    extraction time, e.g.:
+
+    calculator_timings = {
+        'cwt_coefficients': {'time': 0.151231, 'features': 60},
+        'mean': {'time': 0.000904, 'features': 1},
+    }
+
+    The extraction is run in process (n_jobs=0) so that the timings are not
+    skewed by the multiprocessing overhead.
+
+    :param current_skyline_app: the app calling the function
+    :param timeseries: the time series as a list [[ts, value],...,[ts, value]]
+    :param fc_parameters: the tsfresh feature calculator parameters to time,
+        defaults to EfficientFCParameters
+    :param loops: the number of times to run each calculator, the time is
+        the mean of the loops
+    :type current_skyline_app: str
+    :type timeseries: list
+    :type fc_parameters: dict
+    :type loops: int
+    :return: calculator_timings
+    :rtype: dict
+
+    """
+    function_str = 'functions.ionosphere.tsfresh_features.time_tsfresh_calculators'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    timeseries_array = np.asarray(timeseries, dtype=np.float64)
+    df = pd.DataFrame({
+        'metric': 'metric',
+        'timestamp': timeseries_array[:, 0].astype(np.int64),
+        'value': timeseries_array[:, 1],
+    })
+    if fc_parameters is None:
+        fc_parameters = EfficientFCParameters()
+
+    calculator_timings = {}
+    for calculator, parameters in fc_parameters.items():
+        features_count = 0
+        times = []
+        try:
+            for _ in range(max(int(loops), 1)):
+                start_calculator = timer()
+                df_features = extract_features(
+                    df, default_fc_parameters={calculator: parameters},
+                    column_id='metric', column_sort='timestamp',
+                    column_kind=None, column_value=None,
+                    disable_progressbar=True, n_jobs=0)
+                times.append(timer() - start_calculator)
+                features_count = int(df_features.shape[1])
+        except Exception as err:
+            current_logger.error('error :: %s :: failed to time %s, err: %s' % (
+                function_str, calculator, err))
+            continue
+        calculator_timings[calculator] = {
+            'time': float(np.mean(times)),
+            'features': features_count,
+        }
+    return calculator_timings
@@ -0,0 +1,269 @@
+"""
+batch_cross_correlations.py
+"""
+import logging
+from time import time
+
+import numpy as np
+
+
+# @added 20261110 - Feature #5783: luminosity - batch correlations
+# luminosity created a luminol Correlator for every candidate metric, which
+# loads both time series into luminol TimeSeries objects, crops, normalises and
+# aligns them and calculates the correlation coefficient at each shift in
+# Python loops.  The cropping, alignment and allowed shifts only depend on the
+# timestamps, so the candidates are grouped by time_period and by their
+# cropped timestamps and each group is correlated in a single matrix
+# operation.  The luminol CrossCorrelator calculation is replicated exactly,
+# including its normalisation, alignment and allowed shift quirks, so that the
+# same coefficient, shift and shifted_coefficient results are returned.
+
+# The luminol DEFAULT_ALLOWED_SHIFT_SECONDS and DEFAULT_SHIFT_IMPACT
+ALLOWED_SHIFT_SECONDS = 60
+SHIFT_IMPACT = 0.05
+
+# The number of aligned data points above which the shifted cross correlations
+# are calculated with a FFT rather than with a dot product per shift
+FFT_MIN_DATAPOINTS = 64
+
+
+def load_timeseries(timeseries, time_period):
+    """
+    Return the timestamps and values of a time series in the time_period, as
+    a luminol TimeSeries is loaded and cropped, removing None values and
+    sorting by timestamp.
+    """
+    timeseries_dict = {}
+    for ts, value in timeseries:
+        timeseries_dict[ts] = value
+    timestamps = []
+    values = []
+    for ts in sorted(timeseries_dict):
+        if timeseries_dict[ts] is None:
+            continue
+        int_ts = int(ts)
+        if int_ts < time_period[0] or int_ts > time_period[1]:
+            continue
+        if timestamps and int_ts == timestamps[-1]:
+            values[-1] = float(timeseries_dict[ts])
+            continue
+        timestamps.append(int_ts)
+        values.append(float(timeseries_dict[ts]))
+    return tuple(timestamps), values
+
+
+def align_indices(a_timestamps, b_timestamps):
+    """
+    Return the aligned timestamps and the indices of the a and b values at
+    each aligned timestamp, as luminol TimeSeries.align aligns the values.
+    """
+    timestamps = []
+    a_indices = []
+    b_indices = []
+    i = 0
+    j = 0
+    a_len = len(a_timestamps)
+    b_len = len(b_timestamps)
+    while i < a_len and j < b_len:
+        if a_timestamps[i] == b_timestamps[j]:
+            timestamps.append(a_timestamps[i])
+            i += 1
+            j += 1
+            a_indices.append(i - 1)
+            b_indices.append(j - 1)
+        elif a_timestamps[i] < b_timestamps[j]:
+            timestamps.append(a_timestamps[i])
+            a_indices.append(i)
+            b_indices.append(j)
+            i += 1
+        else:
+            timestamps.append(b_timestamps[j])
+            a_indices.append(i)
+            b_indices.append(j)
+            j += 1
+    while i < a_len:
+        timestamps.append(a_timestamps[i])
+        a_indices.append(i)
+        b_indices.append(b_len - 1)
+        i += 1
+    while j < b_len:
+        timestamps.append(b_timestamps[j])
+        a_indices.append(a_len - 1)
+        b_indices.append(j)
+        j += 1
+    return timestamps, np.array(a_indices), np.array(b_indices)
+
+
+def find_allowed_shift(timestamps, max_shift):
+    """
+    Return the allowed shift steps as the luminol CrossCorrelator
+    _find_allowed_shift binary search does, which returns the last position
+    tested rather than the first bigger position.
+    """
+    residual_timestamps = [ts - timestamps[0] for ts in timestamps]
+    lower_bound = 0
+    upper_bound = len(residual_timestamps)
+    pos = 0
+    while lower_bound < upper_bound:
+        pos = int(lower_bound + (upper_bound - lower_bound) / 2)
+        if residual_timestamps[pos] > max_shift:
+            upper_bound = pos
+        else:
+            lower_bound = pos + 1
+    return pos
+
+
+def shifted_sums(a_centered, b_centered, delays):
+    """
+    Return the sum of the products of the centred a values and the centred b
+    values shifted by each delay, for each row of b_centered.
+    """
+    n = len(a_centered)
+    if n >= FFT_MIN_DATAPOINTS:
+        fft_size = 1 << int(2 * n - 1).bit_length()
+        a_fft = np.conj(np.fft.rfft(a_centered, fft_size))
+        b_fft = np.fft.rfft(b_centered, fft_size, axis=1)
+        cross_correlation = np.fft.irfft(b_fft * a_fft, fft_size, axis=1)
+        # Negative delays wrap around to the end of the circular correlation
+        return cross_correlation[:, [delay % fft_size for delay in delays]]
+    sums = np.zeros((b_centered.shape[0], len(delays)))
+    for index, delay in enumerate(delays):
+        if delay >= 0:
+            sums[:, index] = b_centered[:, delay:] @ a_centered[:n - delay]
+        else:
+            sums[:, index] = b_centered[:, :n + delay] @ a_centered[-delay:]
+    return sums
+
+
+def correlate_group(a_timestamps, a_values, b_timestamps, b_values, max_shift, shift_impact):
+    """
+    Return the coefficients, shifts and shifted_coefficients of the rows of
+    b_values that share the same b_timestamps.
+    """
+    timestamps, a_indices, b_indices = align_indices(a_timestamps, b_timestamps)
+    n = len(timestamps)
+
+    a_values = np.asarray(a_values, dtype=np.float64)
+    a_max = np.max(a_values)
+    if a_max:
+        a_values = a_values / a_max
+    b_max = np.max(b_values, axis=1)
+    b_values = b_values / np.where(b_max != 0, b_max, 1)[:, None]
+
+    a_aligned = a_values[a_indices]
+    b_aligned = b_values[:, b_indices]
+    a_centered = a_aligned - np.average(a_aligned)
+    b_centered = b_aligned - np.average(b_aligned, axis=1)[:, None]
+    denom = np.std(a_aligned) * np.std(b_aligned, axis=1) * n
+
+    allowed_shift_step = find_allowed_shift(timestamps, max_shift)
+    if allowed_shift_step:
+        delays = list(range(-allowed_shift_step, allowed_shift_step))
+    else:
+        delays = [0]
+    delays_in_seconds = []
+    for delay in delays:
+        delay_in_seconds = timestamps[abs(delay)] - timestamps[0]
+        if delay < 0:
+            delay_in_seconds = -delay_in_seconds
+        delays_in_seconds.append(delay_in_seconds)
+
+    sums = shifted_sums(a_centered, b_centered, delays)
+    denom = denom[:, None]
+    correlations = np.divide(sums, denom, out=sums.copy(), where=(denom != 0))
+    if max_shift:
+        shift_factors = 1 + (np.array(delays_in_seconds, dtype=np.float64) / max_shift * shift_impact)
+        shifted_correlations = correlations * shift_factors
+    else:
+        shifted_correlations = correlations
+    max_indices = np.argmax(correlations, axis=1)
+    coefficients = correlations[np.arange(len(correlations)), max_indices]
+    shifts = [delays_in_seconds[index] for index in max_indices]
+    shifted_coefficients = np.max(shifted_correlations, axis=1)
+    return coefficients, shifts, shifted_coefficients
+
+
+def batch_cross_correlations(
+        current_skyline_app, anomalous_ts, candidates,
+        max_shift_seconds=ALLOWED_SHIFT_SECONDS, shift_impact=SHIFT_IMPACT):
+    """
+    Cross correlate the anomalous time series with all the candidate time
+    series and return the luminol CrossCorrelator result of each candidate.
+    Each candidate is a (key, timeseries, time_period) tuple and the result of
+    each key is a (coefficient, shift, shifted_coefficient) tuple, or None if
+    there are not enough data points in the time_period to correlate, where
+    luminol raises NotEnoughDataPoints, e.g.
+
+    candidates = [
+        ('metric.1', [[1762128000, 3.2], ..., [1762128600, 2.9]], (1762128480, 1762128720)),
+        ('metric.2', [[1762128000, 1.0], ..., [1762128600, 0.0]], (1762128480, 1762128720)),
+    ]
+    results = {
+        'metric.1': (0.9571, 0, 0.9571),
+        'metric.2': None,
+    }
+
+    :param current_skyline_app: the app calling the function
+    :param anomalous_ts: the anomalous time series
+    :param candidates: the candidates
+    :param max_shift_seconds: the luminol CrossCorrelator max_shift_seconds
+    :param shift_impact: the luminol CrossCorrelator shift_impact
+    :type current_skyline_app: str
+    :type anomalous_ts: list
+    :type candidates: list
+    :type max_shift_seconds: int
+    :type shift_impact: float
+    :return: results
+    :rtype: dict
+
+    """
+    function_str = 'functions.luminosity.batch_cross_correlations.batch_cross_correlations'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    start = time()
+    # luminol multiplies the max_shift_seconds by 1000 but compares it with
+    # the timestamps in seconds
+    max_shift = max_shift_seconds * 1000
+
+    results = {}
+    anomalous_period_data = {}
+    groups = {}
+    for key, timeseries, time_period in candidates:
+        results[key] = None
+        time_period = (time_period[0], time_period[1])
+        if time_period not in anomalous_period_data:
+            anomalous_period_data[time_period] = load_timeseries(anomalous_ts, time_period)
+        if len(anomalous_period_data[time_period][0]) < 2:
+            continue
+        try:
+            b_timestamps, b_values = load_timeseries(timeseries, time_period)
+        except Exception as err:
+            current_logger.error('error :: %s :: failed to load the time series of %s - %s' % (
+                function_str, str(key), err))
+            continue
+        if len(b_timestamps) < 2:
+            continue
+        group = groups.setdefault((time_period, b_timestamps), {'keys': [], 'values': []})
+        group['keys'].append(key)
+        group['values'].append(b_values)
+
+    for (time_period, b_timestamps), group in groups.items():
+        a_timestamps, a_values = anomalous_period_data[time_period]
+        try:
+            coefficients, shifts, shifted_coefficients = correlate_group(
+                a_timestamps, a_values, b_timestamps,
+                np.array(group['values'], dtype=np.float64), max_shift,
+                shift_impact)
+        except Exception as err:
+            current_logger.error('error :: %s :: failed to correlate a group of %s time series - %s' % (
+                function_str, str(len(group['keys'])), err))
+            continue
+        for index, key in enumerate(group['keys']):
+            results[key] = (
+                float(coefficients[index]), shifts[index],
+                float(shifted_coefficients[index]))
+
+    current_logger.info('%s :: cross correlated %s time series in %s groups in %.6f seconds' % (
+        function_str, str(len(candidates)), str(len(groups)), (time() - start)))
+    return results
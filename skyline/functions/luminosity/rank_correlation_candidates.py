@@ -0,0 +1,89 @@
+"""
+rank_correlation_candidates.py
+"""
+import logging
+
+
+# @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+# luminosity fetched and correlated every recently active metric, however on a
+# large installation many metrics trigger a single algorithm in analyzer at some
+# point in the window around an anomaly and most of them do not correlate.  The
+# analyzer.illuminance.all entries record the algorithms triggered by each
+# metric every minute, so the metrics that triggered the most algorithms
+# nearest to the anomaly_timestamp are ranked first, without fetching any time
+# series data, and only the top ranked candidates are fetched and correlated.
+def get_illuminance_activity_scores(
+        current_skyline_app, illuminance_dicts, anomaly_timestamp, resolution):
+    """
+    Return an activity score for each metric id in the illuminance.all entries.
+    Each entry scores the number of algorithms that the metric triggered,
+    weighted by the proximity of the entry to the anomaly_timestamp in
+    resolution periods, e.g. an entry that triggered 3 algorithms 2 resolution
+    periods before the anomaly_timestamp scores 3 / (1 + 2) = 1.0
+
+    :param current_skyline_app: the app calling the function
+    :param illuminance_dicts: a list of (timestamp, illuminance_dict) tuples of
+        the illuminance.all hash keys and entries, e.g.
+        [(1762128000, {'1234': {'t': 1762128010, 'v': 3.2, 'a': [1, 4]}}), ...]
+    :param anomaly_timestamp: the anomaly timestamp
+    :param resolution: the resolution of the anomalous metric
+    :type current_skyline_app: str
+    :type illuminance_dicts: list
+    :type anomaly_timestamp: int
+    :type resolution: int
+    :return: activity_scores
+    :rtype: dict
+
+    """
+    function_str = 'functions.luminosity.rank_correlation_candidates.get_illuminance_activity_scores'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    activity_scores = {}
+    errors = []
+    resolution = max(int(resolution or 60), 1)
+    for hash_timestamp, illuminance_dict in illuminance_dicts:
+        for metric_id_str, entry in illuminance_dict.items():
+            try:
+                entry_timestamp = int(entry.get('t', hash_timestamp))
+                triggered_algorithms_count = max(len(entry.get('a') or []), 1)
+                proximity = 1 + (abs(entry_timestamp - int(anomaly_timestamp)) / resolution)
+                activity_scores[str(metric_id_str)] = activity_scores.get(str(metric_id_str), 0) + (triggered_algorithms_count / proximity)
+            except Exception as err:
+                errors.append([metric_id_str, err])
+    if errors:
+        current_logger.error('error :: %s :: failed to score %s illuminance entries, sample: %s' % (
+            function_str, str(len(errors)), str(errors[-1])))
+    return activity_scores
+
+
+def rank_correlation_candidates(
+        current_skyline_app, candidates_scores, top_k):
+    """
+    Return the top_k candidates with the highest activity scores, ordered by
+    score.  All the candidates are returned if top_k is 0 or there are fewer
+    than top_k candidates.  Candidates with the same score are ordered by name
+    so the same candidates are selected for the same scores.
+
+    :param current_skyline_app: the app calling the function
+    :param candidates_scores: a dict of the candidate metric names and their
+        activity scores
+    :param top_k: the maximum number of candidates to return
+    :type current_skyline_app: str
+    :type candidates_scores: dict
+    :type top_k: int
+    :return: ranked_candidates
+    :rtype: list
+
+    """
+    function_str = 'functions.luminosity.rank_correlation_candidates.rank_correlation_candidates'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    ranked_candidates = sorted(candidates_scores, key=lambda name: (-candidates_scores[name], name))
+    if top_k and len(ranked_candidates) > int(top_k):
+        current_logger.info('%s :: selected the top %s ranked of %s candidates, lowest selected score: %s' % (
+            function_str, str(top_k), str(len(ranked_candidates)),
+            str(candidates_scores[ranked_candidates[int(top_k) - 1]])))
+        ranked_candidates = ranked_candidates[:int(top_k)]
+    return ranked_candidates
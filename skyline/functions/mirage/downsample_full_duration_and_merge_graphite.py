@@ -6,7 +6,8 @@ import logging
 # @added 20250327 - Feature #5612: downsample_full_duration_and_merge_graphite - cluster aware
 import requests
 
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 
 # @modified 20250327 - Feature #5612: downsample_full_duration_and_merge_graphite - cluster aware
 # Added HORIZON_SHARDS and SKYLINE_URL
@@ -19,6 +20,8 @@ from functions.timeseries.downsample import downsample_timeseries
 from functions.cluster.is_shard_metric import is_shard_metric
 # @added 20250328 - Feature #5612: downsample_full_duration_and_merge_graphite - cluster aware
 from functions.cluster.shard_host import shard_host
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 # @added 20240125 - Task #5178: Build and test skyline v4.1.0
 try:
@@ -158,9 +161,11 @@ def downsample_full_duration_and_merge_graphite(self, metric, timeseries, known_
                 str(metric_resolution), metric))
             try:
                 raw_series = self.redis_conn.get(redis_metric_name)
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                full_duration_timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # full_duration_timeseries = list(unpacker)
+                full_duration_timeseries = unpack_timeseries(raw_series)
                 if full_duration_timeseries:
                     full_duration_timeseries = sort_timeseries(full_duration_timeseries)
                 logger.info('got %s data points from Redis FULL_DURATION data for %s to downsample' % (
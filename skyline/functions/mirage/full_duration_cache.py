@@ -0,0 +1,296 @@
+"""
+full_duration_cache.py
+"""
+import logging
+import traceback
+
+import numpy as np
+from msgpack import packb, unpackb
+
+from functions.timeseries.determine_data_frequency import determine_data_frequency
+
+# @added 20261105 - Feature #5778: mirage - full duration cache
+# The number of seconds that a resolution mismatch is recorded for, a metric's
+# Graphite retentions rarely change
+RESOLUTION_MISMATCH_TTL = 86400
+
+
+# @added 20261105 - Feature #5778: mirage - full duration cache
+# Mirage fetches the hours_to_resolve time series of a metric from Graphite for
+# every check, even if the metric was checked minutes ago.  The last fetched
+# time series of each metric and hours_to_resolve is cached in a Redis key so
+# that only the data since the last cached bucket has to be fetched and merged
+# into the cached time series.
+def full_duration_cache_key(metric, hours_to_resolve):
+    """
+    Return the Redis key name of the full duration cache of a metric.
+
+    :param metric: the metric base_name
+    :param hours_to_resolve: the hours_to_resolve of the check
+    :type metric: str
+    :type hours_to_resolve: int
+    :return: full_duration_cache_key
+    :rtype: str
+
+    """
+    return 'mirage.full_duration_cache.%s.%s' % (str(int(hours_to_resolve)), metric)
+
+
+def full_duration_cache_mismatch_key(metric, hours_to_resolve):
+    """
+    Return the Redis key name that records that the data fetched since the last
+    cached data point of a metric is not at the resolution of the cached time
+    series, so the full duration cache is not used for the metric.
+
+    :param metric: the metric base_name
+    :param hours_to_resolve: the hours_to_resolve of the check
+    :type metric: str
+    :type hours_to_resolve: int
+    :return: full_duration_cache_mismatch_key
+    :rtype: str
+
+    """
+    return 'mirage.full_duration_cache.resolution_mismatch.%s.%s' % (str(int(hours_to_resolve)), metric)
+
+
+def get_full_duration_cache(
+        current_skyline_app, redis_conn, metric, hours_to_resolve,
+        from_timestamp, until_timestamp):
+    """
+    Return the cached time series of a metric if it can be updated
+    incrementally for the from_timestamp to until_timestamp period, with the
+    fetch_from timestamp that the data to merge must be fetched from, e.g.:
+
+    full_duration_cache = {
+        'resolution': 600,
+        'timeseries': [[1761523200, 3.2], ..., [1762128000, 2.9]],
+        'fetch_from': 1762127400,
+    }
+
+    The last cached bucket may not have been filled when it was fetched, so it
+    is always fetched again, along with the bucket before it so that the first
+    data point of a nonNegativeDerivative is not lost.  Returns None if there
+    is no cache, if the cache does not overlap the period or if a resolution
+    mismatch has been recorded for the metric.
+
+    :param current_skyline_app: the app calling the function
+    :param redis_conn: the (not decoded) Redis connection
+    :param metric: the metric base_name
+    :param hours_to_resolve: the hours_to_resolve of the check
+    :param from_timestamp: the from timestamp of the period
+    :param until_timestamp: the until timestamp of the period
+    :type current_skyline_app: str
+    :type redis_conn: object
+    :type metric: str
+    :type hours_to_resolve: int
+    :type from_timestamp: int
+    :type until_timestamp: int
+    :return: full_duration_cache
+    :rtype: dict or None
+
+    """
+    function_str = 'functions.mirage.full_duration_cache.get_full_duration_cache'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    try:
+        packed_cache, resolution_mismatch = redis_conn.mget([
+            full_duration_cache_key(metric, hours_to_resolve),
+            full_duration_cache_mismatch_key(metric, hours_to_resolve)])
+    except Exception as err:
+        current_logger.error('error :: %s :: failed to get %s from Redis - %s' % (
+            function_str, full_duration_cache_key(metric, hours_to_resolve), err))
+        return None
+    if not packed_cache or resolution_mismatch:
+        return None
+    try:
+        full_duration_cache = unpackb(packed_cache, raw=False)
+        resolution = int(full_duration_cache['resolution'])
+        last_timestamp = int(full_duration_cache['timeseries'][-1][0])
+    except Exception as err:
+        current_logger.error('error :: %s :: failed to unpack %s - %s' % (
+            function_str, full_duration_cache_key(metric, hours_to_resolve), err))
+        return None
+    if not resolution or last_timestamp < int(from_timestamp) or last_timestamp > int(until_timestamp):
+        return None
+    full_duration_cache['fetch_from'] = last_timestamp - resolution
+    return full_duration_cache
+
+
+def get_delta_resolution(current_skyline_app, full_duration_cache, timeseries):
+    """
+    Return the resolution of the time series fetched from the fetch_from
+    timestamp of the cache.  A time series with a single data point is assumed
+    to be at the cached resolution.
+
+    :param current_skyline_app: the app calling the function
+    :param full_duration_cache: the cache from get_full_duration_cache
+    :param timeseries: the time series fetched from the fetch_from timestamp
+    :type current_skyline_app: str
+    :type full_duration_cache: dict
+    :type timeseries: list
+    :return: resolution
+    :rtype: int
+
+    """
+    resolution = int(full_duration_cache['resolution'])
+    if len(timeseries) > 2:
+        resolution = int(determine_data_frequency(current_skyline_app, list(timeseries), False) or resolution)
+    elif len(timeseries) == 2:
+        resolution = int(timeseries[1][0]) - int(timeseries[0][0])
+    return resolution
+
+
+def merge_full_duration_cache(
+        current_skyline_app, full_duration_cache, timeseries, from_timestamp,
+        until_timestamp):
+    """
+    Merge the time series fetched from the fetch_from timestamp of the cache
+    into the cached time series and return the time series for the
+    from_timestamp to until_timestamp period.  Graphite returns a recent
+    period from a higher resolution retention than the cached period and
+    consolidates the data in the lower resolution retentions with the
+    aggregationMethod of the metric (average, sum, max, min or last), which
+    is not known here.  So None is returned if the fetched data is not at the
+    cached resolution, or is not aligned to the cached timestamps, and the
+    period has to be fetched in full.  None is also returned if there is no
+    fetched data.
+
+    :param current_skyline_app: the app calling the function
+    :param full_duration_cache: the cache from get_full_duration_cache
+    :param timeseries: the time series fetched from the fetch_from timestamp
+    :param from_timestamp: the from timestamp of the period
+    :param until_timestamp: the until timestamp of the period
+    :type current_skyline_app: str
+    :type full_duration_cache: dict
+    :type timeseries: list
+    :type from_timestamp: int
+    :type until_timestamp: int
+    :return: merged_timeseries
+    :rtype: list or None
+
+    """
+    function_str = 'functions.mirage.full_duration_cache.merge_full_duration_cache'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    if timeseries is None or not len(timeseries):
+        return None
+    try:
+        fetched = np.asarray(timeseries, dtype=np.float64).reshape(-1, 2)
+        cached = np.asarray(full_duration_cache['timeseries'], dtype=np.float64).reshape(-1, 2)
+        resolution = int(full_duration_cache['resolution'])
+        replace_from = int(cached[-1][0])
+        fetched_resolution = get_delta_resolution(current_skyline_app, full_duration_cache, fetched.tolist())
+        if fetched_resolution != resolution:
+            current_logger.info('%s :: fetched resolution %s does not match the cached resolution %s' % (
+                function_str, str(fetched_resolution), str(resolution)))
+            return None
+        if ((fetched[:, 0] - replace_from) % resolution).any():
+            current_logger.info('%s :: fetched timestamps are not aligned to the cached timestamps' % (
+                function_str))
+            return None
+        fetched = fetched[fetched[:, 0] >= replace_from]
+        if not len(fetched):
+            return None
+        merged = np.vstack((cached[cached[:, 0] < replace_from], fetched))
+        merged = merged[(merged[:, 0] >= int(from_timestamp)) & (merged[:, 0] <= int(until_timestamp))]
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to merge time series - %s' % (
+            function_str, err))
+        return None
+    return merged.tolist()
+
+
+def set_full_duration_cache(
+        current_skyline_app, redis_conn, metric, hours_to_resolve, timeseries,
+        ttl=3600):
+    """
+    Cache the time series of a metric for the hours_to_resolve period.
+
+    :param current_skyline_app: the app calling the function
+    :param redis_conn: the (not decoded) Redis connection
+    :param metric: the metric base_name
+    :param hours_to_resolve: the hours_to_resolve of the check
+    :param timeseries: the time series
+    :param ttl: the number of seconds to cache the time series for
+    :type current_skyline_app: str
+    :type redis_conn: object
+    :type metric: str
+    :type hours_to_resolve: int
+    :type timeseries: list
+    :type ttl: int
+    :return: cached
+    :rtype: boolean
+
+    """
+    function_str = 'functions.mirage.full_duration_cache.set_full_duration_cache'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    if not timeseries or len(timeseries) < 3:
+        return False
+    try:
+        # A metric with a resolution mismatch is not cached as the cache
+        # cannot be used
+        if redis_conn.exists(full_duration_cache_mismatch_key(metric, hours_to_resolve)):
+            return False
+        resolution = determine_data_frequency(current_skyline_app, timeseries, False)
+        if not resolution:
+            return False
+        full_duration_cache = {
+            'resolution': int(resolution),
+            'timeseries': [[int(ts), float(value)] for ts, value in timeseries],
+        }
+        redis_conn.setex(
+            full_duration_cache_key(metric, hours_to_resolve), int(ttl),
+            packb(full_duration_cache, use_bin_type=True))
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to cache the time series of %s - %s' % (
+            function_str, metric, err))
+        return False
+    return True
+
+
+def set_full_duration_cache_resolution_mismatch(
+        current_skyline_app, redis_conn, metric, hours_to_resolve,
+        ttl=RESOLUTION_MISMATCH_TTL):
+    """
+    Record that the data fetched since the last cached data point of a metric
+    is not at the resolution of the cached time series, which is the case when
+    the hours_to_resolve period is longer than the first Graphite retention
+    archive of the metric.  Graphite consolidates the data with the
+    aggregationMethod of the metric, which is not known, so the delta cannot
+    be merged.  The full duration cache is deleted and not used for the metric
+    for the ttl, so the delta is not fetched as well as the full period.
+
+    :param current_skyline_app: the app calling the function
+    :param redis_conn: the (not decoded) Redis connection
+    :param metric: the metric base_name
+    :param hours_to_resolve: the hours_to_resolve of the check
+    :param ttl: the number of seconds to record the mismatch for
+    :type current_skyline_app: str
+    :type redis_conn: object
+    :type metric: str
+    :type hours_to_resolve: int
+    :type ttl: int
+    :return: recorded
+    :rtype: boolean
+
+    """
+    function_str = 'functions.mirage.full_duration_cache.set_full_duration_cache_resolution_mismatch'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    try:
+        redis_conn.setex(
+            full_duration_cache_mismatch_key(metric, hours_to_resolve),
+            int(ttl), 1)
+        redis_conn.delete(full_duration_cache_key(metric, hours_to_resolve))
+    except Exception as err:
+        current_logger.error('error :: %s :: failed to record the resolution mismatch of %s - %s' % (
+            function_str, metric, err))
+        return False
+    return True
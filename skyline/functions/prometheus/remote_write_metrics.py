@@ -0,0 +1,163 @@
+"""
+remote_write_metrics.py
+"""
+import logging
+import traceback
+from sys import intern
+
+from matched_or_regexed_in_list import matched_or_regexed_in_list
+
+# @added 20261023 - Feature #5765: flux - prometheus - protobuf fast path
+# The translated metric name of each label set is cached per tenant_id,
+# server_id and dropLabels so that a label set that is sent on every
+# remote_write request is only translated once.
+MAX_TRANSLATED_LABEL_SETS = 500000
+translated_label_sets = {}
+translated_label_sets_count = [0]
+
+
+def translate_label_set(label_set, tenant_id, server_id, dropLabels):
+    """
+    Translate a Prometheus label set into a Skyline labelled metric name, in the
+    same manner as flux/prometheus.py translates a MessageToDict timeseries
+    item.  A label set with an empty label name or value is not translated, as
+    MessageToDict does not include empty values.
+
+    :param label_set: the ((name, value), ...) tuple of labels
+    :param tenant_id: the tenant_id
+    :param server_id: the server_id
+    :param dropLabels: the [[label_name, pattern], ...] of labels to drop
+    :type label_set: tuple
+    :type tenant_id: str
+    :type server_id: str
+    :type dropLabels: list
+    :return: (metric, metric_namespace, labels_dropped, labels_checked_to_drop)
+    :rtype: tuple
+
+    """
+    metric = None
+    metric_namespace = None
+    labels_dropped = 0
+    labels_checked_to_drop = 0
+
+    # Some metrics do not pass the __name__ label first so determine metric
+    # name first before iterating the labels
+    for name, value in label_set:
+        if not name:
+            raise ValueError('label with no name')
+        if name == '__name__':
+            if not value:
+                raise ValueError('__name__ label with no value')
+            metric_namespace = str(value)
+            metric = '%s{_tenant_id="%s",_server_id="%s",' % (metric_namespace, str(tenant_id), str(server_id))
+    if not metric:
+        return None, None, labels_dropped, labels_checked_to_drop
+
+    first_element_done = False
+    for name, value in label_set:
+        if name == 'monitor' and value == 'master':
+            labels_dropped += 1
+            continue
+        if not value:
+            raise ValueError('label %s with no value' % name)
+        if name == '__name__':
+            continue
+        drop_label = False
+        if dropLabels:
+            labels_checked_to_drop += 1
+            for dropLabel in dropLabels:
+                if name == dropLabel[0]:
+                    if dropLabel[1] in ['*', '.*']:
+                        labels_dropped += 1
+                        drop_label = True
+                        break
+                    pattern_match, metric_matched_by = matched_or_regexed_in_list('flux', value, [dropLabel[1]])
+                    del metric_matched_by
+                    if pattern_match:
+                        labels_dropped += 1
+                        drop_label = True
+                        break
+        if drop_label:
+            continue
+        if not first_element_done:
+            metric = metric + name + '="' + value + '"'
+            first_element_done = True
+        else:
+            metric = metric + ',' + name + '="' + value + '"'
+    metric = metric + '}'
+    return metric, metric_namespace, labels_dropped, labels_checked_to_drop
+
+
+def get_remote_write_metrics(current_skyline_app, write_request, tenant_id, server_id, dropLabels):
+    """
+    Translate the timeseries of a parsed Prometheus remote_write WriteRequest
+    protobuf into Skyline labelled metric names by iterating the protobuf
+    directly, rather than converting the entire WriteRequest to a dict with
+    MessageToDict.  The metric name translated from each label set is cached.
+
+    :param current_skyline_app: the app calling the function
+    :param write_request: the parsed remote_pb2.WriteRequest
+    :param tenant_id: the tenant_id
+    :param server_id: the server_id
+    :param dropLabels: the [[label_name, pattern], ...] of labels to drop
+    :type current_skyline_app: str
+    :type write_request: object
+    :type tenant_id: str
+    :type server_id: str
+    :type dropLabels: list
+    :return: (metrics, labels_dropped, labels_checked_to_drop, errors) where
+        metrics is a list of (metric, metric_namespace, samples) and samples is
+        the protobuf repeated Sample container of the timeseries
+    :rtype: tuple
+
+    """
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    metrics = []
+    labels_dropped = 0
+    labels_checked_to_drop = 0
+    errors = 0
+
+    cache = None
+    try:
+        drop_labels_key = tuple(tuple(dropLabel) for dropLabel in (dropLabels or []))
+        cache_key = (str(tenant_id), str(server_id), drop_labels_key)
+        if translated_label_sets_count[0] >= MAX_TRANSLATED_LABEL_SETS:
+            translated_label_sets.clear()
+            translated_label_sets_count[0] = 0
+        cache = translated_label_sets.get(cache_key)
+        if cache is None:
+            cache = {}
+            translated_label_sets[cache_key] = cache
+    except Exception as err:
+        current_logger.error('error :: get_remote_write_metrics :: failed to determine label set cache, err: %s' % err)
+        cache = None
+
+    for timeseries in write_request.timeseries:
+        label_set = tuple((label.name, label.value) for label in timeseries.labels)
+        translated = None
+        if cache is not None:
+            translated = cache.get(label_set)
+        if translated is None:
+            try:
+                translated = translate_label_set(label_set, tenant_id, server_id, dropLabels)
+            except Exception as err:
+                if not errors:
+                    current_logger.error(traceback.format_exc())
+                    current_logger.error('error :: get_remote_write_metrics :: could not translate WriteRequest labels %s - %s' % (
+                        str(label_set), err))
+                errors += 1
+                translated = (None, None, 0, 0)
+            if cache is not None:
+                # Intern the label names and values which are highly repeated
+                # across the cached label sets
+                cache[tuple((intern(name), intern(value)) for name, value in label_set)] = translated
+                translated_label_sets_count[0] += 1
+        metric, metric_namespace, label_set_labels_dropped, label_set_labels_checked_to_drop = translated
+        labels_dropped += label_set_labels_dropped
+        labels_checked_to_drop += label_set_labels_checked_to_drop
+        if not metric:
+            continue
+        metrics.append((metric, metric_namespace, timeseries.samples))
+    return metrics, labels_dropped, labels_checked_to_drop, errors
@@ -0,0 +1,206 @@
+"""
+check_queue.py
+"""
+import logging
+import os
+import traceback
+from time import time
+
+from msgpack import packb, unpackb
+
+from skyline_functions import get_redis_conn, mkdir_p
+
+
+# @added 20261026 - Feature #5768: check queue
+# A Redis hash check queue per app that is used in place of writing check files
+# to the app check directory and parsing them back.  Each check is keyed on the
+# check file name that would have been used for the check file so that the
+# sort order, deduplication and failed check directory conventions of the check
+# files are retained.  The check data is a msgpack payload of the typed metric
+# variables, in the same form as they are returned from the load_metric_vars
+# functions, so no file parsing or literal_eval is required.
+def check_queue_key(app):
+    """
+    Return the Redis hash key name of the check queue of an app.
+
+    :param app: the app that consumes the checks
+    :type app: str
+    :return: check_queue_redis_hash
+    :rtype: str
+
+    """
+    return '%s.check_queue' % app
+
+
+def add_check_to_queue(
+        current_skyline_app, app, check_file, metric_vars, redis_conn=None):
+    """
+    Add a check to the check queue of an app.
+
+    :param current_skyline_app: the app calling the function
+    :param app: the app that consumes the checks
+    :param check_file: the check file name of the check
+    :param metric_vars: the typed metric variables of the check as a list of
+        [key, value] lists
+    :param redis_conn: an optional (not decoded) Redis connection to use
+    :type current_skyline_app: str
+    :type app: str
+    :type check_file: str
+    :type metric_vars: list
+    :type redis_conn: object
+    :return: added
+    :rtype: boolean
+
+    """
+    function_str = 'functions.redis.check_queue.add_check_to_queue'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    check_file_name = os.path.basename(str(check_file))
+    try:
+        if not redis_conn:
+            redis_conn = get_redis_conn(current_skyline_app)
+        check_data = {
+            'added_at': int(time()),
+            'metric_vars': [[key, value] for key, value in metric_vars],
+        }
+        redis_conn.hset(check_queue_key(app), check_file_name, packb(check_data, use_bin_type=True))
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to add %s to %s, err: %s' % (
+            function_str, check_file_name, check_queue_key(app), err))
+        return False
+    return True
+
+
+def get_queued_checks(current_skyline_app, app, redis_conn=None):
+    """
+    Return all the checks in the check queue of an app.
+
+    :param current_skyline_app: the app calling the function
+    :param app: the app that consumes the checks
+    :param redis_conn: an optional (not decoded) Redis connection to use
+    :type current_skyline_app: str
+    :type app: str
+    :type redis_conn: object
+    :return: queued_checks, a dict of the check data keyed by check file name,
+        each check data dict has the added_at and metric_vars keys
+    :rtype: dict
+
+    """
+    function_str = 'functions.redis.check_queue.get_queued_checks'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    queued_checks = {}
+    try:
+        if not redis_conn:
+            redis_conn = get_redis_conn(current_skyline_app)
+        queued_checks_data = redis_conn.hgetall(check_queue_key(app))
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to hgetall %s, err: %s' % (
+            function_str, check_queue_key(app), err))
+        return queued_checks
+    errors = []
+    for check_file_name, packed_check_data in queued_checks_data.items():
+        if isinstance(check_file_name, bytes):
+            check_file_name = check_file_name.decode('utf-8')
+        try:
+            queued_checks[check_file_name] = unpackb(packed_check_data, raw=False)
+        except Exception as err:
+            errors.append([check_file_name, err])
+    if errors:
+        current_logger.error('error :: %s :: failed to unpack %s checks from %s, sample: %s' % (
+            function_str, str(len(errors)), check_queue_key(app), str(errors[-3:])))
+    return queued_checks
+
+
+def remove_queued_check(current_skyline_app, app, check_file, redis_conn=None):
+    """
+    Remove a check from the check queue of an app.
+
+    :param current_skyline_app: the app calling the function
+    :param app: the app that consumes the checks
+    :param check_file: the check file name or path of the check
+    :param redis_conn: an optional (not decoded) Redis connection to use
+    :type current_skyline_app: str
+    :type app: str
+    :type check_file: str
+    :type redis_conn: object
+    :return: removed
+    :rtype: boolean
+
+    """
+    function_str = 'functions.redis.check_queue.remove_queued_check'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    check_file_name = os.path.basename(str(check_file))
+    removed = 0
+    try:
+        if not redis_conn:
+            redis_conn = get_redis_conn(current_skyline_app)
+        removed = redis_conn.hdel(check_queue_key(app), check_file_name)
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to hdel %s from %s, err: %s' % (
+            function_str, check_file_name, check_queue_key(app), err))
+        return False
+    return bool(removed)
+
+
+def fail_queued_check(
+        current_skyline_app, app, failed_check_dir, check_file, check_data,
+        redis_conn=None):
+    """
+    Fail a queued check, the check is written as a check file to the
+    failed_check_dir, in the same manner that fail_check moves a failed check
+    file, and removed from the check queue.
+
+    :param current_skyline_app: the app calling the function
+    :param app: the app that consumes the checks
+    :param failed_check_dir: the directory where failed checks are written to
+    :param check_file: the check file name or path of the check
+    :param check_data: the check data from get_queued_checks
+    :param redis_conn: an optional (not decoded) Redis connection to use
+    :type current_skyline_app: str
+    :type app: str
+    :type failed_check_dir: str
+    :type check_file: str
+    :type check_data: dict
+    :type redis_conn: object
+    :return: failed_check_file
+    :rtype: str
+
+    """
+    function_str = 'functions.redis.check_queue.fail_queued_check'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    check_file_name = os.path.basename(str(check_file))
+    failed_check_file = None
+    try:
+        if not os.path.exists(failed_check_dir):
+            mkdir_p(failed_check_dir)
+        failed_check_file = '%s/%s' % (failed_check_dir, check_file_name)
+        # Written in the check file format so that the check can be copied
+        # back to the check directory to be retried
+        check_lines = []
+        for key, value in check_data['metric_vars']:
+            if isinstance(value, list):
+                check_lines.append('%s = %s\n' % (key, str(value)))
+            else:
+                check_lines.append('%s = "%s"\n' % (key, str(value)))
+        with open(failed_check_file, 'w') as fh:
+            fh.write(''.join(check_lines))
+        os.chmod(failed_check_file, mode=0o644)
+        current_logger.info('%s :: wrote failed queued check to %s' % (
+            function_str, failed_check_file))
+    except Exception as err:
+        current_logger.error(traceback.format_exc())
+        current_logger.error('error :: %s :: failed to write failed check %s, err: %s' % (
+            function_str, check_file_name, err))
+        failed_check_file = None
+    remove_queued_check(current_skyline_app, app, check_file_name, redis_conn=redis_conn)
+    return failed_check_file
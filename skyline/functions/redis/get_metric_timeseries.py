@@ -1,6 +1,7 @@
 import logging
 
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 from settings import FULL_NAMESPACE
 from skyline_functions import (
     get_redis_conn, get_redis_conn_decoded, nonNegativeDerivative)
@@ -9,6 +10,8 @@ from skyline_functions import (
 #                   Branch #4300: prometheus
 # Handle labelled_metrics.
 from functions.redis.get_metric_redistimeseries import get_metric_redistimeseries
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 
 # @added 20210525 - Branch #1444: thunder
@@ -91,9 +94,11 @@ def get_metric_timeseries(
         return timeseries
 
     try:
-        unpacker = Unpacker(use_list=False)
-        unpacker.feed(raw_series)
-        timeseries = list(unpacker)
+        # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+        # unpacker = Unpacker(use_list=False)
+        # unpacker.feed(raw_series)
+        # timeseries = list(unpacker)
+        timeseries = unpack_timeseries(raw_series)
     except Exception as e:
         if not log:
             current_skyline_app_logger = current_skyline_app + 'Log'
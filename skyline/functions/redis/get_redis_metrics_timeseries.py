@@ -1,7 +1,8 @@
 import logging
 import traceback
 
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 from settings import FULL_NAMESPACE
 from skyline_functions import (
     get_redis_conn, get_redis_conn_decoded, nonNegativeDerivative,
@@ -11,6 +12,8 @@ from skyline_functions import (
 #                   Branch #4300: prometheus
 # Handle labelled_metrics.
 from functions.redis.get_metric_redistimeseries import get_metric_redistimeseries
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 
 # @added 20211008 - Feature #4264: luminosity - cross_correlation_relationships
@@ -103,9 +106,11 @@ def get_redis_metrics_timeseries(current_skyline_app, metrics, log=False):
             try:
                 raw_series = raw_assigned[index]
                 if raw_series:
-                    unpacker = Unpacker(use_list=False)
-                    unpacker.feed(raw_series)
-                    timeseries = list(unpacker)
+                    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                    # unpacker = Unpacker(use_list=False)
+                    # unpacker.feed(raw_series)
+                    # timeseries = list(unpacker)
+                    timeseries = unpack_timeseries(raw_series)
             except Exception as err:
                 if not log:
                     current_skyline_app_logger = current_skyline_app + 'Log'
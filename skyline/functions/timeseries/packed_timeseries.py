@@ -0,0 +1,285 @@
+"""
+packed_timeseries.py
+"""
+from struct import pack as struct_pack
+
+import numpy as np
+from msgpack import Unpacker, packb
+
+import settings
+
+try:
+    HORIZON_STORAGE_FORMAT = str(settings.HORIZON_STORAGE_FORMAT)
+except:
+    HORIZON_STORAGE_FORMAT = 'msgpack'
+if HORIZON_STORAGE_FORMAT not in ['msgpack', 'numpy']:
+    HORIZON_STORAGE_FORMAT = 'msgpack'
+
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# Each packed record is a big-endian int64 timestamp and float64 value.  Being
+# big-endian the first byte of every record is always 0x00 (for any timestamp
+# < 2**56) whereas every msgpack [timestamp, value] item that Horizon appends
+# starts with the 0x92 fixarray marker, so the format of each record in a key
+# can be determined from its first byte, even in keys that contain a mixture
+# of both formats.
+PACKED_DTYPE = np.dtype([('timestamp', '>i8'), ('value', '>f8')])
+NATIVE_DTYPE = np.dtype([('timestamp', '<i8'), ('value', '<f8')])
+PACKED_RECORD_SIZE = PACKED_DTYPE.itemsize
+PACKED_RECORD_MARKER = 0x00
+MSGPACK_DATAPOINT_MARKER = 0x92
+
+
+def pack_datapoint(datapoint, storage_format=None):
+    """
+    Return the bytes to append to a Redis metric key for a data point in the
+    :mod:`settings.HORIZON_STORAGE_FORMAT` or the storage_format passed.
+
+    :param datapoint: the data point (timestamp, value)
+    :param storage_format: the storage format, 'msgpack' or 'numpy', optional,
+        defaults to :mod:`settings.HORIZON_STORAGE_FORMAT`
+    :type datapoint: tuple
+    :type storage_format: str
+    :return: packed_datapoint
+    :rtype: bytes
+
+    """
+    if not storage_format:
+        storage_format = HORIZON_STORAGE_FORMAT
+    if storage_format != 'numpy':
+        return packb(datapoint)
+    try:
+        value = float(datapoint[1])
+    except (TypeError, ValueError):
+        value = np.nan
+    return struct_pack('>qd', int(float(datapoint[0])), value)
+
+
+def pack_timeseries(timeseries, storage_format=None):
+    """
+    Return the bytes to SET as a Redis metric key for a time series in the
+    :mod:`settings.HORIZON_STORAGE_FORMAT` or the storage_format passed.  The
+    msgpack format is the concatenation of each packed data point, as Horizon
+    appends them, not a packed array.
+
+    :param timeseries: the time series as a list [(ts, value),...,(ts, value)]
+        or a numpy structured array as returned by
+        :func:`unpack_timeseries_array`
+    :param storage_format: the storage format, 'msgpack' or 'numpy', optional,
+        defaults to :mod:`settings.HORIZON_STORAGE_FORMAT`
+    :type timeseries: list
+    :type storage_format: str
+    :return: packed_timeseries
+    :rtype: bytes
+
+    """
+    if not storage_format:
+        storage_format = HORIZON_STORAGE_FORMAT
+    if len(timeseries) == 0:
+        return b''
+
+    if storage_format == 'numpy':
+        packed = np.empty(len(timeseries), dtype=PACKED_DTYPE)
+        if isinstance(timeseries, np.ndarray) and timeseries.dtype.names:
+            packed['timestamp'] = timeseries['timestamp']
+            packed['value'] = timeseries['value']
+        else:
+            timeseries_array = np.array(
+                [[item[0], item[1]] for item in timeseries], dtype=np.float64)
+            packed['timestamp'] = timeseries_array[:, 0]
+            packed['value'] = timeseries_array[:, 1]
+        return packed.tobytes()
+
+    if isinstance(timeseries, np.ndarray):
+        timeseries = timeseries.tolist()
+    # Serialize and turn key back into not-an-array
+    btimeseries = packb(list(timeseries))
+    if len(timeseries) <= 15:
+        return btimeseries[1:]
+    if len(timeseries) <= 65535:
+        return btimeseries[3:]
+    return btimeseries[5:]
+
+
+def _packed_records_count(raw_series, offset):
+    """
+    Return the number of consecutive packed records in raw_series starting at
+    offset.
+    """
+    complete_records = (len(raw_series) - offset) // PACKED_RECORD_SIZE
+    if not complete_records:
+        return 0
+    markers = np.frombuffer(
+        raw_series, dtype=np.uint8, count=(complete_records * PACKED_RECORD_SIZE),
+        offset=offset)[::PACKED_RECORD_SIZE]
+    not_packed = np.flatnonzero(markers)
+    if not_packed.size:
+        return int(not_packed[0])
+    return complete_records
+
+
+def _unpack_segments(raw_series):
+    """
+    Decode a Redis metric key that contains msgpack and packed records into a
+    list of segments, each segment being a numpy structured array (packed
+    records) or a list of tuples (msgpack data points).
+    """
+    segments = []
+    raw_series_length = len(raw_series)
+    offset = 0
+    while offset < raw_series_length:
+        if raw_series[offset] == PACKED_RECORD_MARKER:
+            records = _packed_records_count(raw_series, offset)
+            if not records:
+                # A truncated record, nothing more can be decoded
+                break
+            segments.append(np.frombuffer(
+                raw_series, dtype=PACKED_DTYPE, count=records, offset=offset))
+            offset += (records * PACKED_RECORD_SIZE)
+            continue
+        unpacker = Unpacker(use_list=False)
+        unpacker.feed(raw_series[offset:])
+        items = []
+        segment_offset = offset
+        for item in unpacker:
+            if isinstance(item, tuple):
+                items.append(item)
+            segment_offset = offset + unpacker.tell()
+            if segment_offset < raw_series_length and raw_series[segment_offset] == PACKED_RECORD_MARKER:
+                break
+        if items:
+            segments.append(items)
+        if segment_offset == offset:
+            break
+        offset = segment_offset
+    return segments
+
+
+# @added 20261028 - Feature #5770: roomba - incremental trim
+def iter_datapoint_offsets(raw_series):
+    """
+    Yield the timestamp and the start and end byte offsets of each complete data
+    point in a Redis metric key, or part of a key that starts on a data point
+    boundary, in the order that they are stored.  An incomplete data point at
+    the end of raw_series is not yielded.  A ValueError is raised if the data
+    does not decode as data points.
+
+    :param raw_series: the Redis metric key data
+    :type raw_series: bytes
+    :return: (timestamp, start_offset, end_offset) for each data point
+    :rtype: generator
+
+    """
+    raw_series_length = len(raw_series)
+    offset = 0
+    while offset < raw_series_length:
+        if raw_series[offset] == PACKED_RECORD_MARKER:
+            records = _packed_records_count(raw_series, offset)
+            if not records:
+                return
+            timestamps = np.frombuffer(
+                raw_series, dtype=PACKED_DTYPE, count=records,
+                offset=offset)['timestamp'].tolist()
+            for timestamp in timestamps:
+                yield timestamp, offset, offset + PACKED_RECORD_SIZE
+                offset += PACKED_RECORD_SIZE
+            continue
+        unpacker = Unpacker(use_list=False)
+        unpacker.feed(raw_series[offset:])
+        segment_offset = offset
+        for item in unpacker:
+            start = segment_offset
+            segment_offset = offset + unpacker.tell()
+            if not isinstance(item, tuple):
+                raise ValueError('data at offset %s is not a data point' % str(start))
+            yield item[0], start, segment_offset
+            if segment_offset < raw_series_length and raw_series[segment_offset] == PACKED_RECORD_MARKER:
+                break
+        if segment_offset == offset:
+            return
+        offset = segment_offset
+
+
+def _unpack_msgpack(raw_series):
+    """
+    Return a list of tuples from a msgpack only Redis metric key or None if the
+    key also contains packed records.
+    """
+    try:
+        unpacker = Unpacker(use_list=False)
+        unpacker.feed(raw_series)
+        timeseries = list(unpacker)
+    except Exception:
+        return None
+    # A packed record decodes as an integer, not a tuple
+    for item in timeseries:
+        if not isinstance(item, tuple):
+            return None
+    return timeseries
+
+
+def unpack_timeseries_array(raw_series, sort=False):
+    """
+    Decode a Redis metric key, in either msgpack or numpy format or a mixture
+    of both, into a numpy structured array with timestamp (int64) and value
+    (float64) fields, without creating a Python object per data point when the
+    key is in the numpy format.
+
+    :param raw_series: the Redis metric key data
+    :param sort: whether to sort the time series by timestamp
+    :type raw_series: bytes
+    :type sort: boolean
+    :return: timeseries_array
+    :rtype: numpy.ndarray
+
+    """
+    if not raw_series:
+        return np.empty(0, dtype=NATIVE_DTYPE)
+
+    timeseries_array = None
+    if raw_series[0] == PACKED_RECORD_MARKER and not len(raw_series) % PACKED_RECORD_SIZE:
+        if _packed_records_count(raw_series, 0) == (len(raw_series) // PACKED_RECORD_SIZE):
+            timeseries_array = np.frombuffer(raw_series, dtype=PACKED_DTYPE).astype(NATIVE_DTYPE)
+    elif raw_series[0] == MSGPACK_DATAPOINT_MARKER:
+        timeseries = _unpack_msgpack(raw_series)
+        if timeseries is not None:
+            timeseries_array = np.array(timeseries, dtype=NATIVE_DTYPE)
+    if timeseries_array is None:
+        segments = []
+        for segment in _unpack_segments(raw_series):
+            if isinstance(segment, np.ndarray):
+                segments.append(segment.astype(NATIVE_DTYPE))
+            else:
+                segments.append(np.array(segment, dtype=NATIVE_DTYPE))
+        if segments:
+            timeseries_array = np.concatenate(segments)
+        else:
+            timeseries_array = np.empty(0, dtype=NATIVE_DTYPE)
+
+    if sort and timeseries_array.size > 1:
+        timeseries_array = timeseries_array[np.argsort(timeseries_array['timestamp'], kind='stable')]
+    return timeseries_array
+
+
+def unpack_timeseries(raw_series, sort=False):
+    """
+    Decode a Redis metric key, in either msgpack or numpy format or a mixture
+    of both, into a time series list of tuples, the equivalent of
+    ``list(Unpacker(use_list=False))`` for msgpack keys.
+
+    :param raw_series: the Redis metric key data
+    :param sort: whether to sort the time series by timestamp
+    :type raw_series: bytes
+    :type sort: boolean
+    :return: timeseries
+    :rtype: list
+
+    """
+    if not raw_series:
+        return []
+    if raw_series[0] == MSGPACK_DATAPOINT_MARKER:
+        timeseries = _unpack_msgpack(raw_series)
+        if timeseries is not None:
+            if sort:
+                timeseries = sorted(timeseries, key=lambda x: x[0])
+            return timeseries
+    return unpack_timeseries_array(raw_series, sort=sort).tolist()
@@ -0,0 +1,121 @@
+"""
+async_fetch.py
+"""
+import asyncio
+import logging
+from time import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+
+# @added 20261106 - Feature #5779: vista - async fetcher
+# The vista fetcher made each remote request in turn with requests, so the time
+# to fetch all the VISTA_FETCH_METRICS was the sum of the round trips.  The
+# requests are now made concurrently with aiohttp, bounded per remote host so
+# that no single remote is flooded, with retries and an exponential backoff on
+# connection errors and server errors.
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+async def fetch_request(session, semaphore, request, retries, backoff):
+    """
+    Make a single request with the retries and return the result dict.
+    """
+    result = {'status_code': None, 'js': None, 'error': None, 'attempts': 0}
+    method = request.get('method', 'get')
+    for attempt in range(retries + 1):
+        result['attempts'] = attempt + 1
+        try:
+            async with semaphore:
+                async with session.request(method, request['url'], json=request.get('json')) as response:
+                    result['status_code'] = response.status
+                    if response.status in [200, 204]:
+                        result['error'] = None
+                        if method == 'get':
+                            result['js'] = await response.json(content_type=None)
+                        return result
+                    result['error'] = 'http status code %s' % str(response.status)
+                    if response.status not in RETRY_STATUS_CODES:
+                        return result
+        except Exception as err:
+            result['error'] = str(err)
+        if attempt < retries:
+            await asyncio.sleep(backoff * (2 ** attempt))
+    return result
+
+
+async def fetch_requests(requests_list, concurrency_per_host, retries, backoff, timeout):
+    """
+    Make all the requests concurrently with a semaphore per remote host.
+    """
+    semaphores = {}
+    for request in requests_list:
+        host = urlparse(request['url']).netloc
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(concurrency_per_host)
+    client_timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        return await asyncio.gather(*[
+            fetch_request(session, semaphores[urlparse(request['url']).netloc], request, retries, backoff)
+            for request in requests_list])
+
+
+def async_fetch(
+        current_skyline_app, requests_list, concurrency_per_host=10, retries=2,
+        backoff=0.5, timeout=(5, 45)):
+    """
+    Make the requests concurrently and return a list of the results, in the
+    order of the requests_list.  Each request is a dict with the url and
+    optionally the method, get or post, and the json to post, e.g.
+
+    requests_list = [
+        {'url': 'https://graphite.example.org/render?from=-5minutes&target=a.b&format=json'},
+        {'url': 'http://127.0.0.1:8000/populate_metric', 'method': 'post', 'json': {...}},
+    ]
+
+    Each result is a dict with the status_code, the parsed json of a get, any
+    error and the number of attempts made, e.g.
+
+    results = [
+        {'status_code': 200, 'js': [...], 'error': None, 'attempts': 1},
+        {'status_code': None, 'js': None, 'error': 'Connection refused', 'attempts': 3},
+    ]
+
+    :param current_skyline_app: the app calling the function
+    :param requests_list: the requests
+    :param concurrency_per_host: the maximum number of concurrent requests to
+        each remote host
+    :param retries: the number of times to retry a request that fails with a
+        connection error or a 429 or 5xx status code
+    :param backoff: the seconds to wait before the first retry, doubling for
+        each retry
+    :param timeout: the (connect, read) timeout of each request
+    :type current_skyline_app: str
+    :type requests_list: list
+    :type concurrency_per_host: int
+    :type retries: int
+    :type backoff: float
+    :type timeout: tuple
+    :return: results
+    :rtype: list
+
+    """
+    function_str = 'functions.vista.async_fetch.async_fetch'
+    current_skyline_app_logger = current_skyline_app + 'Log'
+    current_logger = logging.getLogger(current_skyline_app_logger)
+
+    if not requests_list:
+        return []
+    start = time()
+    results = asyncio.run(fetch_requests(
+        requests_list, max(1, int(concurrency_per_host)), max(0, int(retries)),
+        float(backoff), timeout))
+    failed = len([result for result in results if result['error']])
+    retried = len([result for result in results if result['attempts'] > 1])
+    current_logger.info('%s :: %s requests to %s hosts made in %.6f seconds, %s retried, %s failed' % (
+        function_str, str(len(requests_list)),
+        str(len(set(urlparse(request['url']).netloc for request in requests_list))),
+        (time() - start), str(retried), str(failed)))
+    return results
@@ -6,7 +6,8 @@ from os import kill
 from redis import StrictRedis, WatchError
 from multiprocessing import Process
 from threading import Thread
-from msgpack import Unpacker, packb
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker, packb
 try:
     from types import TupleType
 except ImportError:
@@ -34,6 +35,14 @@ if True:
     # @added 20240518 - Feature #5356: get_batch_processing_namespaces
     #                   Feature #5352: vista - bigquery
     from functions.settings.get_batch_processing_namespaces import get_batch_processing_namespaces
+    # @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+    # @modified 20261028 - Feature #5770: roomba - incremental trim
+    # Added pack_datapoint, iter_datapoint_offsets, HORIZON_STORAGE_FORMAT,
+    # PACKED_RECORD_MARKER and MSGPACK_DATAPOINT_MARKER
+    from functions.timeseries.packed_timeseries import (
+        pack_timeseries, unpack_timeseries, pack_datapoint,
+        iter_datapoint_offsets, HORIZON_STORAGE_FORMAT, PACKED_RECORD_MARKER,
+        MSGPACK_DATAPOINT_MARKER)
 
 
 parent_skyline_app = 'horizon'
@@ -67,6 +76,31 @@ try:
 except:
     BATCH_PROCESSING_DEBUG = None
 
+# @added 20261028 - Feature #5770: roomba - incremental trim
+try:
+    ROOMBA_INCREMENTAL_TRIM = settings.ROOMBA_INCREMENTAL_TRIM
+except:
+    ROOMBA_INCREMENTAL_TRIM = True
+# The number of bytes initially fetched from the start of a key to find the
+# first data point to keep, if all the data points in it are to be trimmed
+# more is fetched
+ROOMBA_INCREMENTAL_TRIM_HEAD_BYTES = 4096
+if HORIZON_STORAGE_FORMAT == 'numpy':
+    STORAGE_FORMAT_MARKER = PACKED_RECORD_MARKER
+else:
+    STORAGE_FORMAT_MARKER = MSGPACK_DATAPOINT_MARKER
+# Atomically remove the trimmed bytes from the start of a key, only if the start
+# of the key has not been changed since it was read.  Data points appended to
+# the key by Horizon while it is being trimmed are retained.
+TRIM_KEY_PREFIX_SCRIPT = """
+local prefix_length = tonumber(ARGV[1])
+if redis.call('GETRANGE', KEYS[1], 0, prefix_length - 1) ~= ARGV[2] then
+    return 0
+end
+redis.call('SET', KEYS[1], redis.call('GETRANGE', KEYS[1], prefix_length, -1))
+return 1
+"""
+
 
 class Roomba(Thread):
     """
@@ -89,6 +123,9 @@ class Roomba(Thread):
         self.redis_conn = get_redis_conn(skyline_app)
         self.redis_conn_decoded = get_redis_conn_decoded(skyline_app)
 
+        # @added 20261028 - Feature #5770: roomba - incremental trim
+        self.trim_key_prefix = self.redis_conn.register_script(TRIM_KEY_PREFIX_SCRIPT)
+
         self.daemon = True
         self.parent_pid = parent_pid
         self.skip_mini = skip_mini
@@ -105,6 +142,86 @@ class Roomba(Thread):
             logger.info('warning :: parent process is dead')
             sys.exit(0)
 
+    # @added 20261028 - Feature #5770: roomba - incremental trim
+    def incremental_trim(self, key, key_trim_state, delta):
+        """
+        Trim the data points that are older than delta from the start of a
+        metric key without decoding and rewriting the entire key.  Only the data
+        points appended since the key was last vacuumed and the data points at
+        the start of the key up to delta are decoded.  If the appended data
+        points are not in order, the key has been rewritten by another process
+        or is not in the HORIZON_STORAGE_FORMAT, None is returned and the key
+        must be fully vacuumed.
+
+        :param key: the metric key
+        :param key_trim_state: the trim state of the key in the form
+            validated_length:last_record_length:last_timestamp
+        :param delta: the timestamp older than or equal to which data points
+            are trimmed
+        :type key: str
+        :type key_trim_state: str
+        :type delta: float
+        :return: (status, key_trim_state) where status is 'trimmed', 'active'
+            or None
+        :rtype: tuple
+
+        """
+        validated_length_str, last_record_length_str, last_timestamp_str = key_trim_state.split(':')
+        validated_length = int(validated_length_str)
+        last_record_length = int(last_record_length_str)
+        last_timestamp = float(last_timestamp_str)
+        tail_offset = validated_length - last_record_length
+        if tail_offset < 0 or not last_record_length:
+            return None, None
+
+        # Check that the last data point that was validated is still at the same
+        # offset and that the data points appended after it are in order
+        raw_tail = self.redis_conn.getrange(key, tail_offset, -1)
+        if not raw_tail or raw_tail[0] != STORAGE_FORMAT_MARKER:
+            return None, None
+        previous_timestamp = None
+        last_start = 0
+        last_end = 0
+        for timestamp, start, end in iter_datapoint_offsets(raw_tail):
+            if previous_timestamp is None:
+                if timestamp != last_timestamp or end != last_record_length:
+                    return None, None
+            elif timestamp <= previous_timestamp or raw_tail[start] != STORAGE_FORMAT_MARKER:
+                return None, None
+            previous_timestamp = timestamp
+            last_start = start
+            last_end = end
+        # If the key has no data points newer than delta it is euthanized by
+        # the full vacuum
+        if previous_timestamp is None or previous_timestamp <= delta:
+            return None, None
+        validated_end = tail_offset + last_end
+
+        # Determine the offset of the first data point to keep
+        cutoff_offset = None
+        raw_head = b''
+        head_length = min(ROOMBA_INCREMENTAL_TRIM_HEAD_BYTES, validated_end)
+        while cutoff_offset is None:
+            raw_head = self.redis_conn.getrange(key, 0, head_length - 1)
+            for timestamp, start, end in iter_datapoint_offsets(raw_head):
+                if timestamp > delta:
+                    cutoff_offset = start
+                    break
+            if cutoff_offset is None:
+                if head_length >= validated_end:
+                    return None, None
+                head_length = min((head_length * 4), validated_end)
+
+        trimmed = 'active'
+        if cutoff_offset:
+            if not self.trim_key_prefix(keys=[key], args=[cutoff_offset, raw_head[:cutoff_offset]]):
+                return None, None
+            trimmed = 'trimmed'
+        key_trim_state = '%s:%s:%s' % (
+            str(validated_end - cutoff_offset), str(last_end - last_start),
+            str(previous_timestamp))
+        return trimmed, key_trim_state
+
     def vacuum(self, i, namespace, duration):
         """
         Trim metrics that are older than settings.FULL_DURATION and purge old
@@ -225,6 +342,21 @@ class Roomba(Thread):
             assigned_metrics = unknown_last_trimmed_assigned_metrics + new_assigned_metrics
         logger.info('horizon.roomba :: ordered assigned_metrics by last trimmed')
 
+        # @added 20261028 - Feature #5770: roomba - incremental trim
+        metrics_trim_state = {}
+        metrics_trim_state_keys = set()
+        new_metrics_trim_state = {}
+        remove_metrics_trim_state = []
+        incrementally_trimmed = 0
+        fully_vacuumed = 0
+        if ROOMBA_INCREMENTAL_TRIM:
+            try:
+                metrics_trim_state = self.redis_conn_decoded.hgetall('horizon.roomba.metrics_trim_state')
+            except Exception as err:
+                logger.error('error :: horizon.roomba :: hgetall failed on horizon.roomba.metrics_trim_state, err: %s' % err)
+                metrics_trim_state = {}
+            metrics_trim_state_keys = set(metrics_trim_state.keys())
+
         # @modified 20191016 - Task #3280: Handle py2 xange and py3 range
         #                      Branch #3262: py3
         # for i in xrange(len(assigned_metrics)):
@@ -253,6 +385,31 @@ class Roomba(Thread):
             now = time()
             key = assigned_metrics[i]
 
+            # @added 20261028 - Feature #5770: roomba - incremental trim
+            # Only trim the start of the key if it is known to be in order,
+            # otherwise fully vacuum it
+            key_trim_state = None
+            if ROOMBA_INCREMENTAL_TRIM and key in metrics_trim_state:
+                incremental_trim = None
+                try:
+                    incremental_trim, key_trim_state = self.incremental_trim(key, metrics_trim_state[key], (now - duration))
+                except Exception as err:
+                    logger.error('error :: horizon.roomba :: incremental_trim failed on %s, fully vacuuming, err: %s' % (
+                        key, err))
+                    incremental_trim = None
+                if incremental_trim:
+                    active_keys += 1
+                    if incremental_trim == 'trimmed':
+                        trimmed_keys += 1
+                    incrementally_trimmed += 1
+                    new_metrics_trim_state[key] = key_trim_state
+                    metrics_trimmed_dict[key] = str(int(now))
+                    continue
+                # Do not retry the incremental trim if the key is blocked
+                del metrics_trim_state[key]
+            if ROOMBA_INCREMENTAL_TRIM:
+                fully_vacuumed += 1
+
             try:
                 # WATCH the key
                 pipe.watch(key)
@@ -261,9 +418,14 @@ class Roomba(Thread):
                 # comes in. If your data has a very small resolution (<.1s),
                 # this technique may not suit you.
                 raw_series = pipe.get(key)
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = sorted([unpacked for unpacked in unpacker])
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # Decode msgpack, numpy or mixed format keys, the key is
+                # rewritten below in the HORIZON_STORAGE_FORMAT which migrates
+                # existing keys when the format is changed.
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = sorted([unpacked for unpacked in unpacker])
+                timeseries = sorted(unpack_timeseries(raw_series))
 
                 # Put pipe back in multi mode
                 pipe.multi()
@@ -311,18 +473,33 @@ class Roomba(Thread):
                 # Purge if everything was deleted, set key otherwise
                 if len(trimmed) > 0:
                     # Serialize and turn key back into not-an-array
-                    btrimmed = packb(trimmed)
-                    if len(trimmed) <= 15:
-                        value = btrimmed[1:]
-                    elif len(trimmed) <= 65535:
-                        value = btrimmed[3:]
-                        trimmed_keys += 1
-                    else:
-                        value = btrimmed[5:]
+                    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                    # btrimmed = packb(trimmed)
+                    # if len(trimmed) <= 15:
+                    #     value = btrimmed[1:]
+                    # elif len(trimmed) <= 65535:
+                    #     value = btrimmed[3:]
+                    #     trimmed_keys += 1
+                    # else:
+                    #     value = btrimmed[5:]
+                    #     trimmed_keys += 1
+                    value = pack_timeseries(trimmed)
+                    if len(trimmed) > 15:
                         trimmed_keys += 1
                     pipe.set(key, value)
                     active_keys += 1
 
+                    # @added 20261028 - Feature #5770: roomba - incremental trim
+                    # The key is now sorted and deduplicated so record the
+                    # length and last data point of the key so that it can be
+                    # incrementally trimmed on the next run
+                    if ROOMBA_INCREMENTAL_TRIM:
+                        last_record = pack_datapoint(trimmed[-1])
+                        if value.endswith(last_record):
+                            key_trim_state = '%s:%s:%s' % (
+                                str(len(value)), str(len(last_record)),
+                                str(trimmed[-1][0]))
+
                     # @added 20240220 - Feature #5272: analyzer - load_shedding - SKYLINE_FEEDBACK_NAMESPACES
                     trimmed_at_str = str(int(now))
                     metrics_trimmed_dict[key] = trimmed_at_str
@@ -341,6 +518,10 @@ class Roomba(Thread):
 
                 pipe.execute()
 
+                # @added 20261028 - Feature #5770: roomba - incremental trim
+                if key_trim_state:
+                    new_metrics_trim_state[key] = key_trim_state
+
             except WatchError:
                 blocked += 1
                 assigned_metrics.append(key)
@@ -355,6 +536,26 @@ class Roomba(Thread):
             finally:
                 pipe.reset()
 
+        # @added 20261028 - Feature #5770: roomba - incremental trim
+        if ROOMBA_INCREMENTAL_TRIM:
+            remove_metrics_trim_state = [
+                key for key in metrics_trim_state_keys
+                if key in assigned_metrics_set and key not in new_metrics_trim_state]
+            if new_metrics_trim_state:
+                try:
+                    self.redis_conn_decoded.hset('horizon.roomba.metrics_trim_state', mapping=new_metrics_trim_state)
+                except Exception as err:
+                    logger.error('error :: %s :: hset failed on horizon.roomba.metrics_trim_state, err: %s' % (
+                        skyline_app, err))
+            if remove_metrics_trim_state:
+                try:
+                    self.redis_conn_decoded.hdel('horizon.roomba.metrics_trim_state', *remove_metrics_trim_state)
+                except Exception as err:
+                    logger.error('error :: %s :: hdel failed on horizon.roomba.metrics_trim_state, err: %s' % (
+                        skyline_app, err))
+            logger.info('%s :: vacuum incrementally trimmed %d keys and fully vacuumed %d keys' % (
+                skyline_app, incrementally_trimmed, fully_vacuumed))
+
         # @added 20240220 - Feature #5272: analyzer - load_shedding - SKYLINE_FEEDBACK_NAMESPACES
         if metrics_trimmed_dict:
             logger.info('%s :: vacuum adding %s metrics to horizon.roomba.metrics_last_trimmed' % (
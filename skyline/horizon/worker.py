@@ -27,7 +27,8 @@ from sys import exit as sys_exit
 # @added 20220722 - Task #4624: Change all dict copy to deepcopy
 import copy
 
-from msgpack import packb
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import packb
 from redis import StrictRedis, WatchError
 
 import settings
@@ -48,6 +49,8 @@ from functions.horizon.process_graphite_fail_queue import process_graphite_fail_
 # @added 20231223 - Task #5188: Optimise redis renames
 #                   Task #5178: Build and test skyline v4.1.0
 from functions.redis.redis_rename_key import redis_rename_key
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import pack_datapoint
 
 parent_skyline_app = 'horizon'
 child_skyline_app = 'worker'
@@ -449,7 +452,10 @@ class Worker(Process):
                     # pipe.sadd(full_uniques, key)
 
                     try:
-                        pipe.append(str(key), packb(metric[1]))
+                        # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                        # Append in the HORIZON_STORAGE_FORMAT
+                        # pipe.append(str(key), packb(metric[1]))
+                        pipe.append(str(key), pack_datapoint(metric[1]))
                         # @added 20200815 - Feature #3680: horizon.worker.datapoints_sent_to_redis
                         datapoints_sent_to_redis += 1
                     except Exception as err:
@@ -488,7 +494,9 @@ class Worker(Process):
                         #                      Bug #3266: py3 Redis binary objects not strings
                         # mini_key = ''.join((MINI_NAMESPACE, metric[0]))
                         mini_key = ''.join((MINI_NAMESPACE, str(metric[0])))
-                        pipe.append(mini_key, packb(metric[1]))
+                        # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                        # pipe.append(mini_key, packb(metric[1]))
+                        pipe.append(mini_key, pack_datapoint(metric[1]))
                         pipe.sadd(mini_uniques, mini_key)
 
                     # @modified 20190130 - Task #2690: Test Skyline on Python-3.6.7
@@ -23,6 +23,8 @@ import settings
 from skyline_functions import get_memcache_metric_object
 from database import (
     get_engine, metrics_table_meta)
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 # @added 20210425 - Task #4030: refactoring
 #                   Feature #4014: Ionosphere - inference
 from functions.numpy.percent_different import get_percent_different
@@ -114,7 +116,11 @@ def get_metrics_db_object(base_name):
     def engine_disposal(engine):
         if engine:
             try:
-                engine.dispose()
+                # @modified 20261024 - Feature #5766: database - pooled engine
+                # The pooled engine is not disposed of
+                # engine.dispose()
+                if not is_pooled_engine(engine):
+                    engine.dispose()
             except:
                 logger.error(traceback.format_exc())
                 logger.error('error :: calling engine.dispose()')
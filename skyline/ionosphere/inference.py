@@ -47,6 +47,12 @@ if True:
     from functions.database.queries.fp_timeseries import get_db_fp_timeseries
     from functions.numpy.percent_different import get_percent_different
     from functions.database.queries.get_ionosphere_fp_ids_for_full_duration import get_ionosphere_fp_ids_for_full_duration
+    # @added 20261101 - Feature #5774: ionosphere - batched motif search
+    from functions.ionosphere.motif_search import (
+        get_motif_search_method, batched_motif_search)
+    # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+    from functions.ionosphere.fp_timeseries_store import (
+        get_stored_fp_timeseries, fp_timeseries_to_list)
 
     # @added 20220731 - Task #2732: Prometheus to Skyline
     #                   Branch #4300: prometheus
@@ -117,6 +123,20 @@ except Exception as outer_err:
     logger.info('warning :: inference :: cannot determine IONOSPHERE_INFERENCE_MOTIFS_RANGE_PADDING from settings - %s' % outer_err)
     IONOSPHERE_INFERENCE_MOTIFS_RANGE_PADDING = 10
 
+# @added 20261101 - Feature #5774: ionosphere - batched motif search
+try:
+    IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH = settings.IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH
+except Exception as outer_err:
+    logger.info('warning :: inference :: cannot determine IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH from settings - %s' % outer_err)
+    IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH = True
+
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+try:
+    IONOSPHERE_FP_TIMESERIES_STORE = settings.IONOSPHERE_FP_TIMESERIES_STORE
+except Exception as outer_err:
+    logger.info('warning :: inference :: cannot determine IONOSPHERE_FP_TIMESERIES_STORE from settings - %s' % outer_err)
+    IONOSPHERE_FP_TIMESERIES_STORE = True
+
 context = 'ionosphere_inference'
 
 
@@ -161,6 +181,12 @@ def ionosphere_motif_inference(metric, timestamp):
     # motif related columns
     fps_checked_for_motifs = []
 
+    # @added 20261101 - Feature #5774: ionosphere - batched motif search
+    # The FFTs of the fp time series are computed once and reused for every
+    # batch_size query
+    motif_search_fft_cache = {}
+    motif_search_pruned = 0
+
     # @added 20210426 - Feature #4014: Ionosphere - inference
     # Optimise the database select time by getting each ionosphere table fp id
     # row for each fp, so that the single resulting object can be referred to
@@ -356,6 +382,28 @@ def ionosphere_motif_inference(metric, timestamp):
         max_inference_runtime = 20
         fps_checked_count = 0
 
+        # @added 20261101 - Feature #5774: ionosphere - batched motif search
+        # The motif searches of all the fps of the full_duration are collected
+        # and run in batches once the fp time series are loaded
+        motif_search_jobs = []
+
+        # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+        # Load the time series of all the fps from the fp timeseries store,
+        # any fps that are not in the store are fetched from the DB in one
+        # query and added to the store
+        stored_fp_timeseries = {}
+        if IONOSPHERE_FP_TIMESERIES_STORE and metric_id:
+            start_get_stored_fp_timeseries = timer()
+            try:
+                stored_fp_timeseries = get_stored_fp_timeseries(
+                    skyline_app, metric_id, full_duration_fp_ids)
+            except Exception as err:
+                logger.error('error :: inference :: get_stored_fp_timeseries failed - %s' % (
+                    err))
+            logger.info('inference :: get_stored_fp_timeseries got %s of %s fp time series in %.6f seconds' % (
+                str(len(stored_fp_timeseries)), str(len(full_duration_fp_ids)),
+                (timer() - start_get_stored_fp_timeseries)))
+
         for fp_id in full_duration_fp_ids:
 
             # if SINGLE_MATCH and matched_motifs:
@@ -379,10 +427,16 @@ def ionosphere_motif_inference(metric, timestamp):
             # even when the data is in memcache, no with no database query
             fp_timeseries = None
 
+            # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+            if fp_id in stored_fp_timeseries:
+                fp_timeseries = fp_timeseries_to_list(stored_fp_timeseries[fp_id])
+
             # But DO query memcache first if the timeseries is less than 2000
             # because shorter timeseries are just as fast with memcache and
             # results in less queries to the database
-            if len(timeseries) < 2000:
+            # @modified 20261102 - Feature #5775: ionosphere - fp timeseries store
+            # if len(timeseries) < 2000:
+            if not fp_timeseries and len(timeseries) < 2000:
                 start_get_fp_timeseries = timer()
                 try:
                     fp_timeseries = get_fp_timeseries(skyline_app, metric_id, fp_id)
@@ -436,6 +490,9 @@ def ionosphere_motif_inference(metric, timestamp):
             fps_timeseries[fp_id] = fp_timeseries
 
             relate_dataset = [float(item[1]) for item in fp_timeseries]
+            # @added 20261101 - Feature #5774: ionosphere - batched motif search
+            if IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH:
+                relate_values = np.array(relate_dataset, dtype=np.float64)
 
             pattern_found = False
             for namespace_key in list(IONOSPHERE_INFERENCE_MOTIFS_SETTINGS.keys()):
@@ -571,6 +628,33 @@ def ionosphere_motif_inference(metric, timestamp):
                 best_indices = None
                 best_dists = None
 
+                # @added 20261101 - Feature #5774: ionosphere - batched motif search
+                # Rather than running mts.mass2_batch or mts.mass3 on this fp
+                # and batch_size now, add a search job to run in a batch with
+                # all the other fps once they are loaded
+                if IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH:
+                    search_method, use_top_matches, skip_reason = get_motif_search_method(
+                        len(relate_dataset), batch_size, len(batch_size_dataset), top_matches)
+                    if not search_method:
+                        logger.info('inference :: skipping motif search on fp_id: %s, batch_size: %s because %s' % (
+                            str(fp_id), str(batch_size), str(skip_reason)))
+                        continue
+                    motif_search_jobs.append({
+                        'fp_id': fp_id, 'fp_values': relate_values,
+                        'query': batch_size_dataset, 'batch_size': batch_size,
+                        'method': search_method, 'use_top_matches': use_top_matches,
+                        'max_distance': max_distance, 'min_y': min_y,
+                        'max_y': max_y, 'range_padding': range_padding,
+                        'min_y_padded': min_y_padded, 'max_y_padded': max_y_padded,
+                        'find_exact_matches': find_exact_matches,
+                        'motif_details': [
+                            batch_size_anomalous_timeseries_subsequence,
+                            batch_size, max_distance, max_area_percent_diff,
+                            max_y, min_y, range_padding, min_y_padded,
+                            max_y_padded],
+                    })
+                    continue
+
                 # POC running all through mass3 with maximum pieces (SUPER FAST)
                 # and then filtering on max_distance, all_in_range and area
                 # percent_different
@@ -873,6 +957,43 @@ def ionosphere_motif_inference(metric, timestamp):
                 # TODO
                 # mass3 ALL, then evaluate, would it be quicker?  No see POC
                 # above
+
+        # @added 20261101 - Feature #5774: ionosphere - batched motif search
+        # Run all the motif searches of the full_duration fps in batches and
+        # add the motifs in the same form as the mts.mass2_batch and mts.mass3
+        # results are added above.  Motifs that would be removed because they
+        # are not within the max_distance or not in range are pruned in the
+        # batched search.
+        if motif_search_jobs:
+            motif_search_results = []
+            start_motif_search = timer()
+            try:
+                motif_search_results = batched_motif_search(
+                    skyline_app, motif_search_jobs, motif_search_fft_cache)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: inference :: batched_motif_search failed - %s' % (
+                    err))
+            end_motif_search = timer()
+            mass2_batch_times.append((end_motif_search - start_motif_search))
+            for motif_search_job, motif_search_result in zip(motif_search_jobs, motif_search_results):
+                if motif_search_result is None:
+                    continue
+                job_fp_id = motif_search_job['fp_id']
+                motif_details = motif_search_job['motif_details']
+                fps_checked_for_motifs.append(job_fp_id)
+                add_motifs = [[job_fp_id, index, dist] + motif_details for index, dist in zip(motif_search_result['indices'], motif_search_result['dists'])]
+                if add_motifs:
+                    motifs_found = motifs_found + add_motifs
+                for index in motif_search_result['exact_match_indices']:
+                    exact_matches_found.append([job_fp_id, index, 0.0] + motif_details)
+                    motifs_found.append([job_fp_id, index, 0.0] + motif_details)
+                motif_search_pruned += motif_search_result['pruned']
+            logger.info('inference :: batched motif search of %s fp batch_size jobs of full_duration %s in %.6f seconds, %s motifs found, %s pruned' % (
+                str(len(motif_search_jobs)), str(full_duration),
+                (end_motif_search - start_motif_search), str(len(motifs_found)),
+                str(motif_search_pruned)))
+
         logger.info('inference :: mts.mass2_batch runs on %s fps of full_duration %s in %.6f seconds' % (
             str(len(mass2_batch_times)), str(full_duration), sum(mass2_batch_times)))
         logger.info('inference :: exact_match runs on %s fps of full_duration %s in %.6f seconds' % (
@@ -1219,10 +1340,12 @@ def ionosphere_motif_inference(metric, timestamp):
     end = timer()
     if dev_null:
         del dev_null
-    logger.info('inference :: %s motif best match found from %s motifs_found, %s fps where checked from %s (motifs removed due to not_in_range %s, percent_different %s) and it took a total of %.6f seconds (all mass2/mass3) to process %s' % (
+    # @modified 20261101 - Feature #5774: ionosphere - batched motif search
+    # Added motif_search_pruned
+    logger.info('inference :: %s motif best match found from %s motifs_found, %s fps where checked from %s (motifs removed due to not_in_range %s, percent_different %s, pruned in batched search %s) and it took a total of %.6f seconds (all mass2/mass3) to process %s' % (
         # str(len(matched_motifs)), str(len(motifs_found)), str(len(fps_checked_for_motifs)),
         str(len(matched_motifs)), str(len(motifs_found)), str(len(unique_fps_checked_for_motifs)),
         str(full_duration_fp_count), str(not_in_range_removed),
-        str(percent_different_removed), (end - start), metric))
+        str(percent_different_removed), str(motif_search_pruned), (end - start), metric))
     # return matched_motifs, fps_checked_for_motifs
     return matched_motifs, unique_fps_checked_for_motifs
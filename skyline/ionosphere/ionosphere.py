@@ -122,6 +122,8 @@ from database import (
     #                   Branch #3590: inference
     not_anomalous_motifs_table_meta,
 )
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 # @added 20210425 - Task #4030: refactoring
 #                   Feature #4014: Ionosphere - inference
@@ -184,6 +186,17 @@ from functions.metrics.get_tenant_id import get_tenant_id
 # @added 20250729 - Feature #5644: ionosphere.learn_self_validation
 from learn_self_validation import self_validation
 
+# @added 20261029 - Feature #5771: ionosphere - fp features matrix
+from functions.ionosphere.get_fp_features_matrix import (
+    get_fp_features_matrix, get_fp_features_scores)
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+from functions.ionosphere.fp_timeseries_store import (
+    get_stored_fp_timeseries, fp_timeseries_to_list)
+# @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+from functions.ionosphere.minmax_fp_evaluation import (
+    load_anomaly_json_timeseries, minmax_ranges_similar, get_minmax_features,
+    evaluate_minmax_fps_parallel)
+
 skyline_app = 'ionosphere'
 skyline_app_logger = '%sLog' % skyline_app
 logger = logging.getLogger(skyline_app_logger)
@@ -344,6 +357,34 @@ try:
 except:
     SKYLINE_DAWN_ENABLED = True
 
+# @added 20261029 - Feature #5771: ionosphere - fp features matrix
+try:
+    IONOSPHERE_FP_FEATURES_MATRIX = settings.IONOSPHERE_FP_FEATURES_MATRIX
+except:
+    IONOSPHERE_FP_FEATURES_MATRIX = True
+
+# @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+try:
+    IONOSPHERE_TSFRESH_FEATURE_SET = str(settings.IONOSPHERE_TSFRESH_FEATURE_SET)
+except:
+    IONOSPHERE_TSFRESH_FEATURE_SET = 'efficient'
+
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+try:
+    IONOSPHERE_FP_TIMESERIES_STORE = settings.IONOSPHERE_FP_TIMESERIES_STORE
+except:
+    IONOSPHERE_FP_TIMESERIES_STORE = True
+
+# @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+try:
+    IONOSPHERE_PARALLEL_FP_EVALUATION = settings.IONOSPHERE_PARALLEL_FP_EVALUATION
+except:
+    IONOSPHERE_PARALLEL_FP_EVALUATION = True
+try:
+    IONOSPHERE_PARALLEL_FP_EVALUATION_PROCESSES = int(settings.IONOSPHERE_PARALLEL_FP_EVALUATION_PROCESSES)
+except:
+    IONOSPHERE_PARALLEL_FP_EVALUATION_PROCESSES = 2
+
 skyline_app_graphite_namespace = 'skyline.%s%s' % (skyline_app, SERVER_METRIC_PATH)
 
 max_age_seconds = settings.IONOSPHERE_CHECK_MAX_AGE
@@ -1255,7 +1296,11 @@ class Ionosphere(Thread):
 
         if engine:
             try:
-                engine.dispose()
+                # @modified 20261024 - Feature #5766: database - pooled engine
+                # The pooled engine is not disposed of
+                # engine.dispose()
+                if not is_pooled_engine(engine):
+                    engine.dispose()
             except:
                 logger.error(traceback.format_exc())
                 logger.error('error :: calling engine.dispose()')
@@ -1578,7 +1623,11 @@ class Ionosphere(Thread):
         def engine_disposal(engine):
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: calling engine.dispose()')
@@ -2566,6 +2615,10 @@ class Ionosphere(Thread):
         # To ensure the good performance of features profiles we ensure that the
         fps_dict = {}
 
+        # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+        # The tsfresh feature set that each features profile was created with
+        fp_tsfresh_feature_sets = {}
+
         # @added 20161209 - Branch #922: ionosphere
         #                   Task #1658: Patterning Skyline Ionosphere
         # Use SQLAlchemy, mysql.connector is still upstairs ^^ but starting the
@@ -2782,6 +2835,11 @@ class Ionosphere(Thread):
                     # Added all_fp_ids
                     all_fp_ids.append(int(fp_id))
 
+                    # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+                    # Features profiles created before the column was added
+                    # were created with the efficient feature set
+                    fp_tsfresh_feature_sets[int(fp_id)] = row.get('tsfresh_feature_set') or 'efficient'
+
                     if int(row['full_duration']) == int(full_duration):
                         # @modified 20170116 - Feature #1854: Ionosphere learn - generations
                         # Handle ionosphere_learn
@@ -3547,9 +3605,17 @@ class Ionosphere(Thread):
 
         context = skyline_app
         f_calc = None
+        # @added 20261030 - Feature #5772: ionosphere - in memory feature extraction
+        # The calculated features are passed back by calculate_features_profile
+        # so the transposed features csv does not need to be read back in
+        in_memory_calculated_features = []
         if not calculated_feature_file_found:
             try:
-                fp_csv, successful, fp_exists, fp_id, log_msg, traceback_format_exc, f_calc = calculate_features_profile(skyline_app, metric_timestamp, use_base_name, context)
+                # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+                # fp_csv, successful, fp_exists, fp_id, log_msg, traceback_format_exc, f_calc = calculate_features_profile(skyline_app, metric_timestamp, use_base_name, context)
+                fp_csv, successful, fp_exists, fp_id, log_msg, traceback_format_exc, f_calc = calculate_features_profile(
+                    skyline_app, metric_timestamp, use_base_name, context,
+                    calculated_features=in_memory_calculated_features)
             except Exception as err:
                 logger.error(traceback.format_exc())
                 logger.error('error :: failed to calculate features - %s' % err)
@@ -3608,7 +3674,11 @@ class Ionosphere(Thread):
         # TODO: Match the test_tsfresh method
         # Create an array of the calculated features
         calculated_features = []
-        if calculated_feature_file_found:
+        # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+        # if calculated_feature_file_found:
+        if in_memory_calculated_features:
+            calculated_features = list(in_memory_calculated_features)
+        elif calculated_feature_file_found:
             calculated_features = get_calculated_features(calculated_feature_file)
 
         if len(calculated_features) == 0:
@@ -3762,6 +3832,12 @@ class Ionosphere(Thread):
                     logger.info('added an additional %s echo fp ids for %s' % (str(echo_fp_count), use_base_name))
                     logger.info('determined a total of %s fp ids (incl. echo) for %s' % (str(fp_count_with_echo), use_base_name))
                     echo_calculated_feature_file = '%s/%s.echo.tsfresh.input.csv.features.transposed.csv' % (metric_training_data_dir, use_base_name)
+                    # @added 20261030 - Feature #5772: ionosphere - in memory feature extraction
+                    # The echo transposed features csv is only used here and
+                    # is removed when the check is done, so it is no longer
+                    # written, the echo calculated features are passed back in
+                    # memory by calculate_features_profile
+                    echo_in_memory_calculated_features = []
                     if os.path.isfile(echo_calculated_feature_file):
                         logger.info('echo calculated features available - %s' % (echo_calculated_feature_file))
                         echo_calculated_feature_file_found = True
@@ -3769,7 +3845,12 @@ class Ionosphere(Thread):
                         use_context = 'ionosphere_echo_check'
                         f_calc = None
                         try:
-                            fp_csv, successful, fp_exists, fp_id, log_msg, traceback_format_exc, f_calc = calculate_features_profile(skyline_app, metric_timestamp, use_base_name, use_context)
+                            # @modified 20261030 - Feature #5772: ionosphere - in memory feature extraction
+                            # fp_csv, successful, fp_exists, fp_id, log_msg, traceback_format_exc, f_calc = calculate_features_profile(skyline_app, metric_timestamp, use_base_name, use_context)
+                            fp_csv, successful, fp_exists, fp_id, log_msg, traceback_format_exc, f_calc = calculate_features_profile(
+                                skyline_app, metric_timestamp, use_base_name, use_context,
+                                write_features_file=False,
+                                calculated_features=echo_in_memory_calculated_features)
                         except:
                             logger.error(traceback.format_exc())
                             logger.error('error :: failed to calculate features')
@@ -3777,7 +3858,13 @@ class Ionosphere(Thread):
                         logger.info('echo calculated features available - %s' % (echo_calculated_feature_file))
                         echo_calculated_feature_file_found = True
                     echo_calculated_features = []
-                    if echo_calculated_feature_file_found:
+                    # @added 20261030 - Feature #5772: ionosphere - in memory feature extraction
+                    if echo_in_memory_calculated_features:
+                        logger.info('echo calculated features determined in memory - %s features' % (
+                            str(len(echo_in_memory_calculated_features))))
+                        echo_calculated_feature_file_found = True
+                        echo_calculated_features = list(echo_in_memory_calculated_features)
+                    elif echo_calculated_feature_file_found:
                         try:
                             echo_calculated_features = get_calculated_features(echo_calculated_feature_file)
                         except:
@@ -3789,6 +3876,261 @@ class Ionosphere(Thread):
                 logger.error(traceback.format_exc())
                 logger.error('error :: failed to process echo')
 
+        # @added 20261029 - Feature #5771: ionosphere - fp features matrix
+        # Get the features of all the fp ids from the cached fp features matrix
+        # and compare the calculated features to all of them at once, rather
+        # than querying the DB for the features of each fp id and comparing
+        # the features of each fp id in turn
+        fp_features_matrix = {}
+        fp_features_scores = {'ionosphere': {}, 'ionosphere_echo_check': {}}
+        calc_features_by_id_by_check_type = {}
+        if calculated_feature_file_found and IONOSPHERE_FP_FEATURES_MATRIX and metrics_id and fp_ids:
+            if not engine:
+                try:
+                    engine, log_msg, trace = get_an_engine()
+                except:
+                    logger.error(traceback.format_exc())
+                    logger.error('error :: could not get a MySQL engine for get_fp_features_matrix')
+            try:
+                fp_features_matrix = get_fp_features_matrix(
+                    skyline_app, metrics_id, fp_ids, engine=engine,
+                    redis_conn=self.redis_conn)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: get_fp_features_matrix failed, err: %s' % err)
+                fp_features_matrix = {}
+            tsfresh_feature_ids = {name: skyline_feature_id for skyline_feature_id, name in TSFRESH_FEATURES}
+            for matrix_check_type, matrix_calculated_features in [
+                    ['ionosphere', calculated_features],
+                    ['ionosphere_echo_check', echo_calculated_features]]:
+                if not matrix_calculated_features:
+                    continue
+                calc_features_by_id_by_check_type[matrix_check_type] = [
+                    [tsfresh_feature_ids[feature_name], float(calc_value)]
+                    for feature_name, calc_value in matrix_calculated_features
+                    if feature_name in tsfresh_feature_ids]
+                if fp_features_matrix:
+                    try:
+                        fp_features_scores[matrix_check_type] = get_fp_features_scores(
+                            fp_features_matrix, calc_features_by_id_by_check_type[matrix_check_type])
+                    except Exception as err:
+                        logger.error(traceback.format_exc())
+                        logger.error('error :: get_fp_features_scores failed for %s, err: %s' % (
+                            matrix_check_type, err))
+            logger.info('determined fp features scores for %s fps' % str(len(fp_features_scores['ionosphere'])))
+
+        # @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+        # The minmax check is the most expensive part of each fp evaluation,
+        # the minmax scaled features of the anomalous time series are extracted
+        # for each fp and the minmax scaled features of each fp are extracted
+        # if they are not in the ionosphere_minmax table.  The anomalous minmax
+        # features are calculated once per check type and the minmax features
+        # of the fps that are not in the ionosphere_minmax table are calculated
+        # in a bounded pool of processes, which stops as soon as the first fp
+        # that matches is known.  The fps are then evaluated in order as
+        # normal, using the calculated minmax features.
+        minmax_anomalous_features_by_check_type = {}
+        fp_minmax_scaled_dicts = {}
+        parallel_minmax_fp_features = {}
+        # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+        # The stored fp time series of all the fp_ids are loaded once, the
+        # store is rewritten for each load that adds missing fps
+        stored_fps_timeseries = {}
+        stored_fps_timeseries_loaded = False
+        try:
+            parallel_minmax_enabled = settings.IONOSPHERE_MINMAX_SCALING_ENABLED
+        except:
+            parallel_minmax_enabled = False
+        if added_by == 'ionosphere_learn':
+            parallel_minmax_enabled = False
+        if not IONOSPHERE_PARALLEL_FP_EVALUATION or not IONOSPHERE_FP_TIMESERIES_STORE:
+            parallel_minmax_enabled = False
+        if not calculated_feature_file_found or not metrics_id or not fp_ids:
+            parallel_minmax_enabled = False
+        # @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+        # The minmax check of an fp is only run if its features do not match,
+        # so the parallel minmax evaluation is only run if none of the fps
+        # match on the features sums.  Whether an fp matches is determined from
+        # the fp_features_scores, if an fp has no score it cannot be determined
+        # and the fps are evaluated in order as normal.
+        if parallel_minmax_enabled:
+            for fp_id in fp_ids:
+                features_check_type = 'ionosphere'
+                if echo_check and fp_id in echo_fp_ids:
+                    features_check_type = 'ionosphere_echo_check'
+                fp_features_score = fp_features_scores[features_check_type].get(int(fp_id))
+                if not fp_features_score:
+                    parallel_minmax_enabled = False
+                    logger.info('parallel fp evaluation :: fp id %s has no features score, not evaluating in parallel' % str(fp_id))
+                    break
+                if not fp_features_score['count']:
+                    continue
+                if features_check_type == 'ionosphere':
+                    features_percent_similar = float(settings.IONOSPHERE_FEATURES_PERCENT_SIMILAR)
+                else:
+                    try:
+                        features_percent_similar = float(settings.IONOSPHERE_ECHO_FEATURES_PERCENT_SIMILAR)
+                    except:
+                        features_percent_similar = 2.0
+                try:
+                    features_percent_different = abs(get_percent_different(
+                        fp_features_score['fp_sum'], fp_features_score['calc_sum'], True))
+                except:
+                    features_percent_different = 100
+                features_almost_equal = False
+                try:
+                    np.testing.assert_array_almost_equal(
+                        [fp_features_score['fp_sum']], [fp_features_score['calc_sum']])
+                    features_almost_equal = True
+                except:
+                    features_almost_equal = False
+                if features_almost_equal or features_percent_different < features_percent_similar:
+                    parallel_minmax_enabled = False
+                    logger.info('parallel fp evaluation :: fp id %s matches on the features sums, not evaluating in parallel' % str(fp_id))
+                    break
+        if parallel_minmax_enabled:
+            start_parallel_minmax = time()
+            try:
+                range_tolerance = settings.IONOSPHERE_MINMAX_SCALING_RANGE_TOLERANCE
+            except:
+                range_tolerance = 0.15
+            fp_check_types = {}
+            for fp_id in fp_ids:
+                fp_check_types[fp_id] = 'ionosphere'
+                if echo_check and fp_id in echo_fp_ids:
+                    fp_check_types[fp_id] = 'ionosphere_echo_check'
+            check_type_timeseries = {}
+            for parallel_check_type in set(fp_check_types.values()):
+                parallel_anomalous_timeseries = None
+                if parallel_check_type == 'ionosphere':
+                    try:
+                        if len(anomalous_timeseries) > 0:
+                            parallel_anomalous_timeseries = anomalous_timeseries
+                    except:
+                        parallel_anomalous_timeseries = None
+                    timeseries_dir = use_base_name.replace('.', '/')
+                    if labelled_metric_name:
+                        timeseries_dir = labelled_metric_name.replace('.', '/')
+                    anomaly_json = '%s/%s/%s/%s.json' % (
+                        settings.IONOSPHERE_DATA_FOLDER, metric_timestamp,
+                        timeseries_dir, use_base_name)
+                    if labelled_metric_name:
+                        anomaly_json = '%s/%s/%s/%s.json' % (
+                            settings.IONOSPHERE_DATA_FOLDER, metric_timestamp,
+                            timeseries_dir, labelled_metric_name)
+                else:
+                    if not echo_calculated_features:
+                        continue
+                    anomaly_json = redis_anomaly_json
+                    if echo_anomalous_timeseries:
+                        parallel_anomalous_timeseries = echo_anomalous_timeseries
+                try:
+                    if not parallel_anomalous_timeseries:
+                        parallel_anomalous_timeseries = load_anomaly_json_timeseries(anomaly_json)
+                        # The loaded time series is used by the minmax check
+                        if parallel_check_type == 'ionosphere':
+                            anomalous_timeseries = parallel_anomalous_timeseries
+                        else:
+                            echo_anomalous_timeseries = parallel_anomalous_timeseries
+                    anomalous_values = np.array([item[1] for item in parallel_anomalous_timeseries], dtype=np.float64)
+                    if len(anomalous_values) == 0 or np.isnan(anomalous_values).any():
+                        continue
+                except Exception as err:
+                    logger.info('parallel fp evaluation :: not evaluating %s fps - %s' % (
+                        parallel_check_type, err))
+                    continue
+                check_type_timeseries[parallel_check_type] = {
+                    'timestamps': np.array([item[0] for item in parallel_anomalous_timeseries], dtype=np.float64),
+                    'values': anomalous_values,
+                }
+            if check_type_timeseries:
+                stored_fps_timeseries_loaded = True
+                try:
+                    stored_fps_timeseries = get_stored_fp_timeseries(
+                        skyline_app, metrics_id, fp_ids, engine)
+                except Exception as err:
+                    logger.error('error :: parallel fp evaluation :: get_stored_fp_timeseries failed - %s' % err)
+            candidates = []
+            for fp_id in fp_ids:
+                parallel_check_type = fp_check_types[fp_id]
+                if parallel_check_type not in check_type_timeseries:
+                    # The fps after an fp that cannot be evaluated cannot
+                    # determine the first match
+                    break
+                stored_fp_data = stored_fps_timeseries.get(int(fp_id))
+                if not stored_fp_data:
+                    break
+                anomalous_values = check_type_timeseries[parallel_check_type]['values']
+                if not minmax_ranges_similar(
+                        stored_fp_data['min'], stored_fp_data['max'],
+                        float(anomalous_values.min()), float(anomalous_values.max()),
+                        range_tolerance):
+                    continue
+                if (len(stored_fp_data['values']) - len(anomalous_values)) not in range(-14, 14):
+                    continue
+                if parallel_check_type == 'ionosphere':
+                    percent_similar = float(settings.IONOSPHERE_FEATURES_PERCENT_SIMILAR)
+                else:
+                    try:
+                        percent_similar = float(settings.IONOSPHERE_ECHO_MINMAX_SCALING_FEATURES_PERCENT_SIMILAR)
+                    except:
+                        percent_similar = 3.5
+                candidate = {
+                    'fp_id': int(fp_id), 'check_type': parallel_check_type,
+                    'percent_similar': percent_similar,
+                }
+                try:
+                    fp_minmax_scaled_dict = get_fp_minmax_scaled_data(skyline_app, fp_id)
+                except Exception as err:
+                    logger.error('error :: parallel fp evaluation :: get_fp_minmax_scaled_data failed on %s - %s' % (
+                        str(fp_id), err))
+                    fp_minmax_scaled_dict = {}
+                fp_minmax_scaled_dicts[int(fp_id)] = fp_minmax_scaled_dict
+                if fp_minmax_scaled_dict and fp_minmax_scaled_dict.get('id') == fp_id:
+                    candidate['features_sum'] = float(fp_minmax_scaled_dict['features_sum'])
+                else:
+                    candidate['timestamps'] = stored_fp_data['timestamps']
+                    candidate['minmax_values'] = stored_fp_data['minmax_values']
+                candidates.append(candidate)
+            for parallel_check_type in set(candidate['check_type'] for candidate in candidates):
+                try:
+                    anomalous_features_count, anomalous_features_sum, calc_time = get_minmax_features(
+                        skyline_app, check_type_timeseries[parallel_check_type]['timestamps'],
+                        minmax_scale(check_type_timeseries[parallel_check_type]['values']),
+                        metric_name=use_base_name)
+                    minmax_anomalous_features_by_check_type[parallel_check_type] = {
+                        'features_count': anomalous_features_count,
+                        'features_sum': anomalous_features_sum,
+                    }
+                except Exception as err:
+                    logger.error(traceback.format_exc())
+                    logger.error('error :: parallel fp evaluation :: failed to calculate the minmax anomalous features for %s - %s' % (
+                        parallel_check_type, err))
+            for parallel_check_type, minmax_anomalous_features in minmax_anomalous_features_by_check_type.items():
+                check_type_candidates = [
+                    candidate for candidate in candidates
+                    if candidate['check_type'] == parallel_check_type]
+                if not check_type_candidates:
+                    continue
+                max_runtime_tolereance = ionosphere_max_runtime - 5
+                parallel_timeout = max_runtime_tolereance - (int(time()) - check_process_start)
+                if parallel_timeout <= 0:
+                    break
+                try:
+                    minmax_evaluation = evaluate_minmax_fps_parallel(
+                        skyline_app, check_type_candidates,
+                        minmax_anomalous_features['features_sum'],
+                        processes=IONOSPHERE_PARALLEL_FP_EVALUATION_PROCESSES,
+                        timeout=parallel_timeout)
+                    parallel_minmax_fp_features.update(minmax_evaluation['fp_minmax_features'])
+                except Exception as err:
+                    logger.error(traceback.format_exc())
+                    logger.error('error :: parallel fp evaluation :: evaluate_minmax_fps_parallel failed for %s - %s' % (
+                        parallel_check_type, err))
+            logger.info('parallel fp evaluation :: %s candidate fps, minmax features calculated for %s fps in %.6f seconds' % (
+                str(len(candidates)), str(len(parallel_minmax_fp_features)),
+                (time() - start_parallel_minmax)))
+
         # Compare calculated features to feature values for each fp id
         not_anomalous = False
         if calculated_feature_file_found:
@@ -3844,6 +4186,11 @@ class Ionosphere(Thread):
                 # features profile is the same full_duration
                 metric_fp_table = 'z_fp_%s' % str(metrics_id)
 
+                # @added 20261029 - Feature #5771: ionosphere - fp features matrix
+                # If the fp id was scored from the fp features matrix the
+                # features do not need to be fetched from memcache or the DB
+                fp_features_score = fp_features_scores[check_type].get(int(fp_id))
+
                 # @added 20170804 - Bug #2130: MySQL - Aborted_clients
                 # Set a conditional here to only get_an_engine if no engine, this
                 # is probably responsible for the Aborted_clients, as it would have
@@ -3863,7 +4210,9 @@ class Ionosphere(Thread):
                 # First check to determine if the fp_id has data in memcache
                 # before querying the database
                 fp_id_feature_values = None
-                if settings.MEMCACHE_ENABLED:
+                # @modified 20261029 - Feature #5771: ionosphere - fp features matrix
+                # if settings.MEMCACHE_ENABLED:
+                if settings.MEMCACHE_ENABLED and not fp_features_score:
                     fp_id_feature_values_key = 'fp.id.%s.feature.values' % str(fp_id)
                     try:
                         # @modified 20191029 - Task #3304: py3 - handle pymemcache bytes not str
@@ -3891,7 +4240,9 @@ class Ionosphere(Thread):
                         fp_features = literal_eval(fp_id_feature_values)
                         logger.info('using memcache %s key data' % fp_id_feature_values_key)
 
-                if not fp_features:
+                # @modified 20261029 - Feature #5771: ionosphere - fp features matrix
+                # if not fp_features:
+                if not fp_features and not fp_features_score:
                     try:
 
                         # @added 20230109 - Task #4022: Move mysql_select calls to SQLAlchemy
@@ -3969,45 +4320,73 @@ class Ionosphere(Thread):
                     all_calc_features_sum_list.append(float(calc_value))
                 all_calc_features_sum = sum(all_calc_features_sum_list)
 
-                # Convert feature names in calculated_features to their id
-                logger.info('converting tsfresh feature names to Skyline feature ids')
-                calc_features_by_id = []
-                # @modified 20190327 - Feature #2484: FULL_DURATION feature profiles
-                # Bifurcate for ionosphere_echo_check
-                # for feature_name, calc_value in calculated_features:
-                for feature_name, calc_value in use_calculated_features:
-                    for skyline_feature_id, name in TSFRESH_FEATURES:
-                        if feature_name == name:
-                            calc_features_by_id.append([skyline_feature_id, float(calc_value)])
-
-                # Determine what features each data has, extract only values for
-                # common features.
-                logger.info('determining common features')
-                relevant_fp_feature_values = []
-                relevant_calc_feature_values = []
-                for skyline_feature_id, calc_value in calc_features_by_id:
-                    for fp_feature_id, fp_value in fp_features:
-                        if skyline_feature_id == fp_feature_id:
-                            relevant_fp_feature_values.append(fp_value)
-                            relevant_calc_feature_values.append(calc_value)
-
-                # Determine the sum of each set
-                relevant_fp_feature_values_count = len(relevant_fp_feature_values)
-                relevant_calc_feature_values_count = len(relevant_calc_feature_values)
+                # @modified 20261029 - Feature #5771: ionosphere - fp features matrix
+                # Use the common features count and sums determined from the fp
+                # features matrix if the fp id was scored
+                if fp_features_score:
+                    logger.info('using fp features matrix score for fp id %s' % str(fp_id))
+                    relevant_fp_feature_values_count = fp_features_score['count']
+                    relevant_calc_feature_values_count = fp_features_score['count']
+                else:
+                    # Convert feature names in calculated_features to their id
+                    logger.info('converting tsfresh feature names to Skyline feature ids')
+                    calc_features_by_id = []
+                    # @modified 20190327 - Feature #2484: FULL_DURATION feature profiles
+                    # Bifurcate for ionosphere_echo_check
+                    # for feature_name, calc_value in calculated_features:
+                    # @modified 20261029 - Feature #5771: ionosphere - fp features matrix
+                    # Use the calc_features_by_id if already determined
+                    if check_type in calc_features_by_id_by_check_type:
+                        calc_features_by_id = calc_features_by_id_by_check_type[check_type]
+                    else:
+                        for feature_name, calc_value in use_calculated_features:
+                            for skyline_feature_id, name in TSFRESH_FEATURES:
+                                if feature_name == name:
+                                    calc_features_by_id.append([skyline_feature_id, float(calc_value)])
+
+                    # Determine what features each data has, extract only values for
+                    # common features.
+                    logger.info('determining common features')
+                    relevant_fp_feature_values = []
+                    relevant_calc_feature_values = []
+                    for skyline_feature_id, calc_value in calc_features_by_id:
+                        for fp_feature_id, fp_value in fp_features:
+                            if skyline_feature_id == fp_feature_id:
+                                relevant_fp_feature_values.append(fp_value)
+                                relevant_calc_feature_values.append(calc_value)
+
+                    # Determine the sum of each set
+                    relevant_fp_feature_values_count = len(relevant_fp_feature_values)
+                    relevant_calc_feature_values_count = len(relevant_calc_feature_values)
                 if relevant_fp_feature_values_count != relevant_calc_feature_values_count:
                     logger.error('error :: mismatch in number of common features')
                     logger.error('error :: relevant_fp_feature_values_count - %s' % str(relevant_fp_feature_values_count))
                     logger.error('error :: relevant_calc_feature_values_count - %s' % str(relevant_calc_feature_values_count))
                     continue
                 logger.info('comparing on %s common features' % str(relevant_fp_feature_values_count))
+                # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+                # The features sums are only compared on the common features so
+                # an fp created with a different feature set is compared like
+                # for like on the features of the smaller feature set
+                fp_tsfresh_feature_set = fp_tsfresh_feature_sets.get(int(fp_id), 'efficient')
+                if fp_tsfresh_feature_set != IONOSPHERE_TSFRESH_FEATURE_SET:
+                    logger.info('fp id %s was created with the %s tsfresh feature set and the features were calculated with the %s feature set, comparing on the common features only' % (
+                        str(fp_id), fp_tsfresh_feature_set, IONOSPHERE_TSFRESH_FEATURE_SET))
 
                 if relevant_fp_feature_values_count == 0:
                     logger.error('error :: relevant_fp_feature_values_count is zero')
                     continue
 
                 # Determine the sum of each set
-                sum_fp_values = sum(relevant_fp_feature_values)
-                sum_calc_values = sum(relevant_calc_feature_values)
+                # @modified 20261029 - Feature #5771: ionosphere - fp features matrix
+                # sum_fp_values = sum(relevant_fp_feature_values)
+                # sum_calc_values = sum(relevant_calc_feature_values)
+                if fp_features_score:
+                    sum_fp_values = fp_features_score['fp_sum']
+                    sum_calc_values = fp_features_score['calc_sum']
+                else:
+                    sum_fp_values = sum(relevant_fp_feature_values)
+                    sum_calc_values = sum(relevant_calc_feature_values)
                 logger.info(
                     'sum of the values of the %s common features in features profile - %s' % (
                         str(relevant_fp_feature_values_count), str(sum_fp_values)))
@@ -4182,7 +4561,13 @@ class Ionosphere(Thread):
                     minmax_fp_features_sum = None
                     fp_minmax_scaled_dict = {}
                     try:
-                        fp_minmax_scaled_dict = get_fp_minmax_scaled_data(skyline_app, fp_id)
+                        # @modified 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+                        # Use the data fetched by the parallel fp evaluation
+                        # fp_minmax_scaled_dict = get_fp_minmax_scaled_data(skyline_app, fp_id)
+                        if int(fp_id) in fp_minmax_scaled_dicts:
+                            fp_minmax_scaled_dict = fp_minmax_scaled_dicts[int(fp_id)]
+                        else:
+                            fp_minmax_scaled_dict = get_fp_minmax_scaled_data(skyline_app, fp_id)
                         if fp_minmax_scaled_dict:
                             logger.info('got minmax data for fp id %s, fp_minmax_scaled_dict: %s' % (
                                 str(fp_id), str(fp_minmax_scaled_dict)))
@@ -4207,10 +4592,35 @@ class Ionosphere(Thread):
                                     fp_minmax_cache_data = False
                                     fp_minmax_scaled_dict = {}
 
+                    # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+                    # Use the fp time series and the precomputed minmax scaled
+                    # values from the fp timeseries store rather than memcache
+                    # or the DB
+                    stored_fp_data = None
+                    if IONOSPHERE_FP_TIMESERIES_STORE and not fp_minmax_cache_data:
+                        # Load the stored time series of all the fp_ids the
+                        # first time one is required
+                        if not stored_fps_timeseries_loaded:
+                            stored_fps_timeseries_loaded = True
+                            try:
+                                stored_fps_timeseries = get_stored_fp_timeseries(
+                                    skyline_app, metrics_id, fp_ids, engine)
+                            except Exception as err:
+                                logger.error('error :: get_stored_fp_timeseries failed on fp ids %s - %s' % (
+                                    str(fp_ids), err))
+                                stored_fps_timeseries = {}
+                        stored_fp_data = stored_fps_timeseries.get(int(fp_id))
+                        if stored_fp_data:
+                            fp_id_metric_ts = fp_timeseries_to_list(stored_fp_data)
+                            logger.info('used the fp timeseries store to populate fp_id_metric_ts with %s data points' % (
+                                str(len(fp_id_metric_ts))))
+
                     # @modified 20221027 - Feature #4708: ionosphere - store and cache fp minmax data
                     # Use fp minmax data from memcache if available
                     # if settings.MEMCACHE_ENABLED:
-                    if settings.MEMCACHE_ENABLED and not fp_minmax_cache_data:
+                    # @modified 20261102 - Feature #5775: ionosphere - fp timeseries store
+                    # if settings.MEMCACHE_ENABLED and not fp_minmax_cache_data:
+                    if settings.MEMCACHE_ENABLED and not fp_minmax_cache_data and not fp_id_metric_ts:
                         # @added 20200421 - Task #3304: py3 - handle pymemcache bytes not str
                         # Explicitly set the fp_id_metric_ts_object so it
                         # always exists to be evaluated
@@ -4413,7 +4823,13 @@ class Ionosphere(Thread):
                     if check_range:
                         # @modified 20221027 - Feature #4708: ionosphere - store and cache fp minmax data
                         # Only calculate if not using memcache fp_minmax_cache_data
-                        if not fp_minmax_cache_data:
+                        # @modified 20261102 - Feature #5775: ionosphere - fp timeseries store
+                        # Use the fp timeseries store min and max
+                        # if not fp_minmax_cache_data:
+                        if not fp_minmax_cache_data and stored_fp_data:
+                            min_fp_value = stored_fp_data['min']
+                            max_fp_value = stored_fp_data['max']
+                        if not fp_minmax_cache_data and not stored_fp_data:
                             try:
                                 minmax_fp_values = [x[1] for x in fp_id_metric_ts]
                                 min_fp_value = min(minmax_fp_values)
@@ -4500,8 +4916,17 @@ class Ionosphere(Thread):
                     if not fp_minmax_cache_data:
 
                         minmax_fp_ts = []
+                        # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+                        # Use the precomputed fp timeseries store minmax values
+                        if range_similar and stored_fp_data:
+                            minmax_fp_ts = [list(item) for item in zip(
+                                stored_fp_data['timestamps'].tolist(),
+                                stored_fp_data['minmax_values'].tolist())]
+                            logger.info('minmax_fp_ts list populated with the fp timeseries store minmax scaled time series with %s data points' % str(len(minmax_fp_ts)))
                         # if fp_id_metric_ts:
-                        if range_similar:
+                        # @modified 20261102 - Feature #5775: ionosphere - fp timeseries store
+                        # if range_similar:
+                        if range_similar and not minmax_fp_ts:
                             if LOCAL_DEBUG:
                                 logger.debug('debug :: creating minmax_fp_ts from minmax scaled fp_id_metric_ts')
                             try:
@@ -4592,9 +5017,24 @@ class Ionosphere(Thread):
                         if LOCAL_DEBUG:
                             logger.debug('debug :: analyzing minmax_fp_ts and minmax_anomalous_ts')
 
+                        # @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+                        # Use the minmax features calculated by the parallel fp
+                        # evaluation
+                        parallel_minmax_fp_data = None
+                        if not fp_minmax_cache_data:
+                            parallel_minmax_fp_data = parallel_minmax_fp_features.get(int(fp_id))
+                        if parallel_minmax_fp_data:
+                            minmax_fp_features_count = parallel_minmax_fp_data['features_count']
+                            minmax_fp_features_sum = parallel_minmax_fp_data['features_sum']
+                            calc_time = parallel_minmax_fp_data['calc_time']
+                            logger.info('minmax_fp_ts - features_count: %s, features_sum: %s (from the parallel fp evaluation)' % (
+                                str(minmax_fp_features_count), str(minmax_fp_features_sum)))
+
                         # @modified 20221027 - Feature #4708: ionosphere - store and cache fp minmax data
                         # Only calculate if not using memcache fp_minmax_cache_data
-                        if not fp_minmax_cache_data:
+                        # @modified 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+                        # if not fp_minmax_cache_data:
+                        if not fp_minmax_cache_data and not parallel_minmax_fp_data:
                             if not os.path.isfile(minmax_fp_ts_csv):
                                 if LOCAL_DEBUG:
                                     logger.debug('debug :: creating %s from minmax_fp_ts' % minmax_fp_ts_csv)
@@ -4722,68 +5162,83 @@ class Ionosphere(Thread):
                         else:
                             logger.error('error :: minmax_fp_features_count is %s' % str(minmax_fp_features_count))
 
-                        if not os.path.isfile(anomalous_ts_csv):
-                            try:
-                                datapoints = minmax_anomalous_ts
-                                converted = []
-                                for datapoint in datapoints:
-                                    try:
-                                        new_datapoint = [float(datapoint[0]), float(datapoint[1])]
-                                        converted.append(new_datapoint)
-                                    # @added 20210425 - Task #4030: refactoring
-                                    except TypeError:
-                                        # This allows for the handling when the
-                                        # entry has a value of None
-                                        continue
-                                    # @modified 20210425 - Task #4030: refactoring
-                                    # except:  # nosec
-                                    except Exception as e:
-                                        logger.error('error :: could not create converted timeseries from minmax_anomalous_ts - %s' % e)
-                                        continue
-                                del datapoints
-                                for ts, value in converted:
-                                    utc_ts_line = '%s,%s,%s\n' % (use_base_name, str(int(ts)), str(value))
-                                    with open(anomalous_ts_csv, 'a') as fh:
-                                        fh.write(utc_ts_line)
-                                del converted
-                            except Exception as err:
-                                logger.error('error :: failed to create %s - %s' % (str(anomalous_ts_csv), err))
+                        # @added 20261103 - Feature #5776: ionosphere - parallel fp evaluation
+                        # The minmax scaled anomalous time series is the same for
+                        # every fp so the features are only calculated once per
+                        # check type
+                        if check_type in minmax_anomalous_features_by_check_type:
+                            minmax_anomalous_features_count = minmax_anomalous_features_by_check_type[check_type]['features_count']
+                            minmax_anomalous_features_sum = minmax_anomalous_features_by_check_type[check_type]['features_sum']
+                            logger.info('minmax_anomalous_ts - minmax_anomalous_features_count: %s, minmax_anomalous_features_sum: %s (calculated once for the check)' % (
+                                str(minmax_anomalous_features_count),
+                                str(minmax_anomalous_features_sum)))
+                        else:
+                            if not os.path.isfile(anomalous_ts_csv):
+                                try:
+                                    datapoints = minmax_anomalous_ts
+                                    converted = []
+                                    for datapoint in datapoints:
+                                        try:
+                                            new_datapoint = [float(datapoint[0]), float(datapoint[1])]
+                                            converted.append(new_datapoint)
+                                        # @added 20210425 - Task #4030: refactoring
+                                        except TypeError:
+                                            # This allows for the handling when the
+                                            # entry has a value of None
+                                            continue
+                                        # @modified 20210425 - Task #4030: refactoring
+                                        # except:  # nosec
+                                        except Exception as e:
+                                            logger.error('error :: could not create converted timeseries from minmax_anomalous_ts - %s' % e)
+                                            continue
+                                    del datapoints
+                                    for ts, value in converted:
+                                        utc_ts_line = '%s,%s,%s\n' % (use_base_name, str(int(ts)), str(value))
+                                        with open(anomalous_ts_csv, 'a') as fh:
+                                            fh.write(utc_ts_line)
+                                    del converted
+                                except Exception as err:
+                                    logger.error('error :: failed to create %s - %s' % (str(anomalous_ts_csv), err))
 
-                        try:
-                            df = pd.read_csv(anomalous_ts_csv, delimiter=',', header=None, names=['metric', 'timestamp', 'value'])
-                            df.columns = ['metric', 'timestamp', 'value']
-                            logger.info('extracting features from anomalous_ts_csv: %s' % str(anomalous_ts_csv))
-                            df_features_current = extract_features(
-                                # @modified 20210101 - Task #3928: Update Skyline to use new tsfresh feature extraction method
-                                # df, column_id='metric', column_sort='timestamp', column_kind=None,
-                                # column_value=None, feature_extraction_settings=tsf_settings)
-                                df, default_fc_parameters=EfficientFCParameters(),
-                                column_id='metric', column_sort='timestamp', column_kind=None,
-                                column_value=None, disable_progressbar=True)
+                            try:
+                                df = pd.read_csv(anomalous_ts_csv, delimiter=',', header=None, names=['metric', 'timestamp', 'value'])
+                                df.columns = ['metric', 'timestamp', 'value']
+                                logger.info('extracting features from anomalous_ts_csv: %s' % str(anomalous_ts_csv))
+                                df_features_current = extract_features(
+                                    # @modified 20210101 - Task #3928: Update Skyline to use new tsfresh feature extraction method
+                                    # df, column_id='metric', column_sort='timestamp', column_kind=None,
+                                    # column_value=None, feature_extraction_settings=tsf_settings)
+                                    df, default_fc_parameters=EfficientFCParameters(),
+                                    column_id='metric', column_sort='timestamp', column_kind=None,
+                                    column_value=None, disable_progressbar=True)
 
-                            del df
-                        except Exception as err:
-                            logger.error('error :: df or extract_features failed - %s' % err)
-                            continue
+                                del df
+                            except Exception as err:
+                                logger.error('error :: df or extract_features failed - %s' % err)
+                                continue
 
-                        # Create transposed features csv
-                        if not os.path.isfile(anomalous_fp_fname_out):
-                            # Transpose
-                            df_t = df_features_current.transpose()
-                            df_t.to_csv(anomalous_fp_fname_out)
-                            del df_t
-                        # Calculate the count and sum of the features values
-                        df_sum_2 = pd.read_csv(
-                            anomalous_fp_fname_out, delimiter=',', header=0,
-                            names=['feature_name', 'value'])
-                        df_sum_2.columns = ['feature_name', 'value']
-                        df_sum_2['feature_name'] = df_sum_2['feature_name'].astype(str)
-                        df_sum_2['value'] = df_sum_2['value'].astype(float)
-                        minmax_anomalous_features_count = len(df_sum_2['value'])
-                        minmax_anomalous_features_sum = df_sum_2['value'].sum()
-                        logger.info('minmax_anomalous_ts - minmax_anomalous_features_count: %s, minmax_anomalous_features_sum: %s' % (
-                            str(minmax_anomalous_features_count),
-                            str(minmax_anomalous_features_sum)))
+                            # Create transposed features csv
+                            if not os.path.isfile(anomalous_fp_fname_out):
+                                # Transpose
+                                df_t = df_features_current.transpose()
+                                df_t.to_csv(anomalous_fp_fname_out)
+                                del df_t
+                            # Calculate the count and sum of the features values
+                            df_sum_2 = pd.read_csv(
+                                anomalous_fp_fname_out, delimiter=',', header=0,
+                                names=['feature_name', 'value'])
+                            df_sum_2.columns = ['feature_name', 'value']
+                            df_sum_2['feature_name'] = df_sum_2['feature_name'].astype(str)
+                            df_sum_2['value'] = df_sum_2['value'].astype(float)
+                            minmax_anomalous_features_count = len(df_sum_2['value'])
+                            minmax_anomalous_features_sum = df_sum_2['value'].sum()
+                            logger.info('minmax_anomalous_ts - minmax_anomalous_features_count: %s, minmax_anomalous_features_sum: %s' % (
+                                str(minmax_anomalous_features_count),
+                                str(minmax_anomalous_features_sum)))
+                            minmax_anomalous_features_by_check_type[check_type] = {
+                                'features_count': minmax_anomalous_features_count,
+                                'features_sum': minmax_anomalous_features_sum,
+                            }
 
                     if minmax_fp_features_sum and minmax_anomalous_features_sum:
                         percent_different = None
@@ -5911,7 +6366,11 @@ class Ionosphere(Thread):
             # Use the MetaData autoload and sqlalchemy rather than string-based query construction
             if got_an_engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: calling engine.dispose()')
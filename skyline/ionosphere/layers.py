@@ -26,6 +26,8 @@ import settings
 from database import (
     get_engine, ionosphere_layers_table_meta, layers_algorithms_table_meta,
     ionosphere_layers_matched_table_meta)
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 # @added 20250122 - Feature #5592: tenant_id column in DB tables
 from functions.metrics.get_tenant_id import get_tenant_id
@@ -100,7 +102,11 @@ def run_layer_algorithms(base_name, layers_id, timeseries, layers_count, layers_
         try:
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                     logger.info('layers :: MySQL engine disposed of')
                     return True
                 except:
@@ -52,6 +52,8 @@ from features_profile import calculate_features_profile
 
 from database import (
     get_engine, ionosphere_table_meta, metrics_table_meta)
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 # @added 2017014 - Feature #1854: Ionosphere learn
 from ionosphere_functions import create_features_profile
@@ -540,7 +542,11 @@ def ionosphere_learn(timestamp):
         try:
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                     logger.info('learn :: MySQL engine disposed of')
                     return True
                 except:
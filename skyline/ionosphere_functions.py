@@ -55,6 +55,8 @@ from database import (
     # @added 20190501 - Branch #2646: slack
     anomalies_table_meta,
 )
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 # @added 20190502 - Branch #2646: slack
 from slack_functions import slack_post_message, slack_post_reaction
 
@@ -137,7 +139,11 @@ def fp_create_engine_disposal(current_skyline_app, engine):
     if engine:
         current_logger.error('fp_create_engine_disposal :: calling engine.dispose()')
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except:
             current_logger.error(traceback.format_exc())
             current_logger.error('error :: fp_create_engine_disposal :: calling engine.dispose()')
@@ -738,6 +744,10 @@ def create_features_profile(current_skyline_app, requested_timestamp, data_for_m
     # Added the ts_full_duration parameter so that the appropriate graphs can be
     # embedded for the user in the training data page
     ts_full_duration = '0'
+    # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+    # Features profiles created before the tsfresh_feature_set was recorded in
+    # the details file were all calculated with the efficient feature set
+    tsfresh_feature_set = 'efficient'
 
     if context == 'ionosphere_learn':
         if not os.path.isfile(features_profile_details_file):
@@ -758,6 +768,9 @@ def create_features_profile(current_skyline_app, requested_timestamp, data_for_m
         except:
             current_logger.error('error :: create_features_profile :: could not determine the full duration from - %s' % features_profile_details_file)
             ts_full_duration = '0'
+        # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+        if len(fp_details) > 6:
+            tsfresh_feature_set = str(fp_details[6])
 
         if context != 'ionosphere_learn':
             if ts_full_duration == '0':
@@ -1159,6 +1172,11 @@ def create_features_profile(current_skyline_app, requested_timestamp, data_for_m
                 echo_fp=echo_fp_value, user_id=user_id, label=label,
                 # @added 20250122 - Feature #5592: tenant_id column in DB tables
                 tenant_id=tenant_id)
+        # @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+        # Stamp the features profile with the tsfresh feature set it was
+        # created with, if the DB has been updated with the column
+        if 'tsfresh_feature_set' in ionosphere_table.c:
+            ins = ins.values(tsfresh_feature_set=tsfresh_feature_set)
         # @modified 20260227 - Task #5176: Migrate to sqlalchemy v2 API
         #                      Task #5628: Build v5.0.0 and test
         #result = connection.execute(ins)
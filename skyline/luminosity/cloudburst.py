@@ -11,7 +11,8 @@ from math import ceil
 from ast import literal_eval
 import copy
 
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 from sqlalchemy.sql import select
 
 import settings
@@ -24,6 +25,8 @@ from database import (
     get_engine, cloudburst_table_meta, ionosphere_matched_table_meta,
     ionosphere_layers_matched_table_meta, ionosphere_table_meta,
     anomalies_table_meta)
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 from functions.database.queries.metric_id_from_base_name import metric_id_from_base_name
 # @added 20220913 - Feature #4662: settings.LUMINOSITY_CLOUDBURST_SKIP_METRICS
 #                   Task #2732: Prometheus to Skyline
@@ -39,6 +42,8 @@ from functions.timeseries.determine_data_frequency import determine_data_frequen
 from functions.luminosity.cloudburst_get_metric_ids_to_check import cloudburst_get_metric_ids_to_check
 from functions.victoriametrics.get_victoriametrics_metric import get_victoriametrics_metric
 from functions.timeseries.downsample import downsample_timeseries
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 skyline_app = 'luminosity'
 skyline_app_logger = '%sLog' % skyline_app
@@ -149,7 +154,11 @@ class Cloudburst(Thread):
         def engine_disposal(engine):
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except Exception as e:
                     logger.error(traceback.format_exc())
                     logger.error('error :: cloudburst :: find_cloudbursts :: calling engine.dispose() - %s' % e)
@@ -500,9 +509,11 @@ class Cloudburst(Thread):
                     raw_series_index = [index for index, metric in enumerate(assigned_redis_metrics) if metric == metric_name][0]
                     raw_series = raw_assigned[raw_series_index]
 
-                    unpacker = Unpacker(use_list=False)
-                    unpacker.feed(raw_series)
-                    timeseries = list(unpacker)
+                    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                    # unpacker = Unpacker(use_list=False)
+                    # unpacker.feed(raw_series)
+                    # timeseries = list(unpacker)
+                    timeseries = unpack_timeseries(raw_series)
                 except Exception as e:
                     logger.error('error :: cloudburst :: find_cloudbursts :: failed to unpack %s timeseries - %s' % (
                         metric_name, e))
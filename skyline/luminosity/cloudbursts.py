@@ -13,6 +13,8 @@ import settings
 from skyline_functions import (
     get_redis_conn, get_redis_conn_decoded)
 from database import get_engine, cloudburst_table_meta
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 # from functions.database.queries.base_name_from_metric_id import base_name_from_metric_id
 from functions.metrics.get_base_name_from_metric_id import get_base_name_from_metric_id
 
@@ -96,7 +98,11 @@ class Cloudbursts(Thread):
         def engine_disposal(engine):
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except Exception as e:
                     logger.error(traceback.format_exc())
                     logger.error('error :: cloudbursts :: find_related :: calling engine.dispose() - %s' % e)
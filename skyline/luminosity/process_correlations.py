@@ -20,7 +20,8 @@ from time import time, strftime, gmtime
 import copy
 
 from redis import StrictRedis
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 
 from luminol.anomaly_detector import AnomalyDetector
 from luminol.correlator import Correlator
@@ -69,6 +70,13 @@ from matched_or_regexed_in_list import matched_or_regexed_in_list
 from functions.metrics.get_base_name_from_labelled_metrics_name import get_base_name_from_labelled_metrics_name
 from functions.metrics.get_labelled_metric_dict import get_labelled_metric_dict
 from functions.metrics.get_metric_id_from_base_name import get_metric_id_from_base_name
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
+# @added 20261110 - Feature #5783: luminosity - batch correlations
+from functions.luminosity.batch_cross_correlations import batch_cross_correlations
+# @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+from functions.luminosity.rank_correlation_candidates import (
+    get_illuminance_activity_scores, rank_correlation_candidates)
 
 # @modified 20230107 - Task #4022: Move mysql_select calls to SQLAlchemy
 #                      Task #4778: v4.0.0 - update dependencies
@@ -93,6 +101,18 @@ try:
 except:
     LUMINOSITY_CORRELATION_MAPS = {}
 
+# @added 20261110 - Feature #5783: luminosity - batch correlations
+try:
+    LUMINOSITY_BATCH_CORRELATIONS = settings.LUMINOSITY_BATCH_CORRELATIONS
+except:
+    LUMINOSITY_BATCH_CORRELATIONS = False
+
+# @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+try:
+    LUMINOSITY_CORRELATION_CANDIDATES_TOP_K = int(settings.LUMINOSITY_CORRELATION_CANDIDATES_TOP_K)
+except:
+    LUMINOSITY_CORRELATION_CANDIDATES_TOP_K = 0
+
 # @added 20210124 - Feature #3956: luminosity - motifs
 # @modified 20230107 - Task #4778: v4.0.0 - update dependencies
 # COMMENTED OUT ALL THE LUMINOSITY_ANALYSE_MOTIFS sections as these are WIP and
@@ -483,9 +503,11 @@ def get_anomalous_ts(base_name, anomaly_timestamp):
         for i, metric_name in enumerate(assigned_metrics):
             try:
                 raw_series = raw_assigned[i]
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
             except:
                 timeseries = []
 
@@ -878,14 +900,36 @@ def get_assigned_metrics(i, base_name, anomaly_timestamp, resolution):
     logger.info('get_assigned_metrics :: determining recently active metrics from %s for timestamps %s' % (
         str(illuminance_all_keys), str(illuminance_all_timestamp_keys)))
     recently_active_metric_ids = []
+
+    # @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+    # Get all the illuminance_all_key timestamps in a single pipeline and keep
+    # the entries to rank the candidates on their activity
+    illuminance_dict_strs = {}
+    try:
+        pipe = redis_conn_decoded.pipeline(transaction=False)
+        for illuminance_all_key in illuminance_all_keys:
+            for ts in illuminance_all_timestamp_keys:
+                pipe.hget(illuminance_all_key, str(ts))
+        results = pipe.execute()
+        index = 0
+        for illuminance_all_key in illuminance_all_keys:
+            for ts in illuminance_all_timestamp_keys:
+                illuminance_dict_strs[(illuminance_all_key, ts)] = results[index]
+                index += 1
+    except Exception as err:
+        errors.append([str(illuminance_all_keys), 'could not query illuminance_all_keys', err])
+    illuminance_dicts = []
+
     for illuminance_all_key in illuminance_all_keys:
         for ts in illuminance_all_timestamp_keys:
             illuminance_dict_str = None
-            try:
-                illuminance_dict_str = redis_conn_decoded.hget(illuminance_all_key, str(ts))
-            except Exception as err:
-                errors.append([illuminance_all_key, ts, 'could not query not illuminance_all_key for ts', err])
-                illuminance_dict_str = None
+            # @modified 20261111 - Feature #5784: luminosity - rank correlation candidates
+            # try:
+            #     illuminance_dict_str = redis_conn_decoded.hget(illuminance_all_key, str(ts))
+            # except Exception as err:
+            #     errors.append([illuminance_all_key, ts, 'could not query not illuminance_all_key for ts', err])
+            #     illuminance_dict_str = None
+            illuminance_dict_str = illuminance_dict_strs.get((illuminance_all_key, ts))
             illuminance_dict = {}
             if illuminance_dict_str:
                 try:
@@ -896,8 +940,21 @@ def get_assigned_metrics(i, base_name, anomaly_timestamp, resolution):
             recent_metric_ids = []
             if illuminance_dict:
                 recent_metric_ids = [int(id_str) for id_str in list(illuminance_dict.keys())]
+                # @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+                illuminance_dicts.append((ts, illuminance_dict))
             recently_active_metric_ids = recently_active_metric_ids + recent_metric_ids
     recently_active_metric_ids = list(set(recently_active_metric_ids))
+
+    # @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+    activity_scores = {}
+    recently_active_metrics_scores = {}
+    if LUMINOSITY_CORRELATION_CANDIDATES_TOP_K and illuminance_dicts:
+        try:
+            activity_scores = get_illuminance_activity_scores(
+                skyline_app, illuminance_dicts, anomaly_timestamp, resolution)
+        except Exception as err:
+            logger.error('error :: get_assigned_metrics :: get_illuminance_activity_scores failed - %s' % err)
+
     ids_with_metric_names = {}
     if recently_active_metric_ids:
         ids_with_metric_names = redis_conn_decoded.hgetall('aet.metrics_manager.ids_with_metric_names')
@@ -915,6 +972,8 @@ def get_assigned_metrics(i, base_name, anomaly_timestamp, resolution):
             else:
                 use_metric_name = '%s%s' % (settings.FULL_NAMESPACE, metric_base_name)
             recently_active_metrics.append(use_metric_name)
+            # @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+            recently_active_metrics_scores[use_metric_name] = activity_scores.get(id_str, 0)
         except KeyError:
             continue
         except Exception as err:
@@ -922,6 +981,19 @@ def get_assigned_metrics(i, base_name, anomaly_timestamp, resolution):
     if recently_active_metrics:
         logger.info('get_assigned_metrics :: filtering out only recently active metrics')
         unique_metrics = list(set(unique_metrics) & set(recently_active_metrics))
+
+        # @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+        # Only correlate the candidates most likely to correlate
+        if LUMINOSITY_CORRELATION_CANDIDATES_TOP_K and len(unique_metrics) > LUMINOSITY_CORRELATION_CANDIDATES_TOP_K and activity_scores:
+            try:
+                unique_metrics = rank_correlation_candidates(
+                    skyline_app,
+                    {metric_name: recently_active_metrics_scores.get(metric_name, 0) for metric_name in unique_metrics},
+                    LUMINOSITY_CORRELATION_CANDIDATES_TOP_K)
+                logger.info('get_assigned_metrics :: ranked and filtered the top %s recently active metrics' % (
+                    str(len(unique_metrics))))
+            except Exception as err:
+                logger.error('error :: get_assigned_metrics :: rank_correlation_candidates failed - %s' % err)
     else:
         logger.info('get_assigned_metrics :: there are no recently active metrics')
         unique_metrics = []
@@ -1068,6 +1140,26 @@ def get_remote_assigned(anomaly_timestamp, resolution, namespace=None):
 
 
 # @modified 20180720 - Feature #2464: luminosity_remote_data
+# @added 20261110 - Feature #5783: luminosity - batch correlations
+def get_matched_anomalies_count(anomalies, anomaly_timestamp, resolution):
+    """
+    Return the number of anomalies within 2 resolution periods of the
+    anomaly_timestamp, which is the number of times that a metric is
+    correlated and its correlation recorded.
+    """
+    matched_anomalies_count = 0
+    for a in anomalies:
+        try:
+            if int(a.exact_timestamp) < int(anomaly_timestamp - (resolution * 2)):
+                continue
+            if int(a.exact_timestamp) > int(anomaly_timestamp + (resolution * 2)):
+                continue
+        except:
+            continue
+        matched_anomalies_count += 1
+    return matched_anomalies_count
+
+
 # def get_correlations(base_name, anomaly_timestamp, anomalous_ts, assigned_metrics, raw_assigned, anomalies):
 # @modified 20230315 - Task #4872: Optimise luminosity for labelled_metrics
 def get_correlations(
@@ -1176,6 +1268,15 @@ def get_correlations(
     timestamps_iterated = 0
     timestamp_iterations_took = 0
 
+    # @added 20261110 - Feature #5783: luminosity - batch correlations
+    # Rather than running a luminol Correlator on each metric, the metrics to
+    # correlate are collected and cross correlated in a batch
+    try:
+        cross_correlation_threshold = settings.LUMINOL_CROSS_CORRELATION_THRESHOLD
+    except:
+        cross_correlation_threshold = 0.9
+    batch_candidates = []
+
     for i, metric_name in enumerate(assigned_metrics):
         count += 1
         # print(metric_name)
@@ -1215,9 +1316,11 @@ def get_correlations(
         if not metric_base_name.startswith('labelled_metrics.'):
             try:
                 raw_series = raw_assigned[i]
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
             except:
                 timeseries = []
         else:
@@ -1296,6 +1399,20 @@ def get_correlations(
             continue
 
         local_redis_metrics_checked_count += 1
+
+        # @added 20261110 - Feature #5783: luminosity - batch correlations
+        if LUMINOSITY_BATCH_CORRELATIONS:
+            matched_anomalies_count = get_matched_anomalies_count(anomalies, anomaly_timestamp, resolution)
+            if matched_anomalies_count:
+                time_period = (int(anomaly_timestamp - (resolution * 2)), int(anomaly_timestamp + (resolution * 2)))
+                # @modified 20261110 - Feature #5783: luminosity - batch correlations
+                # Only hold the data points in the time_period, which is all
+                # that is correlated
+                # batch_candidates.append([metric_base_name, correlate_ts, time_period, matched_anomalies_count])
+                correlate_ts = [item for item in correlate_ts if time_period[0] <= item[0] <= time_period[1]]
+                batch_candidates.append([metric_base_name, correlate_ts, time_period, matched_anomalies_count])
+            continue
+
         anomaly_ts_dict = dict(anomalous_ts)
         correlate_ts_dict = dict(correlate_ts)
 
@@ -1346,6 +1463,25 @@ def get_correlations(
         if correlated:
             correlated_metrics.append(metric_base_name)
 
+    # @added 20261110 - Feature #5783: luminosity - batch correlations
+    # The correlation of a metric is recorded for each matched anomaly, as the
+    # luminol Correlator was run for each matched anomaly
+    if batch_candidates:
+        batch_results = batch_cross_correlations(
+            skyline_app, anomalous_ts,
+            [(index, candidate[1], candidate[2]) for index, candidate in enumerate(batch_candidates)])
+        for index, (metric_base_name, correlate_ts, time_period, matched_anomalies_count) in enumerate(batch_candidates):
+            correlation = batch_results.get(index)
+            if not correlation:
+                continue
+            metrics_checked_for_correlation += matched_anomalies_count
+            if correlation[0] >= cross_correlation_threshold:
+                for _ in range(matched_anomalies_count):
+                    correlations.append([metric_base_name, correlation[0], correlation[1], correlation[2]])
+                local_redis_metrics_correlations_count += matched_anomalies_count
+                correlated_metrics.append(metric_base_name)
+        batch_candidates = []
+
     # @added 20230315 - Task #4872: Optimise luminosity for labelled_metrics
     logger.debug('debug :: get_correlations :: sorts_took: %s, timestamps_iterated: %s, timestamp_iterations_took: %s, labelled_metrics_fetched: %s' % (
         str(sorts_took), str(timestamps_iterated), str(timestamp_iterations_took), str(labelled_metrics_fetched)))
@@ -1447,6 +1583,19 @@ def get_correlations(
         if not correlate_ts:
             continue
 
+        # @added 20261110 - Feature #5783: luminosity - batch correlations
+        if LUMINOSITY_BATCH_CORRELATIONS:
+            matched_anomalies_count = get_matched_anomalies_count(anomalies, anomaly_timestamp, resolution)
+            if matched_anomalies_count:
+                time_period = (int(anomaly_timestamp - (resolution * 2)), int(anomaly_timestamp + (resolution * 2)))
+                # @modified 20261110 - Feature #5783: luminosity - batch correlations
+                # Only hold the data points in the time_period, which is all
+                # that is correlated
+                # batch_candidates.append([metric_base_name, correlate_ts, time_period, matched_anomalies_count])
+                correlate_ts = [item for item in correlate_ts if time_period[0] <= item[0] <= time_period[1]]
+                batch_candidates.append([metric_base_name, correlate_ts, time_period, matched_anomalies_count])
+            continue
+
         anomaly_ts_dict = dict(anomalous_ts)
         correlate_ts_dict = dict(correlate_ts)
 
@@ -1491,6 +1640,24 @@ def get_correlations(
         if correlated:
             correlated_metrics.append(metric_base_name)
 
+    # @added 20261110 - Feature #5783: luminosity - batch correlations
+    if batch_candidates:
+        batch_results = batch_cross_correlations(
+            skyline_app, anomalous_ts,
+            [(index, candidate[1], candidate[2]) for index, candidate in enumerate(batch_candidates)])
+        for index, (metric_base_name, correlate_ts, time_period, matched_anomalies_count) in enumerate(batch_candidates):
+            correlation = batch_results.get(index)
+            if not correlation:
+                continue
+            metrics_checked_for_correlation += matched_anomalies_count
+            remote_correlations_check_count += matched_anomalies_count
+            if correlation[0] >= cross_correlation_threshold:
+                for _ in range(matched_anomalies_count):
+                    correlations.append([metric_base_name, correlation[0], correlation[1], correlation[2]])
+                remote_correlations_count += matched_anomalies_count
+                correlated_metrics.append(metric_base_name)
+        batch_candidates = []
+
     end_remote_correlations = timer()
 
     # @added 20201207 - Feature #3858: skyline_functions - correlate_or_relate_with
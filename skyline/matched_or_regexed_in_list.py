@@ -9,6 +9,158 @@ import re
 from functions.metrics.get_labelled_metric_dict import get_labelled_metric_dict
 
 
+# @added 20261022 - Feature #5764: matched_or_regexed_in_list - compiled matcher
+# The compiled matchers are cached by the match_list contents, so a changed
+# settings or external_settings list simply results in a new matcher.  Each
+# matcher memoizes its results per base_name.
+MAX_COMPILED_MATCHERS = 256
+MAX_MEMOIZED_RESULTS = 100000
+compiled_matchers = {}
+
+
+class CompiledNamespaceMatcher(object):
+    """
+    A match_list compiled for matched_or_regexed_in_list.  Rather than trying
+    each pattern in the match_list in turn, the absolute matches are a dict
+    lookup, the dotted element matches are indexed by element and the regexes
+    are combined into a single alternation, and the first pattern in the
+    match_list that matches is determined from those.  The result is the same
+    as scanning the match_list in order.
+    """
+
+    def __init__(self, match_list):
+        self.match_list = list(match_list)
+        self.absolute = {}
+        self.elements_index = {}
+        self.elements_sets = []
+        self.regexes = []
+        self.combined_regex = None
+        self.combined_regex_groups = {}
+        self.memoized = {}
+        for index, match_namespace in enumerate(self.match_list):
+            if match_namespace not in self.absolute:
+                self.absolute[match_namespace] = index
+            match_namespace_namespace_elements = match_namespace.split('.')
+            elements_set = set(match_namespace_namespace_elements)
+            self.elements_sets.append(elements_set)
+            # A pattern with repeated elements can never be matched by elements
+            if len(elements_set) == len(match_namespace_namespace_elements):
+                for element in elements_set:
+                    self.elements_index.setdefault(element, []).append(index)
+            try:
+                self.regexes.append((index, re.compile(match_namespace)))
+            except:
+                continue
+        # Back references are numbered by group so cannot be combined
+        combine = True
+        for index, regex in self.regexes:
+            if re.search(r'\\[1-9]|\(\?P=', regex.pattern):
+                combine = False
+                break
+        if self.regexes and combine:
+            # Python tries the alternatives in order so the first group that
+            # matches is the first regex in the match_list that matches
+            combined_pattern = '|'.join(
+                '(%s)' % regex.pattern for index, regex in self.regexes)
+            try:
+                combined_regex = re.compile(combined_pattern)
+                group_number = 1
+                for index, regex in self.regexes:
+                    self.combined_regex_groups[group_number] = index
+                    group_number += 1 + regex.groups
+                if combined_regex.groups == (group_number - 1):
+                    self.combined_regex = combined_regex
+            except:
+                self.combined_regex = None
+
+    def first_regex_match(self, base_name, before_index):
+        """
+        Return the index of the first regex in the match_list that matches the
+        base_name or None.
+        """
+        if self.combined_regex is not None:
+            pattern_match = self.combined_regex.match(base_name)
+            if pattern_match is None:
+                return None
+            index = self.combined_regex_groups.get(pattern_match.lastindex)
+            if index is None:
+                # Determine the matched alternative from the groups
+                for group_number, group_index in self.combined_regex_groups.items():
+                    if pattern_match.group(group_number) is not None:
+                        index = group_index
+                        break
+            if index is not None:
+                return index
+        for index, regex in self.regexes:
+            if index >= before_index:
+                break
+            if regex.match(base_name):
+                return index
+        return None
+
+    def match(self, base_name, base_name_namespace_elements):
+        """
+        Return the index of the first pattern in the match_list that matches
+        the base_name and how it matched or None, None.
+        """
+        first_index = len(self.match_list)
+        absolute_index = self.absolute.get(base_name)
+        if absolute_index is not None:
+            first_index = absolute_index
+        for index in range(0, first_index):
+            if self.match_list[index] in base_name:
+                first_index = index
+                break
+        base_name_elements_set = set(base_name_namespace_elements)
+        candidates = set()
+        for element in base_name_elements_set:
+            for index in self.elements_index.get(element, []):
+                if index < first_index:
+                    candidates.add(index)
+        for index in sorted(candidates):
+            if self.elements_sets[index].issubset(base_name_elements_set):
+                first_index = index
+                break
+        regex_index = self.first_regex_match(base_name, first_index)
+        if regex_index is not None and regex_index < first_index:
+            first_index = regex_index
+        if first_index == len(self.match_list):
+            return None, None
+
+        # Determine how the first pattern matched in the same order that
+        # the match_list scan tests them
+        match_namespace = self.match_list[first_index]
+        if base_name == match_namespace:
+            return first_index, 'absolute_match'
+        if match_namespace in base_name:
+            return first_index, 'matched_in_namespace'
+        if first_index in candidates and self.elements_sets[first_index].issubset(base_name_elements_set):
+            return first_index, 'matched_in_elements'
+        return first_index, 'matched_by_regex'
+
+
+def get_compiled_matcher(match_list):
+    """
+    Return the cached CompiledNamespaceMatcher for the match_list or None if
+    the match_list cannot be compiled.
+    """
+    try:
+        match_list_key = tuple(match_list)
+    except TypeError:
+        return None
+    matcher = compiled_matchers.get(match_list_key)
+    if matcher is not None:
+        return matcher
+    for match_namespace in match_list_key:
+        if not isinstance(match_namespace, str):
+            return None
+    if len(compiled_matchers) >= MAX_COMPILED_MATCHERS:
+        compiled_matchers.clear()
+    matcher = CompiledNamespaceMatcher(match_list_key)
+    compiled_matchers[match_list_key] = matcher
+    return matcher
+
+
 # @added 20200423 - Feature #3512: matched_or_regexed_in_list function
 #                   Feature #3508: ionosphere_untrainable_metrics
 #                   Feature #3486: analyzer_batch
@@ -22,6 +174,95 @@ def matched_or_regexed_in_list(current_skyline_app, base_name, match_list, debug
     2) match been dotted elements
     3) matched by a regex
 
+    The match_list is compiled and cached the first time it is used and the
+    result for each base_name is memoized, the match_list is only scanned
+    when debug_log is passed.
+
+    :param current_skyline_app: the app calling the function so the function
+        knows which log to write too.
+    :param metric_name: the metric name
+    :param match_list: the list of items to try and match the metric name in
+    :type current_skyline_app: str
+    :type metric_name: str
+    :type match_list: list
+    :return: False, {}
+    :rtype:  (boolean, dict)
+
+    Returns (matched, matched_by)
+
+    """
+    # @added 20261022 - Feature #5764: matched_or_regexed_in_list - compiled matcher
+    matcher = None
+    if not debug_log and isinstance(base_name, str):
+        try:
+            matcher = get_compiled_matcher(match_list)
+        except:
+            matcher = None
+    if matcher is None:
+        return scan_matched_or_regexed_in_list(current_skyline_app, base_name, match_list, debug_log)
+
+    memoized_result = matcher.memoized.get(base_name)
+    if memoized_result is not None:
+        matched_by = dict(memoized_result[1])
+        if matched_by['matched_in_namespace_elements'] is not None:
+            matched_by['matched_in_namespace_elements'] = set(matched_by['matched_in_namespace_elements'])
+        return (memoized_result[0], matched_by)
+
+    try:
+        base_name_namespace_elements = base_name.split('.')
+        if '_tenant_id' in base_name:
+            try:
+                metric_dict = get_labelled_metric_dict(current_skyline_app, base_name)
+                base_name_namespace_elements = []
+                base_name_namespace_elements.append(metric_dict['metric'])
+                base_name_namespace_elements = base_name_namespace_elements + list(metric_dict['labels'].keys())
+                base_name_namespace_elements = base_name_namespace_elements + list(metric_dict['labels'].values())
+            except:
+                base_name_namespace_elements = base_name.split('.')
+        index, matched_how = matcher.match(base_name, base_name_namespace_elements)
+    except:
+        return scan_matched_or_regexed_in_list(current_skyline_app, base_name, match_list, debug_log)
+
+    matched_by = {
+        'absolute_match': False,
+        'matched_in_namespace': False,
+        'matched_namespace': None,
+        'matched_in_elements': False,
+        'matched_in_namespace_elements': None,
+        'matched_by_regex': False,
+        'matched_regex': None,
+    }
+    matched = False
+    if index is not None:
+        matched = True
+        match_namespace = matcher.match_list[index]
+        matched_by[matched_how] = True
+        matched_by['matched_namespace'] = match_namespace
+        if matched_how == 'matched_in_elements':
+            matched_by['matched_in_namespace_elements'] = set(matcher.elements_sets[index])
+        if matched_how == 'matched_by_regex':
+            matched_by['matched_regex'] = match_namespace
+
+    if len(matcher.memoized) >= MAX_MEMOIZED_RESULTS:
+        matcher.memoized.clear()
+    memoized_matched_by = dict(matched_by)
+    if memoized_matched_by['matched_in_namespace_elements'] is not None:
+        memoized_matched_by['matched_in_namespace_elements'] = frozenset(memoized_matched_by['matched_in_namespace_elements'])
+    matcher.memoized[base_name] = (matched, memoized_matched_by)
+    return (matched, matched_by)
+
+
+# @added 20261022 - Feature #5764: matched_or_regexed_in_list - compiled matcher
+# The original match_list scan, used for debug_log and anything that cannot be
+# compiled
+def scan_matched_or_regexed_in_list(current_skyline_app, base_name, match_list, debug_log=False):
+    """
+    Determine if a pattern is in a list as a:
+    1) absolute match
+    2) match been dotted elements
+    3) matched by a regex
+    by scanning the match_list.
+
     :param current_skyline_app: the app calling the function so the function
         knows which log to write too.
     :param metric_name: the metric name
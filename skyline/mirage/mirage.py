@@ -131,6 +131,22 @@ from functions.timeseries.deduplicate_timeseries import deduplicate_timeseries
 #                   Bug #5518: custom_algorithms_results - invalid JSON
 from functions.custom_algorithms.create_results_json import create_results_json
 
+# @added 20261026 - Feature #5768: check queue
+from functions.redis.check_queue import (
+    check_queue_key, get_queued_checks, remove_queued_check, fail_queued_check)
+
+# @added 20261104 - Feature #5777: graphite - shared http session
+from functions.graphite.graphite_client import fetch_graphite_metrics_timeseries
+
+# @added 20261105 - Feature #5778: mirage - full duration cache
+# @modified 20261105 - Feature #5778: mirage - full duration cache
+# Record a resolution mismatch so the delta is not fetched for the metric
+# from functions.mirage.full_duration_cache import (
+#     get_full_duration_cache, merge_full_duration_cache, set_full_duration_cache)
+from functions.mirage.full_duration_cache import (
+    get_full_duration_cache, merge_full_duration_cache, set_full_duration_cache,
+    get_delta_resolution, set_full_duration_cache_resolution_mismatch)
+
 LOCAL_DEBUG = False
 
 # ENABLE_MEMORY_PROFILING - DEVELOPMENT ONLY
@@ -317,6 +333,26 @@ try:
 except:
     SKYLINE_DAWN_ENABLED = True
 
+# @added 20261104 - Feature #5777: graphite - shared http session
+try:
+    MIRAGE_CONCURRENT_GRAPHITE_FETCH = settings.MIRAGE_CONCURRENT_GRAPHITE_FETCH
+except:
+    MIRAGE_CONCURRENT_GRAPHITE_FETCH = True
+try:
+    MIRAGE_CONCURRENT_GRAPHITE_FETCH_THREADS = int(settings.MIRAGE_CONCURRENT_GRAPHITE_FETCH_THREADS)
+except:
+    MIRAGE_CONCURRENT_GRAPHITE_FETCH_THREADS = 4
+
+# @added 20261105 - Feature #5778: mirage - full duration cache
+try:
+    MIRAGE_FULL_DURATION_CACHE = settings.MIRAGE_FULL_DURATION_CACHE
+except:
+    MIRAGE_FULL_DURATION_CACHE = False
+try:
+    MIRAGE_FULL_DURATION_CACHE_TTL = int(settings.MIRAGE_FULL_DURATION_CACHE_TTL)
+except:
+    MIRAGE_FULL_DURATION_CACHE_TTL = 3600
+
 skyline_app_graphite_namespace = 'skyline.%s%s' % (skyline_app, SERVER_METRIC_PATH)
 failed_checks_dir = '%s_failed' % settings.MIRAGE_CHECK_PATH
 # @added 20191107 - Branch #3262: py3
@@ -807,15 +843,23 @@ class Mirage(Thread):
             # Deprecate self.surface_graphite_metric_data in mirage so that the
             # same function can be used for all graphite requests
             # self.surface_graphite_metric_data(metric, graphite_from, graphite_until)
-            metric_json_file_saved = get_graphite_metric(
-                skyline_app, metric, time_from,
-                time_now, 'json', metric_json_file)
+            # @modified 20261104 - Feature #5777: graphite - shared http session
+            # Surface the time series in memory rather than writing it to a
+            # json file to read it back
+            # metric_json_file_saved = get_graphite_metric(
+            #     skyline_app, metric, time_from,
+            #     time_now, 'json', metric_json_file)
+            timeseries = get_graphite_metric(
+                skyline_app, metric, time_from, time_now, 'list', 'object')
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: populate_redis :: get_graphite_metric failed to surface_graphite_metric_data to populate %s' % (
                 str(metric_json_file)))
+            timeseries = False
         # Check there is a json timeseries file to use
-        if not os.path.isfile(metric_json_file):
+        # @modified 20261104 - Feature #5777: graphite - shared http session
+        # if not os.path.isfile(metric_json_file):
+        if timeseries is False or timeseries is None:
             logger.error(
                 'error :: populate_redis :: retrieve failed - failed to surface %s time series from graphite' % (
                     metric))
@@ -836,14 +880,15 @@ class Mirage(Thread):
         logger.info('populate_redis :: retrieved data :: for %s' % (
             metric))
         self.check_if_parent_is_alive()
-        timeseries = []
-        try:
-            with open((metric_json_file), 'r') as f:
-                timeseries = json.loads(f.read())
-        except:
-            logger.error(traceback.format_exc())
-            logger.error('error :: populate_redis :: failed to get timeseries from json - %s' % metric_json_file)
-            timeseries = []
+        # @modified 20261104 - Feature #5777: graphite - shared http session
+        # timeseries = []
+        # try:
+        #     with open((metric_json_file), 'r') as f:
+        #         timeseries = json.loads(f.read())
+        # except:
+        #     logger.error(traceback.format_exc())
+        #     logger.error('error :: populate_redis :: failed to get timeseries from json - %s' % metric_json_file)
+        #     timeseries = []
         if not timeseries:
             logger.info('populate_redis :: no timeseries data for %s, setting redis_populated_key and removing from mirage.populate_redis' % metric)
             try:
@@ -1043,6 +1088,75 @@ class Mirage(Thread):
         # Let Mirage process manage keys and alerts every minute
         checks_processed = 0
 
+        # @added 20261026 - Feature #5768: check queue
+        # Get the queued checks once, any check that is not a check file is
+        # loaded from the check queue
+        queued_checks = {}
+        if processing_check_files:
+            queued_checks = get_queued_checks(skyline_app, skyline_app, redis_conn=self.redis_conn)
+
+        # @added 20261104 - Feature #5777: graphite - shared http session
+        # Rather than waiting on a Graphite request for each check in turn,
+        # fetch the second order resolution time series of all the checks
+        # that are not stale concurrently and parse them in memory.  Any check
+        # that is not prefetched is fetched with get_graphite_metric as normal.
+        loaded_metric_vars = {}
+        prefetched_timeseries = {}
+        # @added 20261105 - Feature #5778: mirage - full duration cache
+        full_duration_caches = {}
+        if MIRAGE_CONCURRENT_GRAPHITE_FETCH and len(processing_check_files) > 1:
+            graphite_fetches = []
+            for metric_check_filename in processing_check_files:
+                metric_check_file = '%s/%s' % (settings.MIRAGE_CHECK_PATH, metric_check_filename)
+                try:
+                    if metric_check_filename in queued_checks and not os.path.isfile(metric_check_file):
+                        metric_vars_array = list(queued_checks[metric_check_filename]['metric_vars'])
+                    else:
+                        metric_vars_array = self.mirage_load_metric_vars(str(metric_check_file))
+                        if not metric_vars_array:
+                            continue
+                        loaded_metric_vars[metric_check_filename] = metric_vars_array
+                    check_vars = {}
+                    for var_array in metric_vars_array:
+                        if var_array[0] in ['metric', 'hours_to_resolve', 'metric_timestamp']:
+                            check_vars[var_array[0]] = var_array[1]
+                    metric = str(check_vars['metric'])
+                    metric_timestamp = int(check_vars['metric_timestamp'])
+                    hours_to_resolve = int(check_vars['hours_to_resolve'])
+                except Exception as err:
+                    logger.warning('warning :: failed to determine the Graphite fetch for %s - %s' % (
+                        metric_check_filename, err))
+                    continue
+                if (int(run_timestamp) - metric_timestamp) > settings.MIRAGE_STALE_SECONDS:
+                    if metric not in test_values_base_names:
+                        continue
+                # @added 20261105 - Feature #5778: mirage - full duration cache
+                # Only fetch the data since the last cached data point
+                if MIRAGE_FULL_DURATION_CACHE:
+                    full_duration_cache = get_full_duration_cache(
+                        skyline_app, self.redis_conn, metric, hours_to_resolve,
+                        (metric_timestamp - (hours_to_resolve * 3600)),
+                        metric_timestamp)
+                    if full_duration_cache:
+                        full_duration_caches[metric_check_filename] = full_duration_cache
+                        graphite_fetches.append((
+                            metric, full_duration_cache['fetch_from'],
+                            metric_timestamp))
+                        continue
+                graphite_fetches.append((
+                    metric, (metric_timestamp - (hours_to_resolve * 3600)),
+                    metric_timestamp))
+            if graphite_fetches:
+                try:
+                    prefetched_timeseries = fetch_graphite_metrics_timeseries(
+                        skyline_app, graphite_fetches,
+                        threads=MIRAGE_CONCURRENT_GRAPHITE_FETCH_THREADS,
+                        redis_conn_decoded=self.redis_conn_decoded)
+                except Exception as err:
+                    logger.error(traceback.format_exc())
+                    logger.error('error :: fetch_graphite_metrics_timeseries failed - %s' % err)
+                    prefetched_timeseries = {}
+
         # @modified 20221014 - Feature #4576: mirage - process multiple metrics
         for metric_check_filename in processing_check_files:
 
@@ -1078,11 +1192,29 @@ class Mirage(Thread):
                 #                      Panorama check file fails #24
                 # Get rid of the skyline_functions imp as imp is deprecated in py3 anyway
                 # metric_vars = load_metric_vars(skyline_app, str(metric_check_file))
-                metric_vars_array = self.mirage_load_metric_vars(str(metric_check_file))
+                # @modified 20261026 - Feature #5768: check queue
+                # Use the typed metric variables of a queued check
+                # metric_vars_array = self.mirage_load_metric_vars(str(metric_check_file))
+                queued_check = None
+                if metric_check_filename in queued_checks and not os.path.isfile(metric_check_file):
+                    queued_check = queued_checks[metric_check_filename]
+                    metric_vars_array = list(queued_check['metric_vars'])
+                    logger.info('loaded metric variables from check queue - %s' % metric_check_filename)
+                # @modified 20261104 - Feature #5777: graphite - shared http session
+                # Use the metric variables loaded for the Graphite fetch
+                elif metric_check_filename in loaded_metric_vars:
+                    metric_vars_array = loaded_metric_vars[metric_check_filename]
+                else:
+                    metric_vars_array = self.mirage_load_metric_vars(str(metric_check_file))
             except:
                 logger.error(traceback.format_exc())
                 logger.error('error :: failed to load metric variables from check file - %s' % (metric_check_file))
-                fail_check(skyline_app, metric_failed_check_dir, str(metric_check_file))
+                # @modified 20261026 - Feature #5768: check queue
+                # fail_check(skyline_app, metric_failed_check_dir, str(metric_check_file))
+                if queued_check:
+                    fail_queued_check(skyline_app, skyline_app, metric_failed_check_dir, metric_check_filename, queued_check, redis_conn=self.redis_conn)
+                else:
+                    fail_check(skyline_app, metric_failed_check_dir, str(metric_check_file))
                 # @modified 20221014 - Feature #4576: mirage - process multiple metrics
                 # return
                 continue
@@ -1350,6 +1482,9 @@ class Mirage(Thread):
                     logger.info('removed check file - %s' % (metric_check_file))
                 else:
                     logger.info('could not remove check file - %s' % (metric_check_file))
+                # @added 20261026 - Feature #5768: check queue
+                if queued_check:
+                    remove_queued_check(skyline_app, skyline_app, metric_check_filename, redis_conn=self.redis_conn)
                 # Remove the metric directory
                 if os.path.exists(metric_data_dir):
                     try:
@@ -1442,6 +1577,9 @@ class Mirage(Thread):
                     logger.info('removed check file - %s' % (metric_check_file))
                 else:
                     logger.info('could not remove check file - %s' % (metric_check_file))
+                # @added 20261026 - Feature #5768: check queue
+                if queued_check:
+                    remove_queued_check(skyline_app, skyline_app, metric_check_filename, redis_conn=self.redis_conn)
 
                 # Remove the metric directory
                 if os.path.exists(metric_data_dir):
@@ -1484,6 +1622,93 @@ class Mirage(Thread):
                 'retrieve data :: surfacing %s time series from graphite for %s seconds' % (
                     metric, str(second_order_resolution_seconds)))
 
+            # @added 20261105 - Feature #5778: mirage - full duration cache
+            # If the metric has been checked recently only fetch the data since
+            # the last cached data point and merge it into the cached time
+            # series
+            merged_timeseries = None
+            if MIRAGE_FULL_DURATION_CACHE:
+                full_duration_cache = full_duration_caches.get(metric_check_filename)
+                if not full_duration_cache:
+                    full_duration_cache = get_full_duration_cache(
+                        skyline_app, self.redis_conn, metric, hours_to_resolve,
+                        second_resolution_timestamp, int_metric_timestamp)
+                if full_duration_cache:
+                    fetched_timeseries = prefetched_timeseries.get((
+                        metric, full_duration_cache['fetch_from'], int_metric_timestamp))
+                    if fetched_timeseries is None:
+                        try:
+                            fetched_timeseries = get_graphite_metric(
+                                skyline_app, metric, full_duration_cache['fetch_from'],
+                                metric_timestamp, 'list', 'object')
+                        except Exception as err:
+                            logger.error('error :: get_graphite_metric failed to fetch the data since %s for %s - %s' % (
+                                str(full_duration_cache['fetch_from']), metric, err))
+                    # @modified 20261105 - Feature #5778: mirage - full duration cache
+                    # Any resolution mismatch is fetched in full, not only
+                    # derivative metrics
+                    # known_derivative_metric = '%s%s' % (settings.FULL_NAMESPACE, metric) in derivative_metrics
+                    # merged_timeseries = merge_full_duration_cache(
+                    #     skyline_app, full_duration_cache, fetched_timeseries,
+                    #     second_resolution_timestamp, int_metric_timestamp,
+                    #     known_derivative_metric)
+                    merged_timeseries = merge_full_duration_cache(
+                        skyline_app, full_duration_cache, fetched_timeseries,
+                        second_resolution_timestamp, int_metric_timestamp)
+                if merged_timeseries:
+                    try:
+                        if not os.path.isdir(metric_data_dir):
+                            mkdir_p(metric_data_dir)
+                        with open(metric_json_file, 'w') as f:
+                            f.write(json.dumps(merged_timeseries))
+                        os.chmod(metric_json_file, mode=0o644)
+                        logger.info('%s time series data saved from the full duration cache merged with the data since %s' % (
+                            metric, str(full_duration_cache['fetch_from'])))
+                    except Exception as err:
+                        logger.error(traceback.format_exc())
+                        logger.error('error :: failed to save the merged time series to %s - %s' % (
+                            metric_json_file, err))
+                elif full_duration_cache:
+                    logger.info('could not merge the full duration cache for %s, fetching the full time series' % metric)
+                    # @added 20261105 - Feature #5778: mirage - full duration cache
+                    # If the hours_to_resolve period is longer than the first
+                    # Graphite retention archive the delta is returned at the
+                    # finest retention and can never be merged, record the
+                    # mismatch so that the delta is not fetched for every
+                    # check as well as the full time series
+                    if fetched_timeseries:
+                        try:
+                            delta_resolution = get_delta_resolution(
+                                skyline_app, full_duration_cache, fetched_timeseries)
+                        except Exception as err:
+                            logger.error('error :: get_delta_resolution failed for %s - %s' % (
+                                metric, err))
+                            delta_resolution = None
+                        if delta_resolution and delta_resolution != int(full_duration_cache['resolution']):
+                            logger.info('the full duration cache resolution of %s for %s does not match the delta resolution of %s, not using the full duration cache for the metric' % (
+                                str(full_duration_cache['resolution']), metric,
+                                str(delta_resolution)))
+                            set_full_duration_cache_resolution_mismatch(
+                                skyline_app, self.redis_conn, metric, hours_to_resolve)
+
+            # @added 20261104 - Feature #5777: graphite - shared http session
+            # Use the time series that was fetched concurrently, the json file
+            # is still saved as the training data requires it
+            prefetched_check_timeseries = prefetched_timeseries.get((
+                metric, second_resolution_timestamp, int_metric_timestamp))
+            if prefetched_check_timeseries is not None and not os.path.isfile(metric_json_file):
+                try:
+                    if not os.path.isdir(metric_data_dir):
+                        mkdir_p(metric_data_dir)
+                    with open(metric_json_file, 'w') as f:
+                        f.write(json.dumps(prefetched_check_timeseries.tolist()))
+                    os.chmod(metric_json_file, mode=0o644)
+                    logger.info('%s time series data saved from the concurrent Graphite fetch' % metric)
+                except Exception as err:
+                    logger.error(traceback.format_exc())
+                    logger.error('error :: failed to save the prefetched time series to %s - %s' % (
+                        metric_json_file, err))
+
             # @modified 20191113 - Branch #3262: py3
             # Wrapped in try
             try:
@@ -1492,11 +1717,14 @@ class Mirage(Thread):
                 # Deprecate self.surface_graphite_metric_data in mirage so that the
                 # same function can be used for all graphite requests
                 # self.surface_graphite_metric_data(metric, graphite_from, graphite_until)
-                metric_json_file_saved = get_graphite_metric(
-                    skyline_app, metric, second_resolution_timestamp,
-                    metric_timestamp, 'json', metric_json_file)
-                if metric_json_file_saved:
-                    logger.info('%s time series data saved' % metric)
+                # @modified 20261104 - Feature #5777: graphite - shared http session
+                # Only fetch if not prefetched
+                if not os.path.isfile(metric_json_file):
+                    metric_json_file_saved = get_graphite_metric(
+                        skyline_app, metric, second_resolution_timestamp,
+                        metric_timestamp, 'json', metric_json_file)
+                    if metric_json_file_saved:
+                        logger.info('%s time series data saved' % metric)
             except:
                 logger.error(traceback.format_exc())
                 logger.error('error :: get_graphite_metric failed to surface_graphite_metric_data to populate %s' % (
@@ -1539,6 +1767,9 @@ class Mirage(Thread):
                         os.remove(metric_check_file)
                     except OSError:
                         pass
+                    # @added 20261026 - Feature #5768: check queue
+                    if queued_check:
+                        remove_queued_check(skyline_app, skyline_app, metric_check_filename, redis_conn=self.redis_conn)
                     # Remove the metric directory
                     try:
                         rmtree(metric_data_dir)
@@ -1570,6 +1801,15 @@ class Mirage(Thread):
                     str(metric_json_file), err))
                 timeseries = []
 
+            # @added 20261105 - Feature #5778: mirage - full duration cache
+            # Cache the time series when it was fetched in full, a merged time
+            # series is not cached again so that the full time series is
+            # fetched again once the cache expires
+            if MIRAGE_FULL_DURATION_CACHE and timeseries and not merged_timeseries:
+                set_full_duration_cache(
+                    skyline_app, self.redis_conn, metric, hours_to_resolve,
+                    timeseries, ttl=MIRAGE_FULL_DURATION_CACHE_TTL)
+
             # @added 20170212 - Feature #1886: Ionosphere learn
             # Only process if the metric has sufficient data
             first_timestamp = None
@@ -1741,6 +1981,9 @@ class Mirage(Thread):
                     os.remove(metric_check_file)
                 except OSError:
                     pass
+                # @added 20261026 - Feature #5768: check queue
+                if queued_check:
+                    remove_queued_check(skyline_app, skyline_app, metric_check_filename, redis_conn=self.redis_conn)
                 # Remove the metric directory
                 try:
                     rmtree(metric_data_dir)
@@ -3364,6 +3607,9 @@ algorithms_run = %s
                     logger.info('removed check file - %s' % metric_check_file)
                 except OSError:
                     logger.error('error :: failed to remove check file - %s' % metric_check_file)
+            # @added 20261026 - Feature #5768: check queue
+            if queued_check:
+                remove_queued_check(skyline_app, skyline_app, metric_check_filename, redis_conn=self.redis_conn)
 
             # Remove the metric directory
             if os.path.exists(metric_data_dir):
@@ -3578,6 +3824,9 @@ algorithms_run = %s
                 except Exception as err:
                     logger.error('error :: failed to ping Redis - %s' % err)
 
+            # @added 20261026 - Feature #5768: check queue
+            queued_checks = {}
+
             # Determine if any metric to analyze or Ionosphere alerts to be sent
             while True:
 
@@ -4303,6 +4552,34 @@ algorithms_run = %s
                     break
 
                 metric_var_files = [f for f in listdir(settings.MIRAGE_CHECK_PATH) if isfile(join(settings.MIRAGE_CHECK_PATH, f))]
+
+                # @added 20261026 - Feature #5768: check queue
+                # Add the queued checks
+                queued_checks = get_queued_checks(skyline_app, skyline_app, redis_conn=self.redis_conn)
+                # Remove stale queued checks, as with the check files above
+                for check_file in list(queued_checks.keys()):
+                    try:
+                        added_at = int(queued_checks[check_file]['added_at'])
+                    except Exception as err:
+                        logger.error('error :: failed to determine added_at of queued check %s, err: %s' % (
+                            check_file, err))
+                        added_at = 0
+                    if added_at >= stale_age:
+                        continue
+                    if [b_metric for b_metric in batch_processing_metrics if b_metric in check_file]:
+                        continue
+                    remove_queued_check(skyline_app, skyline_app, check_file, redis_conn=self.redis_conn)
+                    del queued_checks[check_file]
+                    logger.info('removed stale queued check - %s' % (check_file))
+                    try:
+                        self.redis_conn.sadd('mirage.stale_check_discarded', str(check_file))
+                    except Exception as err:
+                        logger.error('error :: failed to add %s to mirage.stale_check_discarded Redis set, err: %s' % (
+                            check_file, err))
+                if queued_checks:
+                    check_files = set(metric_var_files)
+                    metric_var_files = metric_var_files + [check_file for check_file in list(queued_checks.keys()) if check_file not in check_files]
+
                 if len(metric_var_files) > 0:
                     break
 
@@ -4329,6 +4606,11 @@ algorithms_run = %s
                 for check_file in metric_var_files_sorted:
                     try:
                         path_and_check_file = '%s/%s' % (settings.MIRAGE_CHECK_PATH, check_file)
+                        # @added 20261026 - Feature #5768: check queue
+                        # Use the added_at timestamp of queued checks
+                        if check_file in queued_checks and not os.path.isfile(path_and_check_file):
+                            metric_var_files_added_at.append([int(queued_checks[check_file]['added_at']), check_file])
+                            continue
                         metric_var_files_added_at.append([int(os.path.getmtime(path_and_check_file)), check_file])
                     except Exception as err:
                         logger.error('error :: failed to determine modified time of %s, err: %s' % (
@@ -4698,6 +4980,9 @@ algorithms_run = %s
                         else:
                             if LOCAL_DEBUG:
                                 logger.debug('debug :: no metric_check_file to remove OK - %s' % metric_check_file)
+                        # @added 20261026 - Feature #5768: check queue
+                        if processing_check_file in queued_checks:
+                            remove_queued_check(skyline_app, skyline_app, processing_check_file, redis_conn=self.redis_conn)
 
                         # Remove the metric directory
                         # @modified 20191113 - Branch #3262: py3
@@ -6460,6 +6745,11 @@ algorithms_run = %s
                 send_graphite_metric(self, skyline_app, send_metric_name, str(stale_check_discarded_count))
                 checks_pending = [f_pending for f_pending in listdir(settings.MIRAGE_CHECK_PATH) if isfile(join(settings.MIRAGE_CHECK_PATH, f_pending))]
                 checks_pending_count = len(checks_pending)
+                # @added 20261026 - Feature #5768: check queue
+                try:
+                    checks_pending_count += self.redis_conn.hlen(check_queue_key(skyline_app))
+                except Exception as err:
+                    logger.error('error :: failed to hlen %s, err: %s' % (check_queue_key(skyline_app), err))
                 logger.info('checks.pending   :: %s' % str(checks_pending_count))
                 send_metric_name = '%s.checks.pending' % skyline_app_graphite_namespace
                 send_graphite_metric(self, skyline_app, send_metric_name, str(checks_pending_count))
@@ -64,7 +64,8 @@ from os import uname
 # @added 20220722 - Task #4624: Change all dict copy to deepcopy
 import copy
 
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 
 # @added 20200116: Feature #3396: http_alerter
 import requests
@@ -162,6 +163,8 @@ if True:
 
     # @added 20250325 - Feature #5611: custom_algorithm_only
     from functions.skyline.coerce_to_valid_json import coerce_to_valid_json
+    # @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+    from functions.timeseries.packed_timeseries import unpack_timeseries
 
 # @added 20200929 - Task #3748: POC SNAB
 #                   Branch #3068: SNAB
@@ -900,7 +903,9 @@ def alert_smtp(alert, metric, second_order_resolution_seconds, context, triggere
 
     timeseries = []
     raw_series = []
-    unpacker = None
+    # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+    # unpacker is no longer used
+    # unpacker = None
     timeseries_x = []
     timeseries_y = []
 
@@ -918,16 +923,19 @@ def alert_smtp(alert, metric, second_order_resolution_seconds, context, triggere
             try:
                 if LOCAL_DEBUG:
                     logger.info('debug :: alert_smtp - Memory usage before get Redis timeseries data: %s (kb)' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
-                unpacker = Unpacker(use_list=True)
-                unpacker.feed(raw_series)
-                timeseries_x = [float(item[0]) for item in unpacker]
-                unpacker = Unpacker(use_list=True)
-                unpacker.feed(raw_series)
-                timeseries_y = [item[1] for item in unpacker]
-
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=True)
+                # unpacker.feed(raw_series)
+                # timeseries_x = [float(item[0]) for item in unpacker]
+                # unpacker = Unpacker(use_list=True)
+                # unpacker.feed(raw_series)
+                # timeseries_y = [item[1] for item in unpacker]
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
+                timeseries_x = [float(item[0]) for item in timeseries]
+                timeseries_y = [item[1] for item in timeseries]
                 if LOCAL_DEBUG:
                     logger.info('debug :: alert_smtp - Memory usage after get Redis timeseries data: %s (kb)' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
             except:
@@ -68,6 +68,8 @@ from database import (
     #                   Branch #3068: SNAB
     snab_table_meta,
 )
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 # @added 20211001 - Feature #4268: Redis hash key - panorama.metrics.latest_anomaly
 #                   Feature #4264: luminosity - cross_correlation_relationships
@@ -225,6 +227,19 @@ except:
         'ionosphere.learn_repetitive_patterns': 3024000,  # 35 days
     }
 
+# @added 20261025 - Feature #5767: panorama - bulk insert
+try:
+    PANORAMA_BULK_INSERT = settings.PANORAMA_BULK_INSERT
+except:
+    PANORAMA_BULK_INSERT = False
+# The maximum number of seconds that spin_process iterates check files in bulk
+# mode, leaving time for the bulk insert to complete before the spin_process
+# timeout
+try:
+    PANORAMA_BULK_INSERT_MAX_RUN_SECONDS = int(settings.PANORAMA_BULK_INSERT_MAX_RUN_SECONDS)
+except:
+    PANORAMA_BULK_INSERT_MAX_RUN_SECONDS = 15
+
 
 # Database configuration
 config = {'user': settings.PANORAMA_DBUSER,
@@ -351,7 +366,11 @@ class Panorama(Thread):
             logger.error(traceback.format_exc())
             logger.error('error :: insert_new_metric :: failed to get metrics_table meta - %s' % err)
             try:
-                engine.dispose()
+                # @modified 20261024 - Feature #5766: database - pooled engine
+                # The pooled engine is not disposed of
+                # engine.dispose()
+                if not is_pooled_engine(engine):
+                    engine.dispose()
             except Exception as err:
                 logger.error('error :: insert_new_metric :: engine.dispose() failed - %s' % (
                     err))
@@ -452,7 +471,11 @@ class Panorama(Thread):
                     log_msg = 'error :: insert_new_metric :: failed to get metrics_table meta - %s' % err
                     logger.error(log_msg)
                     try:
-                        engine.dispose()
+                        # @modified 20261024 - Feature #5766: database - pooled engine
+                        # The pooled engine is not disposed of
+                        # engine.dispose()
+                        if not is_pooled_engine(engine):
+                            engine.dispose()
                     except Exception as err:
                         logger.error('error :: insert_new_metric :: engine.dispose() failed - %s' % (
                             err))
@@ -613,7 +636,11 @@ class Panorama(Thread):
         # @added 20240119 - Task #5228: panorama - optimise insertions
         # Dispose of engine at the end
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except Exception as err:
             logger.error('error :: insert_new_metric :: engine.dispose() failed - %s' % (
                 err))
@@ -865,7 +892,11 @@ class Panorama(Thread):
         def engine_disposal(engine):
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: update_slack_thread_ts :: calling engine.dispose()')
@@ -1137,7 +1168,11 @@ class Panorama(Thread):
         def engine_disposal(engine):
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: update_anomaly_end_timestamp :: calling engine.dispose()')
@@ -1270,7 +1305,11 @@ class Panorama(Thread):
         def engine_disposal(engine):
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: update_alert_ts :: calling engine.dispose()')
@@ -1540,7 +1579,11 @@ class Panorama(Thread):
             # Only dispose of the engine if called and not passed
             if engine_called:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except Exception as err:
                     logger.error('error :: determine_db_id :: engine.dispose() failed - %s' % (
                         err))
@@ -1643,7 +1686,11 @@ class Panorama(Thread):
                 # Only dispose of the engine if called and not passed
                 if engine_called:
                     try:
-                        engine.dispose()
+                        # @modified 20261024 - Feature #5766: database - pooled engine
+                        # The pooled engine is not disposed of
+                        # engine.dispose()
+                        if not is_pooled_engine(engine):
+                            engine.dispose()
                     except Exception as err:
                         logger.error('error :: determine_db_id :: engine.dispose() failed - %s' % (
                             err))
@@ -1674,7 +1721,11 @@ class Panorama(Thread):
             # Only dispose of the engine if called and not passed
             if engine_called:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except Exception as err:
                     logger.error('error :: determine_db_id :: engine.dispose() failed - %s' % (
                         err))
@@ -1712,7 +1763,11 @@ class Panorama(Thread):
         # Only dispose of the engine if called and not passed
         if engine_called:
             try:
-                engine.dispose()
+                # @modified 20261024 - Feature #5766: database - pooled engine
+                # The pooled engine is not disposed of
+                # engine.dispose()
+                if not is_pooled_engine(engine):
+                    engine.dispose()
             except Exception as err:
                 logger.error('error :: determine_db_id :: engine.dispose() failed - %s' % (
                     err))
@@ -1747,7 +1802,11 @@ class Panorama(Thread):
         def engine_disposal(engine):
             if engine:
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except:
                     logger.error(traceback.format_exc())
                     logger.error('error :: update_snab :: calling engine.dispose()')
@@ -1974,6 +2033,373 @@ class Panorama(Thread):
             engine_disposal(engine)
         return
 
+    # @added 20261025 - Feature #5767: panorama - bulk insert
+    def bulk_determine_metric_ids(self, engine, metrics_table, metrics):
+        """
+        Determine the metric ids of multiple metrics from Redis and a single
+        database query and insert any new metrics with insert_new_metric.
+        labelled_metrics names are not determined and any metric that is not
+        determined is left to the single metric method.
+
+        :param engine: the engine object
+        :param metrics_table: the metrics_table object
+        :param metrics: the metric names
+        :type engine: object
+        :type metrics_table: object
+        :type metrics: list
+        :return: metric_ids
+        :rtype: dict
+
+        """
+        metric_ids = {}
+        metrics = list(set([metric for metric in metrics if not metric.startswith('labelled_metrics.')]))
+        if not metrics:
+            return metric_ids
+        try:
+            metric_id_strs = self.redis_conn_decoded.hmget('aet.metrics_manager.metric_names_with_ids', metrics)
+            for metric, metric_id_str in zip(metrics, metric_id_strs):
+                if metric_id_str:
+                    metric_ids[metric] = int(metric_id_str)
+        except Exception as err:
+            logger.error('error :: bulk_determine_metric_ids :: hmget on aet.metrics_manager.metric_names_with_ids failed, err: %s' % err)
+        if 'sqlalchemy.sql.schema.Table' not in str(type(metrics_table)):
+            return metric_ids
+
+        def select_metric_ids(select_metrics):
+            # The metric column collation is case-insensitive on comparisons
+            # so only exact matches are used, the lowered names of all the
+            # matched metrics are returned so that metrics that only differ
+            # by case are not inserted as new metrics
+            matched_metrics = set()
+            for i in range(0, len(select_metrics), 1000):
+                stmt = select(metrics_table.c.id, metrics_table.c.metric).where(
+                    metrics_table.c.metric.in_(select_metrics[i:(i + 1000)]))
+                with engine.connect() as connection:
+                    result = connection.execute(stmt)
+                    for row in result.fetchall():
+                        matched_metrics.add(str(row.metric).lower())
+                        if row.metric in metric_ids:
+                            continue
+                        metric_ids[row.metric] = int(row.id)
+            return matched_metrics
+
+        metrics_to_select = [metric for metric in metrics if metric not in metric_ids]
+        matched_metrics = set()
+        if metrics_to_select:
+            try:
+                matched_metrics = select_metric_ids(metrics_to_select)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: bulk_determine_metric_ids :: failed to select metric ids, err: %s' % err)
+                return metric_ids
+        new_metrics = [metric for metric in metrics_to_select if metric.lower() not in matched_metrics]
+        if new_metrics:
+            logger.info('bulk_determine_metric_ids :: inserting %s new metrics' % str(len(new_metrics)))
+            try:
+                self.insert_new_metric(None, metrics_to_insert=new_metrics)
+                select_metric_ids(new_metrics)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: bulk_determine_metric_ids :: failed to insert new metrics, err: %s' % err)
+        return metric_ids
+
+    # @added 20261025 - Feature #5767: panorama - bulk insert
+    def bulk_insert_anomalies(self, engine, anomalies_table, anomaly_rows):
+        """
+        Insert multiple anomalies in a single transaction, taking the id of
+        each inserted anomaly from its insert, so that the ids are correct even
+        if other processes are inserting anomalies at the same time.  If the
+        bulk insert fails, each anomaly is inserted individually.
+
+        :param engine: the engine object
+        :param anomalies_table: the anomalies_table object
+        :param anomaly_rows: the anomalies table column values of each anomaly
+        :type engine: object
+        :type anomalies_table: object
+        :type anomaly_rows: list
+        :return: anomaly_ids, the id of each anomaly in anomaly_rows or None if
+            it was not inserted
+        :rtype: list
+
+        """
+        start = time()
+        anomaly_ids = [None] * len(anomaly_rows)
+        if 'sqlalchemy.sql.schema.Table' not in str(type(anomalies_table)):
+            anomalies_table, log_msg, trace = anomalies_table_meta(skyline_app, engine)
+
+        try:
+            # @modified 20261025 - Feature #5767: panorama - bulk insert
+            # Determining the inserted ids from the rows with an id greater
+            # than the max id before the insert is not safe with other writers
+            # to the anomalies table, each id is taken from its insert.  The
+            # rows are inserted in one transaction so there is one commit.
+            inserted_ids = [None] * len(anomaly_rows)
+            with engine.begin() as connection:
+                for index, row in enumerate(anomaly_rows):
+                    result = connection.execute(anomalies_table.insert().values(**row))
+                    inserted_ids[index] = int(result.inserted_primary_key[0])
+            anomaly_ids = inserted_ids
+            logger.info('bulk_insert_anomalies :: inserted %s anomalies in %.6f seconds' % (
+                str(len(anomaly_rows)), (time() - start)))
+            return anomaly_ids
+        except Exception as err:
+            logger.error(traceback.format_exc())
+            logger.error('error :: bulk_insert_anomalies :: bulk insert of %s anomalies failed, inserting individually, err: %s' % (
+                str(len(anomaly_rows)), err))
+
+        errors = []
+        for index, row in enumerate(anomaly_rows):
+            try:
+                with engine.begin() as connection:
+                    result = connection.execute(anomalies_table.insert().values(**row))
+                    anomaly_ids[index] = result.inserted_primary_key[0]
+            except Exception as err:
+                errors.append([row, err])
+        if errors:
+            logger.error('error :: bulk_insert_anomalies :: failed to insert %s anomalies individually, sample last 3: %s' % (
+                str(len(errors)), str(errors[-3:])))
+        return anomaly_ids
+
+    # @added 20261025 - Feature #5767: panorama - bulk insert
+    # The processing that is done once an anomaly has been inserted was moved
+    # from spin_process so that it can be run on each anomaly after a bulk
+    # insert as well as after a single anomaly insert
+    def process_inserted_anomaly(self, anomaly_id, anomaly_details):
+        """
+        Set the Redis keys and sets related to an inserted anomaly and remove
+        the metric check file.
+
+        :param anomaly_id: the id of the inserted anomaly
+        :param anomaly_details: the details of the anomaly check
+        :type anomaly_id: int
+        :type anomaly_details: dict
+        :return: None
+
+        """
+        metric = anomaly_details['metric']
+        metric_id = anomaly_details['metric_id']
+        metric_timestamp = anomaly_details['metric_timestamp']
+        labelled_metrics_name = anomaly_details['labelled_metrics_name']
+        custom_algorithm_only = anomaly_details['custom_algorithm_only']
+        app = anomaly_details['app']
+        triggered_algorithms = anomaly_details['triggered_algorithms']
+        full_duration = anomaly_details['full_duration']
+        batch_metric = anomaly_details['batch_metric']
+        cache_key = anomaly_details['cache_key']
+        set_anomaly_key = anomaly_details['set_anomaly_key']
+        add_to_current_anomalies = anomaly_details['add_to_current_anomalies']
+        metric_check_file = anomaly_details['metric_check_file']
+        check_file_name = anomaly_details['check_file_name']
+        # @added 20260221 - Feature #5712: skyline.dawn
+        #                   Task #5628: Build v5.0.0 and test
+        # On the 10th anomaly added the skyline.dawn keys to self regulate
+        # the analysis stages of the apps on a new install.  This is to
+        # ensure that Skyline is not triggering lots of anomalies based on
+        # insufficient data for the task and giving the new user the
+        # impression that Skyline is noisy.  It is noisy until it has
+        # sufficient data.
+        if anomaly_id == 10 and SKYLINE_DAWN_ENABLED:
+            for key, ttl in SKYLINE_DAWN_TTLS.items():
+                if key == 'panorama':
+                    dawn_app_key = 'skyline.dawn.%s' % key
+                    expiry_timestamp = int(time())
+                    try:
+                        self.redis_conn.setex(dawn_app_key, 1, expiry_timestamp)
+                        logger.info('set skyline.dawn Redis key to expire - %s' % dawn_app_key)
+                    except Exception as err:
+                        logger.info(traceback.format_exc())
+                        logger.error('error :: failed to setex skyline.dawn Redis key - %s, err: %s' % (
+                            dawn_app_key, err))                    
+                else:
+                    dawn_app_key = 'skyline.dawn.%s' % key
+                    expiry_timestamp = int(int(time()) + ttl)
+                    try:
+                        self.redis_conn.setex(dawn_app_key, ttl, expiry_timestamp)
+                        logger.info('set skyline.dawn Redis key - %s' % dawn_app_key)
+                    except Exception as err:
+                        logger.info(traceback.format_exc())
+                        logger.error('error :: failed to setex skyline.dawn Redis key - %s, err: %s' % (
+                            dawn_app_key, err))
+
+        # @added 20230110 - Task #4022: Move mysql_select calls to SQLAlchemy
+        #                   Task #4778: v4.0.0 - update dependencies
+        # Use sqlalchemy rather than string-based query construction
+        # @modified 20240119 - Task #5228: panorama - optimise insertions
+        # Dispose of engine once at the end
+        # try:
+        #     engine.dispose()
+        # except Exception as err:
+        #     logger.error('error :: engine.dispose() failed - %s' % err)
+
+        # @added 20211001 - Feature #4268: Redis hash key - panorama.metrics.latest_anomaly
+        #                   Feature #4264: luminosity - cross_correlation_relationships
+        if anomaly_id:
+            latest_anomaly = {}
+            try:
+                latest_anomaly = update_metric_latest_anomaly(skyline_app, metric, metric_id)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: update_metric_latest_anomaly failed - %s' % str(err))
+
+        # @added 20200929 - Task #3748: POC SNAB
+        #                   Branch #3068: SNAB
+        # If snab is enabled add a Redis key with the anomaly_id
+        if anomaly_id:
+            anomaly_id_redis_key = 'panorama.anomaly_id.%s.%s' % (str(int(metric_timestamp)), metric)
+            # @added 20220915 - Task #2732: Prometheus to Skyline
+            #                   Branch #4300: prometheus
+            if labelled_metrics_name:
+                anomaly_id_redis_key = 'panorama.anomaly_id.%s.%s' % (str(int(metric_timestamp)), labelled_metrics_name)
+
+            # @added 20250324 - Feature #5611: custom_algorithm_only
+            # Added custom_algorithm_only
+            if custom_algorithm_only == 'custom_algorithm_only':
+                anomaly_id_redis_key = anomaly_id_redis_key + '.custom_algorithm_only'
+
+            try:
+                self.redis_conn.setex(anomaly_id_redis_key, 86400, int(anomaly_id))
+                logger.info('set Redis anomaly_key - %s' % (anomaly_id_redis_key))
+            except Exception as e:
+                logger.error(
+                    'error :: could not set anomaly_id_redis_key - %s - %s' % (
+                        anomaly_id_redis_key, e))
+
+        # @added 20241119 - Feature #5064: mirage.inflection
+        mirage_inflection = False
+        if anomaly_id and app in ['mirage', 'ionosphere']:
+            if 'mmzrmp' not in triggered_algorithms:
+                mirage_inflection = True
+                # @added 20250404 - Feature #5064: mirage.inflection
+                try:
+                    settings_mirage_inflection = settings.MIRAGE_INFLECTION
+                except:
+                    settings_mirage_inflection = False
+                if not settings_mirage_inflection:
+                    mirage_inflection = False
+        if mirage_inflection:
+            key_data = {
+                'anomaly_id': anomaly_id, 'app': app,
+                'base_name': metric, 'metric': metric,
+                'full_duration': full_duration,
+                'timestamp': int(metric_timestamp)
+            }
+            if labelled_metrics_name:
+                key_data['metric'] = labelled_metrics_name
+            key_name = '%s.%s' % (str(metric_timestamp), str(anomaly_id))
+            logger.info('adding %s to mirage.inflection' % key_name)
+            try:
+                self.redis_conn_decoded.hset('mirage.inflection', key_name, str(key_data))
+                logger.info('added %s key to mirage.inflection' % key_name)
+            except Exception as err:
+                logger.error(
+                    'error :: hset failed on mirage.inflection for key %s, err: %s' % (
+                        key_name, err))
+
+        # @added 20250407 - Feature #5611: custom_algorithm_only
+        # Calculate expire from metric timestamp
+        try:
+            expiry_to_use = int(settings.PANORAMA_EXPIRY_TIME - (int(time()) - int(metric_timestamp)))
+            if expiry_to_use < 1:
+                expiry_to_use = 60
+        except Exception as err:
+            logger.error('error :: failed to determine expiry_to_use, err: %s' % err)
+        logger.info('expiry_to_use: %s' % str(expiry_to_use))
+
+        # Set anomaly record cache key
+        # @modified 20200420 - Feature #3500: webapp - crucible_process_metrics
+        #                      Feature #1448: Crucible web UI
+        #                      Branch #868: crucible
+        # Only if it was not added_by webapp or crucible
+        if set_anomaly_key:
+            try:
+                # @modified 20200413 - Feature #3486: analyzer_batch
+                #                   Feature #3480: batch_processing
+                # Set key to timestamp if a batch metric.  I have looked and cannot
+                # find where the panorama.last_check is used anyway else other than
+                # above in panorama its self and further it does not appear that the
+                # packb(value) is used at all, just the existence of the key its
+                # self.
+                if batch_metric:
+                    self.redis_conn.setex(
+                        # @modified 20250407 - Feature #5611: custom_algorithm_only
+                        #cache_key, settings.PANORAMA_EXPIRY_TIME,
+                        cache_key, expiry_to_use,
+                        int(metric_timestamp))
+                else:
+                    self.redis_conn.setex(
+                        # @modified 20200603 - Feature #3486: analyzer_batch
+                        #                      Feature #3480: batch_processing
+                        # As per above do not use msgpack with the value, set the
+                        # value to the timestamp
+                        # cache_key, settings.PANORAMA_EXPIRY_TIME, packb(value))
+                        # @modified 20250407 - Feature #5611: custom_algorithm_only
+                        #cache_key, settings.PANORAMA_EXPIRY_TIME, int(metric_timestamp))
+                        cache_key, expiry_to_use, int(metric_timestamp))
+                logger.info('set cache_key - %s.last_check.%s.%s - %s' % (
+                    # @modified 20250407 - Feature #5611: custom_algorithm_only
+                    #skyline_app, app, metric, str(settings.PANORAMA_EXPIRY_TIME)))
+                    skyline_app, app, metric, str(expiry_to_use)))
+            except Exception as e:
+                logger.error(
+                    'error :: could not set cache_key - %s.last_check.%s.%s - %s' % (
+                        skyline_app, app, metric, e))
+
+        # @added 20191031 - Feature #3306: Record anomaly_end_timestamp
+        # Add to current anomalies set
+        # @modified 20200420 - Feature #3500: webapp - crucible_process_metrics
+        #                      Feature #1448: Crucible web UI
+        #                      Branch #868: crucible
+        # Only if it was not added_by webapp or crucible
+        if add_to_current_anomalies:
+            try:
+                redis_set = 'current.anomalies'
+                data = [metric, metric_timestamp, anomaly_id, None]
+                self.redis_conn.sadd(redis_set, str(data))
+                logger.info('added %s to Redis set %s' % (str(data), redis_set))
+            except Exception as e:
+                logger.error(
+                    'error :: could not add %s to Redis set %s - %s' % (
+                        str(data), redis_set, e))
+
+        if os.path.isfile(str(metric_check_file)):
+            try:
+                os.remove(str(metric_check_file))
+                logger.info('metric_check_file removed - %s' % str(metric_check_file))
+            except OSError:
+                pass
+
+        if anomaly_id:
+            # @added 20240229 - Feature #5294: panorama - retry failed checks
+            # If this is a retried failed check, remove it from the
+            # panorama.retry_failed_checks Redis hash
+            fail_count = 0
+            failed_check_data = None
+            try:
+                failed_check_data_str = self.redis_conn_decoded.hget('panorama.retry_failed_checks', check_file_name)
+                if failed_check_data_str:
+                    try:
+                        failed_check_data = literal_eval(failed_check_data_str)
+                        try:
+                            fail_count = failed_check_data['fail_count']
+                        except:
+                            fail_count = 0
+                    except Exception as err:
+                        logger.error('error :: failed to literal_eval values from %s key in Redis hash panorama.retry_failed_checks, err: %s' % (
+                            check_file_name, err))
+            except Exception as err:
+                logger.error('error :: failed to literal_eval values from %s key in Redis hash panorama.retry_failed_checks, err: %s' % (
+                    check_file_name, err))
+            if failed_check_data:
+                try:
+                    failed_check_data['succeeded'] = True
+                    self.redis_conn_decoded.hset('panorama.retry_failed_checks', check_file_name, str(failed_check_data))
+                    logger.info('%s retried and set to succeeded in panorama.retry_failed_checks after %s previous fails' % (
+                        str(metric_check_file), str(fail_count)))
+                except Exception as err:
+                    logger.error('error :: failed to hset %s key in Redis hash panorama.retry_failed_checks with succeeded, err: %s' % (
+                        check_file_name, err))
+        return
+
     # @modified 20240119 - Task #5228: panorama - optimise insertions
     # def spin_process(self, i, metric_check_file):
     def spin_process(self, i, metric_check_file, assigned_metric_check_files):
@@ -2074,6 +2500,42 @@ class Panorama(Thread):
             for i_host, id in hosts.items():
                 hosts_by_id[id] = i_host
 
+        # @added 20261025 - Feature #5767: panorama - bulk insert
+        # Load the variables of all the assigned check files and resolve the
+        # metric ids of all the metrics in a single query, inserting any new
+        # metrics together, before processing the check files
+        bulk_insert = False
+        if PANORAMA_BULK_INSERT and engine and len(assigned_metric_check_files) > 1:
+            bulk_insert = True
+        bulk_metric_vars = {}
+        bulk_metric_ids = {}
+        bulk_anomalies = []
+        bulk_cache_keys = {}
+        max_run_seconds = 19
+        if bulk_insert:
+            max_run_seconds = PANORAMA_BULK_INSERT_MAX_RUN_SECONDS
+            bulk_metrics = []
+            for assigned_metric_check_file in assigned_metric_check_files:
+                try:
+                    metric_vars_array = self.new_load_metric_vars(str(assigned_metric_check_file))
+                    bulk_metric_vars[assigned_metric_check_file] = metric_vars_array
+                    value_list = [var_array[1] for var_array in metric_vars_array if var_array[0] == 'metric']
+                    if value_list:
+                        bulk_metrics.append(str(value_list[0]))
+                except Exception as err:
+                    # The check file is failed when it is processed
+                    if settings.ENABLE_PANORAMA_DEBUG:
+                        logger.info('debug :: spin_process :: failed to load metric variables from check file - %s, err: %s' % (
+                            assigned_metric_check_file, err))
+            try:
+                bulk_metric_ids = self.bulk_determine_metric_ids(engine, metrics_table, bulk_metrics)
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: spin_process :: bulk_determine_metric_ids failed, err: %s' % err)
+                bulk_metric_ids = {}
+            logger.info('spin_process :: bulk insert mode, loaded %s check files and determined %s metric ids' % (
+                str(len(bulk_metric_vars)), str(len(bulk_metric_ids))))
+
         # @modified 20240119 - Task #5228: panorama - optimise insertions
         # Process multiple metric check file in a single process rather than
         # handle a single metric_check_file per process. Using the same code as
@@ -2084,7 +2546,9 @@ class Panorama(Thread):
             # @added 20240119 - Task #5228: panorama - optimise insertions
             # Process multiple metric check file in a single process rather than
             run_seconds = time() - start
-            if run_seconds >= 19:
+            # @modified 20261025 - Feature #5767: panorama - bulk insert
+            # if run_seconds >= 19:
+            if run_seconds >= max_run_seconds:
                 logger.info('spin_process :: child_process_pid - %s, processed %s checks of the %s assigned checks in %s, max run time reached stopping' % (
                     str(child_process_pid), str(len(processed_checks)),
                     str(len(assigned_metric_check_files)), str(run_seconds)))
@@ -2131,7 +2595,13 @@ class Panorama(Thread):
                 # Get rid of the skyline_functions imp as imp is deprecated in py3 anyway
                 # Use def new_load_metric_vars(self, metric_vars_file):
                 # metric_vars = load_metric_vars(skyline_app, str(metric_check_file))
-                metric_vars_array = self.new_load_metric_vars(str(metric_check_file))
+                # @modified 20261025 - Feature #5767: panorama - bulk insert
+                # Use the variables already loaded in bulk mode
+                # metric_vars_array = self.new_load_metric_vars(str(metric_check_file))
+                if metric_check_file in bulk_metric_vars:
+                    metric_vars_array = bulk_metric_vars.pop(metric_check_file)
+                else:
+                    metric_vars_array = self.new_load_metric_vars(str(metric_check_file))
             except:
                 logger.info(traceback.format_exc())
                 logger.error('error :: failed to load metric variables from check file - %s' % (metric_check_file))
@@ -2450,6 +2920,12 @@ class Panorama(Thread):
                         skyline_app, app, metric, e))
                 last_check = None
 
+            # @added 20261025 - Feature #5767: panorama - bulk insert
+            # An anomaly for the metric that is pending in the bulk insert is
+            # handled as if the cache_key had been set
+            if not last_check and cache_key in bulk_cache_keys:
+                last_check = str(bulk_cache_keys[cache_key])
+
             # @modified 20200420 - Feature #3500: webapp - crucible_process_metrics
             #                      Feature #1448: Crucible web UI
             #                      Branch #868: crucible
@@ -2695,10 +3171,17 @@ class Panorama(Thread):
             # @added 20240122 - Task #5228: panorama - optimise insertions
             # Try and determine the metric id from Redis
             metric_id = 0
+            # @added 20261025 - Feature #5767: panorama - bulk insert
+            # Use the metric id determined in bulk
+            if bulk_metric_ids:
+                metric_id = bulk_metric_ids.get(metric, 0)
+            # @modified 20261025 - Feature #5767: panorama - bulk insert
+            # Only if not determined in bulk
             try:
-                metric_id_str = self.redis_conn_decoded.hget('aet.metrics_manager.metric_names_with_ids', str(metric))
-                if metric_id_str:
-                    metric_id = int(metric_id_str)
+                if not metric_id:
+                    metric_id_str = self.redis_conn_decoded.hget('aet.metrics_manager.metric_names_with_ids', str(metric))
+                    if metric_id_str:
+                        metric_id = int(metric_id_str)
             except Exception as err:
                 logger.error('error :: hget on aet.metrics_manager.metric_names_with_ids failed for %s, err: %s' % (metric, err))
 
@@ -2976,7 +3459,11 @@ class Panorama(Thread):
                 if len(anomalies_dict) > 0:
                     logger.info('not recording duplicate anomaly for %s' % metric)
                     try:
-                        engine.dispose()
+                        # @modified 20261024 - Feature #5766: database - pooled engine
+                        # The pooled engine is not disposed of
+                        # engine.dispose()
+                        if not is_pooled_engine(engine):
+                            engine.dispose()
                     except Exception as err:
                         logger.error('error :: engine.dispose() failed - %s' % err)
                     if os.path.isfile(str(metric_check_file)):
@@ -2999,6 +3486,55 @@ class Panorama(Thread):
                     err))
                 tenant_id = 0
 
+            # @added 20261025 - Feature #5767: panorama - bulk insert
+            anomaly_details = {
+                'metric': metric, 'metric_id': metric_id,
+                'metric_timestamp': metric_timestamp,
+                'labelled_metrics_name': labelled_metrics_name,
+                'custom_algorithm_only': custom_algorithm_only, 'app': app,
+                'triggered_algorithms': triggered_algorithms,
+                'full_duration': full_duration, 'batch_metric': batch_metric,
+                'cache_key': cache_key, 'set_anomaly_key': set_anomaly_key,
+                'add_to_current_anomalies': add_to_current_anomalies,
+                'metric_check_file': metric_check_file,
+                'check_file_name': check_file_name,
+                'metric_failed_check_dir': metric_failed_check_dir,
+            }
+            # In bulk mode the anomaly is added to the anomalies to insert
+            # and it is inserted with all the other anomalies after all the
+            # check files have been processed
+            if bulk_insert:
+                # A check file with a bad value is failed and not allowed to
+                # fail all the check files in the bulk insert
+                try:
+                    bulk_anomaly = {
+                        'metric_id': int(metric_id),
+                        'tenant_id': tenant_id,
+                        'host_id': int(added_by_host_id),
+                        'app_id': int(app_id),
+                        'source_id': int(source_id),
+                        'anomaly_timestamp': int(metric_timestamp),
+                        'anomalous_datapoint': float(anomalous_datapoint),
+                        'full_duration': int(full_duration),
+                        'algorithms_run': str(algorithms_ids_csv),
+                        'triggered_algorithms': str(triggered_algorithms_ids_csv),
+                        'label': str(label),
+                        'user_id': int(user_id)}
+                except Exception as err:
+                    logger.error(traceback.format_exc())
+                    logger.error('error :: failed to add anomaly for %s at %s to bulk insert - %s' % (
+                        str(metric), str(metric_timestamp), err))
+                    fail_check(skyline_app, metric_failed_check_dir, str(metric_check_file))
+                    continue
+                bulk_anomalies.append([bulk_anomaly, anomaly_details])
+                # The cache_key is only set once the anomaly is inserted, so
+                # record it to prevent another check for the same metric
+                # in this bulk insert being recorded
+                if set_anomaly_key:
+                    bulk_cache_keys[cache_key] = int(metric_timestamp)
+                logger.info('added anomaly on %s to bulk insert' % str(metric))
+                continue
+
             logger.info('executing inserting statement for anomaly on %s' % str(metric))
             anomaly_id = None
             try:
@@ -3041,7 +3577,11 @@ class Panorama(Thread):
                 #                   Task #4778: v4.0.0 - update dependencies
                 # Use sqlalchemy rather than string-based query construction
                 try:
-                    engine.dispose()
+                    # @modified 20261024 - Feature #5766: database - pooled engine
+                    # The pooled engine is not disposed of
+                    # engine.dispose()
+                    if not is_pooled_engine(engine):
+                        engine.dispose()
                 except Exception as err2:
                     logger.error('error :: engine.dispose() failed - %s' % err2)
 
@@ -3050,224 +3590,57 @@ class Panorama(Thread):
                 # return False
                 continue
 
-            # @added 20260221 - Feature #5712: skyline.dawn
-            #                   Task #5628: Build v5.0.0 and test
-            # On the 10th anomaly added the skyline.dawn keys to self regulate
-            # the analysis stages of the apps on a new install.  This is to
-            # ensure that Skyline is not triggering lots of anomalies based on
-            # insufficient data for the task and giving the new user the
-            # impression that Skyline is noisy.  It is noisy until it has
-            # sufficient data.
-            if anomaly_id == 10 and SKYLINE_DAWN_ENABLED:
-                for key, ttl in SKYLINE_DAWN_TTLS.items():
-                    if key == 'panorama':
-                        dawn_app_key = 'skyline.dawn.%s' % key
-                        expiry_timestamp = int(time())
-                        try:
-                            self.redis_conn.setex(dawn_app_key, 1, expiry_timestamp)
-                            logger.info('set skyline.dawn Redis key to expire - %s' % dawn_app_key)
-                        except Exception as err:
-                            logger.info(traceback.format_exc())
-                            logger.error('error :: failed to setex skyline.dawn Redis key - %s, err: %s' % (
-                                dawn_app_key, err))                    
-                    else:
-                        dawn_app_key = 'skyline.dawn.%s' % key
-                        expiry_timestamp = int(int(time()) + ttl)
-                        try:
-                            self.redis_conn.setex(dawn_app_key, ttl, expiry_timestamp)
-                            logger.info('set skyline.dawn Redis key - %s' % dawn_app_key)
-                        except Exception as err:
-                            logger.info(traceback.format_exc())
-                            logger.error('error :: failed to setex skyline.dawn Redis key - %s, err: %s' % (
-                                dawn_app_key, err))
+            # @modified 20261025 - Feature #5767: panorama - bulk insert
+            # The processing that is done once an anomaly has been inserted has
+            # been moved to process_inserted_anomaly so that it can be run on
+            # each anomaly after a bulk insert as well
+            self.process_inserted_anomaly(anomaly_id, anomaly_details)
 
-            # @added 20230110 - Task #4022: Move mysql_select calls to SQLAlchemy
-            #                   Task #4778: v4.0.0 - update dependencies
-            # Use sqlalchemy rather than string-based query construction
             # @modified 20240119 - Task #5228: panorama - optimise insertions
-            # Dispose of engine once at the end
-            # try:
-            #     engine.dispose()
-            # except Exception as err:
-            #     logger.error('error :: engine.dispose() failed - %s' % err)
-
-            # @added 20211001 - Feature #4268: Redis hash key - panorama.metrics.latest_anomaly
-            #                   Feature #4264: luminosity - cross_correlation_relationships
-            if anomaly_id:
-                latest_anomaly = {}
-                try:
-                    latest_anomaly = update_metric_latest_anomaly(skyline_app, metric, metric_id)
-                except Exception as err:
-                    logger.error(traceback.format_exc())
-                    logger.error('error :: update_metric_latest_anomaly failed - %s' % str(err))
-
-            # @added 20200929 - Task #3748: POC SNAB
-            #                   Branch #3068: SNAB
-            # If snab is enabled add a Redis key with the anomaly_id
+            # return anomaly_id
             if anomaly_id:
-                anomaly_id_redis_key = 'panorama.anomaly_id.%s.%s' % (str(int(metric_timestamp)), metric)
-                # @added 20220915 - Task #2732: Prometheus to Skyline
-                #                   Branch #4300: prometheus
-                if labelled_metrics_name:
-                    anomaly_id_redis_key = 'panorama.anomaly_id.%s.%s' % (str(int(metric_timestamp)), labelled_metrics_name)
-
-                # @added 20250324 - Feature #5611: custom_algorithm_only
-                # Added custom_algorithm_only
-                if custom_algorithm_only == 'custom_algorithm_only':
-                    anomaly_id_redis_key = anomaly_id_redis_key + '.custom_algorithm_only'
-
-                try:
-                    self.redis_conn.setex(anomaly_id_redis_key, 86400, int(anomaly_id))
-                    logger.info('set Redis anomaly_key - %s' % (anomaly_id_redis_key))
-                except Exception as e:
-                    logger.error(
-                        'error :: could not set anomaly_id_redis_key - %s - %s' % (
-                            anomaly_id_redis_key, e))
-
-            # @added 20241119 - Feature #5064: mirage.inflection
-            mirage_inflection = False
-            if anomaly_id and app in ['mirage', 'ionosphere']:
-                if 'mmzrmp' not in triggered_algorithms:
-                    mirage_inflection = True
-                    # @added 20250404 - Feature #5064: mirage.inflection
-                    try:
-                        settings_mirage_inflection = settings.MIRAGE_INFLECTION
-                    except:
-                        settings_mirage_inflection = False
-                    if not settings_mirage_inflection:
-                        mirage_inflection = False
-            if mirage_inflection:
-                key_data = {
-                    'anomaly_id': anomaly_id, 'app': app,
-                    'base_name': metric, 'metric': metric,
-                    'full_duration': full_duration,
-                    'timestamp': int(metric_timestamp)
-                }
-                if labelled_metrics_name:
-                    key_data['metric'] = labelled_metrics_name
-                key_name = '%s.%s' % (str(metric_timestamp), str(anomaly_id))
-                logger.info('adding %s to mirage.inflection' % key_name)
-                try:
-                    self.redis_conn_decoded.hset('mirage.inflection', key_name, str(key_data))
-                    logger.info('added %s key to mirage.inflection' % key_name)
-                except Exception as err:
-                    logger.error(
-                        'error :: hset failed on mirage.inflection for key %s, err: %s' % (
-                            key_name, err))
+                inserted_anomaly_ids.append(anomaly_id)
+                processed_checks[metric_check_file] = anomaly_id
 
-            # @added 20250407 - Feature #5611: custom_algorithm_only
-            # Calculate expire from metric timestamp
+        # @added 20261025 - Feature #5767: panorama - bulk insert
+        # Insert all the anomalies in a single transaction and then process
+        # each inserted anomaly
+        if bulk_anomalies:
+            bulk_anomaly_ids = []
             try:
-                expiry_to_use = int(settings.PANORAMA_EXPIRY_TIME - (int(time()) - int(metric_timestamp)))
-                if expiry_to_use < 1:
-                    expiry_to_use = 60
+                bulk_anomaly_ids = self.bulk_insert_anomalies(
+                    engine, anomalies_table, [item[0] for item in bulk_anomalies])
             except Exception as err:
-                logger.error('error :: failed to determine expiry_to_use, err: %s' % err)
-            logger.info('expiry_to_use: %s' % str(expiry_to_use))
-
-            # Set anomaly record cache key
-            # @modified 20200420 - Feature #3500: webapp - crucible_process_metrics
-            #                      Feature #1448: Crucible web UI
-            #                      Branch #868: crucible
-            # Only if it was not added_by webapp or crucible
-            if set_anomaly_key:
-                try:
-                    # @modified 20200413 - Feature #3486: analyzer_batch
-                    #                   Feature #3480: batch_processing
-                    # Set key to timestamp if a batch metric.  I have looked and cannot
-                    # find where the panorama.last_check is used anyway else other than
-                    # above in panorama its self and further it does not appear that the
-                    # packb(value) is used at all, just the existence of the key its
-                    # self.
-                    if batch_metric:
-                        self.redis_conn.setex(
-                            # @modified 20250407 - Feature #5611: custom_algorithm_only
-                            #cache_key, settings.PANORAMA_EXPIRY_TIME,
-                            cache_key, expiry_to_use,
-                            int(metric_timestamp))
-                    else:
-                        self.redis_conn.setex(
-                            # @modified 20200603 - Feature #3486: analyzer_batch
-                            #                      Feature #3480: batch_processing
-                            # As per above do not use msgpack with the value, set the
-                            # value to the timestamp
-                            # cache_key, settings.PANORAMA_EXPIRY_TIME, packb(value))
-                            # @modified 20250407 - Feature #5611: custom_algorithm_only
-                            #cache_key, settings.PANORAMA_EXPIRY_TIME, int(metric_timestamp))
-                            cache_key, expiry_to_use, int(metric_timestamp))
-                    logger.info('set cache_key - %s.last_check.%s.%s - %s' % (
-                        # @modified 20250407 - Feature #5611: custom_algorithm_only
-                        #skyline_app, app, metric, str(settings.PANORAMA_EXPIRY_TIME)))
-                        skyline_app, app, metric, str(expiry_to_use)))
-                except Exception as e:
-                    logger.error(
-                        'error :: could not set cache_key - %s.last_check.%s.%s - %s' % (
-                            skyline_app, app, metric, e))
-
-            # @added 20191031 - Feature #3306: Record anomaly_end_timestamp
-            # Add to current anomalies set
-            # @modified 20200420 - Feature #3500: webapp - crucible_process_metrics
-            #                      Feature #1448: Crucible web UI
-            #                      Branch #868: crucible
-            # Only if it was not added_by webapp or crucible
-            if add_to_current_anomalies:
-                try:
-                    redis_set = 'current.anomalies'
-                    data = [metric, metric_timestamp, anomaly_id, None]
-                    self.redis_conn.sadd(redis_set, str(data))
-                    logger.info('added %s to Redis set %s' % (str(data), redis_set))
-                except Exception as e:
-                    logger.error(
-                        'error :: could not add %s to Redis set %s - %s' % (
-                            str(data), redis_set, e))
-
-            if os.path.isfile(str(metric_check_file)):
+                logger.error(traceback.format_exc())
+                logger.error('error :: spin_process :: bulk_insert_anomalies failed, err: %s' % err)
+            for index, item in enumerate(bulk_anomalies):
+                anomaly_details = item[1]
+                metric_check_file = anomaly_details['metric_check_file']
+                anomaly_id = None
                 try:
-                    os.remove(str(metric_check_file))
-                    logger.info('metric_check_file removed - %s' % str(metric_check_file))
-                except OSError:
-                    pass
-
-            # @modified 20240119 - Task #5228: panorama - optimise insertions
-            # return anomaly_id
-            if anomaly_id:
+                    anomaly_id = bulk_anomaly_ids[index]
+                except IndexError:
+                    anomaly_id = None
+                if not anomaly_id:
+                    logger.error('error :: failed to insert anomaly for %s at %s' % (
+                        anomaly_details['metric'], str(anomaly_details['metric_timestamp'])))
+                    fail_check(skyline_app, anomaly_details['metric_failed_check_dir'], str(metric_check_file))
+                    continue
+                logger.info('anomaly id - %d - created for %s at %s' % (
+                    anomaly_id, anomaly_details['metric'],
+                    str(anomaly_details['metric_timestamp'])))
+                self.process_inserted_anomaly(anomaly_id, anomaly_details)
                 inserted_anomaly_ids.append(anomaly_id)
                 processed_checks[metric_check_file] = anomaly_id
 
-                # @added 20240229 - Feature #5294: panorama - retry failed checks
-                # If this is a retried failed check, remove it from the
-                # panorama.retry_failed_checks Redis hash
-                fail_count = 0
-                failed_check_data = None
-                try:
-                    failed_check_data_str = self.redis_conn_decoded.hget('panorama.retry_failed_checks', check_file_name)
-                    if failed_check_data_str:
-                        try:
-                            failed_check_data = literal_eval(failed_check_data_str)
-                            try:
-                                fail_count = failed_check_data['fail_count']
-                            except:
-                                fail_count = 0
-                        except Exception as err:
-                            logger.error('error :: failed to literal_eval values from %s key in Redis hash panorama.retry_failed_checks, err: %s' % (
-                                check_file_name, err))
-                except Exception as err:
-                    logger.error('error :: failed to literal_eval values from %s key in Redis hash panorama.retry_failed_checks, err: %s' % (
-                        check_file_name, err))
-                if failed_check_data:
-                    try:
-                        failed_check_data['succeeded'] = True
-                        self.redis_conn_decoded.hset('panorama.retry_failed_checks', check_file_name, str(failed_check_data))
-                        logger.info('%s retried and set to succeeded in panorama.retry_failed_checks after %s previous fails' % (
-                            str(metric_check_file), str(fail_count)))
-                    except Exception as err:
-                        logger.error('error :: failed to hset %s key in Redis hash panorama.retry_failed_checks with succeeded, err: %s' % (
-                            check_file_name, err))
-
         # @added 20240119 - Task #5228: panorama - optimise insertions
         if engine:
             try:
-                engine.dispose()
+                # @modified 20261024 - Feature #5766: database - pooled engine
+                # The pooled engine is not disposed of
+                # engine.dispose()
+                if not is_pooled_engine(engine):
+                    engine.dispose()
             except Exception as err:
                 logger.error('error :: engine.dispose() failed - %s' % err)
         run_seconds = time() - start
@@ -173,6 +173,23 @@ GRAPHITE_READ_TIMEOUT = 10
 :vartype GRAPHITE_READ_TIMEOUT: int
 """
 
+GRAPHITE_HTTP_POOL_SIZE = 10
+"""
+:var GRAPHITE_HTTP_POOL_SIZE: The maximum number of keep-alive connections that
+    each Skyline process holds open to Graphite in the shared HTTP session that
+    Graphite requests are made with.
+:vartype GRAPHITE_HTTP_POOL_SIZE: int
+"""
+
+GRAPHITE_RENDER_FORMAT = 'json'
+"""
+:var GRAPHITE_RENDER_FORMAT: The Graphite render API format that time series
+    data is fetched in by the concurrent Graphite fetches, either 'json' or
+    'msgpack'.  The msgpack format is more compact and faster to parse but it
+    is only available in graphite-web >= 1.1.  [ADVANCED FEATURE]
+:vartype GRAPHITE_RENDER_FORMAT: str
+"""
+
 GRAPHITE_GRAPH_SETTINGS = '&width=588&height=308&bgcolor=000000&fontBold=true&fgcolor=C0C0C0'
 """
 :var GRAPHITE_GRAPH_SETTINGS: These are graphite settings in terms of alert
@@ -331,6 +348,17 @@ MIRAGE_CHECK_PATH = '/opt/skyline/mirage/check'
 :vartype MIRAGE_CHECK_PATH: str
 """
 
+MIRAGE_CHECK_QUEUE = True
+"""
+:var MIRAGE_CHECK_QUEUE: Analyzer adds the checks for Mirage to the mirage
+    check queue Redis hash rather than writing them as check files to the
+    MIRAGE_CHECK_PATH.  This removes the directory scans, file parsing and file
+    operations in Mirage.  Mirage processes both queued checks and any check
+    files in the MIRAGE_CHECK_PATH, such as those added by other apps or the
+    operator.  Set to False to use check files.
+:vartype MIRAGE_CHECK_QUEUE: boolean
+"""
+
 CRUCIBLE_CHECK_PATH = '/opt/skyline/crucible/check'
 """
 :var CRUCIBLE_CHECK_PATH: This is the location the Skyline apps will write the
@@ -473,6 +501,85 @@ ANALYZER_PROCESSES = 1
   optimal settings take note of 'seconds to run' values in the Analyzer log.
 """
 
+ANALYZER_COST_BALANCED_ASSIGNMENT = True
+"""
+:var ANALYZER_COST_BALANCED_ASSIGNMENT: When :mod:`settings.ANALYZER_PROCESSES`
+    is greater than 1, divide the metrics between the Analyzer processes by the
+    time each metric took to analyse in the last run, so that each process is
+    assigned an equal share of the work rather than an equal number of metrics.
+:vartype ANALYZER_COST_BALANCED_ASSIGNMENT: boolean
+
+- With an equal number of metrics per process, the process that is assigned the
+  expensive metrics (custom_algorithms, airgap checks, many data points, etc)
+  can finish long after the other processes and the Analyzer run takes as long
+  as its slowest process.
+- The analysis time of each metric is recorded in the
+  analyzer.metrics.analysis_cost Redis hash.  Metrics that have no recorded
+  analysis time are assigned the median analysis time.
+- Set to False to assign each process an equal contiguous slice of the metrics.
+"""
+
+ANALYZER_PERSISTENT_WORKERS = False
+"""
+:var ANALYZER_PERSISTENT_WORKERS: EXPERIMENTAL - Rather than spawning new Analyzer processes on
+    every run, keep the :mod:`settings.ANALYZER_PROCESSES` running between runs
+    and send each its assigned metrics for the run.
+:vartype ANALYZER_PERSISTENT_WORKERS: boolean
+
+- This saves the spawn and start up cost of each process on every run and the
+  Redis connections, loaded custom_algorithms and numba compiled algorithms
+  remain loaded between runs.
+- Any process that exceeds the :mod:`settings.MAX_ANALYZER_PROCESS_RUNTIME` is
+  terminated and replaced with a new process on the next run.
+- Defaults to False, new processes are spawned on every run.
+"""
+
+ANALYZER_PERSISTENT_WORKERS_MAX_RUNS = 60
+"""
+:var ANALYZER_PERSISTENT_WORKERS_MAX_RUNS: The number of runs an Analyzer
+    process does when :mod:`settings.ANALYZER_PERSISTENT_WORKERS` is enabled
+    before it exits and is replaced with a new process.  This bounds any memory
+    growth in the long running processes.
+:vartype ANALYZER_PERSISTENT_WORKERS_MAX_RUNS: int
+"""
+
+ANALYZER_METADATA_SNAPSHOT = True
+"""
+:var ANALYZER_METADATA_SNAPSHOT: Load the Redis sets and hashes that every
+    Analyzer process reads at the start of a run, such as the derivative,
+    airgapped, stale, batch and last timestamp metrics sets and hashes, once
+    per run in a single Redis pipeline and pass the snapshot to the processes.
+:vartype ANALYZER_METADATA_SNAPSHOT: boolean
+
+- With :mod:`settings.ANALYZER_PERSISTENT_WORKERS` each worker loads the
+  snapshot itself in a single Redis pipeline at the start of each run.
+
+- Set to False to have each Analyzer process read each set and hash from Redis.
+"""
+
+ANALYZER_VECTORIZED_ALGORITHMS = False
+"""
+:var ANALYZER_VECTORIZED_ALGORITHMS: EXPERIMENTAL - Run the three-sigma
+    :mod:`settings.ALGORITHMS` on all the metrics assigned to an Analyzer process
+    in batches with numpy, rather than running each algorithm on each metric.
+:vartype ANALYZER_VECTORIZED_ALGORITHMS: boolean
+
+- The vectorized results are only used for metrics whose time series is not
+  changed before analysis, metrics that are converted to a derivative, filled,
+  sorted and deduplicated or tested are run through each algorithm as normal.
+- With this enabled all the metric data is decoded with numpy, so msgpack
+  data point values are analysed as floats and None values as NaN.
+"""
+
+ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE = 1000
+"""
+:var ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE: The maximum number of metrics
+    that are run through the vectorized algorithms at once when
+    :mod:`settings.ANALYZER_VECTORIZED_ALGORITHMS` is enabled, which limits the
+    size of the padded arrays.
+:vartype ANALYZER_VECTORIZED_ALGORITHMS_BATCH_SIZE: int
+"""
+
 ANALYZER_OPTIMUM_RUN_DURATION = 60
 """
 :var ANALYZER_OPTIMUM_RUN_DURATION: This is how many seconds it would be
@@ -1809,6 +1916,24 @@ name is in a metric namespace found in a list.
 
 """
 
+ROOMBA_INCREMENTAL_TRIM = True
+"""
+:var ROOMBA_INCREMENTAL_TRIM: Rather than decoding, sorting, deduplicating and
+    rewriting every metric key on every run, Horizon roomba only decodes the
+    data points that have been appended since the key was last vacuumed and the
+    data points at the start of the key up to the trim timestamp and removes
+    the old data points from the start of the key in Redis.
+:vartype ROOMBA_INCREMENTAL_TRIM: boolean
+
+- A key is fully vacuumed (decoded, sorted, deduplicated and rewritten) the
+  first time it is seen, when out of order or duplicate data points have been
+  appended to it, when it was rewritten by another process or when it is not in
+  the :mod:`settings.HORIZON_STORAGE_FORMAT`.
+- The byte length and last timestamp of the sorted data in each key is stored
+  in the horizon.roomba.metrics_trim_state Redis hash.
+- Set to False to fully vacuum every key on every run.
+"""
+
 BATCH_METRICS_CUSTOM_FULL_DURATIONS = {}
 """
 :var BATCH_METRICS_CUSTOM_FULL_DURATIONS: This is ONLY applicable to metrics
@@ -1828,6 +1953,28 @@ BATCH_METRICS_CUSTOM_FULL_DURATIONS = {}
 
 """
 
+HORIZON_STORAGE_FORMAT = 'msgpack'
+"""
+:var HORIZON_STORAGE_FORMAT: ADVANCED FEATURE - The format that Horizon uses to
+    append data points to the :mod:`settings.FULL_NAMESPACE` and
+    :mod:`settings.MINI_NAMESPACE` Redis keys.  Either ``'msgpack'`` (the
+    default) or ``'numpy'``.
+:vartype HORIZON_STORAGE_FORMAT: str
+
+With ``'numpy'`` each data point is appended as a fixed width 16 byte packed
+binary record (big-endian int64 timestamp and float64 value) which the
+analyzer, roomba, boundary, mirage, etc decode directly into a numpy array
+rather than unpacking each data point as a Python object with msgpack.  On
+large metric populations the unpacking of the time series is one of the
+largest costs in the analyzer spin_process.
+
+All the apps read both formats, including keys that contain a mixture of both
+formats, so this setting can be changed on a running Skyline.  Data points
+already in Redis are migrated to the new format as roomba rewrites each key.
+The horizon, analyzer and roomba must all be restarted after changing this
+setting.  Note that in ``'numpy'`` format timestamps are stored as integers.
+"""
+
 MAX_RESOLUTION = 1000
 """
 :var MAX_RESOLUTION: The Horizon agent will ignore incoming datapoints if their
@@ -2200,6 +2347,39 @@ PANORAMA_DBUSERPASS = 'the_user_password'
 :vartype PANORAMA_DBUSERPASS: str
 """
 
+DATABASE_POOLED_ENGINE = False
+"""
+:var DATABASE_POOLED_ENGINE: EXPERIMENTAL - Whether each Skyline process uses
+    a single pooled database engine, rather than creating a new engine and
+    connection for each database operation and disposing of it afterwards.  The
+    pooled connections are health checked before use and the reflected tables
+    are cached.
+:vartype DATABASE_POOLED_ENGINE: boolean
+"""
+
+DATABASE_POOL_SIZE = 5
+"""
+:var DATABASE_POOL_SIZE: The number of connections to keep open in the pool of
+    each process when :mod:`settings.DATABASE_POOLED_ENGINE` is enabled.
+:vartype DATABASE_POOL_SIZE: int
+"""
+
+DATABASE_POOL_MAX_OVERFLOW = 10
+"""
+:var DATABASE_POOL_MAX_OVERFLOW: The number of connections that can be opened
+    in addition to the :mod:`settings.DATABASE_POOL_SIZE` when all the pool
+    connections are in use.
+:vartype DATABASE_POOL_MAX_OVERFLOW: int
+"""
+
+DATABASE_POOL_RECYCLE = 3600
+"""
+:var DATABASE_POOL_RECYCLE: The number of seconds after which a pooled
+    connection is replaced with a new connection.  This must be less than the
+    MySQL wait_timeout.
+:vartype DATABASE_POOL_RECYCLE: int
+"""
+
 NUMBER_OF_ANOMALIES_TO_STORE_IN_PANORAMA = 0
 """
 :var NUMBER_OF_ANOMALIES_TO_STORE_IN_PANORAMA: The number of anomalies to store
@@ -2257,6 +2437,26 @@ PANORAMA_INSERT_METRICS_IMMEDIATELY = True
 :vartype PANORAMA_CHECK_INTERVAL: boolean
 """
 
+PANORAMA_BULK_INSERT = False
+"""
+:var PANORAMA_BULK_INSERT: EXPERIMENTAL - Panorama processes its assigned check
+    files in bulk.  The metric ids of all the checks are resolved with a single
+    query, any new metrics are inserted together and the anomalies are inserted
+    in a single transaction, rather than one anomaly at a time.  This allows
+    Panorama to keep up when thousands of anomaly checks are queued during an
+    incident.  When False each anomaly is inserted individually.
+:vartype PANORAMA_BULK_INSERT: boolean
+"""
+
+PANORAMA_BULK_INSERT_MAX_RUN_SECONDS = 15
+"""
+:var PANORAMA_BULK_INSERT_MAX_RUN_SECONDS: The maximum number of seconds that
+    Panorama iterates the check files in bulk mode, leaving time for the bulk
+    insert to complete before the Panorama process times out.  Only applies if
+    :mod:`settings.PANORAMA_BULK_INSERT` is True.
+:vartype PANORAMA_BULK_INSERT_MAX_RUN_SECONDS: int
+"""
+
 """
 Mirage settings
 """
@@ -2470,6 +2670,47 @@ MIRAGE_INFLECTION = False
 :vartype MIRAGE_INFLECTION: bool
 """
 
+MIRAGE_CONCURRENT_GRAPHITE_FETCH = True
+"""
+:var MIRAGE_CONCURRENT_GRAPHITE_FETCH: Whether Mirage fetches the Graphite
+    time series of all the checks assigned to a process concurrently before
+    the checks are analysed, rather than making a Graphite request for each
+    check in turn.
+:vartype MIRAGE_CONCURRENT_GRAPHITE_FETCH: bool
+"""
+
+MIRAGE_CONCURRENT_GRAPHITE_FETCH_THREADS = 4
+"""
+:var MIRAGE_CONCURRENT_GRAPHITE_FETCH_THREADS: The maximum number of concurrent
+    Graphite requests that each Mirage process makes when
+    MIRAGE_CONCURRENT_GRAPHITE_FETCH is enabled.  This should not be more than
+    :mod:`settings.GRAPHITE_HTTP_POOL_SIZE`.
+:vartype MIRAGE_CONCURRENT_GRAPHITE_FETCH_THREADS: int
+"""
+
+MIRAGE_FULL_DURATION_CACHE = False
+"""
+:var MIRAGE_FULL_DURATION_CACHE: EXPERIMENTAL - Whether Mirage caches the last
+    Graphite time series fetched for each metric and second order resolution in
+    Redis, so that when the metric is checked again only the data since the
+    last cached data point is fetched from Graphite and merged into the cached
+    time series.  If the data since the last cached data point is not at the
+    resolution of the cached time series, which is the case when the
+    hours_to_resolve period is longer than the first retention archive of the
+    metric, the mismatch is recorded for 24 hours and the full time series is
+    fetched for the metric.
+:vartype MIRAGE_FULL_DURATION_CACHE: bool
+"""
+
+MIRAGE_FULL_DURATION_CACHE_TTL = 3600
+"""
+:var MIRAGE_FULL_DURATION_CACHE_TTL: The number of seconds that a Mirage full
+    duration cache is kept for.  After this period the full time series is
+    fetched from Graphite again, so that any data that Graphite received late
+    is not missed for longer than this.
+:vartype MIRAGE_FULL_DURATION_CACHE_TTL: int
+"""
+
 """
 Boundary settings
 """
@@ -3149,6 +3390,112 @@ IONOSPHERE_FEATURES_PERCENT_SIMILAR = 1.0
 :vartype IONOSPHERE_FEATURES_PERCENT_SIMILAR: float
 """
 
+IONOSPHERE_FP_FEATURES_MATRIX = True
+"""
+:var IONOSPHERE_FP_FEATURES_MATRIX: Cache the features of all the features
+    profiles of a metric as a matrix in Redis and compare the calculated
+    features to all the features profiles at once, rather than querying the DB
+    for the features of each features profile on every check.
+:vartype IONOSPHERE_FP_FEATURES_MATRIX: boolean
+
+- The matrix of a metric is updated when features profiles are added or are
+  disabled.
+- Set to False to get the features of each features profile from memcache or
+  the DB on every check.
+"""
+
+IONOSPHERE_TSFRESH_FEATURE_SET = 'efficient'
+"""
+:var IONOSPHERE_TSFRESH_FEATURE_SET: The tsfresh feature set that is used to
+    calculate features, either 'efficient' for the full tsfresh
+    EfficientFCParameters or 'fast' for the EfficientFCParameters without the
+    calculators in IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS.
+:vartype IONOSPHERE_TSFRESH_FEATURE_SET: str
+
+- Feature extraction is the largest CPU cost of an Ionosphere check.  The
+  features sum comparison is only done on the features that the calculated
+  features and the features profile have in common, so a 'fast' check can be
+  compared to an 'efficient' features profile on the fast features.
+- Features profiles are stamped with the feature set that they were created
+  with in the tsfresh_feature_set column of the ionosphere table.
+- Use skyline/tsfresh_features/time_tsfresh_calculators.py to time each tsfresh
+  calculator on your own training data before changing to 'fast'.
+"""
+
+IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS = [
+    'agg_linear_trend', 'ar_coefficient', 'augmented_dickey_fuller',
+    'change_quantiles', 'cwt_coefficients', 'friedrich_coefficients',
+    'lempel_ziv_complexity', 'max_langevin_fixed_point', 'number_cwt_peaks',
+    'partial_autocorrelation', 'permutation_entropy',
+]
+"""
+:var IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS: The tsfresh feature
+    calculators that are not calculated when IONOSPHERE_TSFRESH_FEATURE_SET is
+    'fast'.
+:vartype IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS: list
+
+- The default list is the most expensive calculators in EfficientFCParameters.
+  It should be adjusted to the output of
+  skyline/tsfresh_features/time_tsfresh_calculators.py on your training data.
+"""
+
+IONOSPHERE_FP_TIMESERIES_STORE = True
+"""
+:var IONOSPHERE_FP_TIMESERIES_STORE: Store the time series of the features
+    profiles of a metric in a binary file per metric, with the minmax scaled
+    values and the min and max of each features profile precomputed.  The file
+    is memory mapped by ionosphere, inference and the webapp rather than
+    querying the z_ts_<metric_id> table or memcache for the features profile
+    time series on every check.
+:vartype IONOSPHERE_FP_TIMESERIES_STORE: boolean
+
+- The time series of a features profile is added to the store the first time
+  it is used.
+- Set to False to get the features profile time series from memcache or the DB.
+"""
+
+IONOSPHERE_FP_TIMESERIES_STORE_DIR = '/opt/skyline/ionosphere/fp_timeseries'
+"""
+:var IONOSPHERE_FP_TIMESERIES_STORE_DIR: The absolute path of the directory
+    where the fp time series store files are written.  It must be writable by
+    the user that runs Skyline.
+:vartype IONOSPHERE_FP_TIMESERIES_STORE_DIR: str
+"""
+
+IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED = 1000
+"""
+:var IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED: The maximum number of fp time
+    series store files that each process keeps memory mapped.  The least
+    recently used store is unmapped when the limit is reached.
+:vartype IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED: int
+"""
+
+IONOSPHERE_PARALLEL_FP_EVALUATION = True
+"""
+:var IONOSPHERE_PARALLEL_FP_EVALUATION: Calculate the minmax scaled features
+    of the features profiles of a check that do not have minmax data in the
+    ionosphere_minmax table in a pool of processes before the features profiles
+    are evaluated, stopping as soon as the first features profile that matches
+    is known.  Requires IONOSPHERE_FP_TIMESERIES_STORE.
+:vartype IONOSPHERE_PARALLEL_FP_EVALUATION: boolean
+
+- The features profiles are still evaluated in order, so the features profile
+  that matches is the same features profile that matches without the parallel
+  evaluation.
+- The parallel evaluation is only run when none of the features profiles match
+  on the features sums, which is determined from the
+  :mod:`settings.IONOSPHERE_FP_FEATURES_MATRIX` scores, so it also requires
+  IONOSPHERE_FP_FEATURES_MATRIX.
+"""
+
+IONOSPHERE_PARALLEL_FP_EVALUATION_PROCESSES = 2
+"""
+:var IONOSPHERE_PARALLEL_FP_EVALUATION_PROCESSES: The maximum number of
+    processes each Ionosphere check can use for the parallel features profile
+    evaluation.
+:vartype IONOSPHERE_PARALLEL_FP_EVALUATION_PROCESSES: int
+"""
+
 IONOSPHERE_MINMAX_SCALING_ENABLED = True
 """
 :var IONOSPHERE_MINMAX_SCALING_ENABLED: Implement Min-Max scaling on features
@@ -3503,6 +3850,17 @@ IONOSPHERE_INFERENCE_MOTIFS_RANGE_PADDING = 10.0
 :vartype IONOSPHERE_INFERENCE_MOTIFS_RANGE_PADDING: float
 """
 
+IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH = True
+"""
+:var IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH: Search all the features
+    profiles of a metric for similar motifs in batches, with a single FFT
+    convolution for all the fps per batch_size, rather than running
+    mts.mass2_batch or mts.mass3 per fp per batch_size.  Motifs that are not
+    within the max_distance or within the padded range are pruned before they
+    are evaluated.  Set to False to use mass-ts per fp.
+:vartype IONOSPHERE_INFERENCE_BATCHED_MOTIF_SEARCH: boolean
+"""
+
 IONOSPHERE_INFERENCE_MOTIFS_SINGLE_MATCH = True
 """
 :var IONOSPHERE_INFERENCE_MOTIFS_SINGLE_MATCH: ADVANCED FEATURE.  By default
@@ -3803,6 +4161,26 @@ LUMINOL_CROSS_CORRELATION_THRESHOLD = 0.9
 :vartype LUMINOL_CROSS_CORRELATION_THRESHOLD: float
 """
 
+LUMINOSITY_BATCH_CORRELATIONS = False
+"""
+:var LUMINOSITY_BATCH_CORRELATIONS: EXPERIMENTAL - Cross correlate all the
+    metrics with an anomaly in a vectorised batch rather than running a luminol
+    Correlator for each metric.  The results are the same as the luminol cross
+    correlation results.  Defaults to False, the luminol Correlator is used.
+:vartype LUMINOSITY_BATCH_CORRELATIONS: boolean
+"""
+
+LUMINOSITY_CORRELATION_CANDIDATES_TOP_K = 0
+"""
+:var LUMINOSITY_CORRELATION_CANDIDATES_TOP_K: EXPERIMENTAL - The maximum number
+    of recently active metrics that are fetched and correlated with an anomaly.
+    The metrics are ranked on the number of algorithms that they triggered in
+    analyzer nearest to the anomaly timestamp and only the top ranked metrics
+    are correlated.  The default of 0 correlates all the recently active
+    metrics, a value such as 1000 enables the ranking.
+:vartype LUMINOSITY_CORRELATION_CANDIDATES_TOP_K: int
+"""
+
 LUMINOSITY_RELATED_TIME_PERIOD = 240
 """
 :var LUMINOSITY_RELATED_TIME_PERIOD: The time period (in seconds) either side of
@@ -4128,6 +4506,46 @@ FLUX_PERSIST_QUEUE = False
 :vartype FLUX_PERSIST_QUEUE: boolean
 """
 
+FLUX_LISTEN_BUFFERED_ACCOUNTING = False
+"""
+:var FLUX_LISTEN_BUFFERED_ACCOUNTING: EXPERIMENTAL - Whether each flux listen process
+    accumulates the flux.listen.added_to_queue, namespace quota and
+    flux.listen.discarded.* Redis set adds and counters that are updated for
+    every data point received and writes them to Redis in one pipeline every
+    FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL seconds, rather than making Redis
+    requests for every data point in every request.  The Redis keys are the
+    same but are updated up to FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL seconds
+    later, so a namespace quota can be exceeded by the new metrics that are
+    received in that time.  The FLUX_PERSIST_QUEUE flux.queue set is not
+    buffered, data is always added to it before it is queued.
+:vartype FLUX_LISTEN_BUFFERED_ACCOUNTING: boolean
+"""
+
+FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL = 1
+"""
+:var FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL: The number of seconds between each
+    write of the accumulated FLUX_LISTEN_BUFFERED_ACCOUNTING data to Redis.
+:vartype FLUX_LISTEN_ACCOUNTING_FLUSH_INTERVAL: int
+"""
+
+FLUX_LISTEN_CACHE = False
+"""
+:var FLUX_LISTEN_CACHE: EXPERIMENTAL - Whether each flux listen process resolves
+    the API keys, the namespace of each key and the namespace quotas, metrics
+    and current metric counts from an in-process cache that is refreshed from
+    Redis by a background thread every FLUX_LISTEN_CACHE_REFRESH_INTERVAL
+    seconds, rather than querying Redis for the namespace quota data on every
+    request.
+:vartype FLUX_LISTEN_CACHE: boolean
+"""
+
+FLUX_LISTEN_CACHE_REFRESH_INTERVAL = 5
+"""
+:var FLUX_LISTEN_CACHE_REFRESH_INTERVAL: The number of seconds between each
+    refresh of the FLUX_LISTEN_CACHE.
+:vartype FLUX_LISTEN_CACHE_REFRESH_INTERVAL: int
+"""
+
 FLUX_CHECK_LAST_TIMESTAMP = True
 """
 :var FLUX_CHECK_LAST_TIMESTAMP: By default flux deduplicates data and only
@@ -4166,6 +4584,26 @@ FLUX_CARBON_PICKLE_PORT = 2004
 :vartype FLUX_CARBON_PICKLE_PORT: int
 """
 
+FLUX_WORKER_BATCH_SIZE = 1
+"""
+:var FLUX_WORKER_BATCH_SIZE: EXPERIMENTAL - The maximum number of data points
+    that each flux worker takes off the queue at a time.  The last timestamps
+    of all the metrics in the batch are checked in one Redis round trip and the
+    data points of the batch are submitted to Graphite in one pickle
+    submission.  The default of 1 processes the queue one data point at a time,
+    a value such as 500 enables the batch mode.
+:vartype FLUX_WORKER_BATCH_SIZE: int
+"""
+
+FLUX_CARBON_PERSISTENT_CONNECTION = False
+"""
+:var FLUX_CARBON_PERSISTENT_CONNECTION: EXPERIMENTAL - Whether the flux workers
+    keep the connection to the Carbon PICKLE_RECEIVER_PORT open between
+    submissions, reconnecting if the connection is closed, rather than opening
+    a new connection for each submission.
+:vartype FLUX_CARBON_PERSISTENT_CONNECTION: boolean
+"""
+
 FLUX_GRAPHITE_WHISPER_PATH = '/opt/graphite/storage/whisper'
 """
 :var FLUX_GRAPHITE_WHISPER_PATH: This is the absolute path on your GRAPHITE server, it is
@@ -4398,6 +4836,16 @@ FLUX_PROMETHEUS_MAX_AGE = 300
 :vartype FLUX_PROMETHEUS_MAX_AGE: int
 """
 
+FLUX_PROMETHEUS_PROTOBUF_FAST_PATH = True
+"""
+:var FLUX_PROMETHEUS_PROTOBUF_FAST_PATH: Whether flux iterates the Prometheus
+    remote_write WriteRequest protobuf timeseries directly and caches the metric
+    name translated from each label set, rather than converting the entire
+    WriteRequest to a dict with MessageToDict and translating the labels of
+    every timeseries on every request.
+:vartype FLUX_PROMETHEUS_PROTOBUF_FAST_PATH: boolean
+"""
+
 FLUX_TORNADO_ENABLED = False
 """
 :var FLUX_TORNADO_ENABLED: ADVANCED FEATURE.  Whether to enable tornado on flux.
@@ -4551,6 +4999,30 @@ VISTA_GRAPHITE_BATCH_SIZE = 20
 :vartype VISTA_GRAPHITE_BATCH_SIZE: int
 """
 
+VISTA_ASYNC_FETCH = True
+"""
+:var VISTA_ASYNC_FETCH: Whether the Vista fetcher makes its requests to the
+    remote hosts, and its submissions to flux, concurrently rather than one
+    after the other.
+:vartype VISTA_ASYNC_FETCH: bool
+"""
+
+VISTA_FETCH_CONCURRENCY_PER_HOST = 10
+"""
+:var VISTA_FETCH_CONCURRENCY_PER_HOST: The maximum number of concurrent
+    requests that each Vista fetcher process makes to a single remote host when
+    VISTA_ASYNC_FETCH is enabled.
+:vartype VISTA_FETCH_CONCURRENCY_PER_HOST: int
+"""
+
+VISTA_FETCH_RETRIES = 2
+"""
+:var VISTA_FETCH_RETRIES: The number of times that a Vista fetcher request is
+    retried, with an exponential backoff, if it fails with a connection error
+    or a 429 or 5xx status code when VISTA_ASYNC_FETCH is enabled.
+:vartype VISTA_FETCH_RETRIES: int
+"""
+
 VISTA_BQ_VIRTUALENV_PATH = None
 """
 :var VISTA_BQ_VIRTUALENV_PATH: ADVANCED FEATURE.  The path to the dedicated venv
@@ -366,6 +366,10 @@ CREATE TABLE IF NOT EXISTS `ionosphere` (
 #                   Feature #5479: ionosphere.alias_features_profile
 */
   `alias_id` INT(11) DEFAULT 0 COMMENT 'the alias_id of the alias_features_profile if it has one',
+/*
+# @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+*/
+  `tsfresh_feature_set` VARCHAR(32) DEFAULT 'efficient' COMMENT 'the tsfresh feature set the features profile was calculated with',
   PRIMARY KEY (id),
 /*
 # @modified 20180821 - Bug #2546: Fix SQL errors
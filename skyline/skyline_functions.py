@@ -1183,9 +1183,22 @@ def get_graphite_metric(
         sanitised = False
         sanitised, url = sanitise_graphite_url(current_skyline_app, url)
 
+        # @added 20261104 - Feature #5777: graphite - shared http session
+        # Make the request with the shared keep-alive session of the process
+        # rather than a new connection for each request
+        try:
+            from functions.graphite.graphite_client import get_graphite_session
+            graphite_session = get_graphite_session()
+        except:
+            current_logger.error(traceback.format_exc())
+            current_logger.error('error :: get_graphite_metric :: get_graphite_session failed')
+            graphite_session = requests
+
         graphite_json_fetched = False
         try:
-            r = requests.get(url, timeout=use_timeout)
+            # @modified 20261104 - Feature #5777: graphite - shared http session
+            # r = requests.get(url, timeout=use_timeout)
+            r = graphite_session.get(url, timeout=use_timeout)
             # @added 20220505 - Bug #4374: webapp - handle url encoded chars
             # Handle metrics with url encoded names
             try_encoded_name = False
@@ -1196,7 +1209,9 @@ def get_graphite_metric(
                 new_url = url.replace('%', '%25')
                 new_url = new_url.replace('%2525', '%25')
                 current_logger.info('get_graphite_metric :: no data - trying %s' % new_url)
-                r = requests.get(new_url, timeout=use_timeout)
+                # @modified 20261104 - Feature #5777: graphite - shared http session
+                # r = requests.get(new_url, timeout=use_timeout)
+                r = graphite_session.get(new_url, timeout=use_timeout)
             graphite_json_fetched = True
         except:
             datapoints = [[None, str(graphite_until)]]
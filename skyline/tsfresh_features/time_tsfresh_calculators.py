@@ -0,0 +1,143 @@
+"""
+This script times every tsfresh feature calculator of the EfficientFCParameters
+feature set over the Ionosphere training data time series to determine which
+calculators account for the feature extraction time.  It reports the mean time
+of each calculator, its share of the total extraction time and the number of
+features it produces, then outputs a suggested
+IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS list for the 'fast'
+IONOSPHERE_TSFRESH_FEATURE_SET.
+
+Run the script with for example:
+
+.. code-block:: bash
+
+    PYTHON_MAJOR_VERSION="3.8"
+    PYTHON_VIRTUALENV_DIR="/opt/python_virtualenv"
+    PROJECT="skyline-py383"
+
+    cd "${PYTHON_VIRTUALENV_DIR}/projects/${PROJECT}"
+    source bin/activate
+    bin/python${PYTHON_MAJOR_VERSION} skyline/tsfresh_features/time_tsfresh_calculators.py --max-files 50
+    deactivate
+
+"""
+
+import os
+import sys
+import argparse
+from ast import literal_eval
+import traceback
+from timeit import default_timer as timer
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir
+sys.path.append(skyline_dir)
+
+import settings
+from functions.ionosphere.tsfresh_features import time_tsfresh_calculators
+
+
+def get_training_timeseries_files(data_dir, max_files):
+    """
+    Return the training data time series json files in the data_dir, the
+    <base_name>.json and <base_name>.mirage.redis.<hours>h.json files that
+    features profiles are calculated from.
+    """
+    timeseries_files = []
+    for root, dirs, files in os.walk(data_dir):
+        for f in files:
+            if not f.endswith('.json'):
+                continue
+            if '.echo.' in f or f.endswith('.fp.json'):
+                continue
+            timeseries_files.append(os.path.join(root, f))
+            if len(timeseries_files) >= max_files:
+                return timeseries_files
+    return timeseries_files
+
+
+def load_timeseries(timeseries_file):
+    """
+    Load a training data time series json file as a list of [ts, value]
+    """
+    with open(timeseries_file, 'r') as f:
+        raw_timeseries = f.read()
+    timeseries_array_str = str(raw_timeseries).replace('(', '[').replace(')', ']')
+    timeseries_array_str = timeseries_array_str.replace('nan', 'None').replace('NaN', 'None')
+    timeseries = literal_eval(timeseries_array_str)
+    return [[int(ts), float(value)] for ts, value in timeseries if value is not None]
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description='Time each tsfresh feature calculator on the Ionosphere training data')
+    parser.add_argument(
+        '--data-dir', default=settings.IONOSPHERE_DATA_FOLDER,
+        help='the training data directory (default: settings.IONOSPHERE_DATA_FOLDER)')
+    parser.add_argument(
+        '--max-files', type=int, default=20,
+        help='the maximum number of training data time series to time (default: 20)')
+    parser.add_argument(
+        '--loops', type=int, default=1,
+        help='the number of times to run each calculator on each time series (default: 1)')
+    parser.add_argument(
+        '--min-share', type=float, default=0.02,
+        help='suggest excluding calculators that take at least this share of the total time (default: 0.02)')
+    args = parser.parse_args()
+
+    timeseries_files = get_training_timeseries_files(args.data_dir, args.max_files)
+    if not timeseries_files:
+        print('error: no training data time series found in %s' % args.data_dir)
+        sys.exit(1)
+
+    start = timer()
+    total_times = {}
+    features_counts = {}
+    timed_files = 0
+    for timeseries_file in timeseries_files:
+        try:
+            timeseries = load_timeseries(timeseries_file)
+        except:
+            print(traceback.format_exc())
+            print('error: failed to load %s' % timeseries_file)
+            continue
+        if len(timeseries) < 10:
+            continue
+        print('timing calculators on %s (%s data points)' % (timeseries_file, str(len(timeseries))))
+        calculator_timings = time_tsfresh_calculators('tsfresh_features', timeseries, loops=args.loops)
+        for calculator, timing in calculator_timings.items():
+            total_times[calculator] = total_times.get(calculator, 0) + timing['time']
+            features_counts[calculator] = timing['features']
+        timed_files += 1
+
+    if not timed_files:
+        print('error: no training data time series could be timed')
+        sys.exit(1)
+
+    total_time = sum(total_times.values())
+    print('')
+    print('timed %s calculators on %s time series in %.6f seconds' % (
+        str(len(total_times)), str(timed_files), (timer() - start)))
+    print('')
+    print('%-60s %12s %8s %8s %8s' % ('calculator', 'mean time', 'share', 'cumul', 'features'))
+    cumulative_share = 0.0
+    suggested_exclusions = []
+    for calculator, calculator_time in sorted(total_times.items(), key=lambda item: item[1], reverse=True):
+        share = calculator_time / total_time if total_time else 0.0
+        cumulative_share += share
+        print('%-60s %12.6f %7.2f%% %7.2f%% %8s' % (
+            calculator, (calculator_time / timed_files), (share * 100),
+            (cumulative_share * 100), str(features_counts[calculator])))
+        if share >= args.min_share:
+            suggested_exclusions.append(calculator)
+
+    excluded_time = sum(total_times[calculator] for calculator in suggested_exclusions)
+    print('')
+    print('the suggested exclusions account for %.2f%% of the feature extraction time' % (
+        ((excluded_time / total_time) * 100) if total_time else 0.0))
+    print('IONOSPHERE_TSFRESH_FAST_EXCLUDED_CALCULATORS = [')
+    for calculator in sorted(suggested_exclusions):
+        print('    \'%s\',' % calculator)
+    print(']')
@@ -52,6 +52,8 @@ if True:
     from functions.settings.get_bq_accounts_settings import get_bq_accounts_settings
     # @added 20240521 - Feature #5352: vista - bigquery
     from functions.thunder.send_event import thunder_send_event
+    # @added 20261106 - Feature #5779: vista - async fetcher
+    from functions.vista.async_fetch import async_fetch
 
 parent_skyline_app = 'vista'
 child_skyline_app = 'fetcher'
@@ -87,6 +89,20 @@ try:
 except:
     VERBOSE_LOGGING = False
 
+# @added 20261106 - Feature #5779: vista - async fetcher
+try:
+    VISTA_ASYNC_FETCH = settings.VISTA_ASYNC_FETCH
+except:
+    VISTA_ASYNC_FETCH = True
+try:
+    VISTA_FETCH_CONCURRENCY_PER_HOST = int(settings.VISTA_FETCH_CONCURRENCY_PER_HOST)
+except:
+    VISTA_FETCH_CONCURRENCY_PER_HOST = 10
+try:
+    VISTA_FETCH_RETRIES = int(settings.VISTA_FETCH_RETRIES)
+except:
+    VISTA_FETCH_RETRIES = 2
+
 # @added 20240516 - Feature #5352: vista - bigquery
 try:
     VISTA_BQ_VIRTUALENV_PATH = settings.VISTA_BQ_VIRTUALENV_PATH
@@ -394,6 +410,34 @@ class Fetcher(Thread):
                 graphite_batches = new_graphite_batches
             if added_to_batch:
                 in_batch_responses.append(target)
+        # @added 20261106 - Feature #5779: vista - async fetcher
+        # Make the batch requests and the requests for the metrics that are not
+        # in a batch concurrently, rather than one after the other.  Any
+        # batched metric that is not in its batch response is still requested
+        # individually below.
+        fetched_responses = {}
+        if VISTA_ASYNC_FETCH:
+            fetch_urls = []
+            for batch_number, remote_host, from_timestamp_str, url in graphite_batches:
+                sanitised, url = sanitise_graphite_url(skyline_app, url)
+                fetch_urls.append(url)
+            for remote_host_type, frequency, remote_target, graphite_target, metric, url, namespace_prefix, api_key, token, user, password in metrics_to_fetch:
+                if remote_target in in_batch_responses:
+                    continue
+                sanitised, url = sanitise_graphite_url(skyline_app, url)
+                fetch_urls.append(url)
+            fetch_urls = list(dict.fromkeys(fetch_urls))
+            try:
+                fetch_results = async_fetch(
+                    parent_skyline_app, [{'url': fetch_url} for fetch_url in fetch_urls],
+                    concurrency_per_host=VISTA_FETCH_CONCURRENCY_PER_HOST,
+                    retries=VISTA_FETCH_RETRIES, timeout=(5, 45))
+                fetched_responses = dict(zip(fetch_urls, fetch_results))
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: fetcher :: async_fetch failed, fetching sequentially - %s' % err)
+                fetched_responses = {}
+
         batch_responses = []
         start_batch_fetches = int(time())
         for batch_number, remote_host, from_timestamp_str, url in graphite_batches:
@@ -403,6 +447,15 @@ class Fetcher(Thread):
             sanitised = False
             sanitised, url = sanitise_graphite_url(skyline_app, url)
 
+            # @added 20261106 - Feature #5779: vista - async fetcher
+            if url in fetched_responses:
+                if fetched_responses[url]['js'] is not None:
+                    batch_responses.append(fetched_responses[url]['js'])
+                else:
+                    logger.error('error :: fetcher :: failed to get valid response for batch request %s - %s' % (
+                        str(url), str(fetched_responses[url]['error'])))
+                continue
+
             try:
                 # @modified 20241106 - Task #5526: Build v5.0.0 and upgrade deps
                 # Add timeout for bandit B113
@@ -455,10 +508,25 @@ class Fetcher(Thread):
             sanitised = False
             sanitised, url = sanitise_graphite_url(skyline_app, url)
 
+            # @added 20261106 - Feature #5779: vista - async fetcher
+            # Use the response that was fetched concurrently
+            fetched_response = None
+            if not success:
+                fetched_response = fetched_responses.get(url)
+            if fetched_response:
+                if fetched_response['status_code'] == 200 and fetched_response['js'] is not None:
+                    js = fetched_response['js']
+                    success = True
+                else:
+                    logger.info('warning :: fetcher :: failed to get data from %s after %s attempts - %s' % (
+                        str(url), str(fetched_response['attempts']), str(fetched_response['error'])))
+
             # @modified 20191127 - Feature #3338: Vista - batch Graphite requests
             # Wrapped in if not success
             response = None
-            if not success:
+            # @modified 20261106 - Feature #5779: vista - async fetcher
+            # if not success:
+            if not success and not fetched_response:
                 try:
                     # @modified 20191011 - Task #3258: Reduce vista logging
                     if LOCAL_DEBUG:
@@ -1005,6 +1073,8 @@ class Fetcher(Thread):
             metrics_to_fetch = []
 
             fetcher_sent_to_flux = 0
+            # @added 20261106 - Feature #5779: vista - async fetcher
+            flux_posts = []
 
             if LOCAL_DEBUG:
                 try:
@@ -1461,6 +1531,12 @@ class Fetcher(Thread):
                     except Exception as e:
                         logger.error(traceback.format_exc())
                         logger.error('error :: fetcher :: could not build the payload json - %s' % e)
+                # @added 20261106 - Feature #5779: vista - async fetcher
+                # Submit all the payloads to flux concurrently once all the
+                # metrics have been evaluated
+                if flux_url and payload and VISTA_ASYNC_FETCH:
+                    flux_posts.append({'url': flux_url, 'method': 'post', 'json': payload})
+                    payload = None
                 if flux_url and payload:
                     try:
                         # @modified 20191011 - Task #3258: Reduce vista logging
@@ -1545,6 +1621,28 @@ class Fetcher(Thread):
                     if LOCAL_DEBUG:
                         logger.info('fetcher :: added metric_to_fetch - %s' % str(metric_to_fetch))
 
+            # @added 20261106 - Feature #5779: vista - async fetcher
+            if flux_posts:
+                try:
+                    flux_results = async_fetch(
+                        parent_skyline_app, flux_posts,
+                        concurrency_per_host=VISTA_FETCH_CONCURRENCY_PER_HOST,
+                        retries=VISTA_FETCH_RETRIES, timeout=(5, 45))
+                except Exception as err:
+                    logger.error(traceback.format_exc())
+                    logger.error('error :: fetcher :: async_fetch failed to post %s payloads to flux - %s' % (
+                        str(len(flux_posts)), err))
+                    flux_results = []
+                for flux_post, flux_result in zip(flux_posts, flux_results):
+                    if flux_result['status_code'] in [200, 204]:
+                        fetcher_sent_to_flux += 1
+                    else:
+                        logger.error('error :: fetcher :: could not post data to flux URL - %s, remote_target: %s, status code: %s - %s' % (
+                            str(flux_post['url']), str(flux_post['json']['remote_target']),
+                            str(flux_result['status_code']), str(flux_result['error'])))
+                logger.info('fetcher :: submitted %s of %s payloads to flux /populate_metric' % (
+                    str(fetcher_sent_to_flux), str(len(flux_posts))))
+
             if LOCAL_DEBUG:
                 if metrics_to_fetch:
                     metrics_to_fetch_count = len(metrics_to_fetch)
@@ -1560,7 +1658,11 @@ class Fetcher(Thread):
                         logger.info('fetcher :: WARNING: Skyline Vista fetcher is set for more cores than needed.')
                         break
                     try:
-                        p = Process(target=self.fetch_process, args=(i, metrics_to_fetch))
+                        # @modified 20261106 - Feature #5779: vista - async fetcher
+                        # Each process fetches its own share of the metrics
+                        # rather than every process fetching all the metrics
+                        # p = Process(target=self.fetch_process, args=(i, metrics_to_fetch))
+                        p = Process(target=self.fetch_process, args=(i, metrics_to_fetch[(i - 1)::settings.VISTA_FETCHER_PROCESSES]))
                         pids.append(p)
                         pid_count += 1
                         logger.info('fetcher :: starting %s of %s fetch_process/es' % (str(pid_count), str(settings.VISTA_FETCHER_PROCESSES)))
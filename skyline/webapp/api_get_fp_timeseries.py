@@ -17,6 +17,16 @@ from functions.database.queries.fp_timeseries import get_db_fp_timeseries
 # and fp ids
 from functions.database.queries.get_fps_for_metric import get_fps_for_metric
 
+import settings
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+from functions.ionosphere.fp_timeseries_store import (
+    get_stored_fp_timeseries, fp_timeseries_to_list)
+
+try:
+    IONOSPHERE_FP_TIMESERIES_STORE = settings.IONOSPHERE_FP_TIMESERIES_STORE
+except:
+    IONOSPHERE_FP_TIMESERIES_STORE = True
+
 
 # @added 20220517 - Feature #4578: webapp - api_get_fp_timeseries
 def api_get_fp_timeseries(current_skyline_app):
@@ -148,11 +158,25 @@ def api_get_fp_timeseries(current_skyline_app):
                 str(base_name), err))
         current_logger.info('api_get_fp_timeseries :: determined metric_id - %s' % str(metric_id))
 
-    try:
-        fp_timeseries = get_db_fp_timeseries(current_skyline_app, metric_id, fp_id)
-    except Exception as err:
-        current_logger.error('error :: api_get_fp_timeseries :: get_db_fp_timeseries failed - %s' % (
-            err))
+    # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+    fp_timeseries = []
+    if IONOSPHERE_FP_TIMESERIES_STORE:
+        try:
+            stored_fp_timeseries = get_stored_fp_timeseries(current_skyline_app, metric_id, [fp_id])
+            if int(fp_id) in stored_fp_timeseries:
+                fp_timeseries = fp_timeseries_to_list(stored_fp_timeseries[int(fp_id)])
+        except Exception as err:
+            current_logger.error('error :: api_get_fp_timeseries :: get_stored_fp_timeseries failed - %s' % (
+                err))
+
+    # @modified 20261102 - Feature #5775: ionosphere - fp timeseries store
+    # Only query the DB if the fp timeseries store is not used
+    if not fp_timeseries:
+        try:
+            fp_timeseries = get_db_fp_timeseries(current_skyline_app, metric_id, fp_id)
+        except Exception as err:
+            current_logger.error('error :: api_get_fp_timeseries :: get_db_fp_timeseries failed - %s' % (
+                err))
     if fp_timeseries:
         # @modified 20220722 - Task #4624: Change all dict copy to deepcopy
         # fp_timeseries_dict = fp_id_row.copy()
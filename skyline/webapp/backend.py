@@ -17,7 +17,8 @@ from flask import request
 # @added 20180720 - Feature #2464: luminosity_remote_data
 # Added redis and msgpack
 from redis import StrictRedis
-from msgpack import Unpacker
+# @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+# from msgpack import Unpacker
 
 # @added 20201103 - Feature #3824: get_cluster_data
 import requests
@@ -84,6 +85,8 @@ from database import (
     get_engine, engine_disposal, anomalies_table_meta, metrics_table_meta,
     luminosity_table_meta)
 from functions.metrics.get_base_name_from_metric_id import get_base_name_from_metric_id
+# @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+from functions.timeseries.packed_timeseries import unpack_timeseries
 
 import skyline_version
 skyline_version = skyline_version.__absolute_version__
@@ -1034,9 +1037,11 @@ def luminosity_remote_data(anomaly_timestamp, resolution, namespace=None):
             timeseries = []
             try:
                 raw_series = raw_assigned[i]
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
-                timeseries = list(unpacker)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
+                # timeseries = list(unpacker)
+                timeseries = unpack_timeseries(raw_series)
             except:
                 timeseries = []
 
@@ -15,6 +15,8 @@ import skyline_version
 from skyline_functions import (
     mkdir_p, write_data_to_file, filesafe_metricname, is_derivative_metric)
 from database import (get_engine, metrics_table_meta)
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 skyline_version = skyline_version.__absolute_version__
 skyline_app = 'webapp'
@@ -47,7 +49,11 @@ def get_an_engine():
 def engine_disposal(engine):
     if engine:
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: calling engine.dispose()')
@@ -10,6 +10,8 @@ from sqlalchemy.sql import select
 from sqlalchemy import or_
 
 from database import get_engine, snab_table_meta
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 # @added 20230802 - Feature #5038: snab_results_algorithms
 #                   Feature #5008: webapp - snab report page
@@ -43,7 +45,11 @@ def get_snab_engine():
 def snab_engine_disposal(engine):
     if engine:
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: get_snab_report :: calling engine.dispose()')
@@ -15,6 +15,8 @@ import skyline_version
 from sqlalchemy import select, Table, MetaData
 
 from database import get_engine, snab_table_meta, anomalies_table_meta
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 from matched_or_regexed_in_list import matched_or_regexed_in_list
 # @modified 20241026 - Task #5521: webapp - update to bootstrap-5.3.3
 #                      Feature #5008: webapp - snab report page
@@ -74,7 +76,11 @@ def get_snab_engine():
 def snab_engine_disposal(engine):
     if engine:
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: get_snab_results :: calling engine.dispose()')
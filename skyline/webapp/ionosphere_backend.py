@@ -81,6 +81,8 @@ from database import (
     # Use sqlalchemy rather than string-based query construction
     not_anomalous_motifs_table_meta,
 )
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 from motif_match_types import motif_match_types_dict
 
 # @added 20190502 - Branch #2646: slack
@@ -143,6 +145,9 @@ from functions.database.queries.get_all_fps import get_all_fps
 # @added 20250122 - Feature #5592: tenant_id column in DB tables
 from functions.metrics.get_tenant_id import get_tenant_id
 
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+from functions.ionosphere.fp_timeseries_store import remove_fp_timeseries_store_fps
+
 # @added 20220405 - Task #4514: Integrate opentelemetry
 #                   Feature #4516: flux - opentelemetry traces
 OTEL_ENABLED = False
@@ -236,6 +241,11 @@ try:
     IONOSPHERE_INFERENCE_STORE_MATCHED_MOTIFS = settings.IONOSPHERE_INFERENCE_STORE_MATCHED_MOTIFS
 except:
     IONOSPHERE_INFERENCE_STORE_MATCHED_MOTIFS = False
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+try:
+    IONOSPHERE_FP_TIMESERIES_STORE = settings.IONOSPHERE_FP_TIMESERIES_STORE
+except:
+    IONOSPHERE_FP_TIMESERIES_STORE = True
 
 
 def ionosphere_get_metrics_dir(requested_timestamp, context):
@@ -626,7 +636,11 @@ def get_an_engine():
 def engine_disposal(engine):
     if engine:
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: calling engine.dispose()')
@@ -5716,6 +5730,20 @@ def disable_features_profile_family_tree(fp_ids):
                 engine_disposal(engine)
             raise
 
+        # @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+        # Remove the disabled fp from the fp time series store of the metric
+        if IONOSPHERE_FP_TIMESERIES_STORE:
+            try:
+                stmt = select(ionosphere_table.c.metric_id).where(ionosphere_table.c.id == int(fp_id))
+                with engine.connect() as connection:
+                    disabled_fp_metric_id = connection.execute(stmt).scalar()
+                if disabled_fp_metric_id:
+                    remove_fp_timeseries_store_fps(skyline_app, int(disabled_fp_metric_id), [int(fp_id)])
+            except Exception as err:
+                logger.error(traceback.format_exc())
+                logger.error('error :: failed to remove fp_id %s from the fp time series store - %s' % (
+                    str(fp_id), err))
+
         # @added 20200516 - Bug #3546: Change ionosphere_enabled if all features profiles are disabled
         # Disable any related layers as well
         if layer_ids:
@@ -8,6 +8,8 @@ from sqlalchemy.sql import select
 
 import settings
 from database import get_engine, ionosphere_table_meta
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 from functions.metrics.get_base_name_from_metric_id import get_base_name_from_metric_id
 
 skyline_app = 'webapp'
@@ -44,7 +46,11 @@ def get_motif_annihilations_to_validate(
         fail_msg = 'error ::  %s :: failed to get ionosphere_table meta, err: %s' % (function_str, err)
         logger.error('%s' % fail_msg)
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except Exception as dispose_err:
             logger.error(traceback.format_exc())
             logger.error('error :: %s :: calling engine.dispose(), err: %s' % (function_str, dispose_err))
@@ -96,7 +102,11 @@ def get_motif_annihilations_to_validate(
         raise
 
     try:
-        engine.dispose()
+        # @modified 20261024 - Feature #5766: database - pooled engine
+        # The pooled engine is not disposed of
+        # engine.dispose()
+        if not is_pooled_engine(engine):
+            engine.dispose()
     except Exception as dispose_err:
         logger.error(traceback.format_exc())
         logger.error('error :: %s :: calling engine.dispose(), err: %s' % (function_str, dispose_err))
@@ -40,6 +40,8 @@ from skyline_functions import (
 #                      Task #4778: v4.0.0 - update dependencies
 # Use sqlalchemy rather than string-based query construction
 from database import get_engine, ionosphere_table_meta
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 # @added 20210414 - Feature #4014: Ionosphere - inference
 #                   Branch #3590: inference
@@ -219,7 +221,11 @@ def on_demand_motif_analysis(
         fail_msg = 'error :: %s :: failed to get ionosphere_table meta - %s' % (function_str, err)
         logger.error(fail_msg)
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except Exception as err:
             logger.error('error :: %s :: engine.dispose() failed - %s' % (
                 function_str, err))
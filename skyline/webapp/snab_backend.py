@@ -20,6 +20,8 @@ import requests
 
 from database import (
     get_engine, snab_table_meta, metrics_table_meta, anomalies_table_meta)
+# @added 20261024 - Feature #5766: database - pooled engine
+from database import is_pooled_engine
 
 # @added 20230804 - Feature #5010: snab - save training_data
 from functions.database.queries.get_algorithms import get_algorithms
@@ -54,7 +56,11 @@ def get_snab_engine():
 def snab_engine_disposal(engine):
     if engine:
         try:
-            engine.dispose()
+            # @modified 20261024 - Feature #5766: database - pooled engine
+            # The pooled engine is not disposed of
+            # engine.dispose()
+            if not is_pooled_engine(engine):
+                engine.dispose()
         except:
             logger.error(traceback.format_exc())
             logger.error('error :: update_snab_result :: calling engine.dispose()')
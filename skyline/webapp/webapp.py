@@ -396,6 +396,8 @@ if True:
     # @added 20240118 - Task #2732: Prometheus to Skyline
     #                   Branch #4300: prometheus
     from functions.victoriametrics.get_victoriametrics_metric_link import get_victoriametrics_metric_link
+    # @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+    from functions.timeseries.packed_timeseries import unpack_timeseries
     # @added 20241108 - Feature #5537: webapp - tsdbs
     from functions.victoriametrics.get_victoriametrics_metric_link import get_victoriametrics_url
 
@@ -5757,15 +5759,17 @@ def api():
 
         if raw_series:
             try:
-                unpacker = Unpacker(use_list=False)
-                unpacker.feed(raw_series)
+                # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+                # unpacker = Unpacker(use_list=False)
+                # unpacker.feed(raw_series)
                 # @modified 20201117 - Feature #3824: get_cluster_data
                 #                      Feature #2464: luminosity_remote_data
                 #                      Bug #3266: py3 Redis binary objects not strings
                 #                      Branch #3262: py3
                 # Replace redefinition of item from line 1338
                 # timeseries = [item[:2] for item in unpacker]
-                timeseries = [ts_item[:2] for ts_item in unpacker]
+                # timeseries = [ts_item[:2] for ts_item in unpacker]
+                timeseries = [ts_item[:2] for ts_item in unpack_timeseries(raw_series)]
             except Exception as err:
                 logger.error(traceback.format_exc())
                 logger.error('error :: failed to unpack raw data from Redis for %s' % metric)
@@ -18191,11 +18195,33 @@ def rebrow_key(host, port, db, key):
         # panorama.mysql_ids will always be msgpack
         if 'panorama.mysql_ids' in str(key):
             test_string = False
+
+        # @added 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+        # Metric keys may be in the numpy format, which can decode as a utf-8
+        # string, so always unpack metric keys as a time series
+        metric_key = False
+        if settings.FULL_NAMESPACE and str(dump_key).startswith(settings.FULL_NAMESPACE):
+            metric_key = True
+            test_string = False
+
         if not test_string:
             raw_result = r.get(key)
-            unpacker = Unpacker(use_list=False)
-            unpacker.feed(raw_result)
-            val = list(unpacker)
+            # @modified 20261018 - Feature #5760: HORIZON_STORAGE_FORMAT - numpy
+            # unpacker = Unpacker(use_list=False)
+            # unpacker.feed(raw_result)
+            # val = list(unpacker)
+            val = None
+            if metric_key:
+                try:
+                    val = unpack_timeseries(raw_result)
+                except Exception as err:
+                    logger.error('error :: rebrow :: unpack_timeseries failed on %s, trying msgpack - %s' % (
+                        str(dump_key), err))
+                    val = None
+            if not val:
+                unpacker = Unpacker(use_list=False)
+                unpacker.feed(raw_result)
+                val = list(unpacker)
             msg_pack_key = True
             logger.info('rebrow :: msgpack key unpacked - %s' % str(dump_key))
     elif t == 'list':
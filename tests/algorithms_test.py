@@ -24,9 +24,15 @@ parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
 skyline_dir = parent_dir + '/skyline'
 sys.path.append(skyline_dir)
 
+# @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+# algorithms_vectorized imports algorithms as analyzer does
+sys.path.append(skyline_dir + '/analyzer')
+
 if True:
     from analyzer import algorithms
     import settings
+    # @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+    from analyzer import algorithms_vectorized
 
 
 class TestAlgorithms(unittest.TestCase):
@@ -132,6 +138,55 @@ class TestAlgorithms(unittest.TestCase):
         self.assertTrue(len(list(filter(None, ensemble))) >= settings.CONSENSUS)
         self.assertEqual(datapoint, 1000)
 
+    # @added 20261019 - Feature #5761: analyzer - vectorized algorithms
+    @patch.object(algorithms_vectorized, 'time')
+    @patch.object(algorithms, 'time')
+    def test_run_selected_algorithms_vectorized(self, timeMock, vectorizedTimeMock):
+        """
+        Assert that run_selected_algorithms_vectorized returns the same
+        anomalous, ensemble and datapoint results, or raises the same
+        exception, as run_selected_algorithm for each time series in a batch
+        and that run_selected_algorithm returns the same results when passed
+        the vectorized ensemble
+        """
+        timeMock.return_value, anomalous_timeseries, series = self.data(time())
+        vectorizedTimeMock.return_value = timeMock.return_value
+
+        # Not anomalous
+        not_anomalous_timeseries = [[ts, float((index % 2) + 1)] for index, (ts, value) in enumerate(anomalous_timeseries)]
+        # Boring
+        boring_timeseries = [[ts, 1] for ts, value in anomalous_timeseries]
+        # TooShort
+        too_short_timeseries = [list(item) for item in anomalous_timeseries[-10:]]
+        # Stale
+        stale_timeseries = [list(item) for item in anomalous_timeseries[:-3600]]
+        timeseries_list = [
+            anomalous_timeseries, not_anomalous_timeseries, boring_timeseries,
+            too_short_timeseries, stale_timeseries]
+        metric_names = ['test.metric.%s' % str(index) for index in range(len(timeseries_list))]
+
+        results, exceptions = algorithms_vectorized.run_selected_algorithms_vectorized(
+            timeseries_list, metric_names)
+
+        self.assertEqual(results[0][0], True)
+        self.assertEqual(results[1][0], False)
+        self.assertEqual(exceptions[2:], ['Boring', 'TooShort', 'Stale'])
+        for index, timeseries in enumerate(timeseries_list):
+            try:
+                result, ensemble, datapoint, negatives_found, algorithms_run = algorithms.run_selected_algorithm(
+                    timeseries, metric_names[index], [], [], False, False, {})
+            except Exception as err:
+                self.assertIsNone(results[index])
+                self.assertEqual(exceptions[index], err.__class__.__name__)
+                continue
+            self.assertIsNone(exceptions[index])
+            self.assertEqual(results[index], (result, ensemble, datapoint))
+            # The vectorized_ensemble passed to run_selected_algorithm
+            vectorized_result, vectorized_ensemble, vectorized_datapoint, negatives_found, algorithms_run = algorithms.run_selected_algorithm(
+                timeseries, metric_names[index], [], [], False, False, {},
+                results[index][1])
+            self.assertEqual((vectorized_result, vectorized_ensemble, vectorized_datapoint), (result, ensemble, datapoint))
+
     @unittest.skip('Fails inexplicable in certain environments.')
     @patch.object(algorithms, 'CONSENSUS')
     @patch.object(algorithms, 'ALGORITHMS')
@@ -0,0 +1,110 @@
+"""
+analyzer_test.py
+"""
+# @added 20261021 - Feature #5763: analyzer - persistent spin_process workers
+import unittest
+
+from mock import Mock, patch
+from queue import Queue
+import os.path
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+sys.path.append(skyline_dir + '/analyzer')
+
+if True:
+    from analyzer import analyzer
+    # @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+    from functions.analyzer.get_cost_balanced_assigned_metrics import get_cost_balanced_assigned_metrics
+
+
+class TestSpinWorker(unittest.TestCase):
+    """
+    Test that a persistent spin_worker runs spin_process with the
+    unique_metrics and the assigned_metrics of each assignment
+    """
+
+    @patch.object(analyzer, 'ANALYZER_METADATA_SNAPSHOT', False)
+    def test_spin_worker_passes_unique_metrics(self):
+        worker = Mock()
+        worker.spin_workers_completed_q = Queue()
+        assignment_q = Queue()
+        unique_metrics = ['metrics.a', 'metrics.b', 'metrics.c', 'metrics.d']
+        assigned_metrics = ['metrics.c', 'metrics.d']
+        assignment_q.put((1.0, unique_metrics, {}, assigned_metrics))
+        assignment_q.put(None)
+        analyzer.Analyzer.spin_worker(worker, 2, assignment_q)
+        worker.spin_process.assert_called_once_with(
+            2, unique_metrics, {}, assigned_metrics, {})
+        self.assertEqual(worker.spin_workers_completed_q.get_nowait(), (2, 1.0))
+
+    @patch.object(analyzer, 'ANALYZER_METADATA_SNAPSHOT', False)
+    @patch.object(analyzer, 'ANALYZER_PERSISTENT_WORKERS_MAX_RUNS', 2)
+    def test_spin_worker_exits_after_max_runs(self):
+        worker = Mock()
+        worker.spin_workers_completed_q = Queue()
+        assignment_q = Queue()
+        for run_id in range(3):
+            assignment_q.put((run_id, ['metrics.a'], {}, ['metrics.a']))
+        analyzer.Analyzer.spin_worker(worker, 1, assignment_q)
+        self.assertEqual(worker.spin_process.call_count, 2)
+        self.assertEqual(assignment_q.qsize(), 1)
+
+
+# @added 20261020 - Feature #5762: analyzer - cost balanced assigned_metrics
+class TestCostBalancedAssignedMetrics(unittest.TestCase):
+    """
+    Test that the metrics are divided between the processes by analysis cost
+    """
+
+    def test_expensive_metrics_are_spread(self):
+        unique_metrics = ['metrics.%s' % str(i) for i in range(8)]
+        metrics_analysis_cost = {
+            'metrics.0': 10.0, 'metrics.1': 10.0, 'metrics.2': 1.0,
+            'metrics.3': 1.0, 'metrics.4': 1.0, 'metrics.5': 1.0,
+            'metrics.6': 1.0, 'metrics.7': 1.0}
+        assigned_metrics_lists = get_cost_balanced_assigned_metrics(
+            None, 2, unique_metrics, metrics_analysis_cost)
+        self.assertEqual(len(assigned_metrics_lists), 2)
+        process_costs = sorted(
+            sum(metrics_analysis_cost[metric] for metric in assigned_metrics)
+            for assigned_metrics in assigned_metrics_lists)
+        self.assertEqual(process_costs, [13.0, 13.0])
+        # Each expensive metric is assigned to a different process
+        self.assertNotEqual(
+            'metrics.0' in assigned_metrics_lists[0],
+            'metrics.1' in assigned_metrics_lists[0])
+
+    def test_all_metrics_assigned_once_in_order(self):
+        unique_metrics = ['metrics.%s' % str(i) for i in range(10)]
+        metrics_analysis_cost = {'metrics.%s' % str(i): float(i) for i in range(10)}
+        assigned_metrics_lists = get_cost_balanced_assigned_metrics(
+            None, 3, unique_metrics, metrics_analysis_cost)
+        assigned = [metric for assigned_metrics in assigned_metrics_lists for metric in assigned_metrics]
+        self.assertEqual(sorted(assigned), sorted(unique_metrics))
+        for assigned_metrics in assigned_metrics_lists:
+            self.assertEqual(
+                assigned_metrics,
+                sorted(assigned_metrics, key=unique_metrics.index))
+
+    def test_unknown_costs_use_the_median(self):
+        unique_metrics = ['metrics.a', 'metrics.b', 'metrics.c', 'metrics.d']
+        metrics_analysis_cost = {'metrics.a': 3.0, 'metrics.b': 'nan?', 'metrics.c': 1.0}
+        assigned_metrics_lists = get_cost_balanced_assigned_metrics(
+            None, 2, unique_metrics, metrics_analysis_cost)
+        # b and d are assigned the median cost of 2.0
+        self.assertIn(['metrics.a', 'metrics.c'], assigned_metrics_lists)
+        self.assertIn(['metrics.b', 'metrics.d'], assigned_metrics_lists)
+
+    def test_single_process(self):
+        unique_metrics = ['metrics.a', 'metrics.b']
+        assigned_metrics_lists = get_cost_balanced_assigned_metrics(
+            None, 0, unique_metrics, {})
+        self.assertEqual(assigned_metrics_lists, [unique_metrics])
+
+
+if __name__ == '__main__':
+    unittest.main()
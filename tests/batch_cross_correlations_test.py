@@ -0,0 +1,89 @@
+"""
+batch_cross_correlations_test.py
+"""
+# @added 20261110 - Feature #5783: luminosity - batch correlations
+import unittest
+
+import math
+import os.path
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.luminosity.batch_cross_correlations import batch_cross_correlations
+
+START = 1762128000
+
+# The (coefficient, shift, shifted_coefficient) results of the luminol 0.4
+# Correlator(anomaly_ts_dict, correlate_ts_dict, time_period) for each of the
+# candidate time series below
+LUMINOL_REFERENCE_RESULTS = {
+    'same': (0.9999999999999999, 0, 0.9999999999999999),
+    'shifted': (0.986309075854602, 60, 0.9863583913083949),
+    'noise': (0.5552006040912817, 120, 0.5552561241516908),
+    'gappy': (0.6678452788101011, 0, 0.6678452788101011),
+}
+
+
+class TestBatchCrossCorrelations(unittest.TestCase):
+    """
+    Test that batch_cross_correlations returns the luminol Correlator results
+    """
+
+    def anomalous_ts(self):
+        return [
+            [START + (i * 60), 1.0 + math.sin(i / 3.0) + (20.0 if i == 30 else 0)]
+            for i in range(40)]
+
+    def candidates(self):
+        anomalous_ts = self.anomalous_ts()
+        return {
+            'same': [[ts, value * 2] for ts, value in anomalous_ts],
+            'shifted': [
+                [START + (i * 60), 1.0 + math.sin((i - 1) / 3.0) + (20.0 if i == 31 else 0)]
+                for i in range(40)],
+            'noise': [[START + (i * 60), ((i * 7919) % 13) / 3.0] for i in range(40)],
+            'gappy': [
+                [START + (i * 60), 1.0 + math.cos(i / 2.0) + (15.0 if i == 30 else 0)]
+                for i in range(40) if i % 4 != 1],
+        }
+
+    def test_luminol_reference_results(self):
+        time_period = (START + (26 * 60), START + (34 * 60))
+        candidates = [
+            (key, timeseries, time_period)
+            for key, timeseries in self.candidates().items()]
+        results = batch_cross_correlations('test', self.anomalous_ts(), candidates)
+        for key, reference in LUMINOL_REFERENCE_RESULTS.items():
+            coefficient, shift, shifted_coefficient = results[key]
+            self.assertAlmostEqual(coefficient, reference[0], places=9)
+            self.assertEqual(shift, reference[1])
+            self.assertAlmostEqual(shifted_coefficient, reference[2], places=9)
+
+    def test_cropped_candidates(self):
+        # Cropping the candidate time series to the time_period does not change
+        # the results
+        time_period = (START + (26 * 60), START + (34 * 60))
+        candidates = [
+            (key, [item for item in timeseries if time_period[0] <= item[0] <= time_period[1]], time_period)
+            for key, timeseries in self.candidates().items()]
+        results = batch_cross_correlations('test', self.anomalous_ts(), candidates)
+        for key, reference in LUMINOL_REFERENCE_RESULTS.items():
+            self.assertAlmostEqual(results[key][0], reference[0], places=9)
+            self.assertEqual(results[key][1], reference[1])
+
+    def test_not_enough_datapoints(self):
+        time_period = (START + (26 * 60), START + (34 * 60))
+        results = batch_cross_correlations(
+            'test', self.anomalous_ts(), [
+                ('short', [[START + (30 * 60), 1.0]], time_period),
+                ('outside', [[START, 1.0], [START + 60, 2.0]], time_period)])
+        self.assertEqual(results, {'short': None, 'outside': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
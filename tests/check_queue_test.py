@@ -0,0 +1,117 @@
+"""
+check_queue_test.py
+"""
+# @added 20261026 - Feature #5768: check queue
+import unittest
+
+from mock import Mock
+import os.path
+import shutil
+import sys
+import tempfile
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.redis.check_queue import (
+        add_check_to_queue, check_queue_key, fail_queued_check,
+        get_queued_checks, remove_queued_check)
+
+
+class HashRedis(object):
+    """
+    The Redis hash methods used by the check queue, backed by a dict with the
+    bytes keys that a not decoded Redis connection returns
+    """
+    def __init__(self):
+        self.hashes = {}
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field.encode('utf-8')] = value
+        return 1
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key, field):
+        if self.hashes.get(key, {}).pop(field.encode('utf-8'), None) is None:
+            return 0
+        return 1
+
+
+class TestCheckQueue(unittest.TestCase):
+    """
+    Test that checks are added to, read from, removed from and failed out of
+    the check queue with their typed metric variables
+    """
+
+    def setUp(self):
+        self.redis_conn = HashRedis()
+        self.metric_vars = [
+            ['metric', 'test.metric'], ['value', 1.5],
+            ['hours_to_resolve', 168], ['metric_timestamp', 1762128000],
+            ['snab_only_check', False], ['triggered_algorithms', ['histogram_bins', 'ks_test']]]
+        self.check_file = '/opt/skyline/mirage/check/1762128000.test.metric.txt'
+
+    def test_add_and_get(self):
+        self.assertTrue(add_check_to_queue(
+            'test', 'mirage', self.check_file, self.metric_vars, redis_conn=self.redis_conn))
+        self.assertIn('mirage.check_queue', self.redis_conn.hashes)
+        self.assertEqual(check_queue_key('mirage'), 'mirage.check_queue')
+        queued_checks = get_queued_checks('test', 'mirage', redis_conn=self.redis_conn)
+        self.assertEqual(list(queued_checks.keys()), ['1762128000.test.metric.txt'])
+        check_data = queued_checks['1762128000.test.metric.txt']
+        self.assertEqual(check_data['metric_vars'], self.metric_vars)
+        self.assertIsInstance(check_data['added_at'], int)
+
+    def test_same_check_is_deduplicated(self):
+        add_check_to_queue('test', 'mirage', self.check_file, self.metric_vars, redis_conn=self.redis_conn)
+        add_check_to_queue('test', 'mirage', self.check_file, self.metric_vars, redis_conn=self.redis_conn)
+        self.assertEqual(len(get_queued_checks('test', 'mirage', redis_conn=self.redis_conn)), 1)
+
+    def test_remove(self):
+        add_check_to_queue('test', 'mirage', self.check_file, self.metric_vars, redis_conn=self.redis_conn)
+        self.assertTrue(remove_queued_check('test', 'mirage', self.check_file, redis_conn=self.redis_conn))
+        self.assertFalse(remove_queued_check('test', 'mirage', self.check_file, redis_conn=self.redis_conn))
+        self.assertEqual(get_queued_checks('test', 'mirage', redis_conn=self.redis_conn), {})
+
+    def test_bad_check_data_is_skipped(self):
+        add_check_to_queue('test', 'mirage', self.check_file, self.metric_vars, redis_conn=self.redis_conn)
+        self.redis_conn.hset('mirage.check_queue', 'bad.txt', b'\xc1')
+        queued_checks = get_queued_checks('test', 'mirage', redis_conn=self.redis_conn)
+        self.assertEqual(list(queued_checks.keys()), ['1762128000.test.metric.txt'])
+
+    def test_redis_errors(self):
+        redis_conn = Mock()
+        redis_conn.hset.side_effect = Exception('redis down')
+        redis_conn.hgetall.side_effect = Exception('redis down')
+        redis_conn.hdel.side_effect = Exception('redis down')
+        self.assertFalse(add_check_to_queue(
+            'test', 'mirage', self.check_file, self.metric_vars, redis_conn=redis_conn))
+        self.assertEqual(get_queued_checks('test', 'mirage', redis_conn=redis_conn), {})
+        self.assertFalse(remove_queued_check('test', 'mirage', self.check_file, redis_conn=redis_conn))
+
+    def test_fail(self):
+        failed_check_dir = tempfile.mkdtemp()
+        try:
+            add_check_to_queue('test', 'mirage', self.check_file, self.metric_vars, redis_conn=self.redis_conn)
+            check_data = get_queued_checks('test', 'mirage', redis_conn=self.redis_conn)['1762128000.test.metric.txt']
+            failed_check_file = fail_queued_check(
+                'test', 'mirage', failed_check_dir + '/failed', self.check_file,
+                check_data, redis_conn=self.redis_conn)
+            self.assertEqual(failed_check_file, failed_check_dir + '/failed/1762128000.test.metric.txt')
+            with open(failed_check_file) as fh:
+                lines = fh.readlines()
+            self.assertEqual(lines[0], 'metric = "test.metric"\n')
+            self.assertEqual(lines[1], 'value = "1.5"\n')
+            self.assertEqual(lines[5], "triggered_algorithms = ['histogram_bins', 'ks_test']\n")
+            self.assertEqual(get_queued_checks('test', 'mirage', redis_conn=self.redis_conn), {})
+        finally:
+            shutil.rmtree(failed_check_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+flux_listen_accounting_test.py
+"""
+# @added 20261108 - Feature #5781: flux - listen accounting
+import unittest
+
+from mock import Mock, patch
+from os import getpid
+import os.path
+import sys
+import threading
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.flux.listen_accounting import ListenAccounting
+
+
+class TestListenAccountingFlush(unittest.TestCase):
+    """
+    Test that ListenAccounting.flush writes the accumulated data to Redis in
+    one pipeline and resets it
+    """
+
+    def listen_accounting(self):
+        accounting = ListenAccounting('flux', flush_interval=60)
+        # Do not start the flusher thread
+        accounting.pid = getpid()
+        accounting.lock = threading.Lock()
+        accounting.redis_conn = Mock()
+        self.pipe = Mock()
+        accounting.redis_conn.pipeline.return_value = self.pipe
+        return accounting
+
+    def test_flush(self):
+        accounting = self.listen_accounting()
+        accounting.sadd('flux.listen.discarded.invalid_value', 'metrics.a', 'metrics.b')
+        accounting.sadd('flux.listen.discarded.invalid_value', 'metrics.a')
+        self.assertEqual(accounting.incr('flux.listen.added_to_queue'), 1)
+        self.assertEqual(accounting.incrby('flux.listen.added_to_queue', 4), 5)
+        accounting.expire('flux.namespace_quota.test', 60)
+        self.assertTrue(accounting.flush())
+        accounting.redis_conn.pipeline.assert_called_once_with(transaction=False)
+        sadd_args = self.pipe.sadd.call_args[0]
+        self.assertEqual(sadd_args[0], 'flux.listen.discarded.invalid_value')
+        self.assertEqual(sorted(sadd_args[1:]), ['metrics.a', 'metrics.b'])
+        self.pipe.incrby.assert_called_once_with('flux.listen.added_to_queue', 5)
+        self.pipe.expire.assert_called_once_with('flux.namespace_quota.test', 60)
+        self.pipe.execute.assert_called_once_with()
+        self.assertEqual((accounting.sets, accounting.counters, accounting.expires), ({}, {}, {}))
+
+    def test_flush_nothing_to_flush(self):
+        accounting = self.listen_accounting()
+        self.assertTrue(accounting.flush())
+        accounting.redis_conn.pipeline.assert_not_called()
+
+    @patch('functions.flux.listen_accounting.MEMCACHE_ENABLED', True)
+    @patch('functions.flux.listen_accounting.incr_memcache_key')
+    def test_flush_redis_failure(self, mock_incr_memcache_key):
+        accounting = self.listen_accounting()
+        self.pipe.execute.side_effect = Exception('redis down')
+        accounting.sadd('flux.listen.discarded.invalid_value', 'metrics.a')
+        accounting.incrby('flux.listen.added_to_queue', 3)
+        self.assertFalse(accounting.flush())
+        mock_incr_memcache_key.assert_called_once_with('flux', 'flux.listen.added_to_queue', 3)
+        self.assertIsNone(accounting.redis_conn)
+        self.assertEqual(accounting.counters, {})
+
+    def test_flush_in_another_process(self):
+        accounting = self.listen_accounting()
+        accounting.incr('flux.listen.added_to_queue')
+        accounting.pid = -1
+        self.assertFalse(accounting.flush())
+        accounting.redis_conn.pipeline.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
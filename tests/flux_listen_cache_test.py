@@ -0,0 +1,100 @@
+"""
+flux_listen_cache_test.py
+"""
+# @added 20261109 - Feature #5782: flux - listen cache
+import unittest
+
+from mock import Mock
+from os import getpid
+from time import time
+import os.path
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.flux.listen_cache import ListenCache
+
+
+class TestListenCache(unittest.TestCase):
+    """
+    Test that the ListenCache resolves the API keys and namespace quotas from
+    the Redis data and only rebuilds them when the data changes
+    """
+
+    def redis_conn(self, pipeline_results):
+        redis_conn_decoded = Mock()
+        pipes = []
+        for results in pipeline_results:
+            pipe = Mock()
+            pipe.execute.return_value = results
+            pipes.append(pipe)
+        redis_conn_decoded.pipeline.side_effect = pipes
+        return redis_conn_decoded
+
+    def listen_cache(self, pipeline_results):
+        listen_cache = ListenCache(
+            'flux', flux_api_keys={'settings_key': 'settings.namespace'},
+            flux_self_api_key='self_key')
+        listen_cache.redis_conn_decoded = self.redis_conn(pipeline_results)
+        # Do not start the refresher thread
+        listen_cache.pid = getpid()
+        return listen_cache
+
+    def test_validate_key(self):
+        external_settings = str({
+            'test': {'flux_token': 'external_key', 'namespace': 'external'}})
+        listen_cache = self.listen_cache([[None, external_settings, {}]])
+        self.assertEqual(listen_cache.refresh(), 1)
+        self.assertEqual(listen_cache.validate_key('settings_key'), (True, 'settings.namespace'))
+        self.assertEqual(listen_cache.validate_key('external_key'), (True, 'external'))
+        self.assertEqual(listen_cache.validate_key('self_key'), (True, None))
+        self.assertEqual(listen_cache.validate_key('unknown_key'), (False, None))
+
+    def test_refresh_only_versions_changes(self):
+        external_settings = str({
+            'test': {'flux_token': 'external_key', 'namespace': 'external'}})
+        changed_external_settings = str({
+            'test': {'flux_token': 'new_key', 'namespace': 'external'}})
+        listen_cache = self.listen_cache([
+            [None, external_settings, {}],
+            [None, external_settings, {}],
+            ['1', changed_external_settings, {}],
+        ])
+        self.assertEqual(listen_cache.refresh(), 1)
+        self.assertEqual(listen_cache.refresh(), 1)
+        self.assertEqual(listen_cache.refresh(), 2)
+        self.assertEqual(listen_cache.validate_key('external_key'), (False, None))
+        self.assertEqual(listen_cache.validate_key('new_key'), (True, 'external'))
+
+    def test_refresh_namespace_quotas(self):
+        listen_cache = self.listen_cache([
+            [None, None, {'quota_namespace': '100', 'bad_namespace': 'none', 'no_quota': '0'}],
+            [{'quota_namespace.a', 'quota_namespace.b'}, 7],
+        ])
+        listen_cache.refresh()
+        self.assertEqual(listen_cache.get_namespace_quota('quota_namespace'), 100)
+        self.assertEqual(listen_cache.get_namespace_quota('bad_namespace'), 0)
+        self.assertEqual(listen_cache.get_namespace_quota('unknown'), 0)
+        self.assertEqual(
+            listen_cache.get_namespace_metrics('quota_namespace'),
+            {'quota_namespace.a', 'quota_namespace.b'})
+        self.assertEqual(listen_cache.get_namespace_metrics('no_quota'), set())
+        if int(time()) // 60 * 60 == listen_cache.snapshot['namespace_metric_counts']['quota_namespace'][0]:
+            self.assertEqual(listen_cache.get_namespace_metric_count('quota_namespace'), 7)
+
+    def test_refresh_keeps_the_snapshot_on_failure(self):
+        listen_cache = self.listen_cache([[None, None, {}]])
+        listen_cache.refresh()
+        listen_cache.redis_conn_decoded.pipeline.side_effect = Exception('redis down')
+        with self.assertRaises(Exception):
+            listen_cache.refresh()
+        self.assertEqual(listen_cache.validate_key('self_key'), (True, None))
+        self.assertEqual(listen_cache.snapshot['version'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
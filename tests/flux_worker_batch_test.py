@@ -0,0 +1,103 @@
+"""
+flux_worker_batch_test.py
+"""
+# @added 20261107 - Feature #5780: flux - worker batch mode
+import unittest
+
+from mock import Mock
+from queue import Queue
+import os.path
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.flux.worker_batch import (
+        get_metric_data_batch, prefetch_last_metric_data)
+
+
+class TestGetMetricDataBatch(unittest.TestCase):
+    """
+    Test that the batch is drained from the queue up to the batch size
+    """
+
+    def test_batch_size(self):
+        q = Queue()
+        for i in range(5):
+            q.put(['metrics.%s' % str(i), 1.0, 1666700000, 0])
+        metric_data_batch = get_metric_data_batch(q, ['metrics.first', 1.0, 1666700000, 0], 4)
+        self.assertEqual(
+            [item[0] for item in metric_data_batch],
+            ['metrics.first', 'metrics.0', 'metrics.1', 'metrics.2'])
+        self.assertEqual(q.qsize(), 2)
+
+    def test_empty_queue(self):
+        metric_data_batch = get_metric_data_batch(Queue(), ['metrics.first', 1.0, 1666700000, 0], 500)
+        self.assertEqual(list(metric_data_batch), [['metrics.first', 1.0, 1666700000, 0]])
+
+
+class TestPrefetchLastMetricData(unittest.TestCase):
+    """
+    Test that the last metric data of each metric in a batch is fetched once in
+    a single pipeline
+    """
+
+    def redis_conn(self, results):
+        redis_conn_decoded = Mock()
+        pipe = Mock()
+        pipe.execute.return_value = results
+        redis_conn_decoded.pipeline.return_value = pipe
+        return redis_conn_decoded, pipe
+
+    def test_metrics_deduplicated(self):
+        metric_data_batch = [
+            ['metrics.b', 1.0, 1666700060, 0],
+            ['metrics.a', 1.0, 1666700060, 0],
+            ['metrics.b', 2.0, 1666700120, 0],
+            ['metrics.a', 2.0, 1666700120, 0],
+        ]
+        redis_conn_decoded, pipe = self.redis_conn([
+            ["{'timestamp': 1666700000, 'value': 1.0}", None],
+            [None, '1666699940'],
+        ])
+        batch_last_metric_data = prefetch_last_metric_data(
+            'test', redis_conn_decoded, metric_data_batch)
+        redis_conn_decoded.pipeline.assert_called_once_with(transaction=False)
+        pipe.hmget.assert_called_once_with('flux.last.metric_data', ['metrics.a', 'metrics.b'])
+        pipe.mget.assert_called_once_with(['flux.last.metrics.a', 'flux.last.metrics.b'])
+        self.assertEqual(batch_last_metric_data, {
+            'metrics.a': {
+                'last_metric_data_dict': {'timestamp': 1666700000, 'value': 1.0},
+                'last_metric_data': None},
+            'metrics.b': {
+                'last_metric_data_dict': {},
+                'last_metric_data': '1666699940'},
+        })
+
+    def test_backfill_and_check_metrics(self):
+        metric_data_batch = [
+            ['metrics.backfill', 1.0, 1666700060, 1],
+            ['metrics.vista', 1.0, 1666700060, 1],
+            ['metrics.a', 1.0, 1666700060, 0],
+            ['metrics.bad'],
+        ]
+        redis_conn_decoded, pipe = self.redis_conn([['bad dict', None], [None, None]])
+        batch_last_metric_data = prefetch_last_metric_data(
+            'test', redis_conn_decoded, metric_data_batch,
+            check_metrics=['metrics.vista'])
+        pipe.hmget.assert_called_once_with('flux.last.metric_data', ['metrics.a', 'metrics.vista'])
+        self.assertEqual(batch_last_metric_data['metrics.a']['last_metric_data_dict'], {})
+
+    def test_last_timestamp_not_checked(self):
+        redis_conn_decoded, pipe = self.redis_conn([])
+        self.assertEqual(prefetch_last_metric_data(
+            'test', redis_conn_decoded, [['metrics.a', 1.0, 1666700060, 0]],
+            check_last_timestamp=False), {})
+        redis_conn_decoded.pipeline.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+fp_features_matrix_test.py
+"""
+# @added 20261029 - Feature #5771: ionosphere - fp features matrix
+import unittest
+
+from mock import Mock
+import os.path
+import sys
+
+import numpy as np
+from msgpack import packb
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.ionosphere.get_fp_features_matrix import (
+        get_fp_features_matrix, get_fp_features_scores)
+
+
+class TestGetFpFeaturesScores(unittest.TestCase):
+    """
+    Test that get_fp_features_scores returns the same common feature counts and
+    sums as comparing the calculated features to each features profile in turn
+    """
+
+    fp_features = {
+        1: {1: 1.5, 2: 0.0, 3: 2.25, 4: -1.0},
+        2: {1: 1.0, 3: 2.0},
+        3: {5: 7.0},
+        4: {2: 3.0, 4: 0.5, 6: 10.0},
+    }
+
+    def fp_features_matrix(self, fp_ids):
+        feature_ids = sorted(set().union(*[self.fp_features[fp_id].keys() for fp_id in fp_ids]))
+        values = np.full((len(fp_ids), len(feature_ids)), np.nan)
+        for row, fp_id in enumerate(fp_ids):
+            for feature_id, value in self.fp_features[fp_id].items():
+                values[row, feature_ids.index(feature_id)] = value
+        return {'fp_ids': fp_ids, 'feature_ids': feature_ids, 'values': values}
+
+    def brute_force_scores(self, fp_ids, calc_features_by_id):
+        scores = {}
+        for fp_id in fp_ids:
+            count = 0
+            fp_sum = 0.0
+            calc_sum = 0.0
+            for feature_id, calc_value in calc_features_by_id:
+                if feature_id in self.fp_features[fp_id]:
+                    count += 1
+                    fp_sum += self.fp_features[fp_id][feature_id]
+                    calc_sum += calc_value
+            scores[fp_id] = {'count': count, 'fp_sum': fp_sum, 'calc_sum': calc_sum}
+        return scores
+
+    def test_matches_brute_force(self):
+        fp_ids = [1, 2, 3, 4]
+        # Feature 7 is not a feature of any fp and feature 5 is only in fp 3
+        calc_features_by_id = [[1, 1.25], [2, 0.5], [3, 2.5], [4, 0.0], [6, 9.0], [7, 100.0]]
+        fp_features_scores = get_fp_features_scores(
+            self.fp_features_matrix(fp_ids), calc_features_by_id)
+        expected = self.brute_force_scores(fp_ids, calc_features_by_id)
+        self.assertEqual(sorted(fp_features_scores.keys()), fp_ids)
+        for fp_id in fp_ids:
+            self.assertEqual(fp_features_scores[fp_id]['count'], expected[fp_id]['count'])
+            self.assertAlmostEqual(fp_features_scores[fp_id]['fp_sum'], expected[fp_id]['fp_sum'])
+            self.assertAlmostEqual(fp_features_scores[fp_id]['calc_sum'], expected[fp_id]['calc_sum'])
+        self.assertEqual(fp_features_scores[3], {'count': 0, 'fp_sum': 0.0, 'calc_sum': 0.0})
+
+    def test_random_features_match_brute_force(self):
+        rng = np.random.RandomState(42)
+        self.fp_features = {}
+        for fp_id in range(1, 21):
+            feature_ids = rng.choice(range(1, 200), size=rng.randint(1, 150), replace=False)
+            self.fp_features[fp_id] = {int(feature_id): float(rng.normal()) for feature_id in feature_ids}
+        calc_features_by_id = [
+            [int(feature_id), float(rng.normal())]
+            for feature_id in rng.choice(range(1, 220), size=180, replace=False)]
+        fp_ids = list(self.fp_features.keys())
+        fp_features_scores = get_fp_features_scores(
+            self.fp_features_matrix(fp_ids), calc_features_by_id)
+        expected = self.brute_force_scores(fp_ids, calc_features_by_id)
+        for fp_id in fp_ids:
+            self.assertEqual(fp_features_scores[fp_id]['count'], expected[fp_id]['count'])
+            self.assertAlmostEqual(fp_features_scores[fp_id]['fp_sum'], expected[fp_id]['fp_sum'])
+            self.assertAlmostEqual(fp_features_scores[fp_id]['calc_sum'], expected[fp_id]['calc_sum'])
+
+    def test_no_fps(self):
+        self.assertEqual(get_fp_features_scores({}, [[1, 1.0]]), {})
+        self.assertEqual(get_fp_features_scores(
+            {'fp_ids': [], 'feature_ids': [], 'values': np.empty((0, 0))}, [[1, 1.0]]), {})
+
+
+class TestGetFpFeaturesMatrix(unittest.TestCase):
+    """
+    Test that the cached fp features matrix is used and that removed fp ids are
+    removed from the cache
+    """
+
+    def test_cached_matrix(self):
+        values = np.array([[1.0, np.nan, 2.0], [1.5, 0.5, np.nan], [3.0, 3.0, 3.0]])
+        redis_conn = Mock()
+        redis_conn.get.return_value = packb({
+            'fp_ids': [1, 2, 3], 'feature_ids': [1, 2, 3],
+            'values': values.tobytes()}, use_bin_type=True)
+        fp_features_matrix = get_fp_features_matrix(
+            'test', 10, ['2', 1], engine=Mock(), redis_conn=redis_conn)
+        redis_conn.get.assert_called_once_with('ionosphere.fp_features_matrix.10')
+        self.assertEqual(fp_features_matrix['fp_ids'], [2, 1])
+        self.assertEqual(fp_features_matrix['feature_ids'], [1, 2, 3])
+        np.testing.assert_array_equal(
+            fp_features_matrix['values'], np.array([[1.5, 0.5, np.nan], [1.0, np.nan, 2.0]]))
+        # fp id 3 was removed so the cache is updated
+        self.assertEqual(redis_conn.setex.call_count, 1)
+        self.assertEqual(redis_conn.setex.call_args[0][0], 'ionosphere.fp_features_matrix.10')
+
+    def test_cache_unchanged(self):
+        values = np.array([[1.0, 2.0]])
+        redis_conn = Mock()
+        redis_conn.get.return_value = packb({
+            'fp_ids': [1], 'feature_ids': [4, 5], 'values': values.tobytes()},
+            use_bin_type=True)
+        fp_features_matrix = get_fp_features_matrix(
+            'test', 10, [1], engine=Mock(), redis_conn=redis_conn)
+        self.assertEqual(fp_features_matrix['feature_ids'], [4, 5])
+        redis_conn.setex.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+fp_timeseries_store_test.py
+"""
+# @added 20261102 - Feature #5775: ionosphere - fp timeseries store
+import unittest
+
+from mock import patch
+import os.path
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.ionosphere import fp_timeseries_store
+
+
+class TestFpTimeseriesStore(unittest.TestCase):
+    """
+    Test that the mapped fp time series stores are bounded and that fps can be
+    removed from a store
+    """
+
+    def setUp(self):
+        self.store_dir = tempfile.mkdtemp()
+        self.dir_patch = patch.object(
+            fp_timeseries_store, 'IONOSPHERE_FP_TIMESERIES_STORE_DIR', self.store_dir)
+        self.dir_patch.start()
+        fp_timeseries_store.fp_timeseries_stores.clear()
+
+    def tearDown(self):
+        self.dir_patch.stop()
+        fp_timeseries_store.fp_timeseries_stores.clear()
+        shutil.rmtree(self.store_dir)
+
+    def fp_timeseries(self, fp_ids):
+        return {
+            fp_id: {
+                'timestamps': np.array([1666700000, 1666700060, 1666700120]),
+                'values': np.array([1.0, 3.0, float(fp_id)]),
+            } for fp_id in fp_ids}
+
+    def test_write_and_load(self):
+        self.assertTrue(fp_timeseries_store.write_fp_timeseries_store(
+            'test', 1, self.fp_timeseries([10, 11])))
+        stored = fp_timeseries_store.load_fp_timeseries_store('test', 1)
+        self.assertEqual(sorted(stored.keys()), [10, 11])
+        self.assertEqual(stored[11]['values'].tolist(), [1.0, 3.0, 11.0])
+        self.assertEqual(stored[11]['min'], 1.0)
+        self.assertEqual(stored[11]['max'], 11.0)
+        self.assertEqual(stored[11]['minmax_values'].tolist(), [0.0, 0.2, 1.0])
+
+    @patch.object(fp_timeseries_store, 'IONOSPHERE_FP_TIMESERIES_STORE_MAX_MAPPED', 2)
+    def test_mapped_stores_are_bounded(self):
+        for metric_id in [1, 2, 3]:
+            fp_timeseries_store.write_fp_timeseries_store(
+                'test', metric_id, self.fp_timeseries([metric_id]))
+        fp_timeseries_store.load_fp_timeseries_store('test', 1)
+        fp_timeseries_store.load_fp_timeseries_store('test', 2)
+        # 1 is used again so 2 is the least recently used
+        fp_timeseries_store.load_fp_timeseries_store('test', 1)
+        fp_timeseries_store.load_fp_timeseries_store('test', 3)
+        self.assertEqual(list(fp_timeseries_store.fp_timeseries_stores.keys()), [1, 3])
+
+    def test_remove_fps(self):
+        fp_timeseries_store.write_fp_timeseries_store(
+            'test', 1, self.fp_timeseries([10, 11]))
+        self.assertTrue(fp_timeseries_store.remove_fp_timeseries_store_fps('test', 1, [10]))
+        stored = fp_timeseries_store.load_fp_timeseries_store('test', 1)
+        self.assertEqual(list(stored.keys()), [11])
+        self.assertEqual(stored[11]['values'].tolist(), [1.0, 3.0, 11.0])
+        self.assertTrue(fp_timeseries_store.remove_fp_timeseries_store_fps('test', 1, [11]))
+        self.assertFalse(os.path.isfile(fp_timeseries_store.get_fp_timeseries_store_path(1)))
+        self.assertEqual(fp_timeseries_store.load_fp_timeseries_store('test', 1), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+full_duration_cache_test.py
+"""
+# @added 20261105 - Feature #5778: mirage - full duration cache
+import unittest
+
+from mock import Mock
+import os.path
+import sys
+
+from msgpack import packb
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.mirage.full_duration_cache import (
+        full_duration_cache_key, full_duration_cache_mismatch_key,
+        get_full_duration_cache, merge_full_duration_cache,
+        set_full_duration_cache_resolution_mismatch)
+
+
+class TestFullDurationCache(unittest.TestCase):
+    """
+    Test that the full duration cache only merges data fetched at the cached
+    resolution and that a recorded resolution mismatch disables the cache
+    """
+
+    def cache(self, start=1000, resolution=600, points=10):
+        timeseries = [[start + (i * resolution), float(i)] for i in range(points)]
+        return {
+            'resolution': resolution,
+            'timeseries': timeseries,
+            'fetch_from': timeseries[-1][0] - resolution,
+        }
+
+    def test_merge_replaces_the_last_cached_bucket(self):
+        full_duration_cache = self.cache()
+        # The last cached bucket (6400) was not filled when it was cached
+        fetched = [[5800, 9.0], [6400, 100.0], [7000, 101.0], [7600, 102.0]]
+        merged = merge_full_duration_cache(
+            'test', full_duration_cache, fetched, 2200, 7600)
+        self.assertEqual(merged[0], [2200.0, 2.0])
+        self.assertEqual(merged[-3:], [[6400.0, 100.0], [7000.0, 101.0], [7600.0, 102.0]])
+        timestamps = [item[0] for item in merged]
+        self.assertEqual(timestamps, list(range(2200, 7601, 600)))
+
+    def test_merge_resolution_mismatch(self):
+        full_duration_cache = self.cache()
+        fetched = [[5800 + (i * 60), 1.0] for i in range(40)]
+        self.assertIsNone(merge_full_duration_cache(
+            'test', full_duration_cache, fetched, 1000, 8200))
+
+    def test_merge_unaligned_timestamps(self):
+        full_duration_cache = self.cache()
+        fetched = [[5830, 1.0], [6430, 1.0], [7030, 1.0]]
+        self.assertIsNone(merge_full_duration_cache(
+            'test', full_duration_cache, fetched, 1000, 7030))
+
+    def test_merge_no_fetched_data(self):
+        full_duration_cache = self.cache()
+        self.assertIsNone(merge_full_duration_cache(
+            'test', full_duration_cache, [], 1000, 7000))
+        self.assertIsNone(merge_full_duration_cache(
+            'test', full_duration_cache, None, 1000, 7000))
+
+    def test_get_full_duration_cache_skipped_on_resolution_mismatch(self):
+        full_duration_cache = self.cache()
+        packed_cache = packb({
+            'resolution': full_duration_cache['resolution'],
+            'timeseries': full_duration_cache['timeseries']})
+        redis_conn = Mock()
+        redis_conn.mget.return_value = [packed_cache, None]
+        cache = get_full_duration_cache(
+            'test', redis_conn, 'test.metric', 168, 1000, 7000)
+        self.assertEqual(cache['fetch_from'], 5800)
+        redis_conn.mget.assert_called_with([
+            full_duration_cache_key('test.metric', 168),
+            full_duration_cache_mismatch_key('test.metric', 168)])
+
+        redis_conn.mget.return_value = [packed_cache, b'1']
+        self.assertIsNone(get_full_duration_cache(
+            'test', redis_conn, 'test.metric', 168, 1000, 7000))
+
+    def test_set_full_duration_cache_resolution_mismatch(self):
+        redis_conn = Mock()
+        self.assertTrue(set_full_duration_cache_resolution_mismatch(
+            'test', redis_conn, 'test.metric', 168, ttl=60))
+        redis_conn.setex.assert_called_with(
+            full_duration_cache_mismatch_key('test.metric', 168), 60, 1)
+        redis_conn.delete.assert_called_with(
+            full_duration_cache_key('test.metric', 168))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+motif_search_test.py
+"""
+# @added 20261101 - Feature #5774: ionosphere - batched motif search
+import unittest
+
+import os.path
+import sys
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.ionosphere.motif_search import (
+        batched_motif_search, get_motif_search_method, sliding_distance_profiles)
+
+
+def brute_force_distance_profile(values, query):
+    """
+    The z-normalised Euclidean distance of the query to every window of values
+    """
+    m = len(query)
+    z_query = (query - query.mean()) / query.std()
+    distances = []
+    for position in range(len(values) - m + 1):
+        window = values[position:(position + m)]
+        if window.std() == 0:
+            distances.append(np.nan)
+            continue
+        z_window = (window - window.mean()) / window.std()
+        distances.append(np.sqrt(np.sum((z_window - z_query) ** 2)))
+    return np.array(distances)
+
+
+class TestMotifSearch(unittest.TestCase):
+    """
+    Test that the batched motif search distances and motifs are the same as a
+    brute force z-normalised Euclidean distance search
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.fps_values = {
+            1: np.cumsum(rng.normal(size=300)) + 1000.0,
+            2: np.sin(np.arange(250) / 5.0) * 10 + rng.normal(scale=0.1, size=250),
+            3: np.concatenate((np.full(40, 5.0), rng.normal(size=160))),
+            # Shorter than the query
+            4: rng.normal(size=10),
+        }
+        self.query = self.fps_values[2][90:120].copy()
+
+    def test_distance_profiles_match_brute_force(self):
+        distance_profiles = sliding_distance_profiles(self.fps_values, self.query)
+        self.assertEqual(sorted(distance_profiles.keys()), [1, 2, 3])
+        for fp_id, profile in distance_profiles.items():
+            expected = brute_force_distance_profile(self.fps_values[fp_id], self.query)
+            self.assertEqual(len(profile), len(expected))
+            np.testing.assert_array_equal(np.isnan(profile), np.isnan(expected))
+            np.testing.assert_allclose(
+                profile[~np.isnan(profile)], expected[~np.isnan(expected)], atol=1e-6)
+        # The query is found in its own time series
+        self.assertAlmostEqual(distance_profiles[2][90], 0.0, places=5)
+
+    def test_fft_cache(self):
+        fft_cache = {}
+        first = sliding_distance_profiles(self.fps_values, self.query, fft_cache)
+        self.assertEqual(len(fft_cache), 3)
+        second = sliding_distance_profiles(self.fps_values, self.query[::-1].copy(), fft_cache)
+        self.assertEqual(len(fft_cache), 3)
+        expected = brute_force_distance_profile(self.fps_values[1], self.query[::-1].copy())
+        np.testing.assert_allclose(second[1], expected, atol=1e-6)
+        self.assertEqual(len(first[1]), len(second[1]))
+
+    def search_job(self, fp_id, method, use_top_matches=None, max_distance=np.inf):
+        values = self.fps_values[fp_id]
+        return {
+            'fp_id': fp_id, 'fp_values': values, 'query': self.query,
+            'batch_size': len(self.query), 'method': method,
+            'use_top_matches': use_top_matches, 'max_distance': max_distance,
+            'min_y': values.min(), 'max_y': values.max(), 'range_padding': np.inf,
+            'min_y_padded': -np.inf, 'max_y_padded': np.inf,
+            'find_exact_matches': True,
+        }
+
+    def test_mass3_motifs_match_brute_force(self):
+        max_distance = 5.0
+        results = batched_motif_search('test', [
+            self.search_job(fp_id, 'mass3', max_distance=max_distance) for fp_id in [1, 2]])
+        m = len(self.query)
+        for fp_id, result in zip([1, 2], results):
+            expected = brute_force_distance_profile(self.fps_values[fp_id], self.query)
+            with np.errstate(invalid='ignore'):
+                expected_positions = np.flatnonzero(expected <= max_distance)
+            self.assertEqual(result['indices'], (expected_positions + (m - 1)).tolist())
+            np.testing.assert_allclose(result['dists'], expected[expected_positions], atol=1e-6)
+            self.assertEqual(result['candidates'], len(expected))
+            self.assertEqual(result['pruned'], len(expected) - len(expected_positions))
+
+    def test_mass2_batch_motifs_match_brute_force(self):
+        top_matches = 3
+        result = batched_motif_search('test', [
+            self.search_job(2, 'mass2_batch', use_top_matches=top_matches)])[0]
+        values = self.fps_values[2]
+        m = len(self.query)
+        batch_size = m
+        expected = brute_force_distance_profile(values, self.query)
+        # The minimum distance of the positions in each batch_size block
+        block_minimums = []
+        for block_start in range(0, len(values) - batch_size + 1, batch_size):
+            block = expected[block_start:(block_start + batch_size - m + 1)]
+            block_minimums.append((float(np.nanmin(block)), block_start + int(np.nanargmin(block))))
+        expected_top = sorted(block_minimums)[:top_matches]
+        self.assertEqual(sorted(result['indices']), sorted(index for _, index in expected_top))
+        np.testing.assert_allclose(
+            sorted(result['dists']), [dist for dist, _ in expected_top], atol=1e-6)
+        self.assertIn(90, result['indices'])
+        self.assertEqual(result['exact_match_indices'], [90])
+
+    def test_fp_shorter_than_query(self):
+        result = batched_motif_search('test', [self.search_job(4, 'mass3')])[0]
+        self.assertEqual(result['indices'], [])
+        self.assertEqual(result['candidates'], 0)
+
+    def test_get_motif_search_method(self):
+        self.assertEqual(get_motif_search_method(1000, 30, 30, 50), ('mass2_batch', 31, None))
+        self.assertEqual(get_motif_search_method(1000, 30, 30, 10), ('mass2_batch', 10, None))
+        self.assertEqual(get_motif_search_method(70, 30, 30, 10), ('mass3', None, None))
+        self.assertEqual(get_motif_search_method(90, 30, 30, 50), ('mass2_batch', 1, None))
+        self.assertEqual(
+            get_motif_search_method(31, 30, 30, 10),
+            (None, None, 'fp_timeseries length is not long enough for the query size'))
+        self.assertEqual(
+            get_motif_search_method(100, 95, 95, 10),
+            (None, None, 'the batch_size is too close to length'))
+
+
+if __name__ == '__main__':
+    unittest.main()
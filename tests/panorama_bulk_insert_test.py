@@ -0,0 +1,100 @@
+"""
+panorama_bulk_insert_test.py
+"""
+# @added 20261025 - Feature #5767: panorama - bulk insert
+import unittest
+
+from mock import Mock
+import os.path
+import sys
+
+from sqlalchemy import (
+    create_engine, select, Column, Integer, MetaData, String, Table)
+from sqlalchemy.pool import StaticPool
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+sys.path.append(skyline_dir + '/panorama')
+
+if True:
+    from panorama import panorama
+
+
+class TestPanoramaBulkInsert(unittest.TestCase):
+    """
+    Test that the bulk inserted anomalies and metrics are assigned the ids of
+    their own inserts
+    """
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool)
+        meta = MetaData()
+        self.anomalies_table = Table(
+            'anomalies', meta,
+            Column('id', Integer, primary_key=True),
+            Column('metric_id', Integer),
+            Column('anomaly_timestamp', Integer, unique=True))
+        self.metrics_table = Table(
+            'metrics', meta,
+            Column('id', Integer, primary_key=True),
+            Column('metric', String(255)))
+        meta.create_all(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def anomaly_ids_by_timestamp(self):
+        with self.engine.connect() as connection:
+            result = connection.execute(select(
+                self.anomalies_table.c.id, self.anomalies_table.c.anomaly_timestamp))
+            return {row.anomaly_timestamp: row.id for row in result.fetchall()}
+
+    def test_bulk_insert_anomalies(self):
+        # Another writer has inserted an anomaly
+        with self.engine.begin() as connection:
+            connection.execute(self.anomalies_table.insert().values(metric_id=9, anomaly_timestamp=1))
+        anomaly_rows = [
+            {'metric_id': 1, 'anomaly_timestamp': 1762128000},
+            {'metric_id': 2, 'anomaly_timestamp': 1762128060},
+            {'metric_id': 3, 'anomaly_timestamp': 1762128120}]
+        anomaly_ids = panorama.Panorama.bulk_insert_anomalies(
+            Mock(), self.engine, self.anomalies_table, anomaly_rows)
+        ids_by_timestamp = self.anomaly_ids_by_timestamp()
+        self.assertEqual(
+            anomaly_ids, [ids_by_timestamp[row['anomaly_timestamp']] for row in anomaly_rows])
+        self.assertNotIn(ids_by_timestamp[1], anomaly_ids)
+
+    def test_bulk_insert_falls_back_to_individual_inserts(self):
+        anomaly_rows = [
+            {'metric_id': 1, 'anomaly_timestamp': 1762128000},
+            {'metric_id': 2, 'anomaly_timestamp': 1762128000},
+            {'metric_id': 3, 'anomaly_timestamp': 1762128120}]
+        anomaly_ids = panorama.Panorama.bulk_insert_anomalies(
+            Mock(), self.engine, self.anomalies_table, anomaly_rows)
+        ids_by_timestamp = self.anomaly_ids_by_timestamp()
+        self.assertEqual(anomaly_ids, [ids_by_timestamp[1762128000], None, ids_by_timestamp[1762128120]])
+
+    def test_bulk_determine_metric_ids(self):
+        with self.engine.begin() as connection:
+            connection.execute(self.metrics_table.insert().values(metric='metrics.known'))
+
+        def insert_new_metric(metric_name, metrics_to_insert=None):
+            with self.engine.begin() as connection:
+                for metric in metrics_to_insert:
+                    connection.execute(self.metrics_table.insert().values(metric=metric))
+
+        worker = Mock()
+        worker.redis_conn_decoded.hmget.side_effect = lambda key, metrics: [
+            '20' if metric == 'metrics.cached' else None for metric in metrics]
+        worker.insert_new_metric.side_effect = insert_new_metric
+        metrics = ['metrics.cached', 'metrics.known', 'metrics.new', 'labelled_metrics.1']
+        metric_ids = panorama.Panorama.bulk_determine_metric_ids(
+            worker, self.engine, self.metrics_table, metrics + ['metrics.known'])
+        self.assertEqual(metric_ids, {'metrics.cached': 20, 'metrics.known': 1, 'metrics.new': 2})
+        worker.insert_new_metric.assert_called_once_with(None, metrics_to_insert=['metrics.new'])
+
+
+if __name__ == '__main__':
+    unittest.main()
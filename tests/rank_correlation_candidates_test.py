@@ -0,0 +1,72 @@
+"""
+rank_correlation_candidates_test.py
+"""
+# @added 20261111 - Feature #5784: luminosity - rank correlation candidates
+import unittest
+
+import os.path
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+
+if True:
+    from functions.luminosity.rank_correlation_candidates import (
+        get_illuminance_activity_scores, rank_correlation_candidates)
+
+ANOMALY_TIMESTAMP = 1762128000
+
+
+class TestRankCorrelationCandidates(unittest.TestCase):
+    """
+    Test that the correlation candidates are scored on their illuminance
+    activity and ranked deterministically
+    """
+
+    def test_activity_scores(self):
+        illuminance_dicts = [
+            (ANOMALY_TIMESTAMP - 120, {
+                '1': {'t': ANOMALY_TIMESTAMP - 120, 'v': 1.0, 'a': [1, 2, 3]},
+                '2': {'t': ANOMALY_TIMESTAMP - 120, 'v': 1.0, 'a': [1]}}),
+            (ANOMALY_TIMESTAMP, {
+                '2': {'t': ANOMALY_TIMESTAMP, 'v': 1.0, 'a': [1, 2]},
+                # No algorithms recorded scores as one
+                '3': {'v': 1.0}}),
+        ]
+        activity_scores = get_illuminance_activity_scores(
+            'test', illuminance_dicts, ANOMALY_TIMESTAMP, 60)
+        self.assertEqual(set(activity_scores.keys()), {'1', '2', '3'})
+        self.assertAlmostEqual(activity_scores['1'], 1.0)
+        self.assertAlmostEqual(activity_scores['2'], (1 / 3.0) + 2)
+        self.assertAlmostEqual(activity_scores['3'], 1.0)
+
+    def test_bad_entries_are_skipped(self):
+        illuminance_dicts = [
+            (ANOMALY_TIMESTAMP, {'1': {'t': 'bad'}, '2': {'t': ANOMALY_TIMESTAMP, 'a': [1]}})]
+        activity_scores = get_illuminance_activity_scores(
+            'test', illuminance_dicts, ANOMALY_TIMESTAMP, 60)
+        self.assertEqual(activity_scores, {'2': 1.0})
+
+    def test_ranked_by_score(self):
+        candidates_scores = {'metrics.a': 1.0, 'metrics.b': 3.0, 'metrics.c': 2.0, 'metrics.d': 0}
+        self.assertEqual(
+            rank_correlation_candidates('test', candidates_scores, 0),
+            ['metrics.b', 'metrics.c', 'metrics.a', 'metrics.d'])
+        self.assertEqual(
+            rank_correlation_candidates('test', candidates_scores, 2),
+            ['metrics.b', 'metrics.c'])
+        self.assertEqual(
+            rank_correlation_candidates('test', candidates_scores, 10),
+            ['metrics.b', 'metrics.c', 'metrics.a', 'metrics.d'])
+
+    def test_ties_ordered_by_name(self):
+        candidates_scores = {'metrics.d': 1.0, 'metrics.b': 1.0, 'metrics.c': 1.0, 'metrics.a': 2.0}
+        self.assertEqual(
+            rank_correlation_candidates('test', candidates_scores, 3),
+            ['metrics.a', 'metrics.b', 'metrics.c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+roomba_incremental_trim_test.py
+"""
+# @added 20261028 - Feature #5770: roomba - incremental trim
+import unittest
+
+from mock import Mock, patch
+import os.path
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.join(os.path.dirname(os.path.realpath(current_dir)))
+skyline_dir = parent_dir + '/skyline'
+sys.path.append(skyline_dir)
+sys.path.append(skyline_dir + '/horizon')
+
+if True:
+    from horizon import roomba
+    from functions.timeseries.packed_timeseries import (
+        pack_datapoint, unpack_timeseries, MSGPACK_DATAPOINT_MARKER,
+        PACKED_RECORD_MARKER)
+
+START = 1762128000
+
+
+class BytesRedis(object):
+    """
+    The Redis string methods used by incremental_trim, backed by a dict
+    """
+    def __init__(self, data):
+        self.data = data
+
+    def getrange(self, key, start, end):
+        value = self.data.get(key, b'')
+        if end == -1:
+            return value[start:]
+        return value[start:end + 1]
+
+    def trim_key_prefix(self, keys, args):
+        prefix_length, prefix = args
+        if self.data[keys[0]][:prefix_length] != prefix:
+            return 0
+        self.data[keys[0]] = self.data[keys[0]][prefix_length:]
+        return 1
+
+
+class TestIncrementalTrim(unittest.TestCase):
+    """
+    Test that incremental_trim parses the key trim state, only trims keys that
+    are known to be in order and returns the new trim state
+    """
+
+    storage_format = 'msgpack'
+
+    def key_data(self, timestamps):
+        return b''.join(
+            pack_datapoint((timestamp, 1.0), storage_format=self.storage_format)
+            for timestamp in timestamps)
+
+    def trim_state(self, timestamps):
+        value = self.key_data(timestamps)
+        last_record = pack_datapoint((timestamps[-1], 1.0), storage_format=self.storage_format)
+        return '%s:%s:%s' % (str(len(value)), str(len(last_record)), str(timestamps[-1]))
+
+    def incremental_trim(self, key_data, key_trim_state, delta):
+        self.redis = BytesRedis({'metrics.test': key_data})
+        worker = Mock()
+        worker.redis_conn = self.redis
+        worker.trim_key_prefix = self.redis.trim_key_prefix
+        if self.storage_format == 'numpy':
+            marker = PACKED_RECORD_MARKER
+        else:
+            marker = MSGPACK_DATAPOINT_MARKER
+        with patch.object(roomba, 'STORAGE_FORMAT_MARKER', marker):
+            return roomba.Roomba.incremental_trim(worker, 'metrics.test', key_trim_state, delta)
+
+    def test_trims_the_start_of_the_key(self):
+        validated = [START + (i * 60) for i in range(10)]
+        appended = [START + (i * 60) for i in range(10, 13)]
+        status, key_trim_state = self.incremental_trim(
+            self.key_data(validated + appended), self.trim_state(validated),
+            START + (4 * 60))
+        self.assertEqual(status, 'trimmed')
+        kept = validated[5:] + appended
+        self.assertEqual(
+            [item[0] for item in unpack_timeseries(self.redis.data['metrics.test'])], kept)
+        self.assertEqual(key_trim_state, self.trim_state(kept))
+
+    def test_nothing_to_trim(self):
+        validated = [START + (i * 60) for i in range(10)]
+        status, key_trim_state = self.incremental_trim(
+            self.key_data(validated), self.trim_state(validated), START - 60)
+        self.assertEqual(status, 'active')
+        self.assertEqual(key_trim_state, self.trim_state(validated))
+        self.assertEqual(self.redis.data['metrics.test'], self.key_data(validated))
+
+    def test_trim_beyond_the_head_bytes(self):
+        validated = [START + (i * 60) for i in range(1000)]
+        with patch.object(roomba, 'ROOMBA_INCREMENTAL_TRIM_HEAD_BYTES', 64):
+            status, key_trim_state = self.incremental_trim(
+                self.key_data(validated), self.trim_state(validated),
+                START + (900 * 60))
+        self.assertEqual(status, 'trimmed')
+        self.assertEqual(key_trim_state, self.trim_state(validated[901:]))
+
+    def test_appended_out_of_order(self):
+        validated = [START + (i * 60) for i in range(10)]
+        appended = [START + (12 * 60), START + (11 * 60)]
+        self.assertEqual(self.incremental_trim(
+            self.key_data(validated + appended), self.trim_state(validated),
+            START + (4 * 60)), (None, None))
+
+    def test_appended_duplicate(self):
+        validated = [START + (i * 60) for i in range(10)]
+        appended = [validated[-1]]
+        self.assertEqual(self.incremental_trim(
+            self.key_data(validated + appended), self.trim_state(validated),
+            START + (4 * 60)), (None, None))
+
+    def test_key_rewritten(self):
+        validated = [START + (i * 60) for i in range(10)]
+        # The key has been rewritten and is shorter than the validated length
+        self.assertEqual(self.incremental_trim(
+            self.key_data(validated[3:]), self.trim_state(validated),
+            START + (4 * 60)), (None, None))
+        # The last validated data point is not at the validated offset
+        self.assertEqual(self.incremental_trim(
+            self.key_data([START - 60] + validated), self.trim_state(validated),
+            START + (4 * 60)), (None, None))
+
+    def test_all_data_older_than_delta(self):
+        validated = [START + (i * 60) for i in range(10)]
+        self.assertEqual(self.incremental_trim(
+            self.key_data(validated), self.trim_state(validated),
+            START + (20 * 60)), (None, None))
+
+    def test_trim_state_parsing(self):
+        validated = [START + (i * 60) for i in range(10)]
+        key_data = self.key_data(validated)
+        # A last record length of 0 or longer than the validated length
+        self.assertEqual(self.incremental_trim(
+            key_data, '%s:0:%s' % (str(len(key_data)), str(validated[-1])), START), (None, None))
+        self.assertEqual(self.incremental_trim(
+            key_data, '10:20:%s' % str(validated[-1]), START), (None, None))
+        # A float last timestamp as recorded from a float data point
+        key_trim_state = self.trim_state(validated).rsplit(':', 1)[0] + ':%s.0' % str(validated[-1])
+        status, new_key_trim_state = self.incremental_trim(key_data, key_trim_state, START)
+        self.assertEqual(status, 'trimmed')
+        for bad_key_trim_state in ['', '1:2', '1:2:3:4', 'a:b:c']:
+            with self.assertRaises(ValueError):
+                self.incremental_trim(key_data, bad_key_trim_state, START)
+
+
+class TestIncrementalTrimNumpy(TestIncrementalTrim):
+    """
+    Test incremental_trim on keys in the numpy format
+    """
+
+    storage_format = 'numpy'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,15 @@
+/*
+This is the SQL script to update Skyline to v5.0.0-patch-dev-5773
+*/
+
+/*
+# @added 20261031 - Feature #5773: ionosphere - fast tsfresh feature set
+# Add the tsfresh_feature_set column to the ionosphere table so that features
+# profiles are stamped with the tsfresh feature set they were calculated with.
+# All existing features profiles were calculated with the efficient feature set.
+*/
+USE skyline;
+ALTER TABLE `ionosphere` ADD COLUMN `tsfresh_feature_set` VARCHAR(32) DEFAULT 'efficient' COMMENT 'the tsfresh feature set the features profile was calculated with' AFTER `alias_id`;
+COMMIT;
+
+INSERT INTO `sql_versions` (version) VALUES ('5.0.0-patch.dev.5773');